@@ -0,0 +1,356 @@
+"""
+KPSS Quiz App - Sütunlu Sonuç Analitiği
+Tüm kullanıcıların test sonuçları NumPy dizilerinde (satır başına kullanıcı, konu, test, doğru, yanlış)
+tutulur; kullanıcı / ders / konu gruplamaları np.bincount ile vektörel yapılır
+Tablo bir kez depodan kurulur, sonra sonuç günlüğünün yeni satırlarıyla artımlı güncellenir
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config import Config
+from kullanici_repo import kullanici_repo
+from sonuc_gunlugu import sonuc_gunlugu, gunluk_sikistirici
+
+# Satır anahtarı: kullanıcı (31 bit) | konu (20 bit) | test_no (12 bit)
+_KONU_BIT = 20
+_TEST_BIT = 12
+
+
+def _oran(dogru, yanlis):
+    """Başarı yüzdesi (IlerlemeOzeti.basari_orani'nın vektörel hali)"""
+    toplam = dogru + yanlis
+    return np.divide(dogru * 100.0, toplam, out=np.zeros(np.shape(toplam)), where=toplam > 0)
+
+
+class _Sozluk:
+    """Metin ↔ tamsayı kodu (sütunlarda metin yerine kod tutulur)"""
+
+    __slots__ = ("kodlar", "adlar")
+
+    def __init__(self):
+        self.kodlar: Dict = {}
+        self.adlar: List = []
+
+    def kod(self, ad) -> int:
+        kod = self.kodlar.get(ad)
+        if kod is None:
+            kod = self.kodlar[ad] = len(self.adlar)
+            self.adlar.append(ad)
+        return kod
+
+    def __len__(self) -> int:
+        return len(self.adlar)
+
+
+class SonucTablosu:
+    """
+    (kullanıcı, ders, konu, test) başına bir satır; aynı test yeniden çözülünce satır güncellenir
+    Anahtarlar sıralı bir int64 dizisinde tutulur, toplu upsert np.searchsorted ile yapılır
+    """
+
+    def __init__(self, depo=None, gunluk=None, sikistirici=None, yeniden_kurma_sn: float = None):
+        self.depo = depo or kullanici_repo
+        self.gunluk = gunluk or sonuc_gunlugu
+        self.sikistirici = sikistirici or gunluk_sikistirici
+        self.yeniden_kurma_sn = yeniden_kurma_sn or Config.ANALITIK_YENIDEN_KURMA_SN
+
+        self._kilit = threading.RLock()
+        self._kuruldu = 0.0
+        self._bos()
+
+    def _bos(self):
+        self.kullanicilar = _Sozluk()
+        self.dersler = _Sozluk()
+        # (ders, konu) çiftleri; aynı adlı konu farklı derslerde ayrı tutulur
+        self.konular = _Sozluk()
+        self._konu_dersi = np.zeros(0, dtype=np.int32)
+
+        self.n = 0
+        self.kullanici = np.zeros(0, dtype=np.int32)
+        self.konu = np.zeros(0, dtype=np.int32)
+        self.test_no = np.zeros(0, dtype=np.int32)
+        self.dogru = np.zeros(0, dtype=np.int32)
+        self.yanlis = np.zeros(0, dtype=np.int32)
+        # Sıralı anahtarlar ve karşılık gelen satır numaraları
+        self._anahtarlar = np.zeros(0, dtype=np.int64)
+        self._satirlar = np.zeros(0, dtype=np.int64)
+        # Günlükte okunmuş son ofsetler
+        self._konum: Dict[str, int] = {}
+
+    # ===============================
+    # KURMA / GÜNCELLEME
+    # ===============================
+
+    def _kodla(self, kayitlar: Iterable[Tuple[str, str, str, int, int, int]]):
+        k, c, t, d, y = [], [], [], [], []
+        for kullanici, ders, konu, test_no, dogru, yanlis in kayitlar:
+            k.append(self.kullanicilar.kod(kullanici))
+            kod = self.konular.kod((ders, konu))
+            if kod == len(self._konu_dersi):
+                self._konu_dersi = np.append(self._konu_dersi, np.int32(self.dersler.kod(ders)))
+            c.append(kod)
+            t.append(test_no)
+            d.append(dogru)
+            y.append(yanlis)
+        return (np.array(k, dtype=np.int32), np.array(c, dtype=np.int32), np.array(t, dtype=np.int32),
+                np.array(d, dtype=np.int32), np.array(y, dtype=np.int32))
+
+    @staticmethod
+    def _anahtar(k, c, t):
+        return ((k.astype(np.int64) << (_KONU_BIT + _TEST_BIT))
+                | (c.astype(np.int64) << _TEST_BIT)
+                | (t.astype(np.int64) & ((1 << _TEST_BIT) - 1)))
+
+    def _uygula(self, kayitlar: Iterable[Tuple[str, str, str, int, int, int]]) -> int:
+        """Satırları ekle ya da güncelle (aynı anahtarda sonraki kayıt kazanır)"""
+        k, c, t, d, y = self._kodla(kayitlar)
+        if not len(k):
+            return 0
+        anahtar = self._anahtar(k, c, t)
+
+        # Parti içindeki tekrarlardan yalnızca sonuncusu
+        ters_anahtar = anahtar[::-1]
+        tekil, ilk = np.unique(ters_anahtar, return_index=True)
+        sec = len(anahtar) - 1 - ilk
+        k, c, t, d, y = k[sec], c[sec], t[sec], d[sec], y[sec]
+
+        konum = np.searchsorted(self._anahtarlar, tekil)
+        var = konum < len(self._anahtarlar)
+        var[var] = self._anahtarlar[konum[var]] == tekil[var]
+
+        # Var olan satırlar yerinde güncellenir
+        satir = self._satirlar[konum[var]]
+        self.dogru[satir] = d[var]
+        self.yanlis[satir] = y[var]
+
+        # Yeniler sona eklenir, sıralı anahtar dizisine araya sokulur
+        yeni = ~var
+        adet = int(yeni.sum())
+        if adet:
+            self._yer_ac(self.n + adet)
+            bas, son = self.n, self.n + adet
+            self.kullanici[bas:son] = k[yeni]
+            self.konu[bas:son] = c[yeni]
+            self.test_no[bas:son] = t[yeni]
+            self.dogru[bas:son] = d[yeni]
+            self.yanlis[bas:son] = y[yeni]
+            self._anahtarlar = np.insert(self._anahtarlar, konum[yeni], tekil[yeni])
+            self._satirlar = np.insert(self._satirlar, konum[yeni], np.arange(bas, son, dtype=np.int64))
+            self.n = son
+        return len(tekil)
+
+    def _yer_ac(self, gereken: int):
+        kapasite = len(self.kullanici)
+        if gereken <= kapasite:
+            return
+        yeni = max(gereken, kapasite * 2, 1024)
+        for ad in ("kullanici", "konu", "test_no", "dogru", "yanlis"):
+            eski = getattr(self, ad)
+            dizi = np.zeros(yeni, dtype=eski.dtype)
+            dizi[:kapasite] = eski
+            setattr(self, ad, dizi)
+
+    def yukle(self):
+        """Tabloyu depodan baştan kur"""
+        with self._kilit:
+            self._bos()
+            # Konum depodan önce okunur: arada işlenen kayıtlar iki kez uygulanır (zararsız)
+            self._konum = dict(self.sikistirici.konum())
+            self._uygula(self.depo.sonuc_satirlari())
+            self._kuruldu = time.monotonic()
+            self._gunlukten_oku()
+
+    def _gunlukten_oku(self) -> int:
+        okunan = 0
+        for segment in self.gunluk.segmentler():
+            ofset = self._konum.get(segment, 0)
+            try:
+                if os.path.getsize(os.path.join(self.gunluk.klasor, segment)) <= ofset:
+                    continue
+            except FileNotFoundError:
+                continue
+            kayitlar, self._konum[segment] = self.gunluk.oku(segment, ofset)
+            okunan += self._uygula(
+                (r["kullanici"], r["ders"], r["konu"], r["test_no"], r["dogru"], r["yanlis"])
+                for r in kayitlar
+            )
+        return okunan
+
+    def guncelle(self) -> int:
+        """
+        Günlüğe yeni eklenen sonuçları tabloya işle (ilk çağrıda ve yeniden_kurma_sn'de bir baştan kurar)
+        Returns: işlenen satır sayısı
+        """
+        with self._kilit:
+            if not self._kuruldu or time.monotonic() - self._kuruldu >= self.yeniden_kurma_sn:
+                self.yukle()
+                return self.n
+            return self._gunlukten_oku()
+
+    def kullanici_sil(self, kullanici: str):
+        """Silinen kullanıcının satırlarını sıfırla (bir sonraki kurulumda tamamen düşer)"""
+        with self._kilit:
+            kod = self.kullanicilar.kodlar.get(kullanici)
+            if kod is not None:
+                satirlar = self.kullanici[:self.n] == kod
+                self.dogru[:self.n][satirlar] = 0
+                self.yanlis[:self.n][satirlar] = 0
+
+    # ===============================
+    # SORGULAR
+    # ===============================
+
+    def _kullanici_toplamlari(self) -> Tuple[np.ndarray, np.ndarray]:
+        n, adet = self.n, len(self.kullanicilar)
+        kullanici = self.kullanici[:n]
+        return (np.bincount(kullanici, weights=self.dogru[:n], minlength=adet),
+                np.bincount(kullanici, weights=self.yanlis[:n], minlength=adet))
+
+    def kullanici_toplamlari(self) -> Dict[str, Tuple[int, int]]:
+        """Kullanıcı → (doğru, yanlış)"""
+        self.guncelle()
+        with self._kilit:
+            dogru, yanlis = self._kullanici_toplamlari()
+            return {
+                ad: (int(d), int(y))
+                for ad, d, y in zip(self.kullanicilar.adlar, dogru.tolist(), yanlis.tolist())
+                if d or y
+            }
+
+    def kullanici_raporu(self, kullanici: str) -> Dict[Tuple[str, str], Tuple[int, int, int]]:
+        """(ders, konu) → (çözülen test, doğru, yanlış)"""
+        self.guncelle()
+        with self._kilit:
+            kod = self.kullanicilar.kodlar.get(kullanici)
+            if kod is None:
+                return {}
+            n = self.n
+            maske = self.kullanici[:n] == kod
+            konu = self.konu[:n][maske]
+            adet = len(self.konular)
+            # test_no=0 satırları testlere dağıtılamamış eski toplamlardır, test sayılmaz
+            testler = np.bincount(konu, weights=self.test_no[:n][maske] > 0, minlength=adet)
+            dogru = np.bincount(konu, weights=self.dogru[:n][maske], minlength=adet)
+            yanlis = np.bincount(konu, weights=self.yanlis[:n][maske], minlength=adet)
+            dolu = np.flatnonzero(testler + dogru + yanlis)
+            return {
+                self.konular.adlar[i]: (int(testler[i]), int(dogru[i]), int(yanlis[i]))
+                for i in dolu
+            }
+
+    def ders_ortalamalari(self) -> Dict[str, Dict]:
+        """
+        Ders → {kullanici, dogru, yanlis, oran, ortalama_oran}
+        oran tüm cevapların başarısı, ortalama_oran dersi çözen kullanıcıların başarı ortalaması
+        """
+        self.guncelle()
+        with self._kilit:
+            n = self.n
+            ders_sayisi = max(len(self.dersler), 1)
+            ders = self._konu_dersi[self.konu[:n]] if n else np.zeros(0, dtype=np.int32)
+            dogru = np.bincount(ders, weights=self.dogru[:n], minlength=ders_sayisi)
+            yanlis = np.bincount(ders, weights=self.yanlis[:n], minlength=ders_sayisi)
+
+            # Kullanıcı × ders hücreleri
+            hucre = self.kullanici[:n].astype(np.int64) * ders_sayisi + ders
+            boyut = len(self.kullanicilar) * ders_sayisi
+            h_dogru = np.bincount(hucre, weights=self.dogru[:n], minlength=boyut)
+            h_yanlis = np.bincount(hucre, weights=self.yanlis[:n], minlength=boyut)
+            dolu = np.flatnonzero(h_dogru + h_yanlis)
+            h_ders = dolu % ders_sayisi
+            kullanici_sayisi = np.bincount(h_ders, minlength=ders_sayisi)
+            oran_toplami = np.bincount(
+                h_ders, weights=_oran(h_dogru[dolu], h_yanlis[dolu]), minlength=ders_sayisi
+            )
+            oran = _oran(dogru, yanlis)
+
+            sonuc = {}
+            for i, ad in enumerate(self.dersler.adlar):
+                if kullanici_sayisi[i]:
+                    sonuc[ad] = {
+                        "kullanici": int(kullanici_sayisi[i]),
+                        "dogru": int(dogru[i]),
+                        "yanlis": int(yanlis[i]),
+                        "oran": round(float(oran[i])),
+                        "ortalama_oran": round(float(oran_toplami[i] / kullanici_sayisi[i])),
+                    }
+            return sonuc
+
+    def konu_zorlugu(self, en_az_cevap: int = None, limit: int = None) -> List[Dict]:
+        """
+        Konular en düşük başarıdan en yükseğe (en zor konu başta)
+        en_az_cevap'tan az cevaplanmış konular istatistiksel olarak anlamsız sayılıp atlanır
+        """
+        en_az_cevap = Config.ANALITIK_EN_AZ_CEVAP if en_az_cevap is None else en_az_cevap
+        self.guncelle()
+        with self._kilit:
+            n, adet = self.n, len(self.konular)
+            konu = self.konu[:n]
+            dogru = np.bincount(konu, weights=self.dogru[:n], minlength=adet)
+            yanlis = np.bincount(konu, weights=self.yanlis[:n], minlength=adet)
+            oran = _oran(dogru, yanlis)
+            uygun = np.flatnonzero((dogru + yanlis) >= max(en_az_cevap, 1))
+            sira = uygun[np.argsort(oran[uygun], kind="stable")][:limit]
+            return [
+                {
+                    "ders": self.konular.adlar[i][0],
+                    "konu": self.konular.adlar[i][1],
+                    "dogru": int(dogru[i]),
+                    "yanlis": int(yanlis[i]),
+                    "oran": round(float(oran[i])),
+                }
+                for i in sira
+            ]
+
+    def liderlik(self, limit: int = 10, ders: Optional[str] = None) -> List[Dict]:
+        """En yüksek nete (doğru - yanlış / 4) sahip kullanıcılar"""
+        self.guncelle()
+        with self._kilit:
+            n = self.n
+            satir = slice(0, n)
+            kullanici, dogru, yanlis = self.kullanici[satir], self.dogru[satir], self.yanlis[satir]
+            if ders is not None:
+                kod = self.dersler.kodlar.get(ders)
+                if kod is None:
+                    return []
+                maske = self._konu_dersi[self.konu[satir]] == kod
+                kullanici, dogru, yanlis = kullanici[maske], dogru[maske], yanlis[maske]
+
+            adet = len(self.kullanicilar)
+            t_dogru = np.bincount(kullanici, weights=dogru, minlength=adet)
+            t_yanlis = np.bincount(kullanici, weights=yanlis, minlength=adet)
+            net = t_dogru - t_yanlis / 4
+            aday = np.flatnonzero((t_dogru + t_yanlis) > 0)
+            if len(aday) > limit:
+                aday = aday[np.argpartition(-net[aday], limit - 1)[:limit]]
+            aday = aday[np.argsort(-net[aday], kind="stable")]
+            return [
+                {
+                    "kullanici": self.kullanicilar.adlar[i],
+                    "dogru": int(t_dogru[i]),
+                    "yanlis": int(t_yanlis[i]),
+                    "net": round(float(net[i]), 2),
+                }
+                for i in aday
+            ]
+
+    def siralama(self, kullanici: str) -> Optional[Tuple[int, int]]:
+        """Kullanıcının nete göre sırası: (sıra, sonucu olan kullanıcı sayısı); sonucu yoksa None"""
+        self.guncelle()
+        with self._kilit:
+            kod = self.kullanicilar.kodlar.get(kullanici)
+            if kod is None:
+                return None
+            dogru, yanlis = self._kullanici_toplamlari()
+            aktif = (dogru + yanlis) > 0
+            if not aktif[kod]:
+                return None
+            net = dogru - yanlis / 4
+            return int((net[aktif] > net[kod]).sum()) + 1, int(aktif.sum())
+
+
+# Global sonuç tablosu instance (ilk sorguda kurulur)
+sonuc_tablosu = SonucTablosu()
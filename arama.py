@@ -0,0 +1,261 @@
+"""
+KPSS Quiz App - Soru Arama
+Soru metni, seçenekler ve çözüm üzerinde Türkçe'ye uygun ters indeks (inverted index)
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from soru_bankasi import soru_deposu
+
+# Alan ağırlıkları: soru metnindeki eşleşme, çözümdeki eşleşmeden daha önemlidir
+ALAN_AGIRLIKLARI = {"soru": 2.0, "maddeler": 1.5, "secenekler": 1.0, "cozum": 0.5}
+
+# BM25 parametreleri
+K1 = 1.2
+B = 0.75
+
+# Son kelime yazılırken önek eşleşmesinin katsayısı
+ONEK_KATSAYISI = 0.5
+
+# Tek geçişte Türkçe harfleri katla (I ve İ de i olur; ı zaten i'ye katlanır)
+_KATLAMA = str.maketrans("IİıçğöşüâîûÇĞÖŞÜÂÎÛ", "iiicgosuaiuCGOSUAIU")
+_KELIME = re.compile(r"[a-z0-9]+")
+# Özel isimden sonra kesmeyle ayrılan ek (Devleti'nin, 1923'te); ayrı kelime sayılmaz
+_KESME_EKI = re.compile(r"(?<=[a-z0-9])['’‘`´][a-z]+")
+
+_DURAK_KELIMELER = frozenset({
+    "ve", "veya", "ile", "bir", "bu", "su", "o", "da", "de", "ki", "mi", "mu",
+    "icin", "gibi", "olan", "olarak", "hangisi", "hangisidir", "hangisinde",
+    "asagidakilerden", "asagidaki", "yalniz",
+})
+
+# Katlanmış (ç→c, ı→i ...) halde, uzundan kısaya
+_EKLER = tuple(sorted({
+    "lerinden", "larindan", "lerinde", "larinda", "lerine", "larina", "lerini", "larini",
+    "leri", "lari", "ler", "lar",
+    "inden", "indan", "nden", "ndan", "inde", "inda", "dan", "den", "tan", "ten",
+    "nin", "nun", "in", "un", "da", "de", "ta", "te",
+    "yi", "yu", "ya", "ye", "si", "su", "i", "u", "a", "e",
+}, key=len, reverse=True))
+_EN_KISA_KOK = 3
+
+
+# ===============================
+# METİN NORMALLEŞTİRME
+# ===============================
+
+def normallestir(metin: str) -> str:
+    """Türkçe küçük harfe çevir, aksanları at (İ→i, I→ı→i, ş→s ...)"""
+    metin = metin.translate(_KATLAMA).lower()
+    if metin.isascii():
+        return metin
+    metin = unicodedata.normalize("NFKD", metin)
+    return "".join(c for c in metin if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=65536)
+def kok(kelime: str) -> str:
+    """Hafif ek atma (en fazla iki ek); sorgu ve indeks aynı kuralı kullandığı için tutarlıdır"""
+    for _ in range(2):
+        for ek in _EKLER:
+            if kelime.endswith(ek) and len(kelime) - len(ek) >= _EN_KISA_KOK:
+                kelime = kelime[:-len(ek)]
+                break
+        else:
+            break
+    return kelime
+
+
+def _ham_kelimeler(metin: str) -> List[str]:
+    return _KELIME.findall(_KESME_EKI.sub("", normallestir(metin)))
+
+
+def kelimeler(metin: str) -> List[str]:
+    """Metni indekslenecek köklere ayır"""
+    return [kok(k) for k in _ham_kelimeler(metin) if k not in _DURAK_KELIMELER]
+
+
+def _soru_alanlari(soru):
+    yield "soru", soru.get("soru", "")
+    maddeler = soru.get("maddeler")
+    if maddeler:
+        yield "maddeler", " ".join(maddeler)
+    yield "secenekler", " ".join(soru.get("secenekler", {}).values())
+    yield "cozum", soru.get("cozum", "")
+
+
+# ===============================
+# İNDEKS
+# ===============================
+
+class SoruAramaIndeksi:
+    """
+    Soru bankası için ters indeks
+    İlk aramada kurulur; yönetim panelindeki değişikliklerde yalnızca ilgili konu
+    yeniden indekslenir, banka başka süreçte değişirse baştan kurulur
+    """
+
+    def __init__(self, depo):
+        self.depo = depo
+        self._kilit = threading.Lock()
+        self._versiyon = None
+        self._kurulu = False
+
+        # belge_id → (ders, konu, sira, ağırlıklı uzunluk, kelimeler)
+        self._belgeler: Dict[int, Tuple[str, str, int, float, tuple]] = {}
+        self._konu_belgeleri: Dict[Tuple[str, str], List[int]] = {}
+        self._ters: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._toplam_uzunluk = 0.0
+        self._sonraki_id = 0
+        self._sirali_kelimeler: Optional[List[str]] = None
+
+    # ===============================
+    # KURMA / GÜNCELLEME
+    # ===============================
+
+    def _belge_ekle(self, ders: str, konu: str, sira: int, soru) -> int:
+        belge_id = self._sonraki_id
+        self._sonraki_id += 1
+
+        frekans: Dict[str, float] = defaultdict(float)
+        uzunluk = 0.0
+        for alan, metin in _soru_alanlari(soru):
+            agirlik = ALAN_AGIRLIKLARI[alan]
+            for k in kelimeler(metin):
+                frekans[k] += agirlik
+                uzunluk += agirlik
+
+        for k, f in frekans.items():
+            self._ters[k][belge_id] = f
+        self._belgeler[belge_id] = (ders, konu, sira, uzunluk, tuple(frekans))
+        self._toplam_uzunluk += uzunluk
+        return belge_id
+
+    def _konu_cikar(self, ders: str, konu: str):
+        for belge_id in self._konu_belgeleri.pop((ders, konu), []):
+            _, _, _, uzunluk, belge_kelimeleri = self._belgeler.pop(belge_id)
+            self._toplam_uzunluk -= uzunluk
+            for k in belge_kelimeleri:
+                liste = self._ters[k]
+                del liste[belge_id]
+                if not liste:
+                    del self._ters[k]
+
+    def _konu_ekle(self, ders: str, konu: str):
+        self._konu_belgeleri[(ders, konu)] = [
+            self._belge_ekle(ders, konu, sira, soru)
+            for sira, soru in enumerate(self.depo.sorular(ders, konu))
+        ]
+        self._sirali_kelimeler = None
+
+    def _kur(self):
+        self._belgeler.clear()
+        self._konu_belgeleri.clear()
+        self._ters.clear()
+        self._toplam_uzunluk = 0.0
+        for ders in self.depo.ders_listesi():
+            for konu in self.depo.konu_listesi(ders):
+                self._konu_ekle(ders, konu)
+        self._versiyon = self.depo.versiyon
+        self._kurulu = True
+
+    def _guncel_tut(self):
+        self.depo.ders_listesi()  # deponun dosya değişikliği kontrolünü tetikler
+        if not self._kurulu or self.depo.versiyon != self._versiyon:
+            self._kur()
+
+    def konu_guncelle(self, ders: str, konu: str):
+        """Bir konu eklendi/düzenlendi/silindi; yalnızca o konuyu yeniden indeksle"""
+        with self._kilit:
+            if not self._kurulu:
+                return
+            self._konu_cikar(ders, konu)
+            if konu in self.depo.konu_listesi(ders):
+                self._konu_ekle(ders, konu)
+            self._versiyon = self.depo.versiyon
+
+    # ===============================
+    # ARAMA
+    # ===============================
+
+    def _onek_eslesmeleri(self, onek: str) -> List[str]:
+        if self._sirali_kelimeler is None:
+            self._sirali_kelimeler = sorted(self._ters)
+        sonuc = []
+        i = bisect_left(self._sirali_kelimeler, onek)
+        while i < len(self._sirali_kelimeler) and self._sirali_kelimeler[i].startswith(onek):
+            sonuc.append(self._sirali_kelimeler[i])
+            i += 1
+        return sonuc
+
+    def ara(self, sorgu: str, limit: int = 20, ders: Optional[str] = None) -> List[Dict]:
+        """
+        Sorguyu ara; tüm kelimeleri içeren sorular öne çıkar
+        Returns: [{"ders", "konu", "sira", "test_no", "skor", "ozet"}, ...]
+        """
+        ham = _ham_kelimeler(sorgu)
+        terimler = [kok(k) for k in ham if k not in _DURAK_KELIMELER]
+        if not terimler:
+            return []
+
+        with self._kilit:
+            self._guncel_tut()
+            n = len(self._belgeler)
+            if n == 0:
+                return []
+            ort_uzunluk = self._toplam_uzunluk / n
+
+            puanlar: Dict[int, float] = defaultdict(float)
+            eslesen: Dict[int, int] = defaultdict(int)
+            for j, terim in enumerate(terimler):
+                adaylar = [(terim, 1.0)]
+                # Son kelime henüz yazılıyor olabilir: öneki tutan kelimeleri de say
+                if (j == len(terimler) - 1 and len(ham[-1]) >= _EN_KISA_KOK
+                        and ham[-1] not in _DURAK_KELIMELER):
+                    adaylar += [(k, ONEK_KATSAYISI) for k in self._onek_eslesmeleri(ham[-1]) if k != terim]
+
+                bulunan = set()
+                for kelime, katsayi in adaylar:
+                    liste = self._ters.get(kelime)
+                    if not liste:
+                        continue
+                    idf = math.log(1 + (n - len(liste) + 0.5) / (len(liste) + 0.5))
+                    for belge_id, tf in liste.items():
+                        uzunluk = self._belgeler[belge_id][3]
+                        puanlar[belge_id] += katsayi * idf * tf * (K1 + 1) / (
+                            tf + K1 * (1 - B + B * uzunluk / ort_uzunluk)
+                        )
+                        bulunan.add(belge_id)
+                for belge_id in bulunan:
+                    eslesen[belge_id] += 1
+
+            sonuclar = []
+            for belge_id, puan in puanlar.items():
+                b_ders, b_konu, sira, _, _ = self._belgeler[belge_id]
+                if ders is not None and b_ders != ders:
+                    continue
+                sonuclar.append((puan * eslesen[belge_id] / len(terimler), b_ders, b_konu, sira))
+
+            sonuclar.sort(key=lambda s: s[0], reverse=True)
+            cikti = []
+            for puan, b_ders, b_konu, sira in sonuclar[:limit]:
+                soru = self.depo.sorular(b_ders, b_konu)[sira]
+                cikti.append({
+                    "ders": b_ders,
+                    "konu": b_konu,
+                    "sira": sira,
+                    "test_no": self.depo.test_no_bul(b_ders, b_konu, sira),
+                    "skor": round(puan, 3),
+                    "ozet": soru.get("soru", "")[:100],
+                })
+            return cikti
+
+
+# Global arama indeksi instance
+arama_indeksi = SoruAramaIndeksi(soru_deposu)
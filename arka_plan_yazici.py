@@ -0,0 +1,68 @@
+"""
+KPSS Quiz App - Arka Plan Yazıcısı
+Bellekte biriken değişiklikleri aralıklarla (ya da eşik dolunca uyandırılınca)
+tek bir daemon thread'de yazan ortak döngü. Yazılamayan partiyi kuyruğa geri koymak
+yazma fonksiyonunun işidir; döngü yalnızca uyarır ve bir sonraki turda yeniden dener
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+
+class ArkaPlanYazici:
+    """
+    yaz() fonksiyonunu aralik saniyede bir çağıran thread
+    İlk baslat() çağrısında açılır; kapat() thread'i durdurup son kez yazar
+    """
+
+    def __init__(self, ad: str, yaz: Callable[[], Any], aralik: float, uyari: str):
+        self.ad = ad
+        self.yaz = yaz
+        self.aralik = aralik
+        self.uyari = uyari
+
+        self._kilit = threading.Lock()
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _dongu(self):
+        while True:
+            self._uyandir.wait(self.aralik)
+            self._uyandir.clear()
+            if self._durdur.is_set():
+                # Son yazma kapat()'ta, çağıranın thread'inde yapılır
+                return
+            try:
+                self.yaz()
+            except Exception as e:
+                print(f"⚠️ {self.uyari}: {e}")
+
+    def baslat(self):
+        """Thread'i başlat (çalışıyorsa bir şey yapmaz)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._kilit:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._durdur.clear()
+            self._thread = threading.Thread(target=self._dongu, name=self.ad, daemon=True)
+            self._thread.start()
+
+    def uyandir(self):
+        """Beklemeden bir yazma turu çalıştır"""
+        self._uyandir.set()
+
+    def durdur(self):
+        """Thread'i durdur (bekleyenler yazılmaz)"""
+        self._durdur.set()
+        self._uyandir.set()
+        with self._kilit:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.aralik + 5)
+
+    def kapat(self):
+        """Thread'i durdur ve kalanları yaz (süreç kapanırken çağrılır)"""
+        self.durdur()
+        self.yaz()
@@ -3,20 +3,24 @@ KPSS Quiz App - Kimlik Doğrulama ve Güvenlik Modülü
 bcrypt ile şifre hashleme ve güvenli kullanıcı yönetimi
 """
 
-import bcrypt
-import json
-import os
+import hmac
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict, Tuple
 from config import Config
+from kullanici_repo import kullanici_repo
+from sifre_havuzu import sifre_havuzu, SifreHavuzuMesgul, bcrypt_hash_mi, hash_maliyeti
+from sifre_gocu import SifreGocu
+from hiz_siniri import giris_hiz_siniri
+from yazma_kuyrugu import yazma_kuyrugu
 
 class AuthManager:
     """Kimlik doğrulama yöneticisi"""
     
     def __init__(self):
         self.kullanicilar_dosya = Config.KULLANICILAR_DOSYA
-        self.failed_attempts = {}  # Başarısız giriş denemeleri
+        self.depo = kullanici_repo  # main.py ve arka plan işleriyle ortak, önbellekli
+        self.hiz_siniri = giris_hiz_siniri  # Başarısız giriş denemeleri (süreçler arası ortak)
     
     # ===============================
     # ŞİFRE HASHLEME
@@ -24,41 +28,93 @@ class AuthManager:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Şifreyi bcrypt ile hashle"""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """
+        Şifreyi bcrypt ile hashle (şifre havuzunda, Config.BCRYPT_ROUNDS maliyetiyle)
+        Havuz doluysa SifreHavuzuMesgul fırlatır
+        """
+        return sifre_havuzu.hashle(password)
     
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
-        """Şifreyi doğrula"""
-        try:
-            return bcrypt.checkpw(
-                password.encode('utf-8'),
-                hashed_password.encode('utf-8')
-            )
-        except Exception:
+        """
+        Şifreyi doğrula (şifre havuzunda)
+        Havuz doluysa SifreHavuzuMesgul fırlatır
+        """
+        if not hashed_password:
             return False
+        return sifre_havuzu.dogrula(password, hashed_password)
+    
+    @staticmethod
+    def hash_guncel_mi(hashed_password: str) -> bool:
+        """Kayıtlı şifre bcrypt hash'i ve maliyeti Config.BCRYPT_ROUNDS'tan düşük değil mi"""
+        return bcrypt_hash_mi(hashed_password) and hash_maliyeti(hashed_password) >= Config.BCRYPT_ROUNDS
+    
+    def sifre_kontrol(self, kullanici_adi: str, kullanici: Dict, sifre: str) -> bool:
+        """
+        Şifreyi doğrula; eski düz metin kayıtları da kabul eder
+        Doğruysa ve kayıt güncel değilse (düz metin ya da düşük maliyet) yeniden hashler
+        Havuz doluysa SifreHavuzuMesgul fırlatır
+        """
+        kayitli = kullanici.get("sifre", "")
+        if bcrypt_hash_mi(kayitli):
+            if not self.verify_password(sifre, kayitli):
+                return False
+        elif not kayitli or not hmac.compare_digest(sifre.encode("utf-8"), kayitli.encode("utf-8")):
+            return False
+        
+        if not self.hash_guncel_mi(kayitli):
+            try:
+                yeni = self.hash_password(sifre)
+            except SifreHavuzuMesgul:
+                # Giriş yine başarılı; yükseltme bir sonraki girişte denenir
+                return True
+            if self.depo.sifreleri_guncelle({kullanici_adi: (kayitli, yeni)}):
+                kullanici["sifre"] = yeni
+        return True
     
     # ===============================
     # KULLANICI YÖNETİMİ
     # ===============================
     
     def kullanicilari_yukle(self) -> Dict:
-        """Kullanıcıları yükle"""
-        if not os.path.exists(self.kullanicilar_dosya):
-            return {}
-        
-        try:
-            with open(self.kullanicilar_dosya, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+        """Kullanıcıları yükle (kuyrukta bekleyen profil alanları dahil)"""
+        return yazma_kuyrugu.uygula(self.depo.tumunu_yukle())
     
     def kullanicilari_kaydet(self, kullanicilar: Dict):
         """Kullanıcıları kaydet"""
-        with open(self.kullanicilar_dosya, "w", encoding="utf-8") as f:
-            json.dump(kullanicilar, f, ensure_ascii=False, indent=2)
+        self.depo.tumunu_kaydet(kullanicilar)
+    
+    def kullanici_getir(self, kullanici_adi: str) -> Optional[Dict]:
+        """Tek kullanıcıyı getir (kuyrukta bekleyen profil alanları dahil)"""
+        kullanici = self.depo.kullanici_getir(kullanici_adi)
+        if kullanici is not None:
+            kullanici.update(yazma_kuyrugu.bekleyen(kullanici_adi) or {})
+        return kullanici
+    
+    def kullanici_var_mi(self, kullanici_adi: str) -> bool:
+        """Kullanıcı kayıtlı mı (önbellekten, kopyalamadan)"""
+        return self.depo.var_mi(kullanici_adi)
+    
+    def kullanici_kaydet(self, kullanici_adi: str, kullanici: Dict):
+        """Tek kullanıcıyı kaydet"""
+        self.depo.kullanici_kaydet(kullanici_adi, kullanici)
+    
+    def kullanici_sil(self, kullanici_adi: str) -> bool:
+        """Kullanıcıyı sil"""
+        return self.depo.kullanici_sil(kullanici_adi)
+    
+    # ===============================
+    # SONUÇ KAYDI
+    # ===============================
+    
+    def sonuclari_kaydet(self, kullanici_adi: str, sonuclar: Dict):
+        """Kullanıcının tüm sonuçlarını kaydet (yalnızca o kullanıcı yazılır)"""
+        self.depo.sonuclari_kaydet(kullanici_adi, sonuclar)
+    
+    def test_sonucu_kaydet(self, kullanici_adi: str, ders: str, konu: str,
+                           test_no: int, dogru: int, yanlis: int):
+        """Tek bir test sonucunu kaydet"""
+        self.depo.test_sonucu_kaydet(kullanici_adi, ders, konu, test_no, dogru, yanlis)
     
     # ===============================
     # KAYIT İŞLEMLERİ
@@ -70,10 +126,8 @@ class AuthManager:
         Yeni kullanıcı kaydı oluştur
         Returns: (başarılı_mı, mesaj)
         """
-        kullanicilar = self.kullanicilari_yukle()
-        
         # Kullanıcı adı kontrolü
-        if kullanici_adi in kullanicilar:
+        if self.kullanici_var_mi(kullanici_adi):
             return False, "❌ Bu kullanıcı adı zaten kayıtlı!"
         
         # Şifre güvenlik kontrolü
@@ -81,18 +135,19 @@ class AuthManager:
             return False, "❌ Şifre en az 6 karakter olmalı!"
         
         # Yeni kullanıcı oluştur
-        hashed_password = self.hash_password(sifre)
+        try:
+            hashed_password = self.hash_password(sifre)
+        except SifreHavuzuMesgul:
+            return False, "⏳ Sunucu şu an yoğun, lütfen birkaç saniye sonra tekrar deneyin."
         
-        kullanicilar[kullanici_adi] = {
+        self.kullanici_kaydet(kullanici_adi, {
             "isim": isim,
             "sifre": hashed_password,
             "is_admin": is_admin,
             "sonuclar": {},
             "created_at": datetime.now().isoformat(),
             "last_login": None
-        }
-        
-        self.kullanicilari_kaydet(kullanicilar)
+        })
         return True, f"✅ {isim} başarıyla kaydedildi!"
     
     # ===============================
@@ -101,82 +156,58 @@ class AuthManager:
     
     def check_rate_limit(self, kullanici_adi: str) -> Tuple[bool, Optional[str]]:
         """
-        Rate limiting kontrolü
+        Rate limiting kontrolü (tüm süreçlerde ortak jeton kovası)
         Returns: (izin_var_mı, kalan_süre_mesajı)
         """
-        if kullanici_adi not in self.failed_attempts:
-            return True, None
-        
-        attempt_data = self.failed_attempts[kullanici_adi]
-        
-        # Süre dolmuş mu kontrol et
-        cooldown_end = attempt_data.get("cooldown_until")
-        if cooldown_end:
-            if datetime.now() < cooldown_end:
-                remaining = cooldown_end - datetime.now()
-                minutes = int(remaining.total_seconds() / 60)
-                return False, f"⏰ {minutes} dakika sonra tekrar deneyin"
-            else:
-                # Süre dolmuş, temizle
-                del self.failed_attempts[kullanici_adi]
-                return True, None
-        
+        izin, bekleme, _ = self.hiz_siniri.kontrol(kullanici_adi)
+        if not izin:
+            return False, self.hiz_siniri.bekleme_mesaji(bekleme)
         return True, None
     
-    def record_failed_attempt(self, kullanici_adi: str):
-        """Başarısız giriş denemesini kaydet"""
-        if kullanici_adi not in self.failed_attempts:
-            self.failed_attempts[kullanici_adi] = {
-                "count": 0,
-                "cooldown_until": None
-            }
-        
-        self.failed_attempts[kullanici_adi]["count"] += 1
-        
-        # Limit aşıldı mı?
-        if self.failed_attempts[kullanici_adi]["count"] >= Config.MAX_LOGIN_ATTEMPTS:
-            cooldown_until = datetime.now() + timedelta(
-                minutes=Config.LOGIN_COOLDOWN_MINUTES
-            )
-            self.failed_attempts[kullanici_adi]["cooldown_until"] = cooldown_until
+    def record_failed_attempt(self, kullanici_adi: str) -> int:
+        """
+        Başarısız giriş denemesini kaydet
+        Returns: kalan deneme hakkı
+        """
+        return self.hiz_siniri.basarisiz(kullanici_adi)
     
     def clear_failed_attempts(self, kullanici_adi: str):
         """Başarılı girişte denemeleri temizle"""
-        if kullanici_adi in self.failed_attempts:
-            del self.failed_attempts[kullanici_adi]
+        self.hiz_siniri.temizle(kullanici_adi)
     
     def giris_yap(self, kullanici_adi: str, sifre: str) -> Tuple[bool, str, Optional[Dict]]:
         """
         Kullanıcı girişi
         Returns: (başarılı_mı, mesaj, kullanici_bilgisi)
         """
-        # Rate limiting kontrolü
-        can_attempt, limit_message = self.check_rate_limit(kullanici_adi)
-        if not can_attempt:
-            return False, limit_message, None
+        # Rate limiting: jeton bcrypt'ten önce atomik olarak harcanır,
+        # böylece eşzamanlı denemeler de sınırı aşamaz
+        izin, bekleme, attempts_left = self.hiz_siniri.al(kullanici_adi)
+        if not izin:
+            return False, self.hiz_siniri.bekleme_mesaji(bekleme), None
         
-        kullanicilar = self.kullanicilari_yukle()
+        kullanici = self.kullanici_getir(kullanici_adi)
         
         # Kullanıcı var mı?
-        if kullanici_adi not in kullanicilar:
-            self.record_failed_attempt(kullanici_adi)
+        if kullanici is None:
             return False, "❌ Kullanıcı adı veya şifre hatalı!", None
         
-        kullanici = kullanicilar[kullanici_adi]
+        # Şifre doğrula (yoğunluk hatalı deneme sayılmaz, jeton iade edilir)
+        try:
+            dogru_mu = self.sifre_kontrol(kullanici_adi, kullanici, sifre)
+        except SifreHavuzuMesgul:
+            self.hiz_siniri.iade(kullanici_adi)
+            return False, "⏳ Sunucu şu an yoğun, lütfen birkaç saniye sonra tekrar deneyin.", None
         
-        # Şifre doğrula
-        if not self.verify_password(sifre, kullanici["sifre"]):
-            self.record_failed_attempt(kullanici_adi)
-            attempts_left = Config.MAX_LOGIN_ATTEMPTS - self.failed_attempts[kullanici_adi]["count"]
+        if not dogru_mu:
             return False, f"❌ Kullanıcı adı veya şifre hatalı! (Kalan deneme: {attempts_left})", None
         
         # Başarılı giriş
         self.clear_failed_attempts(kullanici_adi)
         
-        # Son giriş tarihini güncelle
+        # Son giriş tarihini güncelle (arka planda, diğer girişlerle birlikte yazılır)
         kullanici["last_login"] = datetime.now().isoformat()
-        kullanicilar[kullanici_adi] = kullanici
-        self.kullanicilari_kaydet(kullanicilar)
+        yazma_kuyrugu.son_giris(kullanici_adi, kullanici["last_login"])
         
         return True, "✅ Giriş başarılı!", kullanici
     
@@ -190,25 +221,25 @@ class AuthManager:
         Kullanıcı şifresini değiştir
         Returns: (başarılı_mı, mesaj)
         """
-        kullanicilar = self.kullanicilari_yukle()
+        kullanici = self.kullanici_getir(kullanici_adi)
         
-        if kullanici_adi not in kullanicilar:
+        if kullanici is None:
             return False, "❌ Kullanıcı bulunamadı!"
         
-        kullanici = kullanicilar[kullanici_adi]
-        
-        # Eski şifre doğru mu?
-        if not self.verify_password(eski_sifre, kullanici["sifre"]):
-            return False, "❌ Eski şifre yanlış!"
-        
-        # Yeni şifre güvenlik kontrolü
-        if len(yeni_sifre) < 6:
-            return False, "❌ Yeni şifre en az 6 karakter olmalı!"
-        
-        # Şifreyi güncelle
-        kullanici["sifre"] = self.hash_password(yeni_sifre)
-        kullanicilar[kullanici_adi] = kullanici
-        self.kullanicilari_kaydet(kullanicilar)
+        try:
+            # Eski şifre doğru mu?
+            if not self.sifre_kontrol(kullanici_adi, kullanici, eski_sifre):
+                return False, "❌ Eski şifre yanlış!"
+            
+            # Yeni şifre güvenlik kontrolü
+            if len(yeni_sifre) < 6:
+                return False, "❌ Yeni şifre en az 6 karakter olmalı!"
+            
+            # Şifreyi güncelle
+            kullanici["sifre"] = self.hash_password(yeni_sifre)
+        except SifreHavuzuMesgul:
+            return False, "⏳ Sunucu şu an yoğun, lütfen birkaç saniye sonra tekrar deneyin."
+        self.kullanici_kaydet(kullanici_adi, kullanici)
         
         return True, "✅ Şifre başarıyla güncellendi!"
     
@@ -218,20 +249,17 @@ class AuthManager:
     
     def is_admin(self, kullanici_adi: str) -> bool:
         """Kullanıcı admin mi kontrol et"""
-        kullanicilar = self.kullanicilari_yukle()
-        if kullanici_adi in kullanicilar:
-            return kullanicilar[kullanici_adi].get("is_admin", False)
-        return False
+        return bool(self.depo.alan(kullanici_adi, "is_admin", False))
     
     def admin_yap(self, kullanici_adi: str) -> Tuple[bool, str]:
         """Kullanıcıya admin yetkisi ver"""
-        kullanicilar = self.kullanicilari_yukle()
+        kullanici = self.kullanici_getir(kullanici_adi)
         
-        if kullanici_adi not in kullanicilar:
+        if kullanici is None:
             return False, "❌ Kullanıcı bulunamadı!"
         
-        kullanicilar[kullanici_adi]["is_admin"] = True
-        self.kullanicilari_kaydet(kullanicilar)
+        kullanici["is_admin"] = True
+        self.kullanici_kaydet(kullanici_adi, kullanici)
         return True, "✅ Admin yetkisi verildi!"
     
     # ===============================
@@ -240,37 +268,14 @@ class AuthManager:
     
     def migrate_plain_passwords(self) -> Tuple[int, int]:
         """
-        Düz metin şifreleri hash'e çevir
-        Returns: (dönüştürülen_sayısı, toplam_sayı)
+        Düz metin şifreleri hash'e çevir (baştan sona, partiler halinde)
+        Uygulama açıkken sifre_gocu arka planda aynı işi yapar; düz metin
+        şifreler zaten ilk başarılı girişte de hashlenir
+        Returns: (dönüştürülen_sayısı, taranan_sayı)
         """
-        kullanicilar = self.kullanicilari_yukle()
-        converted = 0
-        total = len(kullanicilar)
-        
-        for kullanici_adi, kullanici_data in kullanicilar.items():
-            sifre = kullanici_data.get("sifre", "")
-            
-            # Zaten hash'lenmiş mi kontrol et (bcrypt hash'leri $2b$ ile başlar)
-            if not sifre.startswith("$2b$"):
-                # Düz metin şifre, hashle
-                kullanici_data["sifre"] = self.hash_password(sifre)
-                
-                # Admin flag yoksa ekle
-                if "is_admin" not in kullanici_data:
-                    kullanici_data["is_admin"] = False
-                
-                # Timestamp yoksa ekle
-                if "created_at" not in kullanici_data:
-                    kullanici_data["created_at"] = datetime.now().isoformat()
-                if "last_login" not in kullanici_data:
-                    kullanici_data["last_login"] = None
-                
-                converted += 1
-        
-        if converted > 0:
-            self.kullanicilari_kaydet(kullanicilar)
-        
-        return converted, total
+        gocu = SifreGocu(self.depo)
+        gocu.sifirla()
+        return gocu.calistir()
     
     def create_first_admin(self) -> bool:
         """İlk admin kullanıcısını oluştur"""
@@ -0,0 +1,82 @@
+"""
+KPSS Quiz App - Sonuç Kaydetme Benchmark'ı
+Tek bir test sonucunu kaydetme süresini kullanıcı sayısına göre ölçer (JSON vs SQLite)
+
+Kullanım:
+    python benchmarks/kayit_benchmark.py
+    python benchmarks/kayit_benchmark.py --sayilar 10 1000 100000 --tekrar 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kullanici_deposu import JsonKullaniciDeposu, SQLiteKullaniciDeposu
+
+
+def ornek_kullanicilar(adet: int) -> dict:
+    """Her biri birkaç test çözmüş sentetik kullanıcılar üret"""
+    return {
+        f"kullanici_{i}": {
+            "isim": f"Kullanıcı {i}",
+            "sifre": "$2b$12$" + "x" * 53,
+            "is_admin": False,
+            "created_at": "2026-01-01T00:00:00",
+            "last_login": None,
+            "sonuclar": {
+                "📜 Tarih": {
+                    "1. İslamiyet Öncesi Türk Tarihi": {
+                        "dogru": 7, "yanlis": 3,
+                        "test_1": {"dogru": 4, "yanlis": 1},
+                        "test_2": {"dogru": 3, "yanlis": 2},
+                    }
+                }
+            },
+        }
+        for i in range(adet)
+    }
+
+
+def olc(depo, kullanici_sayisi: int, tekrar: int) -> float:
+    """Ortanca kayıt süresini milisaniye olarak döndür"""
+    sureler = []
+    for i in range(tekrar):
+        k_adi = f"kullanici_{i % kullanici_sayisi}"
+        baslangic = time.perf_counter()
+        depo.test_sonucu_kaydet(k_adi, "📜 Tarih", "1. İslamiyet Öncesi Türk Tarihi", 3, i % 6, 5 - i % 6)
+        sureler.append(time.perf_counter() - baslangic)
+    return statistics.median(sureler) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sayilar", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--tekrar", type=int, default=20, help="Her ölçüm için kayıt sayısı")
+    parser.add_argument("--json-tekrar", type=int, default=3, help="JSON için kayıt sayısı (yavaş)")
+    args = parser.parse_args()
+
+    print(f"{'Kullanıcı':>10} | {'JSON (ms)':>10} | {'SQLite (ms)':>11}")
+    print("-" * 38)
+
+    for adet in args.sayilar:
+        kullanicilar = ornek_kullanicilar(adet)
+        with tempfile.TemporaryDirectory() as klasor:
+            json_depo = JsonKullaniciDeposu(os.path.join(klasor, "kullanicilar.json"))
+            json_depo.tumunu_kaydet(kullanicilar)
+            json_ms = olc(json_depo, adet, args.json_tekrar)
+
+            sqlite_depo = SQLiteKullaniciDeposu(os.path.join(klasor, "kpss.db"))
+            sqlite_depo.tumunu_kaydet(kullanicilar)
+            sqlite_ms = olc(sqlite_depo, adet, args.tekrar)
+            sqlite_depo._baglanti().close()
+
+        print(f"{adet:>10} | {json_ms:>10.2f} | {sqlite_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,10 +19,31 @@ class Config:
     
     # Session Ayarları
     SESSION_LIFETIME_HOURS = int(os.getenv("SESSION_LIFETIME_HOURS", "24"))
+    # Oturum jetonlarını imzalayan anahtar (tüm replikalarda aynı olmalı)
+    # Verilmezse bir kez üretilip oturum veritabanında saklanır
+    OTURUM_ANAHTARI = os.getenv("SESSION_SECRET")
+    # Bellekte tutulan oturum sayısı ve veritabanından yeniden doğrulama aralığı
+    OTURUM_ONBELLEK_BOYU = int(os.getenv("OTURUM_ONBELLEK_BOYU", "10000"))
+    OTURUM_ONBELLEK_SN = float(os.getenv("OTURUM_ONBELLEK_SN", "60"))
     
     # Güvenlik Ayarları
     MAX_LOGIN_ATTEMPTS = int(os.getenv("MAX_LOGIN_ATTEMPTS", "5"))
     LOGIN_COOLDOWN_MINUTES = int(os.getenv("LOGIN_COOLDOWN_MINUTES", "15"))
+    # Hız sınırı tablosunda tutulacak en fazla kullanıcı adı (saldırı anında sınırsız büyümez)
+    HIZ_SINIRI_MAKS_KAYIT = int(os.getenv("HIZ_SINIRI_MAKS_KAYIT", "100000"))
+    
+    # bcrypt Ayarları (maliyet faktörü ve şifre işlemleri havuzu)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_ISCI_SAYISI = int(os.getenv("BCRYPT_ISCI_SAYISI", str(os.cpu_count() or 2)))
+    BCRYPT_KUYRUK_BOYU = int(os.getenv("BCRYPT_KUYRUK_BOYU", "64"))
+    BCRYPT_ZAMAN_ASIMI_SN = float(os.getenv("BCRYPT_ZAMAN_ASIMI_SN", "10"))
+    
+    # Düz metin şifre göçü (arka planda, partiler halinde)
+    SIFRE_GOCU_KONUM_DOSYA = os.getenv("SIFRE_GOCU_KONUM_DOSYA", "sifre_gocu_konum.json")
+    SIFRE_GOCU_PARTI = int(os.getenv("SIFRE_GOCU_PARTI", "50"))
+    # JSON deposunda her parti tüm dosyayı yeniden yazar; partiler büyük tutulur
+    SIFRE_GOCU_JSON_PARTI = int(os.getenv("SIFRE_GOCU_JSON_PARTI", "5000"))
+    SIFRE_GOCU_ARALIK_SN = float(os.getenv("SIFRE_GOCU_ARALIK_SN", "1"))
     
     # Uygulama Ayarları
     APP_NAME = os.getenv("APP_NAME", "KPSS SORU ÇÖZÜM PLATFORMU")
@@ -31,6 +52,77 @@ class Config:
     # Dosya Yolları
     KULLANICILAR_DOSYA = "kullanicilar.json"
     SORU_BANKASI_DOSYA = "soru_bankasi.json"
+    VERITABANI_DOSYA = os.getenv("VERITABANI_DOSYA", "kpss.db")
+    
+    # Kullanıcı deposu: "json" (kullanicilar.json) veya "sqlite" (VERITABANI_DOSYA)
+    KULLANICI_DEPOSU = os.getenv("KULLANICI_DEPOSU", "json").lower()
+    
+    # Sonuç Günlüğü Ayarları
+    SONUC_GUNLUGU_KLASORU = os.getenv("SONUC_GUNLUGU_KLASORU", "sonuc_gunlugu")
+    GUNLUK_FSYNC_ADET = int(os.getenv("GUNLUK_FSYNC_ADET", "32"))
+    GUNLUK_FSYNC_ARALIK_SN = float(os.getenv("GUNLUK_FSYNC_ARALIK_SN", "1"))
+    GUNLUK_SIKISTIRMA_ARALIK_SN = float(os.getenv("GUNLUK_SIKISTIRMA_ARALIK_SN", "30"))
+    
+    # Soru Resmi Boyutları (yüklemede her genişlik için WebP + JPEG üretilir)
+    RESIM_GENISLIKLERI = tuple(
+        int(g) for g in os.getenv("RESIM_GENISLIKLERI", "320,640,800").split(",") if g.strip()
+    )
+    RESIM_WEBP = os.getenv("RESIM_WEBP", "True").lower() == "true"
+    # Genişlik verilmeden gösterilen resimlerin hedef genişliği (masaüstü / telefon)
+    RESIM_MASAUSTU_GENISLIK = int(os.getenv("RESIM_MASAUSTU_GENISLIK", "800"))
+    RESIM_MOBIL_GENISLIK = int(os.getenv("RESIM_MOBIL_GENISLIK", "480"))
+    # Çöp toplamada bu süreden yeni (henüz soruya bağlanmamış olabilecek) resimler silinmez
+    RESIM_GC_BEKLEME_SN = float(os.getenv("RESIM_GC_BEKLEME_SN", "3600"))
+    
+    # Soru sayfasında önbellekte tutulan hazır soru görünümü sayısı
+    SORU_GORUNUM_ONBELLEK = int(os.getenv("SORU_GORUNUM_ONBELLEK", "4096"))
+    
+    # Sonuç analitiği: tablo bu aralıkla depodan baştan kurulur (arada günlükten artımlı güncellenir)
+    ANALITIK_YENIDEN_KURMA_SN = float(os.getenv("ANALITIK_YENIDEN_KURMA_SN", "3600"))
+    # Konu zorluğu listesinde bir konunun yer alması için gereken en az cevap
+    ANALITIK_EN_AZ_CEVAP = int(os.getenv("ANALITIK_EN_AZ_CEVAP", "20"))
+    
+    # Soru istatistikleri: sayaçlar bu aralıkla ya da bu kadar soru biriktiğinde toplu yazılır
+    SORU_ISTATISTIK_ARALIK_SN = float(os.getenv("SORU_ISTATISTIK_ARALIK_SN", "30"))
+    SORU_ISTATISTIK_ESIK = int(os.getenv("SORU_ISTATISTIK_ESIK", "500"))
+    # Bundan uzun cevaplama süreleri (sekme açık bırakılmış) ortalamaya katılmaz
+    SORU_SURE_UST_SN = float(os.getenv("SORU_SURE_UST_SN", "600"))
+    # Madde analizi uyarıları için gereken en az cevap
+    SORU_ANALIZ_EN_AZ_DENEME = int(os.getenv("SORU_ANALIZ_EN_AZ_DENEME", "20"))
+    
+    # Aralıklı tekrar (SM-2): oturum başına en çok kart, unutulan kartın yeniden sorulma süresi
+    TEKRAR_OTURUM_KART = int(os.getenv("TEKRAR_OTURUM_KART", "50"))
+    TEKRAR_YENIDEN_DK = float(os.getenv("TEKRAR_YENIDEN_DK", "10"))
+    # Vadesine bu kadar kalan kartlar da oturuma alınır
+    TEKRAR_ONDEN_SN = float(os.getenv("TEKRAR_ONDEN_SN", "1200"))
+    # Bu sürede doğru cevaplanan kart "kolay" sayılır (aralık daha hızlı uzar)
+    TEKRAR_HIZLI_SN = float(os.getenv("TEKRAR_HIZLI_SN", "30"))
+    
+    # Süreli deneme: soru başına süre (KPSS GY-GK: 120 soru / 130 dk ≈ 65 sn)
+    DENEME_SORU_SN = float(os.getenv("DENEME_SORU_SN", "65"))
+    # Cevaplar bu aralıkla toplu yazılır
+    DENEME_KAYIT_ARALIK_SN = float(os.getenv("DENEME_KAYIT_ARALIK_SN", "1"))
+    # Süre bittikten sonra gelen cevaplar için ağ gecikmesi toleransı
+    DENEME_TOLERANS_SN = float(os.getenv("DENEME_TOLERANS_SN", "5"))
+    # Ekrandaki geri sayımın yenilenme aralığı
+    DENEME_SAAT_YENILEME_SN = float(os.getenv("DENEME_SAAT_YENILEME_SN", "10"))
+    
+    # Toplu resim yüklemede kullanılan işçi süreç sayısı
+    TOPLU_RESIM_ISCI = int(os.getenv("TOPLU_RESIM_ISCI", str(os.cpu_count() or 2)))
+    
+    # Google Drive Resim Önbelleği
+    DRIVE_ONBELLEK_KLASORU = os.getenv("DRIVE_ONBELLEK_KLASORU", "drive_onbellegi")
+    DRIVE_ONBELLEK_MB = float(os.getenv("DRIVE_ONBELLEK_MB", "500"))
+    DRIVE_MAKS_DOSYA_MB = float(os.getenv("DRIVE_MAKS_DOSYA_MB", "10"))
+    # Bu süreden eski kopyalar ETag ile Drive'a sorularak doğrulanır
+    DRIVE_TAZELIK_SN = float(os.getenv("DRIVE_TAZELIK_SN", "3600"))
+    DRIVE_URL_SABLONU = os.getenv("DRIVE_URL_SABLONU", "https://drive.google.com/uc?export=download&id={id}")
+    DRIVE_ZAMAN_ASIMI_SN = float(os.getenv("DRIVE_ZAMAN_ASIMI_SN", "10"))
+    DRIVE_ONCEDEN_ISCI = int(os.getenv("DRIVE_ONCEDEN_ISCI", "4"))
+    
+    # Geciktirilmiş Yazma Ayarları
+    YAZMA_KUYRUGU_ARALIK_SN = float(os.getenv("YAZMA_KUYRUGU_ARALIK_SN", "5"))
+    YAZMA_KUYRUGU_ESIK = int(os.getenv("YAZMA_KUYRUGU_ESIK", "200"))
     
     # İlk Admin Ayarları
     FIRST_ADMIN_USERNAME = os.getenv("FIRST_ADMIN_USERNAME", "admin")
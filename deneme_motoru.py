@@ -0,0 +1,377 @@
+"""
+KPSS Quiz App - Süreli Deneme Sınavı Motoru
+Bir denemenin tüm bölümleri tek oturumda, sunucudaki saate göre süreli çözülür
+Cevaplar yalnızca eklenen (append-only) bir tabloya kısa aralıklarla toplu yazılır;
+aynı soruya verilen son cevap geçerlidir. Puan: net = doğru - yanlış / 4
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from arka_plan_yazici import ArkaPlanYazici
+from config import Config
+from icerik_deposu import deneme_sinavlari
+from kullanici_deposu import baglanti_ac
+from soru_modeli import Soru, sorulari_yukle
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS deneme_oturumlari (
+    oturum_id     TEXT PRIMARY KEY,
+    kullanici_adi TEXT NOT NULL,
+    deneme        TEXT NOT NULL,
+    baslangic     REAL NOT NULL,
+    bitis         REAL NOT NULL,
+    teslim        REAL,
+    resmi         INTEGER NOT NULL,
+    dogru         INTEGER NOT NULL DEFAULT 0,
+    yanlis        INTEGER NOT NULL DEFAULT 0,
+    bos           INTEGER NOT NULL DEFAULT 0,
+    net           REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS deneme_oturumlari_kullanici ON deneme_oturumlari(kullanici_adi, deneme);
+CREATE INDEX IF NOT EXISTS deneme_oturumlari_siralama ON deneme_oturumlari(deneme, resmi, net);
+CREATE TABLE IF NOT EXISTS deneme_cevaplari (
+    oturum_id TEXT NOT NULL,
+    sira      INTEGER NOT NULL,
+    harf      TEXT,
+    zaman     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deneme_cevaplari_oturum ON deneme_cevaplari(oturum_id);
+"""
+
+_OTURUM_ALANLARI = ("oturum_id", "kullanici_adi", "deneme", "baslangic", "bitis",
+                    "teslim", "resmi", "dogru", "yanlis", "bos", "net")
+
+
+def net_hesapla(dogru: int, yanlis: int) -> float:
+    """KPSS neti: dört yanlış bir doğruyu götürür"""
+    return dogru - yanlis / 4
+
+
+class DenemeOturumu:
+    """Bir kullanıcının bir deneme girişi"""
+
+    __slots__ = _OTURUM_ALANLARI
+
+    def __init__(self, oturum_id: str, kullanici_adi: str, deneme: str, baslangic: float,
+                 bitis: float, teslim: Optional[float] = None, resmi: int = 1,
+                 dogru: int = 0, yanlis: int = 0, bos: int = 0, net: float = 0.0):
+        self.oturum_id = oturum_id
+        self.kullanici_adi = kullanici_adi
+        self.deneme = deneme
+        self.baslangic = baslangic
+        self.bitis = bitis          # sunucu saatine göre son cevap zamanı
+        self.teslim = teslim
+        self.resmi = resmi          # kullanıcının bu denemedeki ilk girişi (sıralamaya giren)
+        self.dogru = dogru
+        self.yanlis = yanlis
+        self.bos = bos
+        self.net = net
+
+    def kalan(self, simdi: float = None) -> float:
+        """Kalan süre (sn); teslim edilmişse 0"""
+        if self.teslim is not None:
+            return 0.0
+        return max(0.0, self.bitis - (time.time() if simdi is None else simdi))
+
+
+class DenemeMotoru:
+    """
+    Deneme oturumları ve cevapları (SQLite)
+    Oturum satırı başlangıçta ve teslimde yazılır; cevaplar bellekte biriktirilip
+    kayit_aralik saniyede bir tek işlemde eklenir (aynı anda başlayan sınıf tek yazıcıyı paylaşır)
+    """
+
+    def __init__(self, denemeler: Dict = None, dosya: str = None, kayit_aralik: float = None):
+        self.denemeler = deneme_sinavlari if denemeler is None else denemeler
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self.kayit_aralik = kayit_aralik or Config.DENEME_KAYIT_ARALIK_SN
+
+        # (oturum_id, sira, harf, zaman)
+        self._bekleyen: List[Tuple[str, int, Optional[str], float]] = []
+        self._bolum_onbellegi: Dict[str, List[Tuple[str, List[Soru]]]] = {}
+        self._icerik_surumu = None
+        self._yerel = threading.local()
+        self._kilit = threading.Lock()
+        self._yazma_kilidi = threading.Lock()
+        self._yazici = ArkaPlanYazici(
+            "deneme-cevaplari", self.bosalt, self.kayit_aralik, "Deneme cevapları kaydedilemedi, tekrar denenecek"
+        )
+
+        # İstatistikler
+        self.cevap_sayisi = 0
+        self.bosaltma_sayisi = 0
+
+        self._baglanti().executescript(SEMA)
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    # ===============================
+    # DENEME İÇERİĞİ
+    # ===============================
+
+    def bolumler(self, deneme: str) -> List[Tuple[str, List[Soru]]]:
+        """Denemenin bölümleri sırasıyla: [(alt başlık, sorular)]"""
+        # İçerik deposunda yeni sürüm kaydedildiyse önbellek boşaltılır
+        surum = getattr(self.denemeler, "surum", None)
+        if surum != self._icerik_surumu:
+            self._bolum_onbellegi = {}
+            self._icerik_surumu = surum
+        bolumler = self._bolum_onbellegi.get(deneme)
+        if bolumler is None:
+            if deneme not in self.denemeler:
+                raise KeyError(f"Deneme bulunamadı: {deneme}")
+            bolumler = [(alt, sorulari_yukle(sorular)) for alt, sorular in self.denemeler[deneme].items()]
+            self._bolum_onbellegi[deneme] = bolumler
+        return bolumler
+
+    def sorular(self, deneme: str) -> List[Tuple[str, Soru]]:
+        """Tüm sorular sınavdaki sırasıyla: [(alt başlık, soru)]; cevaplardaki sira bu listenin indeksi"""
+        return [(alt, soru) for alt, sorular in self.bolumler(deneme) for soru in sorular]
+
+    def sure(self, deneme: str) -> float:
+        """Sınav süresi (sn)"""
+        return len(self.sorular(deneme)) * Config.DENEME_SORU_SN
+
+    # ===============================
+    # OTURUM
+    # ===============================
+
+    def _oturum_getir(self, sorgu: str, parametreler: tuple) -> Optional[DenemeOturumu]:
+        satir = self._baglanti().execute(
+            f"SELECT {', '.join(_OTURUM_ALANLARI)} FROM deneme_oturumlari {sorgu}", parametreler
+        ).fetchone()
+        return DenemeOturumu(*satir) if satir else None
+
+    def oturum(self, oturum_id: str, simdi: float = None) -> Optional[DenemeOturumu]:
+        """Oturum; süresi dolmuş ama teslim edilmemişse önce puanlanır"""
+        oturum = self._oturum_getir("WHERE oturum_id = ?", (oturum_id,))
+        if oturum is not None and oturum.teslim is None and not self._suresi_var(oturum, simdi):
+            oturum = self.teslim_et(oturum, simdi)
+        return oturum
+
+    def acik_oturum(self, kullanici: str, deneme: str, simdi: float = None) -> Optional[DenemeOturumu]:
+        """Kullanıcının süresi devam eden (teslim edilmemiş) oturumu"""
+        oturum = self._oturum_getir(
+            "WHERE kullanici_adi = ? AND deneme = ? AND teslim IS NULL ORDER BY baslangic DESC",
+            (kullanici, deneme),
+        )
+        if oturum is not None and not self._suresi_var(oturum, simdi):
+            self.teslim_et(oturum, simdi)
+            return None
+        return oturum
+
+    def baslat(self, kullanici: str, deneme: str, simdi: float = None) -> DenemeOturumu:
+        """Yeni oturum aç; süresi devam eden oturum varsa ona dön"""
+        acik = self.acik_oturum(kullanici, deneme, simdi)
+        if acik is not None:
+            return acik
+
+        simdi = time.time() if simdi is None else simdi
+        conn = self._baglanti()
+        with conn:
+            # Kontroller ve ekleme tek işlemde; çift tıklama ya da iki sekme iki resmi oturum açamaz
+            conn.execute("BEGIN IMMEDIATE")
+            satir = conn.execute(
+                f"SELECT {', '.join(_OTURUM_ALANLARI)} FROM deneme_oturumlari "
+                "WHERE kullanici_adi = ? AND deneme = ? AND teslim IS NULL AND bitis + ? > ? "
+                "ORDER BY baslangic DESC LIMIT 1",
+                (kullanici, deneme, Config.DENEME_TOLERANS_SN, simdi),
+            ).fetchone()
+            if satir is not None:
+                return DenemeOturumu(*satir)
+            onceki = conn.execute(
+                "SELECT 1 FROM deneme_oturumlari WHERE kullanici_adi = ? AND deneme = ? LIMIT 1",
+                (kullanici, deneme),
+            ).fetchone()
+            oturum = DenemeOturumu(uuid.uuid4().hex, kullanici, deneme, simdi,
+                                   simdi + self.sure(deneme), resmi=0 if onceki else 1)
+            conn.execute(
+                f"INSERT INTO deneme_oturumlari ({', '.join(_OTURUM_ALANLARI)}) "
+                f"VALUES ({', '.join('?' * len(_OTURUM_ALANLARI))})",
+                tuple(getattr(oturum, a) for a in _OTURUM_ALANLARI),
+            )
+        return oturum
+
+    def _suresi_var(self, oturum: DenemeOturumu, simdi: float = None) -> bool:
+        # Ağ gecikmesi için küçük bir tolerans
+        simdi = time.time() if simdi is None else simdi
+        return oturum.teslim is None and simdi < oturum.bitis + Config.DENEME_TOLERANS_SN
+
+    # ===============================
+    # CEVAPLAR (APPEND-ONLY)
+    # ===============================
+
+    def cevap_kaydet(self, oturum: DenemeOturumu, sira: int, harf: Optional[str],
+                     simdi: float = None) -> bool:
+        """
+        Cevabı kuyruğa ekle (harf None: cevap silindi)
+        Returns: False (süre dolmuş ya da oturum teslim edilmiş)
+        """
+        simdi = time.time() if simdi is None else simdi
+        if oturum.teslim is not None or not self._suresi_var(oturum, simdi):
+            return False
+        with self._kilit:
+            self._bekleyen.append((oturum.oturum_id, sira, harf, simdi))
+            self.cevap_sayisi += 1
+        self._yazici.baslat()
+        return True
+
+    def cevaplar(self, oturum_id: str) -> Dict[int, str]:
+        """sira → harf (bekleyenler dahil; her sorunun son cevabı)"""
+        cevaplar = {}
+        for sira, harf in self._baglanti().execute(
+            "SELECT sira, harf FROM deneme_cevaplari WHERE oturum_id = ? ORDER BY rowid", (oturum_id,)
+        ):
+            cevaplar[sira] = harf
+        with self._kilit:
+            for o, sira, harf, _ in self._bekleyen:
+                if o == oturum_id:
+                    cevaplar[sira] = harf
+        return {sira: harf for sira, harf in cevaplar.items() if harf}
+
+    def bosalt(self) -> int:
+        """
+        Bekleyen cevapları hemen yaz
+        Returns: yazılan cevap sayısı
+        """
+        with self._yazma_kilidi:
+            with self._kilit:
+                parti, self._bekleyen = self._bekleyen, []
+            if not parti:
+                return 0
+            try:
+                conn = self._baglanti()
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(
+                        "INSERT INTO deneme_cevaplari (oturum_id, sira, harf, zaman) VALUES (?, ?, ?, ?)", parti
+                    )
+            except Exception:
+                with self._kilit:
+                    self._bekleyen[:0] = parti
+                raise
+            self.bosaltma_sayisi += 1
+            return len(parti)
+
+    def kapat(self):
+        """Thread'i durdur ve kalanları yaz (süreç kapanırken çağrılır)"""
+        self._yazici.kapat()
+
+    # ===============================
+    # PUANLAMA / SIRALAMA
+    # ===============================
+
+    def puanla(self, deneme: str, cevaplar: Dict[int, str]) -> Dict[str, Dict]:
+        """
+        Bölüm başına sonuç: alt başlık → {dogru, yanlis, bos, net, cevaplar}
+        cevaplar: bölüm içi soru sırası → harf (soru istatistikleri ve tekrar kartları için)
+        """
+        sonuc = {}
+        sira = 0
+        for alt, sorular in self.bolumler(deneme):
+            bolum = {"dogru": 0, "yanlis": 0, "bos": 0, "cevaplar": {}}
+            for i, soru in enumerate(sorular):
+                harf = cevaplar.get(sira)
+                if not harf:
+                    bolum["bos"] += 1
+                else:
+                    bolum["cevaplar"][i] = harf
+                    bolum["dogru" if harf == soru.dogru_cevap else "yanlis"] += 1
+                sira += 1
+            bolum["net"] = net_hesapla(bolum["dogru"], bolum["yanlis"])
+            sonuc[alt] = bolum
+        return sonuc
+
+    def teslim_et(self, oturum: DenemeOturumu, simdi: float = None) -> DenemeOturumu:
+        """Oturumu puanla ve kapat (zaten teslim edilmişse kayıtlı sonuç döner)"""
+        if oturum.teslim is not None:
+            return oturum
+        self.bosalt()
+        simdi = time.time() if simdi is None else simdi
+        bolumler = self.puanla(oturum.deneme, self.cevaplar(oturum.oturum_id))
+        dogru = sum(b["dogru"] for b in bolumler.values())
+        yanlis = sum(b["yanlis"] for b in bolumler.values())
+        bos = sum(b["bos"] for b in bolumler.values())
+        # Süre dolduktan sonra teslim edilse de teslim zamanı bitişi geçmez
+        teslim = min(simdi, oturum.bitis)
+
+        conn = self._baglanti()
+        with conn:
+            # Başka istek (ör. ikinci sekme) önce teslim ettiyse onun kaydettiği sonuç geçerlidir
+            conn.execute("BEGIN IMMEDIATE")
+            satir = conn.execute(
+                f"SELECT {', '.join(_OTURUM_ALANLARI)} FROM deneme_oturumlari WHERE oturum_id = ?",
+                (oturum.oturum_id,),
+            ).fetchone()
+            if satir is not None and satir[_OTURUM_ALANLARI.index("teslim")] is not None:
+                return DenemeOturumu(*satir)
+            conn.execute(
+                "UPDATE deneme_oturumlari SET teslim = ?, dogru = ?, yanlis = ?, bos = ?, net = ? "
+                "WHERE oturum_id = ?",
+                (teslim, dogru, yanlis, bos, net_hesapla(dogru, yanlis), oturum.oturum_id),
+            )
+
+        oturum.dogru, oturum.yanlis, oturum.bos = dogru, yanlis, bos
+        oturum.net = net_hesapla(dogru, yanlis)
+        oturum.teslim = teslim
+        return oturum
+
+    def siralama(self, oturum: DenemeOturumu) -> Optional[Tuple[int, int]]:
+        """
+        Nete göre sıra: (sıra, katılımcı); yalnızca ilk girişler sıralanır
+        Tekrar girişlerinde sıra, o netin ilk girişler arasındaki yeridir
+        """
+        if oturum.teslim is None:
+            return None
+        daha_iyi, toplam = self._baglanti().execute(
+            "SELECT COALESCE(SUM(net > ?), 0), COUNT(*) FROM deneme_oturumlari "
+            "WHERE deneme = ? AND resmi = 1 AND teslim IS NOT NULL",
+            (oturum.net, oturum.deneme),
+        ).fetchone()
+        if not oturum.resmi:
+            toplam += 1
+        return daha_iyi + 1, toplam
+
+    def liderlik(self, deneme: str, limit: int = 10) -> List[Dict]:
+        """Denemenin ilk girişlerinde en yüksek netler"""
+        return [
+            {"kullanici": k, "dogru": d, "yanlis": y, "net": n}
+            for k, d, y, n in self._baglanti().execute(
+                "SELECT kullanici_adi, dogru, yanlis, net FROM deneme_oturumlari "
+                "WHERE deneme = ? AND resmi = 1 AND teslim IS NOT NULL "
+                "ORDER BY net DESC, teslim - baslangic LIMIT ?",
+                (deneme, limit),
+            )
+        ]
+
+    def son_oturum(self, kullanici: str, deneme: str) -> Optional[DenemeOturumu]:
+        """Kullanıcının bu denemedeki son teslim edilmiş oturumu"""
+        return self._oturum_getir(
+            "WHERE kullanici_adi = ? AND deneme = ? AND teslim IS NOT NULL ORDER BY baslangic DESC",
+            (kullanici, deneme),
+        )
+
+    def kullanici_sil(self, kullanici: str):
+        """Kullanıcının oturumlarını ve cevaplarını sil"""
+        self.bosalt()
+        with self._baglanti() as conn:
+            conn.execute(
+                "DELETE FROM deneme_cevaplari WHERE oturum_id IN "
+                "(SELECT oturum_id FROM deneme_oturumlari WHERE kullanici_adi = ?)",
+                (kullanici,),
+            )
+            conn.execute("DELETE FROM deneme_oturumlari WHERE kullanici_adi = ?", (kullanici,))
+
+
+# Global deneme motoru instance
+deneme_motoru = DenemeMotoru()
+atexit.register(deneme_motoru.kapat)
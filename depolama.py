@@ -0,0 +1,176 @@
+"""
+KPSS Quiz App - Dosya Depolama Katmanı
+JSON dosyaları için süreçler arası kilit, atomik yazma ve iyimser versiyon kontrolü
+"""
+
+import errno
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class VersiyonCakismasi(Exception):
+    """Dosya okunduktan sonra başka bir süreç/oturum tarafından değiştirildi"""
+
+
+class BozukDosyaHatasi(Exception):
+    """Dosya okunamadı (geçersiz JSON); boş veri gibi davranmak veri kaybına yol açar"""
+
+
+# ===============================
+# KİLİT
+# ===============================
+
+@contextmanager
+def dosya_kilidi(yol: str, bekle: bool = True):
+    """
+    yol + ".lock" üzerinde süreçler arası (advisory) özel kilit
+    bekle=False ise kilit alınamadığında False verir, beklemez
+    bekle=True ise kilit alınana kadar bekler; kilitsiz devam etmez
+    Yields: kilit alındı mı
+    """
+    kilit_yolu = yol + ".lock"
+    f = open(kilit_yolu, "a+")
+    alindi = False
+    try:
+        if fcntl is not None:
+            bayrak = fcntl.LOCK_EX if bekle else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(f, bayrak)
+                alindi = True
+            except BlockingIOError:
+                alindi = False
+        else:
+            mod = msvcrt.LK_LOCK if bekle else msvcrt.LK_NBLCK
+            while not alindi:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), mod, 1)
+                    alindi = True
+                except OSError as e:
+                    if not bekle:
+                        break
+                    # LK_LOCK ~10 saniye denedikten sonra vazgeçer; kilitsiz devam etmek yerine yeniden dene
+                    if e.errno not in (errno.EDEADLOCK, errno.EACCES):
+                        raise
+        yield alindi
+    finally:
+        if alindi:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.close()
+
+
+# ===============================
+# VERSİYON VE ATOMİK YAZMA
+# ===============================
+
+def versiyon(yol: str) -> Optional[str]:
+    """
+    Dosyanın versiyon damgası (yoksa None)
+    Her atomik yazma yeni bir inode oluşturduğu için içerik değişince damga da değişir
+    """
+    try:
+        st = os.stat(yol)
+    except FileNotFoundError:
+        return None
+    return f"{st.st_ino}-{st.st_mtime_ns}-{st.st_size}"
+
+
+def atomik_yaz(yol: str, icerik: bytes):
+    """Geçici dosyaya yazıp yeniden adlandır; okuyucular yarım dosya görmez"""
+    klasor = os.path.dirname(os.path.abspath(yol))
+    fd, gecici = tempfile.mkstemp(dir=klasor, prefix=os.path.basename(yol) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(icerik)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(gecici, yol)
+    except BaseException:
+        try:
+            os.remove(gecici)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        dfd = os.open(klasor, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+
+
+# ===============================
+# JSON İŞLEMLERİ
+# ===============================
+
+def json_oku(yol: str, varsayilan: Any = None) -> Tuple[Any, Optional[str]]:
+    """
+    JSON dosyasını kilitsiz oku (atomik yazma sayesinde her zaman tutarlı)
+    Returns: (veri, versiyon); dosya yoksa (varsayilan, None)
+    """
+    for _ in range(3):
+        ver = versiyon(yol)
+        if ver is None:
+            return varsayilan, None
+        try:
+            with open(yol, "r", encoding="utf-8") as f:
+                icerik = f.read()
+        except FileNotFoundError:
+            continue
+        # Okuma sırasında dosya değiştiyse tekrar dene
+        if versiyon(yol) != ver:
+            continue
+        if not icerik.strip():
+            return varsayilan, ver
+        try:
+            return json.loads(icerik), ver
+        except json.JSONDecodeError as e:
+            raise BozukDosyaHatasi(f"{yol} okunamadı: {e}") from e
+    raise VersiyonCakismasi(f"{yol} okunurken sürekli değişti")
+
+
+def _json_bayt(veri: Any, indent: Optional[int]) -> bytes:
+    return json.dumps(veri, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def json_yaz(yol: str, veri: Any, beklenen_versiyon: Optional[str] = None,
+             indent: Optional[int] = 2, kontrol: bool = False) -> Optional[str]:
+    """
+    JSON dosyasını kilit altında atomik olarak yaz
+    kontrol=True ise dosya beklenen_versiyon'dan farklıysa VersiyonCakismasi fırlatır
+    Returns: yeni versiyon
+    """
+    icerik = _json_bayt(veri, indent)
+    with dosya_kilidi(yol):
+        if kontrol and versiyon(yol) != beklenen_versiyon:
+            raise VersiyonCakismasi(f"{yol} başka bir oturum tarafından değiştirildi")
+        atomik_yaz(yol, icerik)
+        return versiyon(yol)
+
+
+def json_guncelle(yol: str, fonksiyon: Callable[[Any], Any], varsayilan: Any = None,
+                  indent: Optional[int] = 2) -> Any:
+    """
+    Oku-değiştir-yaz işlemini kilit altında yap (kayıp güncelleme olmaz)
+    fonksiyon okunan veriyi yerinde değiştirir
+    Returns: fonksiyonun dönüş değeri
+    """
+    with dosya_kilidi(yol):
+        veri, _ = json_oku(yol, varsayilan)
+        sonuc = fonksiyon(veri)
+        atomik_yaz(yol, _json_bayt(veri, indent))
+        return sonuc
@@ -1,84 +0,0 @@
-# ders_konu_notlari.py
-
-ders_konu_notlari = {
-    "📖 Türkçe": {
-        "__ders_notu__": "https://drive.google.com/drive/folders/1qVjDhmdvPuCDeiZmQLDAw-1-rywzDdOx?usp=drive_link",
-        "1) Sözcükte Yapı": "https://drive.google.com/file/d/11_yXT1WQuuuHUDCIDfg9ixEBHp0fFqMq/view?usp=drive_link",
-        "2) Sözcük Türleri": "https://drive.google.com/file/d/1egipd7yFQ9Y1s-HsCO7svtkV6BSj1I-d/view?usp=drive_link",
-        "3) Söz Dizimi": "https://drive.google.com/file/d/1DCXEpvGonGiFZz_nmoEluk5NRJ6MZ8xw/view?usp=drive_link",
-        "4) Ses Bilgisi": "https://drive.google.com/file/d/1EaXYIkwjEUxKtExkzQlJ4Kw4ysobOM1N/view?usp=drive_link",
-        "5) Yazım Kuralları": "https://drive.google.com/file/d/1NrvZJpDOPIzHFx92YN6-51bMPx8JRnrP/view?usp=drive_link",
-        "6) Noktalama İşaretleri": "https://drive.google.com/file/d/1WjpZkpT9Zns3m613dpMRvdoEKBZzImcy/view?usp=drive_link",
-        "7) Sözcükte Anlam": "https://drive.google.com/file/d/11sf95Fe0QHFFWjI9degrHlTmRajlGX7z/view?usp=drive_link",
-        "8) Cümlede Anlam": "https://drive.google.com/file/d/1CEtpoNLlQpTCzG9yIv7gjWfvzPDgiUcp/view?usp=drive_link",
-        "9) Anlatım Biçimleri": "",
-        "10) Paragraf": "",
-        "11) Anlatım Bozukluğu": "" 
-    },
-
-    "➗ Matematik": {
-        "__ders_notu__": "https://drive.google.com/drive/folders/1qW82dDevDAnstzbWOPhV90vjiKvw0kH8?usp=drive_link",     
-        "1) Temel Kavramlar ve İşlem Becerileri": "", 
-    },
-    
-    "📜 Tarih": {
-       "__ders_notu__": "https://drive.google.com/drive/folders/1v-AcgixpmUQ44ES22C4q9TmVPJ8zPls6?usp=drive_link",        
-        "1) İslamiyet Öncesi Türk Tarihi": "https://drive.google.com/file/d/1DlD5FqdOIzHTKO50tgemjA5hvzPH4_29/view?usp=drive_link",
-        "2) İlk Türk-İslam Devletleri ve Beylikleri": "https://drive.google.com/file/d/19R9jf1jmjocqSuIMbYGIxecwq4D973eR/view?usp=drive_link",
-        "3) Türkiye (Anadolu) Selçuklu Devleti ve II. Beylikler Dönemi": "https://drive.google.com/file/d/18_uVtru36alT25trtLieRe-jbV1ESOn7/view?usp=drive_link",
-        "4) Osmanlı Devleti Kuruluş ve Yükselme Dönemleri": "https://drive.google.com/file/d/1Rj-N8oCMkRj-ntM-xu10hrEjvEtGt7aO/view?usp=drive_link",
-        "5) Osmanlı Devleti Kültür ve Medeniyeti": "https://drive.google.com/file/d/1XaraM1Ub0323n52n1KeFwcp8LvKnuS-d/view?usp=drive_link",
-        "6) 17. yy (Duraklama) ve 18. yy (Gerileme) Dönemleri": "",
-        "7) 19. yy (Dağılma) ve Islahatlar": "",
-        "8) Trablusgarp ve Balkan Savaşları": "",
-        "9) I. Dünya Savaşı ve Sonuçları": "",
-        "10) Milli Mücadele'nin Hazırlık Dönemi": "",
-        "11) Kurtuluş Savaşı Muharebeler Dönemi": "",
-        "12) Atatürk Dönemi İç ve Dış Politika": "",
-        "13) Çağdaş Türk ve Dünya Tarihi": ""
-    },
-
-    "🌍 Coğrafya": {
-       "__ders_notu__": "https://drive.google.com/drive/folders/1mWKpWMEkdwQMZdNqz15PjzjuSckvrLph?usp=drive_link",        
-        "1) Türkiye'nin Coğrafi Konumu": "https://drive.google.com/file/d/1DlD5FqdOIzHTKO50tgemjA5hvzPH4_29/view?usp=drive_link",
-        "2) İklim": "",
-        "3) Türkiye'nin Yer Şekilleri": "",
-        "3.1) Dağlar": "",
-        "3.2) Akarsular": "",
-        "3.3) Platolar": "",
-        "3.4) Ovalar": "",
-        "3.5) Göller": "",
-        "3.6) Doğal Afetler": "",
-        "3.7) Dış Kuvvetler": "",
-        "4) Türkiye'de Nüfus": "https://drive.google.com/file/d/1AELkowunqhNluuosm2s6LDmSktELMrUw/view?usp=drive_link",
-        "5) Türkiye'de Tarım": "",
-        "6) Türkiye'de Hayvancılık": "",
-        "7) Madenler": "",
-        "8) Sanayi": "",
-        "9) Ulaşım - Ticaret - Turizm": "",
-        "10) Projeler": ""
-    },
-
-    "🏛️ Vatandaşlık": {
-       "__ders_notu__": "https://drive.google.com/drive/folders/1Cl06OHZZrVPBLN7sxVpPpTO5udooJlqH?usp=drive_link",   
-        "1) Hukukun Temel Kavramları": "https://drive.google.com/file/d/1qC69kkFvSUL99H_Ak9k8XfZ2NdmYMYhm/view?usp=drive_link",
-        "2) Anayasa Hukukuna Giriş": "",
-        "3) 1982 Anayasası'nın Genel Esasları": "",
-        "4) Temel Hak ve Ödevler": "",
-        "5) 1982 Anayasası'nda Yasama": "",
-        "6) 1982 Anayasası'nda Yürütme": "",
-        "7) 1982 Anayasası'nda Yargı": "",
-        "8) İdare Hukuku": "",
-        "9) Ulusal ve Uluslararası Kuruluşlar": ""
-    },
-
-    "🌟 Genel Kültür": {
-       "__ders_notu__": "https://drive.google.com/drive/folders/1usi2wIlwVOj-h7KCAaY6io9DNCG4cGJX?usp=drive_link",   
-        "1) Güncel Bilgiler": "",
-        "2) Sanat ve Edebiyat": ""
-    }
-}
-
-
-
-
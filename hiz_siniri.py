@@ -0,0 +1,179 @@
+"""
+KPSS Quiz App - Giriş Hız Sınırı
+Başarısız giriş denemeleri için SQLite'ta tutulan jeton kovası (token bucket)
+Aynı veritabanını kullanan tüm süreçler/replikalar aynı sayaçları görür
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+from config import Config
+from kullanici_deposu import baglanti_ac
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS giris_sinirlari (
+    anahtar    TEXT PRIMARY KEY,
+    jeton      REAL NOT NULL,
+    guncelleme REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS giris_sinirlari_guncelleme ON giris_sinirlari(guncelleme);
+"""
+
+# Dolmuş (artık sınırlamayan) kayıtların en fazla ne sıklıkla süpürüleceği
+SUPURME_ARALIGI_SN = 60
+
+
+class GirisHizSiniri:
+    """
+    Her kullanıcı adı için kapasite kadar jetonlu bir kova
+    Her başarısız deneme bir jeton harcar; jetonlar dolum_suresi boyunca
+    yeniden dolar. Jeton kalmadığında giriş denenemez.
+    Kova tamamen dolduğunda satır gereksizdir ve süpürülür (TTL)
+    """
+
+    def __init__(self, dosya: str = None, kapasite: int = None,
+                 dolum_suresi_dk: float = None, maks_kayit: int = None):
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self.kapasite = kapasite or Config.MAX_LOGIN_ATTEMPTS
+        dolum_suresi_sn = (dolum_suresi_dk or Config.LOGIN_COOLDOWN_MINUTES) * 60
+        # Saniyede geri gelen jeton
+        self.hiz = self.kapasite / dolum_suresi_sn
+        self.maks_kayit = maks_kayit or Config.HIZ_SINIRI_MAKS_KAYIT
+
+        self._yerel = threading.local()
+        self._son_supurme = 0.0
+        self._baglanti().executescript(SEMA)
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    def _jeton(self, jeton: float, guncelleme: float, simdi: float) -> float:
+        return min(self.kapasite, jeton + max(0.0, simdi - guncelleme) * self.hiz)
+
+    # ===============================
+    # SORGULAMA / KAYIT
+    # ===============================
+
+    def kontrol(self, anahtar: str) -> Tuple[bool, float, int]:
+        """
+        Giriş denenebilir mi
+        Returns: (izin_var_mı, beklenecek_saniye, kalan_deneme)
+        """
+        satir = self._baglanti().execute(
+            "SELECT jeton, guncelleme FROM giris_sinirlari WHERE anahtar = ?", (anahtar,)
+        ).fetchone()
+        if satir is None:
+            return True, 0.0, self.kapasite
+
+        jeton = self._jeton(satir[0], satir[1], time.time())
+        if jeton >= 1:
+            return True, 0.0, int(jeton)
+        return False, (1 - jeton) / self.hiz, 0
+
+    def al(self, anahtar: str) -> Tuple[bool, float, int]:
+        """
+        Deneme için bir jetonu bcrypt'ten önce atomik olarak harca
+        Jeton yoksa satır güncellenmez; eşzamanlı denemeler sınırı aşamaz
+        Başarılı girişte temizle, deneme yapılamadıysa iade çağrılır
+        Returns: (izin_var_mı, beklenecek_saniye, kalan_deneme)
+        """
+        simdi = time.time()
+        satir = self._baglanti().execute(
+            """
+            INSERT INTO giris_sinirlari (anahtar, jeton, guncelleme) VALUES (:anahtar, :kapasite - 1, :simdi)
+            ON CONFLICT(anahtar) DO UPDATE SET
+                jeton = MIN(:kapasite, jeton + MAX(0.0, :simdi - guncelleme) * :hiz) - 1,
+                guncelleme = :simdi
+            WHERE MIN(:kapasite, jeton + MAX(0.0, :simdi - guncelleme) * :hiz) >= 1
+            RETURNING jeton
+            """,
+            {"anahtar": anahtar, "kapasite": float(self.kapasite), "hiz": self.hiz, "simdi": simdi},
+        ).fetchone()
+        self._gerekirse_supur(simdi)
+        if satir is not None:
+            return True, 0.0, int(satir[0])
+        izin, bekleme, kalan = self.kontrol(anahtar)
+        return False, bekleme if not izin else 0.0, kalan
+
+    def iade(self, anahtar: str):
+        """Sonuçlanmayan denemenin (ör. sunucu yoğun) jetonunu geri ver"""
+        self._baglanti().execute(
+            "UPDATE giris_sinirlari SET jeton = MIN(?, jeton + 1) WHERE anahtar = ?",
+            (float(self.kapasite), anahtar),
+        )
+
+    def basarisiz(self, anahtar: str) -> int:
+        """
+        Başarısız denemeyi kaydet (tek atomik upsert)
+        Returns: kalan deneme hakkı
+        """
+        simdi = time.time()
+        jeton = self._baglanti().execute(
+            """
+            INSERT INTO giris_sinirlari (anahtar, jeton, guncelleme) VALUES (:anahtar, :kapasite - 1, :simdi)
+            ON CONFLICT(anahtar) DO UPDATE SET
+                jeton = MAX(0.0, MIN(:kapasite, jeton + MAX(0.0, :simdi - guncelleme) * :hiz) - 1),
+                guncelleme = :simdi
+            RETURNING jeton
+            """,
+            {"anahtar": anahtar, "kapasite": float(self.kapasite), "hiz": self.hiz, "simdi": simdi},
+        ).fetchone()[0]
+        self._gerekirse_supur(simdi)
+        return int(jeton)
+
+    def temizle(self, anahtar: str):
+        """Başarılı girişte kovayı sıfırla"""
+        self._baglanti().execute("DELETE FROM giris_sinirlari WHERE anahtar = ?", (anahtar,))
+
+    # ===============================
+    # SÜPÜRME (TTL)
+    # ===============================
+
+    def supur(self, simdi: Optional[float] = None) -> int:
+        """
+        Kovası tamamen dolmuş satırları sil; kayıt sayısı sınırı aşılırsa
+        dolmaya en yakın kovaları da sil. Jetonu bitmiş (kilitli) kovalar
+        hiçbir zaman silinmez; rastgele kullanıcı adı seli kilidi kaldıramaz
+        Returns: silinen satır sayısı
+        """
+        simdi = simdi or time.time()
+        conn = self._baglanti()
+        silinen = conn.execute(
+            "DELETE FROM giris_sinirlari WHERE jeton + (? - guncelleme) * ? >= ?",
+            (simdi, self.hiz, self.kapasite),
+        ).rowcount
+
+        fazla = conn.execute("SELECT COUNT(*) FROM giris_sinirlari").fetchone()[0] - self.maks_kayit
+        if fazla > 0:
+            silinen += conn.execute(
+                """
+                DELETE FROM giris_sinirlari WHERE anahtar IN (
+                    SELECT anahtar FROM giris_sinirlari
+                    WHERE jeton + (:simdi - guncelleme) * :hiz >= 1
+                    ORDER BY jeton + (:simdi - guncelleme) * :hiz DESC LIMIT :fazla
+                )
+                """,
+                {"simdi": simdi, "hiz": self.hiz, "fazla": fazla},
+            ).rowcount
+        return silinen
+
+    def _gerekirse_supur(self, simdi: float):
+        if simdi - self._son_supurme < SUPURME_ARALIGI_SN:
+            return
+        self._son_supurme = simdi
+        self.supur(simdi)
+
+    @staticmethod
+    def bekleme_mesaji(saniye: float) -> str:
+        dakika = math.ceil(saniye / 60)
+        return f"⏰ {dakika} dakika sonra tekrar deneyin"
+
+
+# Global giriş hız sınırı instance
+giris_hiz_siniri = GirisHizSiniri()
@@ -0,0 +1,169 @@
+"""
+KPSS Quiz App - Sürümlü İçerik Deposu
+Deneme sınavları ve ders/konu notları kodda değil JSON dosyalarında tutulur
+Dosya ilk erişimde okunur, başka süreçte değişirse yeniden yüklenir (yeniden başlatma gerekmez)
+Her kayıtta artan sürüm numarası önbelleklerin tam zamanında geçersizleşmesini sağlar
+"""
+
+import json
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional
+from depolama import atomik_yaz, dosya_kilidi, json_oku, versiyon, VersiyonCakismasi
+
+DENEME_DOSYA = "deneme_sinavlari.json"
+NOTLAR_DOSYA = "ders_konu_notlari.json"
+
+# Dosya değişikliği kontrolü için en kısa aralık (saniye)
+YENILEME_ARALIGI_SN = 2.0
+
+
+# ===============================
+# DOĞRULAMA
+# ===============================
+
+def denemeleri_dogrula(veri: Any):
+    """
+    {deneme: {alt başlık: [soru]}} yapısını doğrula
+    Raises: ValueError
+    """
+    if not isinstance(veri, dict):
+        raise ValueError("Denemeler bir sözlük olmalı")
+    for deneme, bolumler in veri.items():
+        if not isinstance(bolumler, dict) or not bolumler:
+            raise ValueError(f"{deneme}: en az bir bölüm olmalı")
+        for alt_baslik, sorular in bolumler.items():
+            if not isinstance(sorular, list):
+                raise ValueError(f"{deneme} / {alt_baslik}: sorular bir liste olmalı")
+            for no, soru in enumerate(sorular, 1):
+                yer = f"{deneme} / {alt_baslik} / {no}. soru"
+                if not isinstance(soru, dict) or not str(soru.get("soru") or "").strip():
+                    raise ValueError(f"{yer}: soru metni yok")
+                secenekler = soru.get("secenekler")
+                if not isinstance(secenekler, dict) or len(secenekler) < 2:
+                    raise ValueError(f"{yer}: en az iki seçenek olmalı")
+                if soru.get("dogru_cevap") not in secenekler:
+                    raise ValueError(f"{yer}: doğru cevap seçeneklerde yok")
+
+
+def notlari_dogrula(veri: Any):
+    """
+    {ders: {konu ya da "__ders_notu__": link}} yapısını doğrula
+    Raises: ValueError
+    """
+    if not isinstance(veri, dict):
+        raise ValueError("Notlar bir sözlük olmalı")
+    for ders, konular in veri.items():
+        if not isinstance(konular, dict):
+            raise ValueError(f"{ders}: konu → link sözlüğü olmalı")
+        for konu, link in konular.items():
+            if not isinstance(link, str):
+                raise ValueError(f"{ders} / {konu}: link metin olmalı")
+
+
+# ===============================
+# DEPO
+# ===============================
+
+class IcerikDeposu(Mapping):
+    """
+    Süreç genelinde paylaşılan, salt okunur içerik (sözlük gibi kullanılır)
+    Dosya biçimi: {"surum": N, "veri": {...}}
+    """
+
+    def __init__(self, dosya: str, dogrula: Optional[Callable[[Any], None]] = None):
+        self.dosya = dosya
+        self.dogrula = dogrula
+        self._kilit = threading.Lock()
+        self._veri: Optional[Dict] = None
+        self._surum = 0
+        self._dosya_versiyonu = None
+        self._son_kontrol = 0.0
+
+    def _oku(self):
+        belge, ver = json_oku(self.dosya, None)
+        if belge is None:
+            return {}, 0, ver
+        return belge.get("veri", {}), int(belge.get("surum", 0)), ver
+
+    def _guncel(self) -> Dict:
+        """Geçerli veri; dosya başka süreçte değiştiyse yeniden yükle"""
+        veri = self._veri
+        simdi = time.monotonic()
+        if veri is not None and simdi - self._son_kontrol < YENILEME_ARALIGI_SN:
+            return veri
+
+        with self._kilit:
+            self._son_kontrol = simdi
+            if self._veri is None or versiyon(self.dosya) != self._dosya_versiyonu:
+                self._veri, self._surum, self._dosya_versiyonu = self._oku()
+            return self._veri
+
+    @property
+    def surum(self) -> int:
+        """İçerik sürümü (her kayıtta bir artar)"""
+        self._guncel()
+        return self._surum
+
+    def veri(self) -> Dict:
+        """Ham veri (paylaşılır, değiştirilmemeli; düzenleme için kopyalayıp kaydet kullanılır)"""
+        return self._guncel()
+
+    def kaydet(self, veri: Dict, beklenen_surum: Optional[int] = None) -> int:
+        """
+        İçeriği doğrulayıp atomik olarak yaz
+        Dosya beklenen_surum'dan farklıysa (başka bir admin kaydetmiş) VersiyonCakismasi fırlatır
+        Raises: ValueError (geçersiz içerik), VersiyonCakismasi
+        Returns: yeni sürüm
+        """
+        if self.dogrula is not None:
+            self.dogrula(veri)
+
+        with dosya_kilidi(self.dosya):
+            _, mevcut, _ = self._oku()
+            if beklenen_surum is not None and mevcut != beklenen_surum:
+                # Bir sonraki okuma güncel hali yüklesin
+                self._son_kontrol = 0.0
+                raise VersiyonCakismasi(f"{self.dosya} başka bir oturumda değiştirildi (sürüm {mevcut})")
+            yeni = mevcut + 1
+            atomik_yaz(
+                self.dosya,
+                json.dumps({"surum": yeni, "veri": veri}, ensure_ascii=False, indent=2).encode("utf-8"),
+            )
+            ver = versiyon(self.dosya)
+
+        with self._kilit:
+            self._veri, self._surum, self._dosya_versiyonu = veri, yeni, ver
+            self._son_kontrol = time.monotonic()
+        return yeni
+
+    # Okumalar tek bir anlık görüntü üzerinden yapılır (arada yeniden yükleme olsa da tutarlı)
+    def __getitem__(self, anahtar):
+        return self._guncel()[anahtar]
+
+    def __iter__(self):
+        return iter(self._guncel())
+
+    def __len__(self) -> int:
+        return len(self._guncel())
+
+    def __contains__(self, anahtar) -> bool:
+        return anahtar in self._guncel()
+
+    def get(self, anahtar, varsayilan=None):
+        return self._guncel().get(anahtar, varsayilan)
+
+    def keys(self):
+        return self._guncel().keys()
+
+    def items(self):
+        return self._guncel().items()
+
+    def values(self):
+        return self._guncel().values()
+
+
+# Global içerik depoları
+deneme_sinavlari = IcerikDeposu(DENEME_DOSYA, denemeleri_dogrula)
+ders_konu_notlari = IcerikDeposu(NOTLAR_DOSYA, notlari_dogrula)
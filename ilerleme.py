@@ -0,0 +1,75 @@
+"""
+KPSS Quiz App - İlerleme Özeti
+Kullanıcının ders/konu bazında çözdüğü test, doğru ve yanlış sayıları
+Oturum açılırken bir kez hesaplanır, her test kaydında O(1) güncellenir
+"""
+
+from typing import Dict, Tuple
+from kullanici_deposu import test_degistir
+
+
+class IlerlemeOzeti:
+    """
+    sonuclar sözlüğünün özet görünümü
+    Sayfalar sonuclar'ı taramak yerine buradan okur
+    """
+
+    __slots__ = ("sonuclar", "konular", "dersler", "toplam")
+
+    def __init__(self, sonuclar: Dict):
+        self.sonuclar = sonuclar
+        # (ders, konu) → [çözülen test, doğru, yanlış]
+        self.konular: Dict[Tuple[str, str], list] = {}
+        # ders → [çözülen test, doğru, yanlış]
+        self.dersler: Dict[str, list] = {}
+        self.toplam = [0, 0, 0]
+
+        for ders, konular in sonuclar.items():
+            for konu, sonuc in konular.items():
+                if not isinstance(sonuc, dict):
+                    continue
+                cozulen = sum(1 for k in sonuc if k.startswith("test_"))
+                self._ekle(ders, konu, cozulen, sonuc.get("dogru", 0), sonuc.get("yanlis", 0))
+
+    def _ekle(self, ders: str, konu: str, cozulen: int, dogru: int, yanlis: int):
+        for sayac in (
+            self.konular.setdefault((ders, konu), [0, 0, 0]),
+            self.dersler.setdefault(ders, [0, 0, 0]),
+            self.toplam,
+        ):
+            sayac[0] += cozulen
+            sayac[1] += dogru
+            sayac[2] += yanlis
+
+    def test_degistir(self, ders: str, konu: str, test_no: int, dogru: int, yanlis: int):
+        """Test sonucunu sonuclar'a yaz ve özeti aynı anda güncelle"""
+        onceki = self.sonuclar.get(ders, {}).get(konu, {}).get(f"test_{test_no}")
+        if onceki:
+            self._ekle(ders, konu, 0, dogru - onceki.get("dogru", 0), yanlis - onceki.get("yanlis", 0))
+        else:
+            self._ekle(ders, konu, 1, dogru, yanlis)
+        test_degistir(self.sonuclar, ders, konu, test_no, dogru, yanlis)
+
+    # ===============================
+    # OKUMA (O(1))
+    # ===============================
+
+    def konu(self, ders: str, konu: str) -> Tuple[int, int, int]:
+        """(çözülen test, doğru, yanlış)"""
+        return tuple(self.konular.get((ders, konu), (0, 0, 0)))
+
+    def ders(self, ders: str) -> Tuple[int, int, int]:
+        """(çözülen test, doğru, yanlış)"""
+        return tuple(self.dersler.get(ders, (0, 0, 0)))
+
+    def konu_yuzdesi(self, ders: str, konu: str, test_sayisi: int) -> int:
+        """Konudaki testlerin yüzde kaçı çözüldü"""
+        if test_sayisi <= 0:
+            return 0
+        cozulen = self.konular.get((ders, konu), (0,))[0]
+        return int(min(cozulen, test_sayisi) / test_sayisi * 100)
+
+    @staticmethod
+    def basari_orani(dogru: int, yanlis: int) -> int:
+        toplam = dogru + yanlis
+        return round(dogru / toplam * 100) if toplam > 0 else 0
@@ -4,12 +4,19 @@ Sorulara resim ekleme, görüntüleme ve yönetme
 """
 
 import os
+import re
+import time
 import base64
+import hashlib
 import requests
 from io import BytesIO
-from PIL import Image
+from PIL import Image, features
 import streamlit as st
-from typing import Optional, Dict, List
+from collections import Counter
+from typing import Optional, Dict, List, Tuple
+from config import Config
+from depolama import atomik_yaz
+from resim_onbellegi import drive_onbellegi, drive_kimligi
 
 class ImageHandler:
     """Resim işleme sınıfı"""
@@ -23,21 +30,31 @@ class ImageHandler:
     # Resim depolama klasörü
     IMAGE_FOLDER = "soru_resimleri"
     
-    def __init__(self):
-        # Resim klasörünü oluştur
-        if not os.path.exists(self.IMAGE_FOLDER):
-            os.makedirs(self.IMAGE_FOLDER)
+    # Boyutlandırılmış kopyaların alt klasörü (soru_resimleri/boyutlar/<ad>-<genişlik>.webp|jpg)
+    BOYUT_KLASORU = "boyutlar"
+    
+    def __init__(self, klasor: str = None, genislikler: Tuple[int, ...] = None):
+        if klasor:
+            self.IMAGE_FOLDER = klasor
+        self.boyut_klasoru = os.path.join(self.IMAGE_FOLDER, self.BOYUT_KLASORU)
+        self.genislikler = tuple(sorted(genislikler or Config.RESIM_GENISLIKLERI))
+        self.webp = Config.RESIM_WEBP and features.check("webp")
+        
+        # (yol, hedef genişlik, ana dosyanın mtime'ı) → gösterilecek dosya
+        self._secimler: Dict[Tuple[str, int, int], str] = {}
+        
+        # Resim klasörlerini oluştur
+        os.makedirs(self.boyut_klasoru, exist_ok=True)
     
     # ===============================
     # RESİM YÜKLEME
     # ===============================
     
-    def upload_image(self, uploaded_file, soru_id: str) -> Optional[str]:
+    def upload_image(self, uploaded_file) -> Optional[str]:
         """
-        Yüklenen resmi kaydet
+        Yüklenen resmi kaydet (dosya adı içeriğin özetidir; aynı resim bir kez saklanır)
         Args:
             uploaded_file: Streamlit UploadedFile objesi
-            soru_id: Soru ID (dosya adı için)
         Returns:
             Kaydedilen dosya yolu veya None
         """
@@ -56,10 +73,6 @@ class ImageHandler:
             st.error(f"❌ Desteklenmeyen format! Desteklenenler: {', '.join(self.SUPPORTED_FORMATS)}")
             return None
         
-        # Dosya adı oluştur
-        filename = f"{soru_id}{file_ext}"
-        filepath = os.path.join(self.IMAGE_FOLDER, filename)
-        
         # Resmi kaydet
         try:
             # PIL ile aç ve kaydet (format dönüşümü için)
@@ -71,10 +84,8 @@ class ImageHandler:
             # Boyut optimizasyonu (opsiyonel)
             image = self._optimize_image(image)
             
-            # Kaydet
-            image.save(filepath, quality=85, optimize=True)
-            
-            return filepath
+            # Kaydet (küçük ekranlar için boyutlandırılmış kopyalarıyla)
+            return self._icerik_kaydet(image)
             
         except Exception as e:
             st.error(f"❌ Resim kaydedilemedi: {e}")
@@ -121,6 +132,244 @@ class ImageHandler:
         
         return image
     
+    # ===============================
+    # İÇERİK ADRESLİ DEPOLAMA
+    # ===============================
+    
+    def _icerik_kaydet(self, image: Image.Image) -> str:
+        """
+        JPEG olarak kodla ve içeriğin SHA-256 özetiyle adlandır
+        Aynı içerik zaten varsa yeniden yazılmaz, yalnızca zamanı tazelenir
+        (çöp toplayıcı yeni yüklenmiş sayıp silmez)
+        """
+        tampon = BytesIO()
+        image.save(tampon, "JPEG", quality=85, optimize=True)
+        icerik = tampon.getvalue()
+        yol = os.path.join(self.IMAGE_FOLDER, f"{hashlib.sha256(icerik).hexdigest()[:32]}.jpg")
+        
+        if os.path.exists(yol) and self._boyutlar_guncel_mi(yol):
+            os.utime(yol)
+            for genislik in self.genislikler:
+                for uzanti in self._uzantilar():
+                    os.utime(self._boyut_yolu(yol, genislik, uzanti))
+        else:
+            if not os.path.exists(yol):
+                atomik_yaz(yol, icerik)
+            self._boyutlari_yaz(image, yol)
+        return yol
+    
+    def _yerel_mi(self, image_path: str) -> bool:
+        """Yol bu klasördeki bir resim mi (URL ve Drive linkleri değil)"""
+        return os.path.dirname(os.path.normpath(image_path)) == os.path.normpath(self.IMAGE_FOLDER)
+    
+    def referanslar(self, *bankalar: Dict) -> Counter:
+        """
+        Bankalardaki ({ders: {konu: [soru]}}) yerel resim yolu → kullanan alan sayısı
+        Sayım her seferinde bankadan çıkarılır; ayrı tutulan bir indeks bankayla çelişemez
+        """
+        sayac = Counter()
+        for banka in bankalar:
+            for konular in banka.values():
+                for sorular in konular.values():
+                    for soru in sorular:
+                        for resim in soru_resim_yollari(soru):
+                            if self._yerel_mi(resim):
+                                sayac[os.path.normpath(resim)] += 1
+        return sayac
+    
+    def serbest_birak(self, image_path: str, *bankalar: Dict) -> bool:
+        """
+        Soru bankadan çıkarıldıktan / resmi değiştirildikten sonra çağrılır
+        Resmi başka soru kullanmıyorsa siler
+        Returns: silindi mi?
+        """
+        if not image_path or not self._yerel_mi(image_path):
+            return False
+        if self.referanslar(*bankalar)[os.path.normpath(image_path)]:
+            return False
+        return self.delete_image(image_path)
+    
+    def cop_topla(self, *bankalar: Dict, kuru: bool = False, bekleme_sn: float = None) -> List[str]:
+        """
+        Hiçbir sorunun kullanmadığı resimleri ve kopyalarını sil
+        Yüklenip henüz bankaya kaydedilmemiş olabilecek, bekleme_sn'den yeni dosyalara dokunulmaz
+        Returns: silinen (kuru=True ise silinecek) resimler
+        """
+        bekleme_sn = Config.RESIM_GC_BEKLEME_SN if bekleme_sn is None else bekleme_sn
+        sinir = time.time() - bekleme_sn
+        kullanilan = self.referanslar(*bankalar)
+        
+        silinecek = []
+        for image_path in self.list_all_images():
+            try:
+                if os.path.normpath(image_path) in kullanilan or os.path.getmtime(image_path) > sinir:
+                    continue
+            except FileNotFoundError:
+                continue
+            silinecek.append(image_path)
+        if kuru:
+            return silinecek
+        
+        for image_path in silinecek:
+            self.delete_image(image_path)
+        
+        # Ana dosyası kalmamış kopyalar (ör. elle silinmiş resimler)
+        adlar = {os.path.splitext(os.path.basename(y))[0] for y in self.list_all_images()}
+        for ad in os.listdir(self.boyut_klasoru):
+            kopya = os.path.join(self.boyut_klasoru, ad)
+            try:
+                if ad.rsplit("-", 1)[0] not in adlar and os.path.getmtime(kopya) <= sinir:
+                    os.remove(kopya)
+            except FileNotFoundError:
+                pass
+        return silinecek
+    
+    def icerige_gore_tasi(self, *bankalar: Dict) -> int:
+        """
+        Eski (soru kimliğiyle adlandırılmış) resimleri içerik özetiyle yeniden adlandır,
+        aynı içerikli kopyaları birleştir ve bankalardaki yolları güncelle
+        Bankaları diske yazmak çağıranın işidir
+        Returns: taşınan resim sayısı
+        """
+        yeni_yollar: Dict[str, str] = {}
+        for image_path in self.list_all_images():
+            ad, uzanti = os.path.splitext(os.path.basename(image_path))
+            if _OZET_ADI.fullmatch(ad):
+                continue
+            with open(image_path, "rb") as f:
+                ozet = hashlib.sha256(f.read()).hexdigest()[:32]
+            hedef = os.path.join(self.IMAGE_FOLDER, f"{ozet}{uzanti.lower()}")
+            if os.path.exists(hedef):
+                self.delete_image(image_path)
+            else:
+                os.replace(image_path, hedef)
+                for genislik in self.genislikler:
+                    for kopya_uzantisi in ("webp", "jpg"):
+                        eski = self._boyut_yolu(image_path, genislik, kopya_uzantisi)
+                        if os.path.exists(eski):
+                            os.replace(eski, self._boyut_yolu(hedef, genislik, kopya_uzantisi))
+            yeni_yollar[os.path.normpath(image_path)] = hedef
+        
+        def _yeni(resim):
+            if isinstance(resim, str) and self._yerel_mi(resim):
+                return yeni_yollar.get(os.path.normpath(resim), resim)
+            return resim
+        
+        for banka in bankalar:
+            for konular in banka.values():
+                for sorular in konular.values():
+                    for soru in sorular:
+                        for alan in ("soru_resmi", "cozum_resmi", "resim"):
+                            if soru.get(alan):
+                                soru[alan] = _yeni(soru[alan])
+                        for harf, resim in (soru.get("secenekler_resimleri") or {}).items():
+                            soru["secenekler_resimleri"][harf] = _yeni(resim)
+        
+        self._secimler.clear()
+        return len(yeni_yollar)
+    
+    # ===============================
+    # BOYUTLANDIRILMIŞ KOPYALAR
+    # ===============================
+    
+    def _boyut_yolu(self, image_path: str, genislik: int, uzanti: str) -> str:
+        ad = os.path.splitext(os.path.basename(image_path))[0]
+        return os.path.join(self.boyut_klasoru, f"{ad}-{genislik}.{uzanti}")
+    
+    def _uzantilar(self) -> List[str]:
+        return ["webp", "jpg"] if self.webp else ["jpg"]
+    
+    def _boyutlari_yaz(self, image: Image.Image, image_path: str):
+        """Her genişlik için WebP ve JPEG kopya üret (büyütme yapılmaz)"""
+        image = self._optimize_image(image, max_width=self.genislikler[-1])
+        for genislik in self.genislikler:
+            kopya = image
+            if image.width > genislik:
+                yukseklik = max(1, round(image.height * genislik / image.width))
+                kopya = image.resize((genislik, yukseklik), Image.Resampling.LANCZOS)
+            
+            for uzanti in self._uzantilar():
+                tampon = BytesIO()
+                if uzanti == "webp":
+                    kopya.save(tampon, "WEBP", quality=80, method=4)
+                else:
+                    kopya.save(tampon, "JPEG", quality=82, optimize=True, progressive=True)
+                atomik_yaz(self._boyut_yolu(image_path, genislik, uzanti), tampon.getvalue())
+        
+        self._secimler.clear()
+    
+    def _boyutlar_guncel_mi(self, image_path: str) -> bool:
+        mtime = os.stat(image_path).st_mtime_ns
+        for genislik in self.genislikler:
+            for uzanti in self._uzantilar():
+                try:
+                    if os.stat(self._boyut_yolu(image_path, genislik, uzanti)).st_mtime_ns < mtime:
+                        return False
+                except FileNotFoundError:
+                    return False
+        return True
+    
+    def boyutlari_yeniden_olustur(self, zorla: bool = False) -> Tuple[int, int, int]:
+        """
+        Klasördeki tüm resimlerin kopyalarını üret (eski yüklemeler için)
+        zorla=False ise kopyaları güncel olan resimler atlanır
+        Returns: (üretilen, atlanan, hatalı)
+        """
+        uretilen = atlanan = hatali = 0
+        for image_path in self.list_all_images():
+            if not zorla and self._boyutlar_guncel_mi(image_path):
+                atlanan += 1
+                continue
+            try:
+                with Image.open(image_path) as image:
+                    image = self._fix_image_orientation(image)
+                    self._boyutlari_yaz(image, image_path)
+                uretilen += 1
+            except Exception as e:
+                print(f"⚠️ {image_path}: {e}")
+                hatali += 1
+        return uretilen, atlanan, hatali
+    
+    def _hedef_genislik(self, width: Optional[int]) -> int:
+        """Gösterim genişliği verilmemişse tarayıcıya göre tahmin et"""
+        if width:
+            return width
+        try:
+            tarayici = st.context.headers.get("User-Agent", "")
+        except Exception:
+            tarayici = ""
+        if "Mobi" in tarayici:
+            return Config.RESIM_MOBIL_GENISLIK
+        return Config.RESIM_MASAUSTU_GENISLIK
+    
+    def _boyut_sec(self, image_path: str, hedef: int) -> str:
+        """
+        Hedef genişliği karşılayan en küçük kopya (WebP öncelikli)
+        Kopya yoksa ya da ana dosyadan eskiyse ana dosyanın kendisi
+        """
+        if not self._yerel_mi(image_path):
+            return image_path
+        
+        mtime = os.stat(image_path).st_mtime_ns
+        anahtar = (image_path, hedef, mtime)
+        secim = self._secimler.get(anahtar)
+        if secim is not None:
+            return secim
+        
+        genislik = next((g for g in self.genislikler if g >= hedef), self.genislikler[-1])
+        secim = image_path
+        for uzanti in self._uzantilar():
+            aday = self._boyut_yolu(image_path, genislik, uzanti)
+            try:
+                if os.stat(aday).st_mtime_ns >= mtime:
+                    secim = aday
+                    break
+            except FileNotFoundError:
+                continue
+        
+        self._secimler[anahtar] = secim
+        return secim
+    
     # ===============================
     # RESİM GÖRÜNTÜLEME
     # ===============================
@@ -137,9 +386,11 @@ class ImageHandler:
             return
         
         try:
-            # Google Drive linki mi?
+            # Google Drive linki mi? (önce yerel önbellek, alınamazsa tarayıcı Drive'dan çeker)
             if "drive.google.com" in image_path:
-                image_path = self._convert_gdrive_url(image_path)
+                kimlik = drive_kimligi(image_path)
+                yerel = drive_onbellegi.yol(kimlik) if kimlik else None
+                image_path = yerel or self._convert_gdrive_url(image_path)
             
             # width parametresini düzenle
             kwargs = {"caption": caption}
@@ -150,9 +401,9 @@ class ImageHandler:
             if image_path.startswith("http"):
                 st.image(image_path, **kwargs)
             
-            # Yerel dosya mı?
+            # Yerel dosya mı? (ekrana uyan en küçük kopya gösterilir)
             elif os.path.exists(image_path):
-                st.image(image_path, **kwargs)
+                st.image(self._boyut_sec(image_path, self._hedef_genislik(width)), **kwargs)
             
             else:
                 st.warning(f"⚠️ Resim bulunamadı: {image_path}")
@@ -160,6 +411,19 @@ class ImageHandler:
         except Exception as e:
             st.error(f"❌ Resim gösterilemedi: {e}")
     
+    def onceden_getir(self, sorular) -> int:
+        """
+        Testteki Drive resimlerini arka planda önbelleğe al
+        Returns: kuyruğa alınan resim sayısı
+        """
+        kimlikler = []
+        for soru in sorular:
+            for resim in soru_resim_yollari(soru):
+                kimlik = drive_kimligi(resim)
+                if kimlik:
+                    kimlikler.append(kimlik)
+        return len(drive_onbellegi.onceden_getir(kimlikler)) if kimlikler else 0
+    
     def _convert_gdrive_url(self, url: str) -> str:
         """
         Google Drive paylaşım linkini direkt görüntüleme linkine çevir
@@ -179,7 +443,7 @@ class ImageHandler:
     
     def delete_image(self, image_path: str) -> bool:
         """
-        Resmi sil
+        Resmi kopyalarıyla birlikte koşulsuz sil (soru silerken serbest_birak kullanın)
         Args:
             image_path: Silinecek dosya yolu
         Returns:
@@ -190,6 +454,13 @@ class ImageHandler:
         
         try:
             os.remove(image_path)
+            for genislik in self.genislikler:
+                for uzanti in ("webp", "jpg"):
+                    try:
+                        os.remove(self._boyut_yolu(image_path, genislik, uzanti))
+                    except FileNotFoundError:
+                        pass
+            self._secimler.clear()
             return True
         except Exception as e:
             st.error(f"❌ Resim silinemedi: {e}")
@@ -228,6 +499,9 @@ class ImageHandler:
         
         return sorted(images)
 
+# İçerik özetiyle adlandırılmış dosya adı (SHA-256'nın ilk 32 hanesi)
+_OZET_ADI = re.compile(r"[0-9a-f]{32}")
+
 # Global image handler instance
 image_handler = ImageHandler()
 
@@ -274,6 +548,14 @@ def create_image_question_structure():
     }
 
 
+def soru_resim_yollari(soru: Dict) -> List[str]:
+    """Sorunun tüm resim alanları (eski "resim" alanı dahil)"""
+    yollar = list(get_question_images(soru).values())
+    if isinstance(soru.get("resim"), str) and soru["resim"]:
+        yollar.append(soru["resim"])
+    return yollar
+
+
 def get_question_images(soru: Dict) -> Dict[str, str]:
     """
     Sorudaki tüm resimleri çıkar
@@ -302,3 +584,37 @@ def get_question_images(soru: Dict) -> Dict[str, str]:
     
     return images
 
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Soru resimleri bakımı (kopyalar, taşıma, çöp toplama)")
+    parser.add_argument("--klasor", default=ImageHandler.IMAGE_FOLDER)
+    parser.add_argument("--zorla", action="store_true", help="Güncel kopyaları da yeniden üret")
+    parser.add_argument("--tasi", action="store_true",
+                        help="Eski resimleri içerik özetiyle yeniden adlandır ve soru bankasını güncelle")
+    parser.add_argument("--cop-topla", action="store_true", help="Hiçbir sorunun kullanmadığı resimleri sil")
+    parser.add_argument("--kuru", action="store_true", help="--cop-topla ile: silmeden yalnızca listele")
+    args = parser.parse_args()
+
+    handler = ImageHandler(args.klasor)
+    if args.tasi or args.cop_topla:
+        from soru_bankasi import soru_deposu
+        from icerik_deposu import deneme_sinavlari
+        banka = soru_deposu.veri()
+
+    if args.tasi:
+        tasinan = handler.icerige_gore_tasi(banka)
+        if tasinan:
+            soru_deposu.kaydet(banka)
+        print(f"📦 {tasinan} resim içerik özetiyle yeniden adlandırıldı")
+
+    if args.cop_topla:
+        silinen = handler.cop_topla(banka, deneme_sinavlari, kuru=args.kuru)
+        for yol in silinen:
+            print(f"   • {yol}")
+        print(f"🧹 {len(silinen)} kullanılmayan resim {'bulundu' if args.kuru else 'silindi'}")
+
+    uretilen, atlanan, hatali = handler.boyutlari_yeniden_olustur(args.zorla)
+    print(f"✅ {uretilen} resim işlendi, {atlanan} resim zaten güncel, {hatali} hata")
@@ -0,0 +1,606 @@
+"""
+KPSS Quiz App - Kullanıcı Depolama Katmanı
+kullanicilar.json (JSON) veya SQLite (WAL) üzerinde satır bazlı kullanıcı işlemleri
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import Config
+from depolama import json_oku, json_yaz, json_guncelle, versiyon
+
+# Kullanıcı tablosunda ayrı sütunu olan alanlar
+PROFIL_ALANLARI = ("isim", "sifre", "is_admin", "created_at")
+
+
+# ===============================
+# SONUÇ YAPISI YARDIMCILARI
+# ===============================
+
+def _sonuc_mu(deger) -> bool:
+    return isinstance(deger, dict) and ("dogru" in deger or "yanlis" in deger)
+
+
+def test_satirlari(sonuclar: Dict):
+    """
+    İç içe sonuclar yapısını (ders → konu → test_N) satırlara aç
+    Konu toplamı testlerin toplamından farklıysa fark test_no=0 satırı olarak döner
+    Eski deneme yapısı (ders → deneme → alt başlık → sonuç) bugünkü
+    "deneme - alt başlık" konusunun 1. testi olarak açılır
+    Tanınmayan yapılar sessizce atlanmaz, ValueError fırlatır
+    Yields: (ders, konu, test_no, dogru, yanlis)
+    """
+    for ders, konular in sonuclar.items():
+        if not isinstance(konular, dict):
+            raise ValueError(f"Tanınmayan sonuç yapısı: {ders!r}")
+        for konu, kayit in konular.items():
+            if not isinstance(kayit, dict):
+                raise ValueError(f"Tanınmayan sonuç yapısı: {ders!r} / {konu!r}")
+            dogru_toplam = 0
+            yanlis_toplam = 0
+            for anahtar, test in kayit.items():
+                if anahtar in ("dogru", "yanlis"):
+                    continue
+                test_no = None
+                if anahtar.startswith("test_"):
+                    try:
+                        test_no = int(anahtar[len("test_"):])
+                    except ValueError:
+                        pass
+                if test_no is None and _sonuc_mu(test):
+                    # Eski deneme kaydı: konu deneme adı, anahtar alt başlık
+                    yield (ders, f"{konu} - {anahtar}", 1,
+                           int(test.get("dogru", 0)), int(test.get("yanlis", 0)))
+                    continue
+                if test_no is None or not isinstance(test, dict):
+                    raise ValueError(f"Tanınmayan sonuç yapısı: {ders!r} / {konu!r} / {anahtar!r}")
+                dogru = int(test.get("dogru", 0))
+                yanlis = int(test.get("yanlis", 0))
+                dogru_toplam += dogru
+                yanlis_toplam += yanlis
+                yield ders, konu, test_no, dogru, yanlis
+
+            artik_dogru = int(kayit.get("dogru", 0)) - dogru_toplam
+            artik_yanlis = int(kayit.get("yanlis", 0)) - yanlis_toplam
+            if artik_dogru or artik_yanlis:
+                yield ders, konu, 0, artik_dogru, artik_yanlis
+
+
+def kullanici_satirlari(kullanicilar: Dict) -> Iterator[Tuple[str, str, str, int, int, int]]:
+    """
+    Tüm kullanıcıların test sonuçları satır satır (analiz için)
+    Sonuç yapısı tanınmayan kullanıcı uyarıyla atlanır
+    Yields: (kullanıcı, ders, konu, test_no, dogru, yanlis)
+    """
+    for kullanici, veri in kullanicilar.items():
+        try:
+            satirlar = list(test_satirlari(veri.get("sonuclar") or {}))
+        except ValueError as e:
+            print(f"⚠️ {kullanici} sonuçları atlandı: {e}")
+            continue
+        for satir in satirlar:
+            yield (kullanici, *satir)
+
+
+def test_ekle(sonuclar: Dict, ders: str, konu: str, test_no: int, dogru: int, yanlis: int):
+    """Bir test satırını iç içe sonuclar yapısına işle (konu toplamları dahil)"""
+    konu_kaydi = sonuclar.setdefault(ders, {}).setdefault(konu, {"dogru": 0, "yanlis": 0})
+    konu_kaydi["dogru"] += dogru
+    konu_kaydi["yanlis"] += yanlis
+    if test_no > 0:
+        konu_kaydi[f"test_{test_no}"] = {"dogru": dogru, "yanlis": yanlis}
+
+
+def test_degistir(sonuclar: Dict, ders: str, konu: str, test_no: int, dogru: int, yanlis: int):
+    """Testin önceki sonucunu konu toplamından düşüp yenisini yaz"""
+    onceki = sonuclar.get(ders, {}).get(konu, {}).get(f"test_{test_no}")
+    if onceki:
+        test_ekle(sonuclar, ders, konu, 0, -onceki.get("dogru", 0), -onceki.get("yanlis", 0))
+    test_ekle(sonuclar, ders, konu, test_no, dogru, yanlis)
+
+
+# ===============================
+# JSON DEPOSU
+# ===============================
+
+class JsonKullaniciDeposu:
+    """
+    Tüm kullanıcıları tek bir JSON dosyasında tutan depo
+    Yazmalar kilit altında ve atomik; tek kullanıcılık değişiklikler kayıp güncelleme yaratmaz
+    """
+
+    # Her yazma tüm dosyayı yeniden yazar; tek kullanıcı okumak da tüm dosyayı okur
+    tek_dosya = True
+
+    def __init__(self, dosya: str = None):
+        self.dosya = dosya or Config.KULLANICILAR_DOSYA
+
+    def surum(self) -> Optional[str]:
+        """Dosya değiştikçe değişen damga (önbellek doğrulaması için, yalnızca stat)"""
+        return versiyon(self.dosya)
+
+    def tumunu_yukle(self) -> Dict:
+        kullanicilar, _ = json_oku(self.dosya, {})
+        return kullanicilar
+
+    def tumunu_kaydet(self, kullanicilar: Dict):
+        json_yaz(self.dosya, kullanicilar)
+
+    def _guncelle(self, fonksiyon):
+        return json_guncelle(self.dosya, fonksiyon, {})
+
+    def kullanici_getir(self, kullanici_adi: str) -> Optional[Dict]:
+        return self.tumunu_yukle().get(kullanici_adi)
+
+    def sonuc_satirlari(self) -> Iterator[Tuple[str, str, str, int, int, int]]:
+        return kullanici_satirlari(self.tumunu_yukle())
+
+    def kullanici_kaydet(self, kullanici_adi: str, veri: Dict):
+        """
+        Profil alanlarını kaydet; sonuçlara dokunulmaz (onlar yalnızca sonuç
+        yollarından yazılır, elde bayat bir kopya olsa bile kaybolmaz)
+        """
+        def degistir(kullanicilar):
+            kayit = kullanicilar.setdefault(kullanici_adi, {"sonuclar": {}})
+            kayit.update((k, v) for k, v in veri.items() if k != "sonuclar")
+        self._guncelle(degistir)
+
+    def kullanici_sil(self, kullanici_adi: str) -> bool:
+        def degistir(kullanicilar):
+            return kullanicilar.pop(kullanici_adi, None) is not None
+        return self._guncelle(degistir)
+
+    def sonuclari_kaydet(self, kullanici_adi: str, sonuclar: Dict):
+        self.sonuclari_toplu_kaydet({kullanici_adi: sonuclar})
+
+    def sonuclari_toplu_kaydet(self, parti: Dict[str, Dict]):
+        """Birden çok kullanıcının sonuçlarını tek okuma/yazma ile kaydet"""
+        def degistir(kullanicilar):
+            for kullanici_adi, sonuclar in parti.items():
+                if kullanici_adi in kullanicilar:
+                    kullanicilar[kullanici_adi]["sonuclar"] = sonuclar
+        self._guncelle(degistir)
+
+    def test_sonucu_kaydet(self, kullanici_adi: str, ders: str, konu: str,
+                           test_no: int, dogru: int, yanlis: int):
+        def degistir(kullanicilar):
+            if kullanici_adi in kullanicilar:
+                sonuclar = kullanicilar[kullanici_adi].setdefault("sonuclar", {})
+                test_degistir(sonuclar, ders, konu, test_no, dogru, yanlis)
+        self._guncelle(degistir)
+
+    def test_sonuclarini_uygula(self, kayitlar: List[Dict]):
+        """Sonuç günlüğü kayıtlarını tek okuma/yazma ile işle"""
+        def degistir(kullanicilar):
+            for k in kayitlar:
+                if k["kullanici"] not in kullanicilar:
+                    continue
+                sonuclar = kullanicilar[k["kullanici"]].setdefault("sonuclar", {})
+                test_degistir(sonuclar, k["ders"], k["konu"], k["test_no"], k["dogru"], k["yanlis"])
+        self._guncelle(degistir)
+
+    def son_giris_kaydet(self, kullanici_adi: str, zaman: str):
+        def degistir(kullanicilar):
+            if kullanici_adi in kullanicilar:
+                kullanicilar[kullanici_adi]["last_login"] = zaman
+        self._guncelle(degistir)
+
+    def profilleri_toplu_guncelle(self, parti: Dict[str, Dict], girisler: Dict[str, int] = None):
+        """
+        {kullanıcı: {alan: değer}} profil alanlarını tek okuma/yazma ile güncelle
+        JSON deposu giriş sayısı tutmaz; girisler yok sayılır
+        """
+        def degistir(kullanicilar):
+            for kullanici_adi, alanlar in parti.items():
+                if kullanici_adi in kullanicilar:
+                    kullanicilar[kullanici_adi].update(
+                        (k, v) for k, v in alanlar.items() if k != "sonuclar"
+                    )
+        self._guncelle(degistir)
+
+    def sifre_parti(self, baslangic: str, adet: int) -> List[Tuple[str, str]]:
+        """Kullanıcı adı sırasıyla baslangic'tan sonraki adet kullanıcının (ad, şifre) çifti"""
+        kullanicilar = self.tumunu_yukle()
+        adlar = sorted(k for k in kullanicilar if k > baslangic)[:adet]
+        return [(k, kullanicilar[k].get("sifre", "")) for k in adlar]
+
+    def sifreleri_guncelle(self, degisiklikler: Dict[str, Tuple[str, str]]) -> int:
+        """
+        {kullanıcı: (eski, yeni)} şifrelerini tek okuma/yazma ile değiştir
+        Şifre bu arada başka biri tarafından değiştirildiyse dokunulmaz
+        Returns: değiştirilen kullanıcı sayısı
+        """
+        def degistir(kullanicilar):
+            adet = 0
+            for kullanici_adi, (eski, yeni) in degisiklikler.items():
+                veri = kullanicilar.get(kullanici_adi)
+                if veri is not None and veri.get("sifre", "") == eski:
+                    veri["sifre"] = yeni
+                    adet += 1
+            return adet
+        return self._guncelle(degistir)
+
+
+# ===============================
+# SQLITE DEPOSU
+# ===============================
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS kullanicilar (
+    kullanici_adi TEXT PRIMARY KEY,
+    isim          TEXT NOT NULL DEFAULT '',
+    sifre         TEXT NOT NULL DEFAULT '',
+    is_admin      INTEGER NOT NULL DEFAULT 0,
+    created_at    TEXT,
+    ekstra        TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS test_sonuclari (
+    kullanici_adi TEXT NOT NULL REFERENCES kullanicilar(kullanici_adi) ON DELETE CASCADE,
+    ders          TEXT NOT NULL,
+    konu          TEXT NOT NULL,
+    test_no       INTEGER NOT NULL,
+    dogru         INTEGER NOT NULL,
+    yanlis        INTEGER NOT NULL,
+    updated_at    TEXT,
+    PRIMARY KEY (kullanici_adi, ders, konu, test_no)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS giris_bilgileri (
+    kullanici_adi TEXT PRIMARY KEY REFERENCES kullanicilar(kullanici_adi) ON DELETE CASCADE,
+    last_login    TEXT,
+    giris_sayisi  INTEGER NOT NULL DEFAULT 0
+);
+
+-- Kullanıcı verisi her değiştiğinde artan sayaç (önbellek doğrulaması için)
+CREATE TABLE IF NOT EXISTS degisiklik_sayaci (
+    id    INTEGER PRIMARY KEY CHECK (id = 1),
+    surum INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO degisiklik_sayaci (id, surum) VALUES (1, 0);
+"""
+
+# Sayaç tetikleyicileri: her tablo ve işlem için bir tane
+SAYAC_TETIKLEYICILERI = "".join(
+    f"""
+CREATE TRIGGER IF NOT EXISTS {tablo}_{islem.lower()}_sayac AFTER {islem} ON {tablo}
+BEGIN
+    UPDATE degisiklik_sayaci SET surum = surum + 1 WHERE id = 1;
+END;
+"""
+    for tablo in ("kullanicilar", "test_sonuclari", "giris_bilgileri")
+    for islem in ("INSERT", "UPDATE", "DELETE")
+)
+
+
+def baglanti_ac(dosya: str) -> sqlite3.Connection:
+    """WAL modunda, eşzamanlı erişime uygun bir SQLite bağlantısı aç"""
+    conn = sqlite3.connect(dosya, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class SQLiteKullaniciDeposu:
+    """
+    Kullanıcıları, test sonuçlarını ve giriş bilgilerini ayrı tablolarda tutan depo
+    Test bitirmek tek satırlık bir upsert'tir
+    """
+
+    tek_dosya = False
+
+    def __init__(self, dosya: str = None):
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self._yerel = threading.local()
+        self._baglanti().executescript(SEMA + SAYAC_TETIKLEYICILERI)
+
+    def _baglanti(self) -> sqlite3.Connection:
+        """Her thread için ayrı bağlantı (Streamlit oturumları ayrı thread'lerde çalışır)"""
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    # ===============================
+    # OKUMA
+    # ===============================
+
+    def surum(self) -> int:
+        """Kullanıcı tablolarındaki her değişiklikte artan sayaç (tek satır okuma)"""
+        return self._baglanti().execute("SELECT surum FROM degisiklik_sayaci WHERE id = 1").fetchone()[0]
+
+    @staticmethod
+    def _profil(satir) -> Dict:
+        kullanici_adi, isim, sifre, is_admin, created_at, ekstra, last_login = satir
+        veri = json.loads(ekstra) if ekstra else {}
+        veri.update({
+            "isim": isim,
+            "sifre": sifre,
+            "is_admin": bool(is_admin),
+            "sonuclar": {},
+            "created_at": created_at,
+            "last_login": last_login,
+        })
+        return veri
+
+    _PROFIL_SORGUSU = """
+        SELECT k.kullanici_adi, k.isim, k.sifre, k.is_admin, k.created_at, k.ekstra, g.last_login
+        FROM kullanicilar k LEFT JOIN giris_bilgileri g USING (kullanici_adi)
+    """
+
+    def tumunu_yukle(self) -> Dict:
+        conn = self._baglanti()
+        kullanicilar = {
+            satir[0]: self._profil(satir)
+            for satir in conn.execute(self._PROFIL_SORGUSU)
+        }
+        for k_adi, ders, konu, test_no, dogru, yanlis in conn.execute(
+            "SELECT kullanici_adi, ders, konu, test_no, dogru, yanlis FROM test_sonuclari"
+        ):
+            if k_adi in kullanicilar:
+                test_ekle(kullanicilar[k_adi]["sonuclar"], ders, konu, test_no, dogru, yanlis)
+        return kullanicilar
+
+    def sonuc_satirlari(self) -> Iterator[Tuple[str, str, str, int, int, int]]:
+        """Tüm test sonuçları satır satır: (kullanıcı, ders, konu, test_no, dogru, yanlis)"""
+        return self._baglanti().execute(
+            "SELECT kullanici_adi, ders, konu, test_no, dogru, yanlis FROM test_sonuclari"
+        )
+
+    def kullanici_getir(self, kullanici_adi: str) -> Optional[Dict]:
+        conn = self._baglanti()
+        satir = conn.execute(
+            self._PROFIL_SORGUSU + " WHERE k.kullanici_adi = ?", (kullanici_adi,)
+        ).fetchone()
+        if satir is None:
+            return None
+        kullanici = self._profil(satir)
+        for ders, konu, test_no, dogru, yanlis in conn.execute(
+            "SELECT ders, konu, test_no, dogru, yanlis FROM test_sonuclari WHERE kullanici_adi = ?",
+            (kullanici_adi,)
+        ):
+            test_ekle(kullanici["sonuclar"], ders, konu, test_no, dogru, yanlis)
+        return kullanici
+
+    # ===============================
+    # YAZMA
+    # ===============================
+
+    def _kullanici_yaz(self, conn, kullanici_adi: str, veri: Dict, sonuclar_dahil: bool = False):
+        ekstra = {
+            k: v for k, v in veri.items()
+            if k not in PROFIL_ALANLARI and k not in ("sonuclar", "last_login")
+        }
+        conn.execute(
+            """
+            INSERT INTO kullanicilar (kullanici_adi, isim, sifre, is_admin, created_at, ekstra)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(kullanici_adi) DO UPDATE SET
+                isim = excluded.isim, sifre = excluded.sifre, is_admin = excluded.is_admin,
+                created_at = excluded.created_at, ekstra = excluded.ekstra
+            """,
+            (
+                kullanici_adi,
+                veri.get("isim", ""),
+                veri.get("sifre", ""),
+                int(bool(veri.get("is_admin", False))),
+                veri.get("created_at"),
+                json.dumps(ekstra, ensure_ascii=False),
+            ),
+        )
+        if "last_login" in veri:
+            conn.execute(
+                """
+                INSERT INTO giris_bilgileri (kullanici_adi, last_login) VALUES (?, ?)
+                ON CONFLICT(kullanici_adi) DO UPDATE SET last_login = excluded.last_login
+                """,
+                (kullanici_adi, veri["last_login"]),
+            )
+        if sonuclar_dahil and "sonuclar" in veri:
+            self._sonuclari_yaz(conn, kullanici_adi, veri["sonuclar"] or {})
+
+    @staticmethod
+    def _sonuclari_yaz(conn, kullanici_adi: str, sonuclar: Dict):
+        zaman = datetime.now().isoformat()
+        conn.execute("DELETE FROM test_sonuclari WHERE kullanici_adi = ?", (kullanici_adi,))
+        conn.executemany(
+            """
+            INSERT INTO test_sonuclari (kullanici_adi, ders, konu, test_no, dogru, yanlis, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(kullanici_adi, *satir, zaman) for satir in test_satirlari(sonuclar)],
+        )
+
+    def tumunu_kaydet(self, kullanicilar: Dict):
+        """Tüm kullanıcı sözlüğünü veritabanıyla eşitle (eski API uyumluluğu için)"""
+        conn = self._baglanti()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            mevcut = {r[0] for r in conn.execute("SELECT kullanici_adi FROM kullanicilar")}
+            for kullanici_adi in mevcut - set(kullanicilar):
+                conn.execute("DELETE FROM kullanicilar WHERE kullanici_adi = ?", (kullanici_adi,))
+            for kullanici_adi, veri in kullanicilar.items():
+                self._kullanici_yaz(conn, kullanici_adi, veri, sonuclar_dahil=True)
+
+    def kullanici_kaydet(self, kullanici_adi: str, veri: Dict):
+        """Profil satırlarını kaydet; test_sonuclari tablosuna dokunulmaz"""
+        conn = self._baglanti()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._kullanici_yaz(conn, kullanici_adi, veri)
+
+    def kullanici_sil(self, kullanici_adi: str) -> bool:
+        conn = self._baglanti()
+        with conn:
+            cur = conn.execute("DELETE FROM kullanicilar WHERE kullanici_adi = ?", (kullanici_adi,))
+        return cur.rowcount > 0
+
+    def sonuclari_kaydet(self, kullanici_adi: str, sonuclar: Dict):
+        self.sonuclari_toplu_kaydet({kullanici_adi: sonuclar})
+
+    def sonuclari_toplu_kaydet(self, parti: Dict[str, Dict]):
+        """Birden çok kullanıcının sonuçlarını tek işlemde kaydet"""
+        conn = self._baglanti()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for kullanici_adi, sonuclar in parti.items():
+                if conn.execute(
+                    "SELECT 1 FROM kullanicilar WHERE kullanici_adi = ?", (kullanici_adi,)
+                ).fetchone():
+                    self._sonuclari_yaz(conn, kullanici_adi, sonuclar)
+
+    _TEST_UPSERT = """
+        INSERT INTO test_sonuclari (kullanici_adi, ders, konu, test_no, dogru, yanlis, updated_at)
+        SELECT ?, ?, ?, ?, ?, ?, ?
+        WHERE EXISTS (SELECT 1 FROM kullanicilar WHERE kullanici_adi = ?)
+        ON CONFLICT(kullanici_adi, ders, konu, test_no) DO UPDATE SET
+            dogru = excluded.dogru, yanlis = excluded.yanlis, updated_at = excluded.updated_at
+    """
+
+    def test_sonucu_kaydet(self, kullanici_adi: str, ders: str, konu: str,
+                           test_no: int, dogru: int, yanlis: int):
+        """Tek test sonucunu yaz (tek satır upsert)"""
+        conn = self._baglanti()
+        with conn:
+            conn.execute(
+                self._TEST_UPSERT,
+                (kullanici_adi, ders, konu, test_no, dogru, yanlis,
+                 datetime.now().isoformat(), kullanici_adi),
+            )
+
+    def test_sonuclarini_uygula(self, kayitlar: List[Dict]):
+        """Sonuç günlüğü kayıtlarını tek işlemde yaz"""
+        conn = self._baglanti()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                self._TEST_UPSERT,
+                [
+                    (k["kullanici"], k["ders"], k["konu"], k["test_no"],
+                     k["dogru"], k["yanlis"], k["zaman"], k["kullanici"])
+                    for k in kayitlar
+                ],
+            )
+
+    def son_giris_kaydet(self, kullanici_adi: str, zaman: str):
+        conn = self._baglanti()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO giris_bilgileri (kullanici_adi, last_login, giris_sayisi)
+                SELECT ?, ?, 1 WHERE EXISTS (SELECT 1 FROM kullanicilar WHERE kullanici_adi = ?)
+                ON CONFLICT(kullanici_adi) DO UPDATE SET
+                    last_login = excluded.last_login, giris_sayisi = giris_sayisi + 1
+                """,
+                (kullanici_adi, zaman, kullanici_adi),
+            )
+
+    def profilleri_toplu_guncelle(self, parti: Dict[str, Dict], girisler: Dict[str, int] = None):
+        """
+        {kullanıcı: {alan: değer}} profil alanlarını tek işlemde güncelle
+        Yalnızca verilen sütunlar değişir; girisler giriş sayısına eklenir
+        """
+        girisler = girisler or {}
+        conn = self._baglanti()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for kullanici_adi, alanlar in parti.items():
+                satir = conn.execute(
+                    "SELECT ekstra FROM kullanicilar WHERE kullanici_adi = ?", (kullanici_adi,)
+                ).fetchone()
+                if satir is None:
+                    continue
+
+                sutunlar = {k: v for k, v in alanlar.items() if k in PROFIL_ALANLARI}
+                if "is_admin" in sutunlar:
+                    sutunlar["is_admin"] = int(bool(sutunlar["is_admin"]))
+                ekstra = {
+                    k: v for k, v in alanlar.items()
+                    if k not in PROFIL_ALANLARI and k not in ("sonuclar", "last_login")
+                }
+                if ekstra:
+                    sutunlar["ekstra"] = json.dumps(
+                        {**json.loads(satir[0] or "{}"), **ekstra}, ensure_ascii=False
+                    )
+                if sutunlar:
+                    conn.execute(
+                        f"UPDATE kullanicilar SET {', '.join(f'{k} = ?' for k in sutunlar)} "
+                        "WHERE kullanici_adi = ?",
+                        (*sutunlar.values(), kullanici_adi),
+                    )
+
+                if "last_login" in alanlar:
+                    conn.execute(
+                        """
+                        INSERT INTO giris_bilgileri (kullanici_adi, last_login, giris_sayisi)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(kullanici_adi) DO UPDATE SET
+                            last_login = excluded.last_login,
+                            giris_sayisi = giris_sayisi + excluded.giris_sayisi
+                        """,
+                        (kullanici_adi, alanlar["last_login"], girisler.get(kullanici_adi, 0)),
+                    )
+
+    def sifre_parti(self, baslangic: str, adet: int) -> List[Tuple[str, str]]:
+        """Kullanıcı adı sırasıyla baslangic'tan sonraki adet kullanıcının (ad, şifre) çifti"""
+        return self._baglanti().execute(
+            "SELECT kullanici_adi, sifre FROM kullanicilar WHERE kullanici_adi > ? "
+            "ORDER BY kullanici_adi LIMIT ?",
+            (baslangic, adet),
+        ).fetchall()
+
+    def sifreleri_guncelle(self, degisiklikler: Dict[str, Tuple[str, str]]) -> int:
+        """
+        {kullanıcı: (eski, yeni)} şifrelerini tek işlemde değiştir
+        Şifre bu arada başka biri tarafından değiştirildiyse dokunulmaz
+        Returns: değiştirilen kullanıcı sayısı
+        """
+        conn = self._baglanti()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return sum(
+                conn.execute(
+                    "UPDATE kullanicilar SET sifre = ? WHERE kullanici_adi = ? AND sifre = ?",
+                    (yeni, kullanici_adi, eski),
+                ).rowcount
+                for kullanici_adi, (eski, yeni) in degisiklikler.items()
+            )
+
+
+# ===============================
+# FABRİKA VE MİGRASYON
+# ===============================
+
+def depo_olustur():
+    """Config.KULLANICI_DEPOSU ayarına göre depo oluştur"""
+    if Config.KULLANICI_DEPOSU == "sqlite":
+        return SQLiteKullaniciDeposu()
+    return JsonKullaniciDeposu()
+
+
+def json_den_sqlite_e_aktar(json_dosya: str = None, db_dosya: str = None) -> int:
+    """
+    Mevcut kullanicilar.json içeriğini SQLite veritabanına aktar (tek seferlik)
+    Returns: aktarılan kullanıcı sayısı
+    """
+    kaynak = JsonKullaniciDeposu(json_dosya).tumunu_yukle()
+    hedef = SQLiteKullaniciDeposu(db_dosya)
+    hedef.tumunu_kaydet(kaynak)
+    return len(kaynak)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="kullanicilar.json → SQLite aktarımı")
+    parser.add_argument("--json", default=Config.KULLANICILAR_DOSYA, help="Kaynak JSON dosyası")
+    parser.add_argument("--db", default=Config.VERITABANI_DOSYA, help="Hedef SQLite dosyası")
+    args = parser.parse_args()
+
+    adet = json_den_sqlite_e_aktar(args.json, args.db)
+    print(f"✅ {adet} kullanıcı {args.db} dosyasına aktarıldı")
+    print("💡 Kullanmak için .env içinde KULLANICI_DEPOSU=sqlite ayarlayın")
@@ -0,0 +1,174 @@
+"""
+KPSS Quiz App - Ortak Kullanıcı Deposu (Repository)
+main.py, auth.py, security_helpers.py ve arka plan işlerinin paylaştığı tek kullanıcı erişim noktası
+Okumalar önbellekten gelir; önbellek her okumada deponun sürüm damgasıyla doğrulanır
+(JSON: dosya stat'ı, SQLite: tek satırlık değişiklik sayacı). Yazmalar doğrudan depoya gider.
+"""
+
+import copy
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from kullanici_deposu import depo_olustur, kullanici_satirlari
+
+
+class KullaniciRepository:
+    """
+    Depo üzerinde sürüm doğrulamalı okuma önbelleği (read-through) ve
+    doğrudan yazma (write-through)
+    Başka bir süreç ya da arka plan işi yazdığında sürüm değişir ve önbellek boşaltılır;
+    yazmalar arasında yapılan okumalar dosya ayrıştırmaz / sorgu çalıştırmaz
+    """
+
+    def __init__(self, depo):
+        self.depo = depo
+        self.tek_dosya = depo.tek_dosya
+
+        self._kilit = threading.Lock()
+        self._surum = None
+        self._tumu: Optional[Dict] = None
+        # Tek tek okunmuş kullanıcılar (yoksa None da önbelleğe alınır)
+        self._tekil: Dict[str, Optional[Dict]] = {}
+
+        # İstatistikler
+        self.isabet = 0
+        self.iska = 0
+
+    # ===============================
+    # ÖNBELLEK
+    # ===============================
+
+    def _dogrula(self):
+        """Depo sürümü değiştiyse önbelleği boşalt; okumadan önceki sürümü döndür"""
+        surum = self.depo.surum()
+        with self._kilit:
+            if surum != self._surum:
+                self._surum = surum
+                self._tumu = None
+                self._tekil = {}
+        return surum
+
+    def _tumu_al(self) -> Dict:
+        surum = self._dogrula()
+        with self._kilit:
+            if self._tumu is not None:
+                self.isabet += 1
+                return self._tumu
+            self.iska += 1
+        tumu = self.depo.tumunu_yukle()
+        with self._kilit:
+            # Okuma sırasında sürüm değiştiyse sonuç önbelleğe alınmaz
+            if self._surum == surum:
+                self._tumu = tumu
+        return tumu
+
+    def _kayit(self, kullanici_adi: str) -> Optional[Dict]:
+        """Önbellekteki kaydın kendisi (kopyalanmaz; değiştirilmemeli)"""
+        if self.tek_dosya:
+            # JSON'da tek kullanıcı okumak da tüm dosyayı ayrıştırır
+            return self._tumu_al().get(kullanici_adi)
+
+        surum = self._dogrula()
+        with self._kilit:
+            if self._tumu is not None:
+                self.isabet += 1
+                return self._tumu.get(kullanici_adi)
+            if kullanici_adi in self._tekil:
+                self.isabet += 1
+                return self._tekil[kullanici_adi]
+            self.iska += 1
+        kayit = self.depo.kullanici_getir(kullanici_adi)
+        with self._kilit:
+            if self._surum == surum:
+                self._tekil[kullanici_adi] = kayit
+        return kayit
+
+    def _birak(self, *kullanici_adlari: str):
+        """Yazılan kullanıcıların önbellekteki kopyasını hemen düşür"""
+        with self._kilit:
+            self._tumu = None
+            for k in kullanici_adlari:
+                self._tekil.pop(k, None)
+
+    # ===============================
+    # OKUMA
+    # ===============================
+
+    def tumunu_yukle(self) -> Dict:
+        """Tüm kullanıcılar (çağıran değiştirebilsin diye kopya)"""
+        return copy.deepcopy(self._tumu_al())
+
+    def kullanici_getir(self, kullanici_adi: str) -> Optional[Dict]:
+        """Tek kullanıcı (kopya)"""
+        kayit = self._kayit(kullanici_adi)
+        return copy.deepcopy(kayit) if kayit is not None else None
+
+    def var_mi(self, kullanici_adi: str) -> bool:
+        return self._kayit(kullanici_adi) is not None
+
+    def alan(self, kullanici_adi: str, alan: str, varsayilan=None):
+        """Tek bir profil alanı (kullanıcıyı kopyalamadan)"""
+        kayit = self._kayit(kullanici_adi)
+        return kayit.get(alan, varsayilan) if kayit is not None else varsayilan
+
+    def sonuc_satirlari(self) -> Iterator[Tuple[str, str, str, int, int, int]]:
+        """Tüm test sonuçları satır satır (JSON'da önbellekteki kayıtlar kopyalanmadan gezilir)"""
+        if self.tek_dosya:
+            return kullanici_satirlari(self._tumu_al())
+        return self.depo.sonuc_satirlari()
+
+    def surum(self):
+        return self.depo.surum()
+
+    def sifre_parti(self, baslangic: str, adet: int) -> List[Tuple[str, str]]:
+        return self.depo.sifre_parti(baslangic, adet)
+
+    # ===============================
+    # YAZMA (doğrudan depoya)
+    # ===============================
+
+    def tumunu_kaydet(self, kullanicilar: Dict):
+        self.depo.tumunu_kaydet(kullanicilar)
+        self._birak(*kullanicilar)
+
+    def kullanici_kaydet(self, kullanici_adi: str, veri: Dict):
+        self.depo.kullanici_kaydet(kullanici_adi, veri)
+        self._birak(kullanici_adi)
+
+    def kullanici_sil(self, kullanici_adi: str) -> bool:
+        silindi = self.depo.kullanici_sil(kullanici_adi)
+        self._birak(kullanici_adi)
+        return silindi
+
+    def sonuclari_kaydet(self, kullanici_adi: str, sonuclar: Dict):
+        self.depo.sonuclari_kaydet(kullanici_adi, sonuclar)
+        self._birak(kullanici_adi)
+
+    def sonuclari_toplu_kaydet(self, parti: Dict[str, Dict]):
+        self.depo.sonuclari_toplu_kaydet(parti)
+        self._birak(*parti)
+
+    def test_sonucu_kaydet(self, kullanici_adi: str, ders: str, konu: str,
+                           test_no: int, dogru: int, yanlis: int):
+        self.depo.test_sonucu_kaydet(kullanici_adi, ders, konu, test_no, dogru, yanlis)
+        self._birak(kullanici_adi)
+
+    def test_sonuclarini_uygula(self, kayitlar: List[Dict]):
+        self.depo.test_sonuclarini_uygula(kayitlar)
+        self._birak(*{k["kullanici"] for k in kayitlar})
+
+    def son_giris_kaydet(self, kullanici_adi: str, zaman: str):
+        self.depo.son_giris_kaydet(kullanici_adi, zaman)
+        self._birak(kullanici_adi)
+
+    def profilleri_toplu_guncelle(self, parti: Dict[str, Dict], girisler: Dict[str, int] = None):
+        self.depo.profilleri_toplu_guncelle(parti, girisler)
+        self._birak(*parti)
+
+    def sifreleri_guncelle(self, degisiklikler: Dict[str, Tuple[str, str]]) -> int:
+        adet = self.depo.sifreleri_guncelle(degisiklikler)
+        self._birak(*degisiklikler)
+        return adet
+
+
+# Global kullanıcı deposu instance (Config.KULLANICI_DEPOSU'na göre JSON veya SQLite)
+kullanici_repo = KullaniciRepository(depo_olustur())
@@ -1,23 +1,80 @@
 import streamlit as st
 import time
-import json
-import os
-import math
 from streamlit_cookies_manager import EncryptedCookieManager
 
-from soru_bankasi import soru_bankasini_yukle, soru_bankasini_kaydet
-from ders_konu_notlari import ders_konu_notlari
-from deneme_sinavlari import deneme_sinavlari
-from image_handler import image_handler
+from soru_bankasi import soru_bankasini_yukle, soru_bankasini_kaydet, soru_deposu, konu_degistir
+from soru_modeli import sorulari_yukle
+from arama import arama_indeksi
+from tekrar_tespit import tekrar_kontrolu
+from ilerleme import IlerlemeOzeti
+from sifre_havuzu import sifre_havuzu
+from icerik_deposu import deneme_sinavlari, ders_konu_notlari
+from image_handler import image_handler, soru_resim_yollari
+from soru_gorunumu import soru_gorunumleri
+from analitik import sonuc_tablosu
+from soru_istatistikleri import soru_istatistikleri
+from tekrar import tekrar_deposu
+from deneme_motoru import deneme_motoru
+from toplu_resim import eslemeleri_oku, toplu_yukle
+from depolama import VersiyonCakismasi
+from auth import auth_manager
+from config import Config
+from kullanici_deposu import test_degistir
+from sonuc_gunlugu import sonuc_gunlugu, gunluk_sikistirici
+from yazma_kuyrugu import yazma_kuyrugu
+from sifre_gocu import sifre_gocu
+from oturum_deposu import oturum_deposu
 
 
 import uuid
+import json
+
+# Günlükteki test sonuçlarını arka planda kullanıcı kayıtlarına işle
+gunluk_sikistirici.baslat()
+# Düz metin kalan şifreleri arka planda partiler halinde hashle
+sifre_gocu.baslat()
 
 # ===============================
 # SORU BANKASI (GLOBAL)
 # ===============================
+# Süreç genelinde paylaşılan kopya; her rerun'da dosya yeniden okunmaz
 soru_bankasi = soru_bankasini_yukle()
 
+def soru_bankasini_guvenli_kaydet(ders=None, konu=None, sorular=None):
+    # Başka bir oturum/süreç bankayı değiştirdiyse üzerine yazma, güncel hali yükle
+    # sorular verilirse konunun yeni listesi bankanın kopyasına yerleştirilir;
+    # paylaşılan banka yalnızca kayıt başarılı olursa değişir
+    global soru_bankasi
+    veri = soru_bankasi if sorular is None else konu_degistir(soru_bankasi, ders, konu, sorular)
+    try:
+        soru_bankasini_kaydet(veri)
+        soru_bankasi = veri
+        if ders is not None:
+            # Arama ve tekrar indekslerinde yalnızca değişen konuyu yenile
+            arama_indeksi.konu_guncelle(ders, konu)
+            tekrar_kontrolu.konu_guncelle(ders, konu)
+        return True
+    except VersiyonCakismasi:
+        soru_deposu.yenile()
+        st.error("❌ Soru bankası başka bir oturumda değiştirildi. Güncel hali yüklendi, lütfen tekrar deneyin.")
+        return False
+
+def icerigi_guvenli_kaydet(depo, veri, taslak_anahtari):
+    # Taslak (sürüm, içerik) düzenleme başlarken alınır; arada başka admin kaydettiyse üzerine yazılmaz
+    beklenen_surum = st.session_state[taslak_anahtari][0]
+    try:
+        surum = depo.kaydet(veri, beklenen_surum)
+    except ValueError as e:
+        st.error(f"❌ Geçersiz içerik: {e}")
+        return False
+    except VersiyonCakismasi:
+        st.session_state.pop(taslak_anahtari, None)
+        st.error("❌ İçerik başka bir oturumda değiştirildi. Güncel hali yüklendi, lütfen tekrar deneyin.")
+        return False
+    st.session_state.pop(taslak_anahtari, None)
+    st.success(f"✅ Kaydedildi (sürüm {surum}); tüm oturumlarda geçerli")
+    return True
+
 ADMIN_USERS = ["a"]  # admin kullanıcı adları
 
 
@@ -29,12 +86,6 @@ cookies = EncryptedCookieManager(
 if not cookies.ready():
     st.stop()
 
-# ===============================
-# Dosya yolları
-# ===============================
-DOSYA = "kullanicilar.json"
-# AKTIF_DOSYA = "aktif_kullanici.json" # <-- KALDIRILDI: Bu dosya çoklu oturum sorununa neden oluyordu.
-
 # ===============================
 # Sabit kullanıcılar
 # ===============================
@@ -43,24 +94,6 @@ sabit_kullanicilar = {
     "m": {"isim": "Misafir Kullanıcı", "sifre": "0"},
 }
 
-# ===============================
-# Kullanıcı yükle / kaydet
-# ===============================
-def kullanicilari_yukle():
-    if not os.path.exists(DOSYA):
-        with open(DOSYA, "w", encoding="utf-8") as f:
-            f.write("{}")
-    with open(DOSYA, "r", encoding="utf-8") as f:
-        # Dosya boşsa veya bozuksa oluşabilecek hatayı önle
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
-def kullanicilari_kaydet():
-    with open(DOSYA, "w", encoding="utf-8") as f:
-        json.dump(kullanicilar, f, ensure_ascii=False, indent=2)
-
 # ===============================
 # Aktif kullanıcı fonksiyonları KALDIRILDI
 # Bu fonksiyonlar tek bir dosyaya bağımlı olduğu için çoklu oturumu engelliyordu.
@@ -69,31 +102,35 @@ def kullanicilari_kaydet():
 # ===============================
 # Sonuçları kullanıcıya kaydet
 # ===============================
-def kaydet_sonuclar_to_user(user):
-    # Kullanıcı None ise veya sistemde kayıtlı değilse işlem yapma
-    if not user or user not in kullanicilar:
+def kaydet_test_sonucu(user, ders, konu, test_no, dogru, yanlis):
+    # Test bitince günlüğe tek satır eklenir; kullanıcı kaydına sıkıştırıcı işler
+    if not user or not auth_manager.kullanici_var_mi(user):
         return
-    kullanicilar[user]["sonuclar"] = st.session_state.get("sonuclar", {})
-    kullanicilari_kaydet()
+    sonuc_gunlugu.ekle(user, ders, konu, test_no, dogru, yanlis)
+
+def ilerleme_al():
+    # Özet oturumdaki sonuclar sözlüğüne bağlıdır; sonuclar yeniden yüklenirse özet de yeniden kurulur
+    sonuclar = st.session_state.setdefault("sonuclar", {})
+    ozet = st.session_state.get("ilerleme")
+    if ozet is None or ozet.sonuclar is not sonuclar:
+        ozet = IlerlemeOzeti(sonuclar)
+        st.session_state["ilerleme"] = ozet
+    return ozet
 
 def kullanici_sonuclarini_yukle_to_session(user):
-    if user in kullanicilar:
-        st.session_state["sonuclar"] = kullanicilar[user].get("sonuclar", {})
+    # Kullanıcılar ortak, önbellekli depodan okunur (her rerun'da dosya okunmaz)
+    kullanici = auth_manager.kullanici_getir(user)
+    if kullanici is not None:
+        sonuclar = kullanici.get("sonuclar", {})
+        # Günlükte olup henüz sıkıştırılmamış sonuçları da ekle
+        for k in gunluk_sikistirici.bekleyen_kayitlar(user):
+            test_degistir(sonuclar, k["ders"], k["konu"], k["test_no"], k["dogru"], k["yanlis"])
+        st.session_state["sonuclar"] = sonuclar
     else:
         # Kullanıcının daha önce kaydedilmiş sonucu yoksa boş başlat
         st.session_state["sonuclar"] = {}
 
 
-# ======================================================
-# GLOBAL
-# ======================================================
-kullanicilar = kullanicilari_yukle()
-
-# ===============================
-# Global değişkenler
-# ===============================
-kullanicilar = kullanicilari_yukle()
-
 # ===============================
 # Login Sayfası
 # ===============================
@@ -109,11 +146,18 @@ def login_page():
         kayit_btn = st.form_submit_button("🔹 Kayıt Ol 🔹")
 
     if giris_btn:
-        if (k_adi in sabit_kullanicilar and sabit_kullanicilar[k_adi]["sifre"] == sifre) or \
-           (k_adi in kullanicilar and kullanicilar[k_adi]["sifre"] == sifre):
+        if k_adi in sabit_kullanicilar:
+            basarili = sabit_kullanicilar[k_adi]["sifre"] == sifre
+            mesaj = "❌ Hatalı kullanıcı adı veya şifre!"
+        else:
+            # Eski düz metin ya da düşük maliyetli şifre burada yeniden hashlenir
+            basarili, mesaj, _ = auth_manager.giris_yap(k_adi, sifre)
 
+        if basarili:
             st.session_state["current_user"] = k_adi
-            cookies["current_user"] = k_adi
+            # Cookie'de kullanıcı adı değil, sunucuda çözülen imzalı oturum jetonu tutulur
+            cookies["oturum"] = oturum_deposu.olustur(k_adi)
+            cookies.pop("current_user", None)
             cookies.save()
 
             kullanici_sonuclarini_yukle_to_session(k_adi)
@@ -121,12 +165,39 @@ def login_page():
             st.rerun()
             
         else:
-            st.error("❌ Hatalı kullanıcı adı veya şifre!")
+            st.error(mesaj)
 
     if kayit_btn:
         st.session_state["page"] = "kayit"
         st.rerun()
 
+# ===============================
+# Oturumu kapat
+# ===============================
+def oturumu_kapat():
+    # Kullanıcının bekleyen profil/son giriş güncellemelerini hemen yaz
+    # (süreç zamanlayıcıdan önce kapanırsa çıkıştan hemen önceki değişiklik kaybolmaz)
+    kullanici = st.session_state.get("current_user")
+    if kullanici:
+        try:
+            yazma_kuyrugu.bosalt(kullanici)
+        except Exception as e:
+            # Yazılamayanlar kuyruğa geri döndü; arka plan yeniden dener, çıkış engellenmez
+            print(f"⚠️ Çıkışta kullanıcı bilgileri kaydedilemedi: {e}")
+
+    # Sunucudaki oturumu iptal et, cookie ve session'ı temizle
+    oturum_deposu.sil(cookies.get("oturum"))
+    cookies.pop("oturum", None)
+    cookies.save()
+
+    st.session_state.current_user = None
+    st.session_state.page = "login"
+    st.session_state.pop("tekrar", None)
+    st.session_state.pop("sinav", None)
+
+    # ⚠️ COOKIE AUT0 LOGIN BLOĞUNU ATLATMAK İÇİN FLAG
+    st.session_state["logout"] = True
+
 # ===============================
 # Kayıt Sayfası
 # ===============================
@@ -150,12 +221,14 @@ def kayit_page():
         if sifre != sifre_tekrar:
             st.error("❌ Şifreler uyuşmuyor!")
             return
-        if k_adi in sabit_kullanicilar or k_adi in kullanicilar:
+        if k_adi in sabit_kullanicilar or auth_manager.kullanici_var_mi(k_adi):
             st.error("❌ Bu kullanıcı adı zaten kayıtlı!")
             return
-        kullanicilar[k_adi] = {"isim": isim, "sifre": sifre, "sonuclar": {}}
-        kullanicilari_kaydet()
-        st.success(f"✅ {isim} başarıyla kaydedildi! Lütfen giriş yapın.")
+        basarili, mesaj = auth_manager.kayit_ol(k_adi, isim, sifre)
+        if not basarili:
+            st.error(mesaj)
+            return
+        st.success(f"{mesaj} Lütfen giriş yapın.")
         time.sleep(1)
         st.session_state["page"] = "login"
         st.rerun()
@@ -184,9 +257,22 @@ def ders_secim_page():
                 st.rerun()
 
     st.markdown("<h1 style='font-size:38px;'>Ders Seçiniz</h1>", unsafe_allow_html=True)
+
+    # 🔎 Soru arama: bulunan sorunun testine git
+    arama = st.text_input("🔎 Soru Ara", key="ders_arama", placeholder="Konu, kavram veya soru metni yazın")
+    if arama:
+        sonuclar = arama_indeksi.ara(arama, limit=10)
+        if not sonuclar:
+            st.info("Sonuç bulunamadı")
+        for i, sonuc in enumerate(sonuclar):
+            label = f"{sonuc['ders']} › {sonuc['konu']} › Test {sonuc['test_no']}: {sonuc['ozet']}"
+            if st.button(label, key=f"arama_{i}"):
+                testi_baslat(sonuc["ders"], sonuc["konu"], sonuc["test_no"])
+                st.rerun()
+
     st.markdown("---")
 
-    for ders in soru_bankasi.keys():
+    for ders in soru_deposu.ders_listesi():
         if st.button(ders, key=f"ders_{ders}"):
             st.session_state["ders"] = ders
             st.session_state["page"] = "konu"
@@ -196,6 +282,13 @@ def ders_secim_page():
         st.session_state["page"] = "deneme"
         st.rerun()
 
+    # 🔁 Aralıklı tekrar: yanlış yapılan ve vadesi gelen sorular
+    kart_sayisi, vadesi_gelen, _ = tekrar_deposu.ozet(user)
+    if kart_sayisi:
+        if st.button(f"🔁 Tekrar ({vadesi_gelen} soru hazır)"):
+            tekrari_baslat()
+            st.rerun()
+
     if st.button("Genel Raporu Gör 📊"):
         st.session_state["page"] = "rapor"
         st.rerun()
@@ -204,19 +297,8 @@ def ders_secim_page():
 
 
     if st.button("🔻 Çıkış Yap 🔻"):
-        # Sonuçları kaydet
-        kaydet_sonuclar_to_user(st.session_state.get("current_user"))
-
-        # COOKIE ve SESSION TAM TEMİZLE
-        cookies.pop("current_user", None)
-        cookies.save()
-
-        st.session_state.current_user = None
-        st.session_state.page = "login"
-
-        # ⚠️ COOKIE AUT0 LOGIN BLOĞUNU ATLATMAK İÇİN FLAG
-        st.session_state["logout"] = True
-
+        # Sonuçlar her test bitiminde günlüğe yazıldığı için çıkışta ayrıca kaydedilmez
+        oturumu_kapat()
         st.rerun()
 
     st.markdown("---")
@@ -225,8 +307,6 @@ def ders_secim_page():
 # ===============================
 # Konu Seçim Sayfası (Dairesel yüzde gösterimi)
 # ===============================
-from ders_konu_notlari import ders_konu_notlari
-
 def konu_secim_page(ders):
 
     # Geri butonu
@@ -248,22 +328,12 @@ def konu_secim_page(ders):
         )
 
 
-    konular = list(soru_bankasi[ders].keys())
-    sonuclar = st.session_state.get("sonuclar", {})
+    konular = soru_deposu.konu_listesi(ders)
+    ilerleme = ilerleme_al()
 
     for konu in konular:
-        tum_sorular = soru_bankasi[ders][konu]
-        soru_grubu_sayisi = 5
-        toplam_test_sayisi = math.ceil(len(tum_sorular) / soru_grubu_sayisi)
-
-        # Çözülen test sayısını bul
-        testler = sonuclar.get(ders, {}).get(konu, {})
-        cozulmus_test_sayisi = sum(
-            1 for key in testler if key.startswith("test_")
-        )
-
-        # Yüzdeyi hesapla
-        yuzde = int(cozulmus_test_sayisi / toplam_test_sayisi * 100) if toplam_test_sayisi > 0 else 0
+        # Çözülen testlerin yüzdesi (özetten, sonuçlar taranmadan)
+        yuzde = ilerleme.konu_yuzdesi(ders, konu, soru_deposu.test_sayisi(ders, konu))
 
         col1, col2, col3 = st.columns([1, 8, 2])
         with col1:
@@ -300,7 +370,26 @@ def konu_secim_page(ders):
 # ===============================
 # Test Seçim Sayfası
 # ===============================
-from ders_konu_notlari import ders_konu_notlari
+def testi_baslat(ders, konu, test_no):
+    # önceki cevapları temizle
+    cevap_keys = [k for k in list(st.session_state.keys()) if k.startswith("cevap_")]
+    for k in cevap_keys:
+        del st.session_state[k]
+
+    st.session_state["ders"] = ders
+    st.session_state["konu"] = konu
+    st.session_state["current_test"] = {
+        "test": sorulari_yukle(soru_deposu.test_sorulari(ders, konu, test_no)),
+        "index": 0,
+        "ders": ders,
+        "konu": konu,
+        "test_no": test_no,
+        "test_sayisi": soru_deposu.test_sayisi(ders, konu)
+    }
+    # Drive'daki soru resimlerini kullanıcı sorulara gelmeden indir
+    image_handler.onceden_getir(st.session_state["current_test"]["test"])
+    st.session_state["page"] = "soru"
+
 
 def test_secim_page(secilen_ders, secilen_konu):
     # Geri butonu sol üst
@@ -323,23 +412,20 @@ def test_secim_page(secilen_ders, secilen_konu):
     else:  # Link yoksa bilgi ver
         st.info("Bu konu için henüz not eklenmemiştir.")
 
-    tum_sorular = soru_bankasi[secilen_ders][secilen_konu]
-    if not tum_sorular:
+    if not soru_deposu.soru_sayisi(secilen_ders, secilen_konu):
         st.info("Bu konu için henüz soru eklenmemiş.")
         if st.button("Geri"):
             st.session_state["page"] = "konu"
             st.rerun()
         return
 
-    soru_grubu_sayisi = 5
-    test_sayisi = math.ceil(len(tum_sorular) / soru_grubu_sayisi)
+    test_sayisi = soru_deposu.test_sayisi(secilen_ders, secilen_konu)
 
     sonuclar = st.session_state.get("sonuclar", {})
 
     for i in range(test_sayisi):
-        baslangic = i * soru_grubu_sayisi
-        bitis = min((i + 1) * soru_grubu_sayisi, len(tum_sorular))
-        soru_sayisi = bitis - baslangic
+        test_sorulari = soru_deposu.test_sorulari(secilen_ders, secilen_konu, i + 1)
+        soru_sayisi = len(test_sorulari)
         test_adi = f"Test {i+1}: ({soru_sayisi} Soru)"
 
         # Çözülmüş testleri renklendir: doğru oran >=0.6 ise ✅, değilse ❌
@@ -353,21 +439,7 @@ def test_secim_page(secilen_ders, secilen_konu):
             label = f"{test_adi} ⏺"
 
         if st.button(label, key=f"testbtn_{i}", help=f"Test {i+1}"):
-
-            # önceki cevapları temizle
-            cevap_keys = [k for k in list(st.session_state.keys()) if k.startswith("cevap_")]
-            for k in cevap_keys:
-                del st.session_state[k]
-
-            st.session_state["current_test"] = {
-                "test": tum_sorular[baslangic:bitis],
-                "index": 0,
-                "ders": secilen_ders,
-                "konu": secilen_konu,
-                "test_no": i+1,
-                "test_sayisi": test_sayisi
-            }
-            st.session_state["page"] = "soru"
+            testi_baslat(secilen_ders, secilen_konu, i+1)
             st.rerun()
 
     st.markdown("---")  # alt çizgi
@@ -384,9 +456,22 @@ def deneme_secim_page():
     st.markdown("<h2>📝 Deneme Sınavları</h2>", unsafe_allow_html=True)
 
     sonuclar = st.session_state.get("sonuclar", {})
+    user = st.session_state.get("current_user")
 
     for deneme_adi, alt_basliklar in deneme_sinavlari.items():
         with st.expander(f"📘 {deneme_adi}"):
+            # ⏱️ Tüm bölümler tek oturumda, süreli
+            toplam_soru = len(deneme_motoru.sorular(deneme_adi))
+            dakika = round(deneme_motoru.sure(deneme_adi) / 60)
+            son = deneme_motoru.son_oturum(user, deneme_adi)
+            if son:
+                sira = deneme_motoru.siralama(son)
+                st.caption(f"Son girişin: net {son.net:g} · {sira[0]}/{sira[1]}. sıra")
+            if st.button(f"⏱️ Tam Deneme ({toplam_soru} soru · {dakika} dk)", key=f"tam_deneme_{deneme_adi}"):
+                sinavi_baslat(deneme_adi)
+                st.rerun()
+            st.caption("Bölüm bölüm çözmek için (süresiz):")
+
             for alt_baslik, sorular in alt_basliklar.items():
                 soru_sayisi = len(sorular)
                 ders_key = "📝 Deneme Sınavı"
@@ -418,13 +503,14 @@ def deneme_secim_page():
 
                     # Test bilgilerini kaydet
                     st.session_state["current_test"] = {
-                        "test": sorular,
+                        "test": sorulari_yukle(sorular),
                         "index": 0,
                         "ders": ders_key,
                         "konu": konu_key,
                         "test_no": 1,
                         "test_sayisi": 1
                     }
+                    image_handler.onceden_getir(st.session_state["current_test"]["test"])
                     st.session_state["page"] = "soru"
                     st.rerun()
 
@@ -434,6 +520,175 @@ def deneme_secim_page():
         unsafe_allow_html=True
     )
 
+# ===============================
+# Süreli Deneme Sınavı
+# ===============================
+def sinavi_baslat(deneme_adi):
+    # Süresi devam eden oturum varsa ona dönülür (cevaplar sunucudan yüklenir)
+    oturum = deneme_motoru.baslat(st.session_state.get("current_user"), deneme_adi)
+    for k in [k for k in st.session_state.keys() if k.startswith("sinav_radio_")]:
+        del st.session_state[k]
+    st.session_state["sinav"] = {
+        "oturum": oturum,
+        "index": 0,
+        "cevaplar": deneme_motoru.cevaplar(oturum.oturum_id),
+        "teslim": False,
+        "islendi": False,
+    }
+    image_handler.onceden_getir(soru for _, soru in deneme_motoru.sorular(deneme_adi))
+    st.session_state["page"] = "sinav"
+
+
+def _sinav_cevapla(index):
+    sinav = st.session_state["sinav"]
+    harf = st.session_state.get(f"sinav_radio_{index}")
+    if deneme_motoru.cevap_kaydet(sinav["oturum"], index, harf):
+        sinav["cevaplar"][index] = harf
+    else:
+        # Süre doldu: cevap kabul edilmez, sınav teslim edilir
+        sinav["teslim"] = True
+
+
+def _sinav_git(adim):
+    st.session_state["sinav"]["index"] += adim
+
+
+def _sinav_teslim():
+    st.session_state["sinav"]["teslim"] = True
+
+
+@st.fragment(run_every=Config.DENEME_SAAT_YENILEME_SN)
+def deneme_saati():
+    """Kalan süre; sunucu saatine göre hesaplanır, süre bitince sayfa yenilenip sınav teslim edilir"""
+    sinav = st.session_state["sinav"]
+    kalan = sinav["oturum"].kalan()
+    if kalan <= 0 and not sinav["teslim"]:
+        sinav["teslim"] = True
+        st.rerun()
+    dakika, saniye = divmod(int(kalan), 60)
+    st.markdown(f"⏱️ **Kalan süre:** {dakika} dk {saniye:02d} sn")
+
+
+@st.fragment
+def sinav_blogu():
+    """Sınav sorusu; şık seçimi anında (doğru/yanlış gösterilmeden) kaydedilir"""
+    sinav = st.session_state["sinav"]
+    if sinav["teslim"]:
+        st.rerun()
+    sorular = deneme_motoru.sorular(sinav["oturum"].deneme)
+    index = sinav["index"]
+    alt_baslik, soru = sorular[index]
+    gorunum = soru_gorunumleri.al(soru)
+
+    st.markdown(f"**{alt_baslik}** · Soru {index + 1}/{len(sorular)} · Cevaplanan: {len(sinav['cevaplar'])}")
+
+    if gorunum.resim:
+        try:
+            image_handler.display_image(gorunum.resim)
+        except Exception:
+            st.warning("❌ Resim görüntülenemedi.")
+
+    st.markdown(gorunum.metin)
+    for madde in gorunum.maddeler:
+        st.markdown(madde, unsafe_allow_html=True)
+
+    cevap = sinav["cevaplar"].get(index)
+    st.radio(
+        label="Seçenekler",
+        options=gorunum.harfler,
+        index=gorunum.harfler.index(cevap) if cevap in gorunum.harfler else None,
+        format_func=gorunum.etiketler.get,
+        key=f"sinav_radio_{index}",
+        label_visibility="collapsed",
+        on_change=_sinav_cevapla,
+        args=(index,)
+    )
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if index > 0:
+            st.button("⬅️ Önceki Soru", on_click=_sinav_git, args=(-1,))
+    with col2:
+        if index < len(sorular) - 1:
+            st.button("Sonraki Soru ➡️", on_click=_sinav_git, args=(1,))
+    with col3:
+        with st.popover("Sınavı Bitir 🏁"):
+            st.write(f"Boş soru: {len(sorular) - len(sinav['cevaplar'])}. Teslim edilen sınav değiştirilemez.")
+            st.button("✅ Teslim Et", on_click=_sinav_teslim)
+
+
+def sinav_sonucu(oturum):
+    sinav = st.session_state["sinav"]
+    bolumler = deneme_motoru.puanla(oturum.deneme, deneme_motoru.cevaplar(oturum.oturum_id))
+
+    # Bölüm sonuçları bir kez kaydedilir (deneme sayfası, genel rapor, soru istatistikleri ve tekrar kartları)
+    if not sinav["islendi"]:
+        user = st.session_state.get("current_user")
+        ders_key = "📝 Deneme Sınavı"
+        for alt_baslik, sorular in deneme_motoru.bolumler(oturum.deneme):
+            bolum = bolumler[alt_baslik]
+            konu_key = f"{oturum.deneme} - {alt_baslik}"
+            ilerleme_al().test_degistir(ders_key, konu_key, 1, bolum["dogru"], bolum["yanlis"])
+            kaydet_test_sonucu(user, ders_key, konu_key, 1, bolum["dogru"], bolum["yanlis"])
+            soru_istatistikleri.test_ekle(ders_key, konu_key, sorular, bolum["cevaplar"])
+            tekrar_deposu.test_isle(user, ders_key, konu_key, sorular, bolum["cevaplar"])
+        sinav["islendi"] = True
+
+    st.success("🏁 Sınav tamamlandı!")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("✅ Doğru", oturum.dogru)
+    col2.metric("❌ Yanlış", oturum.yanlis)
+    col3.metric("⚪ Boş", oturum.bos)
+    col4.metric("🎯 Net", f"{oturum.net:g}")
+
+    sira = deneme_motoru.siralama(oturum)
+    if sira:
+        ek = "" if oturum.resmi else " (ilk girişler arasında; tekrar girişleri sıralamaya katılmaz)"
+        st.markdown(f"🏆 **Sıralama:** {sira[0]} / {sira[1]}{ek}")
+
+    st.dataframe(
+        [
+            {"Bölüm": alt, "Doğru": b["dogru"], "Yanlış": b["yanlis"], "Boş": b["bos"], "Net": b["net"]}
+            for alt, b in bolumler.items()
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    with st.expander("🏆 Liderlik Tablosu"):
+        for no, s in enumerate(deneme_motoru.liderlik(oturum.deneme), 1):
+            st.write(f"{no}. @{s['kullanici']} → net {s['net']:g} (✅ {s['dogru']} | ❌ {s['yanlis']})")
+
+    if st.button("📝 Deneme Sınavlarına Dön"):
+        st.session_state.pop("sinav", None)
+        st.session_state["page"] = "deneme"
+        st.rerun()
+
+
+def sinav_page():
+    sinav = st.session_state.get("sinav")
+    if not sinav:
+        st.session_state["page"] = "deneme"
+        st.rerun()
+        return
+
+    oturum = sinav["oturum"]
+    st.markdown(f"<h2 style='font-size:22px;'>⏱️ {oturum.deneme}</h2>", unsafe_allow_html=True)
+
+    # Teslim edildi ya da süre doldu (sunucu saatine göre)
+    if sinav["teslim"] or oturum.kalan() <= 0:
+        sinav["oturum"] = oturum = deneme_motoru.teslim_et(oturum)
+        sinav["teslim"] = True
+        sinav_sonucu(oturum)
+        return
+
+    deneme_saati()
+    sinav_blogu()
+
+    st.markdown("---")
+    st.caption("Cevaplar otomatik kaydedilir; sayfayı kapatsan da süre bitene kadar kaldığın yerden devam edebilirsin.")
+
+
 # ===============================
 # Soru Gösterim Sayfası (Radyo başta seçili gelmez)
 # ===============================
@@ -471,41 +726,40 @@ def soru_goster_page():
     if index >= len(secilen_test):
         st.success("Test tamamlandı!")
 
-        if "sonuclar" not in st.session_state:
-            st.session_state["sonuclar"] = {}
-        sonuclar = st.session_state["sonuclar"]
-        if secilen_ders not in sonuclar:
-            sonuclar[secilen_ders] = {}
-        if secilen_konu not in sonuclar[secilen_ders]:
-            sonuclar[secilen_ders][secilen_konu] = {"dogru": 0, "yanlis": 0}
-
         # Cevapları topla
         cevap_keys = [k for k in st.session_state.keys() if k.startswith("cevap_")]
+        cevaplar = {}
         dogru = 0
         yanlis = 0
         for k in cevap_keys:
             secilen_harf = st.session_state[k]
             soru_index = int(k.split("_")[1])
             if soru_index < len(secilen_test):
+                cevaplar[soru_index] = secilen_harf
                 soru = secilen_test[soru_index]
-                if secilen_harf == soru["dogru_cevap"]:
+                if secilen_harf == soru.dogru_cevap:
                     dogru += 1
                 else:
                     yanlis += 1
 
-        # Önceki test sonuçlarını sıfırla
-        onceki_test = sonuclar[secilen_ders][secilen_konu].get(f"test_{test_no}")
-        if onceki_test:
-            sonuclar[secilen_ders][secilen_konu]["dogru"] -= onceki_test.get("dogru", 0)
-            sonuclar[secilen_ders][secilen_konu]["yanlis"] -= onceki_test.get("yanlis", 0)
-
-        # Yeni sonuçları ekle
-        sonuclar[secilen_ders][secilen_konu]["dogru"] += dogru
-        sonuclar[secilen_ders][secilen_konu]["yanlis"] += yanlis
-        sonuclar[secilen_ders][secilen_konu][f"test_{test_no}"] = {"dogru": dogru, "yanlis": yanlis}
-
-        st.session_state["sonuclar"] = sonuclar
-        kaydet_sonuclar_to_user(st.session_state.get("current_user"))
+        # Bu ekran her rerun'da yeniden çalışır; sonuç yalnızca bir kez kaydedilir
+        if not current.get("kaydedildi"):
+            # Önceki test sonucunu düşüp yenisini ekle (ilerleme özeti de güncellenir)
+            ilerleme_al().test_degistir(secilen_ders, secilen_konu, test_no, dogru, yanlis)
+            kaydet_test_sonucu(
+                st.session_state.get("current_user"),
+                secilen_ders, secilen_konu, test_no, dogru, yanlis
+            )
+            # Soru başına sayaçlar (arka planda toplu yazılır)
+            soru_istatistikleri.test_ekle(
+                secilen_ders, secilen_konu, secilen_test, cevaplar, current.get("sureler")
+            )
+            # Yanlışlar tekrar kartı olur
+            tekrar_deposu.test_isle(
+                st.session_state.get("current_user"),
+                secilen_ders, secilen_konu, secilen_test, cevaplar, current.get("sureler")
+            )
+            current["kaydedildi"] = True
 
         st.markdown(f"✅ Doğru: {dogru}  |  ❌ Yanlış: {yanlis}")
 
@@ -518,98 +772,227 @@ def soru_goster_page():
             st.rerun()
         return
 
-    # ===== Soruyu Göster =====
-    soru = secilen_test[index]
-    
+    # ===== Başlık (soru bloğu dışında; cevaplama ve gezinme bunu yeniden çizmez) =====
     st.markdown(
         f"<h2 style='font-size:20px;'>{secilen_ders} - {secilen_konu}</h2>",
         unsafe_allow_html=True
     )
-    
+
+    soru_blogu()
+
+    st.markdown("---")
+    st.markdown("<h1 style='text-align: center; color: orange; font-size:15px;'>KPSS SORU ÇÖZÜM PLATFORMU</h1>", unsafe_allow_html=True)
+
+
+def _cevapla(index):
+    secim = st.session_state.get(f"soru_radio_{index}")
+    if secim is None:
+        st.session_state["soru_uyarisi"] = "⚠️ Lütfen bir seçenek seçin!"
+    else:
+        st.session_state[f"cevap_{index}"] = secim
+        # Cevaplama süresi (soru istatistikleri için)
+        current = st.session_state["current_test"]
+        gosterim = current.get("gosterim", {}).get(index)
+        if gosterim is not None:
+            current.setdefault("sureler", {})[index] = time.time() - gosterim
+
+
+def _soruya_git(adim):
+    current = st.session_state["current_test"]
+    if adim > 0 and f"cevap_{current['index']}" not in st.session_state:
+        st.session_state["soru_uyarisi"] = "⚠️ Lütfen önce bu soruyu cevaplayın!"
+        return
+    current["index"] += adim
+
+
+@st.fragment
+def soru_blogu():
+    """
+    Soru, şıklar ve Önceki / Sonraki butonları
+    Cevaplama ve gezinme (buton callback'leri) yalnızca bu bloğu yeniden çalıştırır;
+    metinler soru_gorunumleri önbelleğinden gelir
+    """
+    current = st.session_state["current_test"]
+    secilen_test = current["test"]
+    index = current["index"]
+    if index >= len(secilen_test):
+        # Testi Bitir: sonuç ekranı sayfanın tamamını değiştirir
+        st.rerun()
+    gorunum = soru_gorunumleri.al(secilen_test[index])
+
     # 👇 SORU NUMARASI
     st.markdown(f"**Soru {index+1}/{len(secilen_test)}**")
-    
+
     # ===== 🖼️ RESİM =====
-    resim_yolu = soru.get("soru_resmi") or soru.get("resim")
-    
-    if resim_yolu and resim_yolu not in ["Yok", "", None]:
+    if gorunum.resim:
         try:
-            image_handler.display_image(
-                resim_yolu,
-       #         caption="🖼️ Soru Görseli"
-            )
-        except Exception as e:
+            image_handler.display_image(gorunum.resim)
+        except Exception:
             st.warning("❌ Resim görüntülenemedi.")
 
-    # ===== Soru metni =====
-    st.markdown(soru["soru"])
-
-    # ===== Maddeler =====
-    if "maddeler" in soru:
-        for madde in soru["maddeler"]:
-            st.markdown(
-                f"<div style='margin:2px 0'>{madde}</div>",
-                unsafe_allow_html=True
-            )
+    # ===== Soru metni ve maddeler =====
+    st.markdown(gorunum.metin)
+    for madde in gorunum.maddeler:
+        st.markdown(madde, unsafe_allow_html=True)
 
     # ===== Şıklar =====
-    secenekler = [f"{h}) {m}" for h, m in soru["secenekler"].items()]
     cevap_key = f"cevap_{index}"
-
-    # Radyo butonu
-    if cevap_key in st.session_state:
-        secim = st.radio(
-            label="",
-            options=secenekler,
-            index=[s.split(")")[0] for s in secenekler].index(st.session_state[cevap_key]),
-            key=f"soru_radio_{index}"
-        )
-    else:
-        secim = st.radio(
-            label="",
-            options=secenekler + [None],
-            index=len(secenekler),
-            format_func=lambda x: "" if x is None else x,
-            key=f"soru_radio_{index}"
-        )
+    cevap = st.session_state.get(cevap_key)
+    secim = st.radio(
+        label="Seçenekler",
+        options=gorunum.harfler,
+        index=gorunum.harfler.index(cevap) if cevap in gorunum.harfler else None,
+        format_func=gorunum.etiketler.get,
+        key=f"soru_radio_{index}",
+        label_visibility="collapsed"
+    )
 
     # Cevap kontrol ve kaydetme
-    if cevap_key in st.session_state:
-        secilen_harf = st.session_state[cevap_key]
-        if secilen_harf == soru["dogru_cevap"]:
+    if cevap is not None:
+        if cevap == gorunum.dogru_cevap:
             st.success("✅ Doğru!")
         else:
-            st.error(f"❌ Yanlış! Doğru Cevap: {soru['dogru_cevap']}) {soru['secenekler'][soru['dogru_cevap']]}")
-        st.info(f"**Çözüm:** {soru['cozum']}")
+            st.error(gorunum.yanlis_mesaji)
+        st.info(gorunum.cozum_mesaji)
     else:
-        if st.button("🎯 Cevapla", key=f"cevapla_{index}"):
-            if secim is None:
-                st.warning("⚠️ Lütfen bir seçenek seçin!")
-            else:
-                secilen_harf = secim.split(")")[0]
-                st.session_state[cevap_key] = secilen_harf
-                st.rerun()
+        current.setdefault("gosterim", {}).setdefault(index, time.time())
+        st.button("🎯 Cevapla", key=f"cevapla_{index}", on_click=_cevapla, args=(index,))
+
+    uyari = st.session_state.pop("soru_uyarisi", None)
+    if uyari:
+        st.warning(uyari)
 
     # ===== Alt kısım: Önceki / Sonraki / Testi Bitir =====
     col1, col2, col3 = st.columns([1, 1, 1])
     with col1:
-        if index > 0 and st.button("⬅️ Önceki Soru"):
-            current["index"] -= 1
-            st.rerun()
+        if index > 0:
+            st.button("⬅️ Önceki Soru", on_click=_soruya_git, args=(-1,))
     with col2:
-        if index < len(secilen_test) - 1 and st.button("Sonraki Soru ➡️"):
-            if cevap_key in st.session_state:
-                current["index"] += 1
-                st.rerun()
-            else:
-                st.warning("⚠️ Lütfen önce bu soruyu cevaplayın!")
+        if index < len(secilen_test) - 1:
+            st.button("Sonraki Soru ➡️", on_click=_soruya_git, args=(1,))
     with col3:
-        if index == len(secilen_test) - 1 and st.button("Testi Bitir 🏁"):
-            if cevap_key in st.session_state:
-                current["index"] += 1
-                st.rerun()
-            else:
-                st.warning("⚠️ Lütfen önce bu soruyu cevaplayın!")
+        if index == len(secilen_test) - 1:
+            st.button("Testi Bitir 🏁", on_click=_soruya_git, args=(1,))
+
+
+# ===============================
+# Tekrar (Aralıklı Tekrar) Sayfası
+# ===============================
+def konu_sorulari(ders, konu):
+    """Konunun soru sözlükleri (deneme sınavları dahil)"""
+    if ders == "📝 Deneme Sınavı":
+        for deneme_adi, alt_basliklar in deneme_sinavlari.items():
+            for alt_baslik, sorular in alt_basliklar.items():
+                if f"{deneme_adi} - {alt_baslik}" == konu:
+                    return sorular
+        return []
+    return soru_deposu.sorular(ders, konu)
+
+
+def tekrari_baslat():
+    kuyruk, sorular = tekrar_deposu.oturum_kur(st.session_state.get("current_user"), konu_sorulari)
+    st.session_state["tekrar"] = {
+        "kuyruk": kuyruk,
+        "sorular": sorular,
+        "kart": None,
+        "cevap": None,
+        "gosterim": None,
+        "sayac": 0,
+        "dogru": 0,
+        "yanlis": 0,
+    }
+    image_handler.onceden_getir(sorular.values())
+    st.session_state["page"] = "tekrar"
+
+
+def _tekrar_cevapla():
+    tekrar = st.session_state["tekrar"]
+    secim = st.session_state.get(f"tekrar_radio_{tekrar['sayac']}")
+    if secim is None:
+        st.session_state["soru_uyarisi"] = "⚠️ Lütfen bir seçenek seçin!"
+        return
+    kart = tekrar["kart"]
+    dogru = secim == tekrar["sorular"][kart.anahtar].dogru_cevap
+    sure = time.time() - tekrar["gosterim"] if tekrar["gosterim"] else None
+    tekrar_deposu.cevapla(st.session_state.get("current_user"), kart, dogru, sure)
+    tekrar["cevap"] = secim
+    tekrar["dogru" if dogru else "yanlis"] += 1
+    if not dogru:
+        # Unutulan kart kısa süre sonra bu oturumda yeniden sorulur
+        tekrar["kuyruk"].ekle(kart)
+
+
+def _tekrar_sonraki():
+    tekrar = st.session_state["tekrar"]
+    tekrar.update(kart=None, cevap=None, gosterim=None, sayac=tekrar["sayac"] + 1)
+
+
+@st.fragment
+def tekrar_blogu():
+    """Sıradaki tekrar kartı; cevaplama ve geçiş yalnızca bu bloğu yeniden çalıştırır"""
+    tekrar = st.session_state["tekrar"]
+    if tekrar["kart"] is None:
+        tekrar["kart"] = tekrar["kuyruk"].siradaki(time.time())
+        tekrar["gosterim"] = time.time()
+    kart = tekrar["kart"]
+
+    if kart is None:
+        st.success(f"🎉 Şimdilik tekrar edilecek soru kalmadı! (✅ {tekrar['dogru']} | ❌ {tekrar['yanlis']})")
+        _, _, sonraki = tekrar_deposu.ozet(st.session_state.get("current_user"))
+        if sonraki:
+            st.info(f"⏰ Sıradaki tekrar: {time.strftime('%d.%m.%Y %H:%M', time.localtime(sonraki))}")
+        return
+
+    gorunum = soru_gorunumleri.al(tekrar["sorular"][kart.anahtar])
+    st.markdown(f"**{kart.ders} › {kart.konu}** · Kalan: {len(tekrar['kuyruk']) + 1}")
+
+    if gorunum.resim:
+        try:
+            image_handler.display_image(gorunum.resim)
+        except Exception:
+            st.warning("❌ Resim görüntülenemedi.")
+
+    st.markdown(gorunum.metin)
+    for madde in gorunum.maddeler:
+        st.markdown(madde, unsafe_allow_html=True)
+
+    cevap = tekrar["cevap"]
+    st.radio(
+        label="Seçenekler",
+        options=gorunum.harfler,
+        index=gorunum.harfler.index(cevap) if cevap in gorunum.harfler else None,
+        format_func=gorunum.etiketler.get,
+        key=f"tekrar_radio_{tekrar['sayac']}",
+        label_visibility="collapsed",
+        disabled=cevap is not None
+    )
+
+    if cevap is None:
+        st.button("🎯 Cevapla", key=f"tekrar_cevapla_{tekrar['sayac']}", on_click=_tekrar_cevapla)
+    else:
+        if cevap == gorunum.dogru_cevap:
+            st.success(f"✅ Doğru! Sonraki tekrar {kart.aralik:g} gün sonra")
+        else:
+            st.error(gorunum.yanlis_mesaji)
+        st.info(gorunum.cozum_mesaji)
+        st.button("Sonraki Soru ➡️", key=f"tekrar_sonraki_{tekrar['sayac']}", on_click=_tekrar_sonraki)
+
+    uyari = st.session_state.pop("soru_uyarisi", None)
+    if uyari:
+        st.warning(uyari)
+
+
+def tekrar_page():
+    if st.button("🏠 Ana Menüye Dön"):
+        st.session_state["page"] = "ders"
+        st.rerun()
+
+    st.markdown("<h2 style='font-size:25px;'>🔁 Tekrar</h2>", unsafe_allow_html=True)
+    st.caption("Yanlış yaptığın sorular, unutmaya başladığın zamanlarda yeniden karşına çıkar.")
+
+    if "tekrar" not in st.session_state:
+        tekrari_baslat()
+    tekrar_blogu()
 
     st.markdown("---")
     st.markdown("<h1 style='text-align: center; color: orange; font-size:15px;'>KPSS SORU ÇÖZÜM PLATFORMU</h1>", unsafe_allow_html=True)
@@ -666,20 +1049,29 @@ def genel_rapor_page():
 
     st.header("📊 Genel Rapor")
     sonuclar = st.session_state.get("sonuclar", {})
+    ilerleme = ilerleme_al()
 
     if not sonuclar:
         st.info("Henüz herhangi bir test çözülmedi.")
     else:
+        # Tüm öğrencilerle karşılaştırma (sütunlu analitik tablosundan)
+        sira = sonuc_tablosu.siralama(st.session_state.get("current_user"))
+        if sira:
+            st.markdown(f"🏆 **Sıralama:** {sira[0]} / {sira[1]} öğrenci (nete göre)")
+        ortalamalar = sonuc_tablosu.ders_ortalamalari()
+
         for ders, konular in sonuclar.items():
-            with st.expander(f" {ders}"):    #📕📙📚📘📗#
-                for konu, sonuc in konular.items():
-                    if not isinstance(sonuc, dict):
+            _, ders_dogru, ders_yanlis = ilerleme.ders(ders)
+            ders_orani = IlerlemeOzeti.basari_orani(ders_dogru, ders_yanlis)
+            ortalama = ortalamalar.get(ders)
+            ortalama_metni = f" · Ortalama: {ortalama['ortalama_oran']}%" if ortalama else ""
+            with st.expander(f" {ders} · Başarı: {ders_orani}%{ortalama_metni}"):    #📕📙📚📘📗#
+                for konu in konular:
+                    if (ders, konu) not in ilerleme.konular:
                         continue
 
-                    dogru = sonuc.get("dogru", 0)
-                    yanlis = sonuc.get("yanlis", 0)
-                    toplam = dogru + yanlis
-                    oran = f"{dogru / toplam * 100:.0f}%" if toplam > 0 else "0%"
+                    _, dogru, yanlis = ilerleme.konu(ders, konu)
+                    oran = f"{IlerlemeOzeti.basari_orani(dogru, yanlis)}%"
 
                     st.markdown(f"- **{konu}** → ✅ {dogru} | ❌ {yanlis} | Başarı: {oran}")
 
@@ -697,7 +1089,8 @@ def genel_rapor_page():
 # ===============================
 def profil_page():
     user = st.session_state.get("current_user")
-    if not user or user not in kullanicilar:
+    bilgiler = auth_manager.kullanici_getir(user) if user else None
+    if bilgiler is None:
         st.warning("❌ Kullanıcı bilgisi bulunamadı!")
         st.session_state["page"] = "login"
         st.rerun()
@@ -710,14 +1103,12 @@ def profil_page():
 
     st.markdown("<h2>👤 Kullanıcı Bilgileri</h2>", unsafe_allow_html=True)
 
-    bilgiler = kullanicilar[user]
     isim = bilgiler.get("isim", "")
     k_adi = user
-    sifre = bilgiler.get("sifre", "")
 
     st.write(f"**İsim Soyisim:** {isim}")
     st.write(f"**Kullanıcı Adı:** {k_adi}")
-    st.write(f"**Şifre:** {'*' * len(sifre)}")
+    st.write("**Şifre:** ********")
 
     # Şifre değiştirme formu
     with st.expander("🔑 Şifre Değiştir"):
@@ -725,16 +1116,18 @@ def profil_page():
         yeni = st.text_input("Yeni Şifre", type="password", key="new_pass")
         yeni2 = st.text_input("Yeni Şifre (Tekrar)", type="password", key="new_pass2")
         if st.button("Şifreyi Güncelle"):
-            if eski != sifre:
-                st.error("❌ Eski şifre yanlış!")
-            elif not yeni or not yeni2:
+            if not yeni or not yeni2:
                 st.error("❌ Yeni şifre alanları boş olamaz!")
             elif yeni != yeni2:
                 st.error("❌ Yeni şifreler uyuşmuyor!")
             else:
-                kullanicilar[user]["sifre"] = yeni
-                kullanicilari_kaydet()
-                st.success("✅ Şifre başarıyla güncellendi!")
+                basarili, mesaj = auth_manager.sifre_degistir(user, eski, yeni)
+                if basarili:
+                    # Diğer cihazlardaki oturumlar kapanır, bu oturum açık kalır
+                    oturum_deposu.kullanici_oturumlarini_sil(user, haric=cookies.get("oturum"))
+                    st.success(mesaj)
+                else:
+                    st.error(mesaj)
 
     st.markdown("---")
     st.markdown("<h1 style='text-align:center; color:orange; font-size:15px;'>KPSS SORU ÇÖZÜM PLATFORMU</h1>", unsafe_allow_html=True)
@@ -751,14 +1144,39 @@ def admin_page():
         st.rerun()
     
     st.title("👨‍🏫 Admin Paneli")
-    
-    
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+
+    # 🔎 Soru arama: bulunan soruyu düzenle / sil sekmelerinde seçili getir
+    arama = st.text_input("🔎 Soru Ara", key="admin_arama", placeholder="Soru metni, seçenek veya çözümde ara")
+    if arama:
+        sonuclar = arama_indeksi.ara(arama, limit=15)
+        if not sonuclar:
+            st.info("Sonuç bulunamadı")
+        for i, sonuc in enumerate(sonuclar):
+            col1, col2, col3 = st.columns([8, 1, 1])
+            with col1:
+                st.markdown(f"**{sonuc['ders']} / {sonuc['konu']}** · {sonuc['sira'] + 1}. soru — {sonuc['ozet']}")
+            with col2:
+                if st.button("✏️", key=f"ara_duzenle_{i}", help="Soru Düzenle sekmesinde seç"):
+                    st.session_state["edit_ders"] = sonuc["ders"]
+                    st.session_state["edit_konu"] = sonuc["konu"]
+                    st.session_state["edit_idx"] = sonuc["sira"]
+                    st.success("✏️ Soru, Soru Düzenle sekmesinde seçildi")
+            with col3:
+                if st.button("🗑️", key=f"ara_sil_{i}", help="Soru Sil sekmesinde seç"):
+                    st.session_state["del_ders"] = sonuc["ders"]
+                    st.session_state["del_konu"] = sonuc["konu"]
+                    st.session_state["del_idx"] = sonuc["sira"]
+                    st.success("🗑️ Soru, Soru Sil sekmesinde seçildi")
+
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
         "👥 Kullanıcılar",
         "➕ Soru Ekle",
         "✏️ Soru Düzenle",
         "🗑️ Soru Sil",
-        "📊 İstatistikler"
+        "📊 İstatistikler",
+        "📦 Toplu Resim",
+        "🔬 Soru Analizi",
+        "🗂️ İçerik"
     ])
     
     # ==================================================
@@ -767,9 +1185,12 @@ def admin_page():
     with tab1:
         st.subheader("👥 Kullanıcı Yönetimi")
         
+        kullanicilar = auth_manager.kullanicilari_yukle()
         if not kullanicilar:
             st.info("Kayıtlı kullanıcı yok.")
         else:
+            # Kullanıcı başına doğru/yanlış toplamları tek vektörel sorguda
+            toplamlar = sonuc_tablosu.kullanici_toplamlari()
             # Kullanıcı listesi
             for k_adi, k_data in kullanicilar.items():
                 col1, col2, col3 = st.columns([3, 2, 1])
@@ -778,20 +1199,16 @@ def admin_page():
                     st.markdown(f"**{k_data.get('isim', 'İsimsiz')}** (@{k_adi})")
                 
                 with col2:
-                    sonuc = k_data.get('sonuclar', {})
-                    toplam = sum(
-                        kd.get("dogru", 0) + kd.get("yanlis", 0)
-                        for dd in sonuc.values()
-                        for kd in dd.values()
-                        if isinstance(kd, dict)
-                    )
-                    st.write(f"📊 {toplam} soru çözdü")
+                    st.write(f"📊 {sum(toplamlar.get(k_adi, (0, 0)))} soru çözdü")
                 
                 with col3:
                     if st.button("❌", key=f"sil_{k_adi}"):
                         if st.session_state.get(f"confirm_{k_adi}"):
-                            del kullanicilar[k_adi]
-                            kullanicilari_kaydet(kullanicilar)
+                            auth_manager.kullanici_sil(k_adi)
+                            oturum_deposu.kullanici_oturumlarini_sil(k_adi)
+                            sonuc_tablosu.kullanici_sil(k_adi)
+                            tekrar_deposu.kullanici_sil(k_adi)
+                            deneme_motoru.kullanici_sil(k_adi)
                             st.success(f"✅ {k_adi} silindi")
                             st.rerun()
                         else:
@@ -872,22 +1289,31 @@ def admin_page():
                     "dogru_cevap": dogru,
                     "cozum": cozum
                 }
+
+                # 🔁 Bankada çok benzer soru varsa önce uyar, ikinci tıklamada kaydet
+                benzerler = tekrar_kontrolu.benzerleri(yeni_soru)
+                if benzerler and st.session_state.get("add_tekrar_onay") != soru_metni:
+                    st.session_state["add_tekrar_onay"] = soru_metni
+                    st.warning("🔁 Bu soruya çok benzeyen sorular var. Yine de kaydetmek için tekrar tıklayın.")
+                    for b_soru in benzerler:
+                        st.markdown(
+                            f"- **%{b_soru['benzerlik'] * 100:.0f}** · {b_soru['ders']} / {b_soru['konu']} · "
+                            f"{b_soru['sira'] + 1}. soru — {b_soru['ozet']}"
+                        )
+                else:
+                    # Resim varsa kaydet
+                    if uploaded_file:
+                        resim_path = image_handler.upload_image(uploaded_file)
+                        if resim_path:
+                            yeni_soru["soru_resmi"] = resim_path
                 
-                # Resim varsa kaydet
-                if uploaded_file:
-                    soru_id = str(uuid.uuid4())[:8]
-                    resim_path = image_handler.upload_image(uploaded_file, soru_id)
-                    if resim_path:
-                        yeni_soru["soru_resmi"] = resim_path
-                
-                soru_bankasi.setdefault(ders, {})
-                soru_bankasi[ders].setdefault(konu, [])
-                soru_bankasi[ders][konu].append(yeni_soru)
+                    sorular = list(soru_deposu.sorular(ders, konu))
+                    sorular.append(yeni_soru)
                 
-                soru_bankasini_kaydet(soru_bankasi)
-                st.success("✅ Soru başarıyla eklendi!")
-                time.sleep(1)
-                st.rerun()
+                    if soru_bankasini_guvenli_kaydet(ders, konu, sorular):
+                        st.success("✅ Soru başarıyla eklendi!")
+                        time.sleep(1)
+                        st.rerun()
     
 # ==================================================
 # ✏️ SORU DÜZENLE
@@ -915,7 +1341,8 @@ def admin_page():
             idx = st.selectbox(
                 "Düzenlenecek Soru",
                 range(len(sorular)),
-                format_func=lambda i: f"{i+1}. {sorular[i]['soru'][:60]}..."
+                format_func=lambda i: f"{i+1}. {sorular[i]['soru'][:60]}...",
+                key="edit_idx"
             )
 
             s = sorular[idx]
@@ -964,12 +1391,12 @@ def admin_page():
             if st.button("💾 Güncelle"):
                 # 🖼️ Resim işlemi
                 if yeni_resim:
-                    soru_id = s.get("id", str(uuid.uuid4()))
-                    resim_path = image_handler.upload_image(yeni_resim, soru_id)
+                    resim_path = image_handler.upload_image(yeni_resim)
                 else:
                     resim_path = s.get("soru_resmi")
 
-                sorular[idx] = {
+                yeni_sorular = list(sorular)
+                yeni_sorular[idx] = {
                     "id": s.get("id", str(uuid.uuid4())),
                     "soru": soru,
                     "secenekler": {
@@ -980,9 +1407,12 @@ def admin_page():
                     "soru_resmi": resim_path
                 }
 
-                soru_bankasini_kaydet(soru_bankasi)
-                st.info("✏️ Soru güncellendi")
-                st.rerun()
+                if soru_bankasini_guvenli_kaydet(ders, konu, yeni_sorular):
+                    # Eski resmi başka soru kullanmıyorsa sil
+                    if resim_path != s.get("soru_resmi"):
+                        image_handler.serbest_birak(s.get("soru_resmi"), soru_bankasi, deneme_sinavlari)
+                    st.info("✏️ Soru güncellendi")
+                    st.rerun()
 
     
     # ==================================================
@@ -1010,15 +1440,16 @@ def admin_page():
             st.write(f"**{sorular[idx]['soru']}**")
             
             if st.button("❌ Soruyu Sil", use_container_width=True):
-                # Resim varsa sil
-                if "soru_resmi" in sorular[idx]:
-                    image_handler.delete_image(sorular[idx]["soru_resmi"])
-                
-                sorular.pop(idx)
-                soru_bankasini_kaydet(soru_bankasi)
-                st.success("🗑️ Soru silindi!")
-                time.sleep(1)
-                st.rerun()
+                yeni_sorular = list(sorular)
+                silinen = yeni_sorular.pop(idx)
+                if soru_bankasini_guvenli_kaydet(ders, konu, yeni_sorular):
+                    # Resimleri başka soru kullanmıyorsa sil (kayıt başarılı olduktan sonra)
+                    for resim in soru_resim_yollari(silinen):
+                        image_handler.serbest_birak(resim, soru_bankasi, deneme_sinavlari)
+                    
+                    st.success("🗑️ Soru silindi!")
+                    time.sleep(1)
+                    st.rerun()
 
 
     
@@ -1027,14 +1458,9 @@ def admin_page():
     with tab5:
         st.subheader("📊 Soru Bankası İstatistikleri")
 
-        toplam_soru = sum(
-            len(sorular)
-            for ders_konular in soru_bankasi.values()
-            for sorular in ders_konular.values()
-        )
-
-        toplam_ders = len(soru_bankasi)
-        toplam_konu = sum(len(konular) for konular in soru_bankasi.values())
+        toplam_soru = soru_deposu.toplam_soru_sayisi()
+        toplam_ders = len(soru_deposu.ders_listesi())
+        toplam_konu = soru_deposu.toplam_konu_sayisi()
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1046,10 +1472,201 @@ def admin_page():
 
         st.markdown("### Ders Bazında Soru Sayıları")
 
-        for ders, konular in soru_bankasi.items():
-            soru_sayisi = sum(len(s) for s in konular.values())
+        for ders in soru_deposu.ders_listesi():
+            soru_sayisi = soru_deposu.ders_soru_sayisi(ders)
             st.write(f"- **{ders}** → {soru_sayisi} soru")
 
+        # 📈 Öğrenci sonuçları (sütunlu analitik tablosu)
+        with st.expander("📈 Öğrenci Analitiği"):
+            st.markdown("**🏆 Liderlik Tablosu (net = doğru - yanlış / 4)**")
+            for no, satir in enumerate(sonuc_tablosu.liderlik(10), 1):
+                st.write(f"{no}. @{satir['kullanici']} → net {satir['net']} (✅ {satir['dogru']} | ❌ {satir['yanlis']})")
+
+            st.markdown("**📚 Ders Ortalamaları**")
+            for ders, o in sonuc_tablosu.ders_ortalamalari().items():
+                st.write(
+                    f"- **{ders}** → {o['kullanici']} öğrenci · öğrenci ortalaması %{o['ortalama_oran']} "
+                    f"· tüm cevaplar %{o['oran']}"
+                )
+
+            st.markdown("**🧗 En Zor Konular**")
+            for z in sonuc_tablosu.konu_zorlugu(limit=10):
+                st.write(f"- {z['ders']} / {z['konu']} → %{z['oran']} başarı ({z['dogru'] + z['yanlis']} cevap)")
+
+        # 🔐 Şifre işlemleri havuzu (giriş yoğunluğu)
+        with st.expander("🔐 Giriş Performansı"):
+            istatistik = sifre_havuzu.istatistikler()
+            st.write(
+                f"- **İşçi / Kuyruk:** {istatistik['isci_sayisi']} / {istatistik['kuyruk_boyu']} "
+                f"· **Bekleyen:** {istatistik['bekleyen']} · **Reddedilen:** {istatistik['reddedilen']}"
+            )
+            for tur, baslik in (("bekleme", "Kuyrukta bekleme"), ("dogrula", "Şifre doğrulama"), ("hashle", "Şifre hashleme")):
+                s = istatistik[tur]
+                st.write(f"- **{baslik}:** {s['adet']} işlem · ort {s['ort_ms']} ms · p95 {s['p95_ms']} ms · max {s['max_ms']} ms")
+
+    # ==================================================
+    # 📦 TOPLU RESİM YÜKLEME
+    # ==================================================
+    with tab6:
+        st.subheader("📦 Toplu Resim Yükleme")
+        st.caption(
+            "Eşleme dosyası sütunları: dosya, ders, konu, sira (konudaki soru numarası), "
+            "alan (opsiyonel: soru_resmi / cozum_resmi)"
+        )
+
+        kaynak_turu = st.radio("Resim kaynağı", ["ZIP arşivi", "Sunucudaki klasör"], horizontal=True, key="toplu_kaynak_turu")
+        if kaynak_turu == "ZIP arşivi":
+            kaynak = st.file_uploader("ZIP seç", type=["zip"], key="toplu_zip")
+        else:
+            kaynak = st.text_input("Klasör yolu", key="toplu_klasor") or None
+        eslesme_dosyasi = st.file_uploader("Eşleme dosyası", type=["csv", "json"], key="toplu_eslesme")
+
+        if st.button("📦 Resimleri Yükle", use_container_width=True, disabled=not (kaynak and eslesme_dosyasi)):
+            try:
+                eslemeler = eslemeleri_oku(eslesme_dosyasi.getvalue(), eslesme_dosyasi.name)
+            except ValueError as e:
+                st.error(f"❌ Eşleme dosyası okunamadı: {e}")
+            else:
+                with st.spinner(f"{len(eslemeler)} resim işleniyor..."):
+                    sonuclar = toplu_yukle(kaynak, eslemeler, soru_bankasi)
+                basarili = sum(1 for s in sonuclar if s["durum"] == "ok")
+                if basarili and soru_bankasini_guvenli_kaydet():
+                    st.success(f"✅ {basarili}/{len(sonuclar)} resim sorulara eklendi")
+                elif not basarili:
+                    st.warning("⚠️ Hiçbir resim eklenemedi")
+                st.dataframe(
+                    [{k: s[k] for k in ("dosya", "ders", "konu", "sira", "alan", "durum", "mesaj")} for s in sonuclar],
+                    use_container_width=True
+                )
+
+        st.markdown("---")
+        st.markdown("**🧹 Kullanılmayan Resimler**")
+        st.caption("Hiçbir sorunun kullanmadığı resimler silinir; yeni yüklenenlere dokunulmaz")
+        if st.button("🧹 Kullanılmayan resimleri sil", key="resim_cop_topla"):
+            silinen = image_handler.cop_topla(soru_bankasi, deneme_sinavlari)
+            st.success(f"✅ {len(silinen)} resim silindi")
+
+    # ==================================================
+    # 🔬 SORU ANALİZİ (MADDE ANALİZİ)
+    # ==================================================
+    with tab7:
+        st.subheader("🔬 Soru Analizi")
+        st.caption(
+            "p: doğru cevaplama oranı · Ayırt edicilik: sorunun testin geri kalanındaki başarıyla "
+            "korelasyonu (0.2 altı zayıf, negatifse cevap anahtarını kontrol edin) · "
+            "Şık oranları: her şıkkın seçilme yüzdesi"
+        )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            analiz_ders = st.selectbox("Ders", ["Tümü", *soru_deposu.ders_listesi()], key="analiz_ders")
+        with col2:
+            konular = soru_deposu.konu_listesi(analiz_ders) if analiz_ders != "Tümü" else []
+            analiz_konu = st.selectbox("Konu", ["Tümü", *konular], key="analiz_konu")
+        with col3:
+            en_az = st.number_input("En az cevap", min_value=1, value=1, key="analiz_en_az")
+        yalniz_uyarili = st.checkbox("Yalnızca uyarılı sorular", key="analiz_uyarili")
+
+        maddeler = soru_istatistikleri.maddeler(
+            None if analiz_ders == "Tümü" else analiz_ders,
+            None if analiz_konu == "Tümü" else analiz_konu,
+            en_az_deneme=int(en_az),
+        )
+        if yalniz_uyarili:
+            maddeler = [m for m in maddeler if m["uyarilar"]]
+
+        if not maddeler:
+            st.info("Bu seçim için henüz cevap istatistiği yok.")
+        else:
+            # Sorunlu sorular önce: uyarı sayısı, sonra düşük ayırt edicilik
+            maddeler.sort(key=lambda m: (-len(m["uyarilar"]), m["ayirt"] if m["ayirt"] is not None else 1))
+            st.dataframe(
+                [
+                    {
+                        "Ders": m["ders"],
+                        "Konu": m["konu"],
+                        "Soru": m["ozet"],
+                        "Cevap": m["dogru_cevap"],
+                        "Cevap sayısı": m["deneme"],
+                        "p": round(m["p"], 2),
+                        "Ayırt edicilik": round(m["ayirt"], 2) if m["ayirt"] is not None else None,
+                        **{
+                            f"{h} %": round(100 * m[f"secim_{h.lower()}"] / m["deneme"])
+                            for h in ("A", "B", "C", "D", "E")
+                        },
+                        "Ort. süre (sn)": round(m["ortalama_sure"]) if m["ortalama_sure"] is not None else None,
+                        "Uyarılar": ", ".join(m["uyarilar"]),
+                    }
+                    for m in maddeler
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+
+    # ==================================================
+    # 🗂️ İÇERİK (DENEME SINAVLARI / KONU NOTLARI)
+    # ==================================================
+    with tab8:
+        st.subheader("🗂️ İçerik Yönetimi")
+        st.caption("Kaydedilen içerik yeniden başlatma gerekmeden tüm oturumlarda geçerli olur.")
+
+        icerik_turu = st.radio("İçerik", ["📝 Deneme Sınavları", "📕 Konu Notları"], horizontal=True, key="icerik_turu")
+
+        if icerik_turu == "📕 Konu Notları":
+            if "notlar_taslak" not in st.session_state:
+                st.session_state["notlar_taslak"] = (ders_konu_notlari.surum, [
+                    {"Ders": ders, "Konu": konu, "Link": link}
+                    for ders, konular in ders_konu_notlari.items()
+                    for konu, link in konular.items()
+                ])
+            surum, satirlar = st.session_state["notlar_taslak"]
+            st.markdown(f"Sürüm: **{surum}** · Dersin genel notu için konu olarak `__ders_notu__` yazın")
+
+            duzenlenen = st.data_editor(
+                satirlar,
+                num_rows="dynamic",
+                use_container_width=True,
+                key=f"notlar_editor_{surum}"
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Notları Kaydet", key="notlar_kaydet"):
+                    yeni = {}
+                    for satir in duzenlenen:
+                        ders = (satir.get("Ders") or "").strip()
+                        konu = (satir.get("Konu") or "").strip()
+                        if ders and konu:
+                            yeni.setdefault(ders, {})[konu] = (satir.get("Link") or "").strip()
+                    icerigi_guvenli_kaydet(ders_konu_notlari, yeni, "notlar_taslak")
+            with col2:
+                if st.button("🔄 Güncel Hali Yükle", key="notlar_yenile"):
+                    st.session_state.pop("notlar_taslak", None)
+                    st.rerun()
+        else:
+            if "deneme_taslak" not in st.session_state:
+                st.session_state["deneme_taslak"] = (
+                    deneme_sinavlari.surum,
+                    json.dumps(deneme_sinavlari.veri(), ensure_ascii=False, indent=2)
+                )
+            surum, metin = st.session_state["deneme_taslak"]
+            st.markdown(f"Sürüm: **{surum}** · Yapı: deneme → bölüm → soru listesi")
+            st.caption("⚠️ Süresi devam eden bir denemenin soru sırasını değiştirmek o oturumların cevaplarını kaydırır.")
+
+            duzenlenen = st.text_area("Deneme Sınavları (JSON)", metin, height=500, key=f"deneme_json_{surum}")
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Denemeleri Kaydet", key="deneme_kaydet"):
+                    try:
+                        veri = json.loads(duzenlenen)
+                    except json.JSONDecodeError as e:
+                        st.error(f"❌ JSON okunamadı: {e}")
+                    else:
+                        icerigi_guvenli_kaydet(deneme_sinavlari, veri, "deneme_taslak")
+            with col2:
+                if st.button("🔄 Güncel Hali Yükle", key="deneme_yenile"):
+                    st.session_state.pop("deneme_taslak", None)
+                    st.rerun()
+
 # ===============================
 # SESSION İLK KURULUM
 # ===============================
@@ -1061,19 +1678,23 @@ if "initialized" not in st.session_state:
 # ===============================
 # COOKIE'DEN OTOMATİK GİRİŞ (TEK VE KONTROLLÜ)
 # ===============================
+# Jeton bellekteki oturum önbelleğinden çözülür; süresi dolmuşsa None döner
+cookie_user = oturum_deposu.coz(cookies.get("oturum"))
 if not st.session_state.get("current_user") and not st.session_state.get("logout"):
-    cookie_user = cookies.get("current_user")
-    if cookie_user and cookie_user in kullanicilar:
+    if cookie_user and auth_manager.kullanici_var_mi(cookie_user):
         st.session_state.current_user = cookie_user
         kullanici_sonuclarini_yukle_to_session(cookie_user)
         st.session_state.page = "ders"
+elif st.session_state.get("current_user") and cookie_user != st.session_state.current_user:
+    # Oturumun süresi (SESSION_LIFETIME_HOURS) doldu ya da oturum iptal edildi
+    oturumu_kapat()
 # ===============================
 # ROUTER
 # ===============================
 page = st.session_state.page
 
 korumali_sayfalar = [
-    "ders", "konu", "test", "soru", "rapor", "profil", "deneme", "admin"
+    "ders", "konu", "test", "soru", "rapor", "profil", "deneme", "admin", "tekrar", "sinav"
 ]
 
 if page in korumali_sayfalar and not st.session_state.get("current_user"):
@@ -1105,6 +1726,10 @@ elif page == "deneme":
     deneme_secim_page()
 elif page == "soru":
     soru_goster_page()
+elif page == "tekrar":
+    tekrar_page()
+elif page == "sinav":
+    sinav_page()
 elif page == "rapor":
     genel_rapor_page()
 elif page == "profil":
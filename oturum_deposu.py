@@ -0,0 +1,222 @@
+"""
+KPSS Quiz App - Sunucu Taraflı Oturumlar
+Cookie yalnızca imzalı, anlamsız bir jeton taşır; jeton → kullanıcı eşlemesi
+SQLite'ta (oturumlar tablosu) ve önündeki bellek içi LRU önbellekte tutulur
+"""
+
+import hashlib
+import hmac
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from config import Config
+from kullanici_deposu import baglanti_ac
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS oturumlar (
+    ozet        TEXT PRIMARY KEY,
+    kullanici   TEXT NOT NULL,
+    bitis       REAL NOT NULL,
+    son_gorulme REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS oturumlar_bitis ON oturumlar(bitis);
+CREATE INDEX IF NOT EXISTS oturumlar_kullanici ON oturumlar(kullanici);
+CREATE TABLE IF NOT EXISTS oturum_anahtari (
+    id      INTEGER PRIMARY KEY CHECK (id = 1),
+    anahtar TEXT NOT NULL
+);
+"""
+
+# Süresi dolmuş oturumların en fazla ne sıklıkla süpürüleceği
+SUPURME_ARALIGI_SN = 300
+
+# son_gorulme sütunu en fazla bu sıklıkla yazılır (her rerun'da yazma olmaz)
+GORULME_YAZMA_ARALIGI_SN = 300
+
+
+class OturumDeposu:
+    """
+    Oturum jetonu üretir, doğrular ve iptal eder
+    Veritabanında jetonun kendisi değil SHA-256 özeti tutulur
+    Önbellek kaydı onbellek_sn sonra veritabanından yeniden doğrulanır;
+    böylece başka süreçte yapılan çıkış/iptal de en geç bu sürede görülür
+    """
+
+    def __init__(self, dosya: str = None, omur_saat: float = None, anahtar: str = None,
+                 onbellek_boyu: int = None, onbellek_sn: float = None):
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self.omur_sn = (omur_saat or Config.SESSION_LIFETIME_HOURS) * 3600
+        self.onbellek_boyu = onbellek_boyu or Config.OTURUM_ONBELLEK_BOYU
+        self.onbellek_sn = onbellek_sn if onbellek_sn is not None else Config.OTURUM_ONBELLEK_SN
+
+        # ozet → (kullanıcı, bitiş, önbelleğe alınma, son_gorulme yazımı)
+        self._onbellek: "OrderedDict[str, Tuple[str, float, float, float]]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+        self._son_supurme = 0.0
+        self._baglanti().executescript(SEMA)
+        self._anahtar = (anahtar or Config.OTURUM_ANAHTARI or self._ortak_anahtar()).encode("utf-8")
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    def _ortak_anahtar(self) -> str:
+        """
+        Veritabanında saklanan imza anahtarı; yoksa üretilir
+        İlk yazan süreç kazanır, böylece tüm işçiler ve yeniden başlatmalar aynı anahtarı kullanır
+        """
+        with self._baglanti() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO oturum_anahtari (id, anahtar) VALUES (1, ?)",
+                (secrets.token_urlsafe(32),),
+            )
+            return conn.execute("SELECT anahtar FROM oturum_anahtari WHERE id = 1").fetchone()[0]
+
+    # ===============================
+    # JETON
+    # ===============================
+
+    def _imza(self, jeton: str) -> str:
+        return hmac.new(self._anahtar, jeton.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    @staticmethod
+    def _ozet(jeton: str) -> str:
+        return hashlib.sha256(jeton.encode("utf-8")).hexdigest()
+
+    def _ayir(self, cerez: Optional[str]) -> Optional[str]:
+        """Cookie değerinden jetonu çıkar; imza tutmuyorsa None (veritabanına gidilmez)"""
+        if not cerez or "." not in cerez:
+            return None
+        jeton, imza = cerez.rsplit(".", 1)
+        if not hmac.compare_digest(imza, self._imza(jeton)):
+            return None
+        return jeton
+
+    # ===============================
+    # OLUŞTURMA / ÇÖZME / İPTAL
+    # ===============================
+
+    def olustur(self, kullanici: str) -> str:
+        """
+        Yeni oturum aç
+        Returns: cookie'ye yazılacak imzalı jeton
+        """
+        jeton = secrets.token_urlsafe(32)
+        ozet = self._ozet(jeton)
+        simdi = time.time()
+        bitis = simdi + self.omur_sn
+        with self._baglanti() as conn:
+            conn.execute(
+                "INSERT INTO oturumlar (ozet, kullanici, bitis, son_gorulme) VALUES (?, ?, ?, ?)",
+                (ozet, kullanici, bitis, simdi),
+            )
+        self._onbellege_al(ozet, kullanici, bitis, simdi)
+        self._gerekirse_supur(simdi)
+        return f"{jeton}.{self._imza(jeton)}"
+
+    def _onbellege_al(self, ozet: str, kullanici: str, bitis: float, gorulme: float):
+        with self._kilit:
+            self._onbellek[ozet] = (kullanici, bitis, time.monotonic(), gorulme)
+            self._onbellek.move_to_end(ozet)
+            while len(self._onbellek) > self.onbellek_boyu:
+                self._onbellek.popitem(last=False)
+
+    def coz(self, cerez: Optional[str]) -> Optional[str]:
+        """
+        Cookie'deki jetonun kullanıcısı
+        Jeton sahte, süresi dolmuş ya da iptal edilmişse None
+        """
+        jeton = self._ayir(cerez)
+        if jeton is None:
+            return None
+        ozet = self._ozet(jeton)
+        simdi = time.time()
+
+        with self._kilit:
+            kayit = self._onbellek.get(ozet)
+            if kayit is not None:
+                self._onbellek.move_to_end(ozet)
+        if kayit is not None and time.monotonic() - kayit[2] < self.onbellek_sn:
+            kullanici, bitis, _, gorulme = kayit
+            if bitis <= simdi:
+                self.sil(cerez)
+                return None
+            if simdi - gorulme >= GORULME_YAZMA_ARALIGI_SN:
+                self._gorulme_yaz(ozet, kullanici, bitis, simdi)
+            return kullanici
+
+        self._gerekirse_supur(simdi)
+        satir = self._baglanti().execute(
+            "SELECT kullanici, bitis FROM oturumlar WHERE ozet = ?", (ozet,)
+        ).fetchone()
+        if satir is None or satir[1] <= simdi:
+            with self._kilit:
+                self._onbellek.pop(ozet, None)
+            return None
+        self._gorulme_yaz(ozet, satir[0], satir[1], simdi)
+        return satir[0]
+
+    def _gorulme_yaz(self, ozet: str, kullanici: str, bitis: float, simdi: float):
+        with self._baglanti() as conn:
+            conn.execute("UPDATE oturumlar SET son_gorulme = ? WHERE ozet = ?", (simdi, ozet))
+        self._onbellege_al(ozet, kullanici, bitis, simdi)
+
+    def sil(self, cerez: Optional[str]):
+        """Çıkışta oturumu iptal et"""
+        jeton = self._ayir(cerez)
+        if jeton is None:
+            return
+        ozet = self._ozet(jeton)
+        with self._kilit:
+            self._onbellek.pop(ozet, None)
+        with self._baglanti() as conn:
+            conn.execute("DELETE FROM oturumlar WHERE ozet = ?", (ozet,))
+
+    def kullanici_oturumlarini_sil(self, kullanici: str, haric: Optional[str] = None) -> int:
+        """
+        Kullanıcının tüm oturumlarını iptal et (şifre değişince, kullanıcı silinince)
+        haric verilirse o cookie'nin oturumu açık kalır
+        Returns: iptal edilen oturum sayısı
+        """
+        jeton = self._ayir(haric)
+        korunan = self._ozet(jeton) if jeton is not None else ""
+        with self._kilit:
+            for ozet in [o for o, k in self._onbellek.items() if k[0] == kullanici and o != korunan]:
+                del self._onbellek[ozet]
+        with self._baglanti() as conn:
+            return conn.execute(
+                "DELETE FROM oturumlar WHERE kullanici = ? AND ozet != ?", (kullanici, korunan)
+            ).rowcount
+
+    # ===============================
+    # SÜPÜRME
+    # ===============================
+
+    def supur(self, simdi: Optional[float] = None) -> int:
+        """
+        Süresi dolmuş oturumları sil
+        Returns: silinen oturum sayısı
+        """
+        simdi = simdi or time.time()
+        with self._kilit:
+            for ozet in [o for o, k in self._onbellek.items() if k[1] <= simdi]:
+                del self._onbellek[ozet]
+        with self._baglanti() as conn:
+            return conn.execute("DELETE FROM oturumlar WHERE bitis <= ?", (simdi,)).rowcount
+
+    def _gerekirse_supur(self, simdi: float):
+        if simdi - self._son_supurme < SUPURME_ARALIGI_SN:
+            return
+        self._son_supurme = simdi
+        self.supur(simdi)
+
+
+# Global oturum deposu instance
+oturum_deposu = OturumDeposu()
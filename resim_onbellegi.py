@@ -0,0 +1,270 @@
+"""
+KPSS Quiz App - Google Drive Resim Önbelleği
+Drive'daki soru resimleri bir kez indirilip yerel diskte içerik özetiyle (SHA-256) saklanır;
+her gösterimde Drive'a gidilmez. Boyut sınırı aşılınca en uzun süredir kullanılmayan
+resimler silinir (LRU), tazelik süresi geçen kayıtlar ETag ile yeniden doğrulanır
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Optional
+from config import Config
+from depolama import atomik_yaz
+from kullanici_deposu import baglanti_ac
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS drive_resimleri (
+    dosya_id   TEXT PRIMARY KEY,
+    ozet       TEXT NOT NULL,
+    uzanti     TEXT NOT NULL,
+    etag       TEXT,
+    boyut      INTEGER NOT NULL,
+    dogrulama  REAL NOT NULL,
+    kullanim   REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS drive_resimleri_kullanim ON drive_resimleri(kullanim);
+CREATE INDEX IF NOT EXISTS drive_resimleri_ozet ON drive_resimleri(ozet);
+"""
+
+# Son kullanım zamanı en fazla bu sıklıkla yazılır (her gösterimde yazma olmaz)
+KULLANIM_YAZMA_ARALIGI_SN = 60
+
+UZANTILAR = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/bmp": "bmp",
+}
+
+# https://drive.google.com/file/d/<ID>/view, ...open?id=<ID>, ...uc?export=view&id=<ID>
+_DRIVE_KIMLIGI = re.compile(r"(?:/file/d/|[?&]id=)([\w-]{10,})")
+
+
+def drive_kimligi(url: str) -> Optional[str]:
+    """Drive linkindeki dosya kimliği (bulunamazsa None)"""
+    if not url or "drive.google.com" not in url:
+        return None
+    eslesme = _DRIVE_KIMLIGI.search(url)
+    return eslesme.group(1) if eslesme else None
+
+
+class DriveOnbellegi:
+    """
+    Drive dosya kimliği → yerel dosya
+    Aynı içerik farklı kimliklerle paylaşılsa da diskte bir kez tutulur
+    Drive'a ulaşılamazsa eski kopya gösterilmeye devam eder
+    """
+
+    def __init__(self, klasor: str = None, dosya: str = None, maks_mb: float = None,
+                 tazelik_sn: float = None, url_sablonu: str = None,
+                 zaman_asimi: float = None, isci_sayisi: int = None):
+        self.klasor = klasor or Config.DRIVE_ONBELLEK_KLASORU
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self.maks_bayt = int((maks_mb or Config.DRIVE_ONBELLEK_MB) * 1024 * 1024)
+        self.tazelik_sn = tazelik_sn if tazelik_sn is not None else Config.DRIVE_TAZELIK_SN
+        self.url_sablonu = url_sablonu or Config.DRIVE_URL_SABLONU
+        self.zaman_asimi = zaman_asimi or Config.DRIVE_ZAMAN_ASIMI_SN
+        self.isci_sayisi = isci_sayisi or Config.DRIVE_ONCEDEN_ISCI
+        self.maks_dosya_bayt = int(Config.DRIVE_MAKS_DOSYA_MB * 1024 * 1024)
+
+        self._yerel = threading.local()
+        self._kilit = threading.Lock()
+        # Aynı kimliği iki thread aynı anda indirmesin (kimlik karmasına göre şeritli kilitler)
+        self._kimlik_kilitleri = [threading.Lock() for _ in range(64)]
+        self._havuz: Optional[ThreadPoolExecutor] = None
+        self._suruyor = set()
+
+        # İstatistikler
+        self.isabet = 0
+        self.indirme = 0
+        self.dogrulama = 0
+
+        os.makedirs(self.klasor, exist_ok=True)
+        self._baglanti().executescript(SEMA)
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    def _dosya_yolu(self, ozet: str, uzanti: str) -> str:
+        return os.path.join(self.klasor, ozet[:2], f"{ozet}.{uzanti}")
+
+    # ===============================
+    # OKUMA
+    # ===============================
+
+    def yol(self, kimlik: str) -> Optional[str]:
+        """
+        Drive dosyasının yerel kopyası; yoksa ya da tazelik süresi geçtiyse indirir/doğrular
+        Returns: yerel dosya yolu veya None (hiç indirilemediyse)
+        """
+        with self._kimlik_kilitleri[hash(kimlik) % len(self._kimlik_kilitleri)]:
+            satir = self._baglanti().execute(
+                "SELECT ozet, uzanti, etag, dogrulama, kullanim FROM drive_resimleri WHERE dosya_id = ?",
+                (kimlik,),
+            ).fetchone()
+            simdi = time.time()
+
+            yerel = None
+            if satir is not None:
+                ozet, uzanti, etag, dogrulama, kullanim = satir
+                yerel = self._dosya_yolu(ozet, uzanti)
+                if not os.path.exists(yerel):
+                    yerel = etag = None
+                elif simdi - dogrulama < self.tazelik_sn:
+                    self.isabet += 1
+                    if simdi - kullanim >= KULLANIM_YAZMA_ARALIGI_SN:
+                        with self._baglanti() as conn:
+                            conn.execute(
+                                "UPDATE drive_resimleri SET kullanim = ? WHERE dosya_id = ?",
+                                (simdi, kimlik),
+                            )
+                    return yerel
+            else:
+                etag = None
+
+            try:
+                return self._indir(kimlik, etag, simdi)
+            except Exception as e:
+                print(f"⚠️ Drive resmi alınamadı ({kimlik}): {e}")
+                return yerel
+
+    def _indir(self, kimlik: str, etag: Optional[str], simdi: float) -> str:
+        istek = urllib.request.Request(self.url_sablonu.format(id=kimlik))
+        if etag:
+            istek.add_header("If-None-Match", etag)
+
+        try:
+            with urllib.request.urlopen(istek, timeout=self.zaman_asimi) as yanit:
+                tip = yanit.headers.get_content_type()
+                # Büyük dosyalarda Drive resim yerine uyarı sayfası (HTML) döndürür
+                if tip not in UZANTILAR:
+                    raise ValueError(f"resim değil ({tip})")
+                icerik = yanit.read(self.maks_dosya_bayt + 1)
+                if len(icerik) > self.maks_dosya_bayt:
+                    raise ValueError(f"{Config.DRIVE_MAKS_DOSYA_MB} MB sınırını aşıyor")
+                yeni_etag = yanit.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not etag:
+                raise
+            # Değişmemiş: yalnızca doğrulama zamanını ilerlet
+            with self._baglanti() as conn:
+                conn.execute(
+                    "UPDATE drive_resimleri SET dogrulama = ?, kullanim = ? WHERE dosya_id = ?",
+                    (simdi, simdi, kimlik),
+                )
+            self.dogrulama += 1
+            ozet, uzanti = self._baglanti().execute(
+                "SELECT ozet, uzanti FROM drive_resimleri WHERE dosya_id = ?", (kimlik,)
+            ).fetchone()
+            return self._dosya_yolu(ozet, uzanti)
+
+        ozet = hashlib.sha256(icerik).hexdigest()
+        uzanti = UZANTILAR[tip]
+        yerel = self._dosya_yolu(ozet, uzanti)
+        if not os.path.exists(yerel):
+            os.makedirs(os.path.dirname(yerel), exist_ok=True)
+            atomik_yaz(yerel, icerik)
+
+        with self._baglanti() as conn:
+            eski = conn.execute(
+                "SELECT ozet, uzanti FROM drive_resimleri WHERE dosya_id = ?", (kimlik,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO drive_resimleri "
+                "(dosya_id, ozet, uzanti, etag, boyut, dogrulama, kullanim) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kimlik, ozet, uzanti, yeni_etag, len(icerik), simdi, simdi),
+            )
+        if eski is not None and eski[0] != ozet:
+            self._sahipsizse_sil(*eski)
+        self.indirme += 1
+
+        self._gerekirse_cikar(haric=kimlik)
+        return yerel
+
+    # ===============================
+    # LRU ÇIKARMA
+    # ===============================
+
+    def toplam_boyut(self) -> int:
+        """Diskteki benzersiz içeriklerin toplam boyutu (bayt)"""
+        return self._baglanti().execute(
+            "SELECT COALESCE(SUM(boyut), 0) FROM (SELECT DISTINCT ozet, boyut FROM drive_resimleri)"
+        ).fetchone()[0]
+
+    def _sahipsizse_sil(self, ozet: str, uzanti: str) -> bool:
+        """İçeriğe başka kimlik bağlı değilse dosyasını sil"""
+        if self._baglanti().execute(
+            "SELECT 1 FROM drive_resimleri WHERE ozet = ? LIMIT 1", (ozet,)
+        ).fetchone():
+            return False
+        try:
+            os.remove(self._dosya_yolu(ozet, uzanti))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _gerekirse_cikar(self, haric: Optional[str] = None) -> int:
+        """
+        Boyut sınırı aşıldıysa en eski kullanılanlardan başlayarak sil
+        Returns: silinen kayıt sayısı
+        """
+        toplam = self.toplam_boyut()
+        if toplam <= self.maks_bayt:
+            return 0
+
+        silinen = 0
+        adaylar = self._baglanti().execute(
+            "SELECT dosya_id, ozet, uzanti, boyut FROM drive_resimleri ORDER BY kullanim"
+        ).fetchall()
+        for kimlik, ozet, uzanti, boyut in adaylar:
+            if toplam <= self.maks_bayt:
+                break
+            if kimlik == haric:
+                continue
+            with self._baglanti() as conn:
+                conn.execute("DELETE FROM drive_resimleri WHERE dosya_id = ?", (kimlik,))
+            if self._sahipsizse_sil(ozet, uzanti):
+                toplam -= boyut
+            silinen += 1
+        return silinen
+
+    # ===============================
+    # ÖNCEDEN GETİRME
+    # ===============================
+
+    def onceden_getir(self, kimlikler: Iterable[str]) -> List[Future]:
+        """Verilen Drive dosyalarını arka planda önbelleğe al (zaten sürenler atlanır)"""
+        isler = []
+        with self._kilit:
+            if self._havuz is None:
+                self._havuz = ThreadPoolExecutor(
+                    max_workers=self.isci_sayisi, thread_name_prefix="drive-onbellek"
+                )
+            for kimlik in dict.fromkeys(kimlikler):
+                if kimlik and kimlik not in self._suruyor:
+                    self._suruyor.add(kimlik)
+                    isler.append(self._havuz.submit(self._arka_planda_getir, kimlik))
+        return isler
+
+    def _arka_planda_getir(self, kimlik: str) -> Optional[str]:
+        try:
+            return self.yol(kimlik)
+        finally:
+            with self._kilit:
+                self._suruyor.discard(kimlik)
+
+
+# Global Drive önbelleği instance
+drive_onbellegi = DriveOnbellegi()
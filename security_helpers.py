@@ -5,6 +5,8 @@ main.py'de kullanılmak üzere güvenli wrapper fonksiyonlar
 
 from auth import auth_manager
 from config import Config
+from sonuc_gunlugu import sonuc_gunlugu
+from yazma_kuyrugu import yazma_kuyrugu
 import streamlit as st
 
 # ===============================
@@ -28,22 +30,24 @@ def is_user_admin(username):
 # ===============================
 
 def kaydet_sonuclar_to_user_secure(user):
-    """Kullanıcı sonuçlarını güvenli kaydet"""
+    """
+    ESKİ FONKSİYON UYUMLULUĞU
+    Her test bitince günlüğe yazıldığı için sonuçların tamamını yeniden kaydetmeye gerek yok
+    """
+    return
+
+def kaydet_test_sonucu_secure(user, ders, konu, test_no, dogru, yanlis):
+    """Tek test sonucunu günlüğe ekle (kullanıcı kaydına sıkıştırıcı işler)"""
     if not user:
         return
     
-    users = get_all_users()
-    if user not in users:
-        return
-    
-    users[user]["sonuclar"] = st.session_state.get("sonuclar", {})
-    save_all_users(users)
+    sonuc_gunlugu.ekle(user, ders, konu, test_no, dogru, yanlis)
 
 def kullanici_sonuclarini_yukle_to_session_secure(user):
     """Kullanıcı sonuçlarını session'a güvenli yükle"""
-    users = get_all_users()
-    if user in users:
-        st.session_state["sonuclar"] = users[user].get("sonuclar", {})
+    kullanici = auth_manager.kullanici_getir(user)
+    if kullanici is not None:
+        st.session_state["sonuclar"] = kullanici.get("sonuclar", {})
     else:
         st.session_state["sonuclar"] = {}
 
@@ -53,16 +57,12 @@ def kullanici_sonuclarini_yukle_to_session_secure(user):
 
 def get_user_info(username):
     """Kullanıcı bilgilerini getir"""
-    users = get_all_users()
-    return users.get(username)
+    return auth_manager.kullanici_getir(username)
 
 def update_user_info(username, **kwargs):
-    """Kullanıcı bilgilerini güncelle"""
-    users = get_all_users()
-    if username in users:
-        for key, value in kwargs.items():
-            users[username][key] = value
-        save_all_users(users)
+    """Kullanıcı bilgilerini güncelle (arka planda toplu yazılır)"""
+    if auth_manager.kullanici_getir(username) is not None:
+        yazma_kuyrugu.profil_guncelle(username, kwargs)
         return True
     return False
 
@@ -72,12 +72,7 @@ def update_user_info(username, **kwargs):
 
 def delete_user_secure(username):
     """Kullanıcıyı güvenli sil"""
-    users = get_all_users()
-    if username in users:
-        del users[username]
-        save_all_users(users)
-        return True
-    return False
+    return auth_manager.kullanici_sil(username)
 
 # ===============================
 # UYUMLULUK FONKSİYONLARI
@@ -94,4 +89,5 @@ def kullanicilari_kaydet(users_dict):
 
 # main.py'de kullanılmak üzere global erişim
 kaydet_sonuclar_to_user = kaydet_sonuclar_to_user_secure
+kaydet_test_sonucu = kaydet_test_sonucu_secure
 kullanici_sonuclarini_yukle_to_session = kullanici_sonuclarini_yukle_to_session_secure
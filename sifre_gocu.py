@@ -0,0 +1,149 @@
+"""
+KPSS Quiz App - Şifre Göçü
+Düz metin şifreleri arka planda, partiler halinde bcrypt'e çevirir
+Kaldığı yer bir konum dosyasına yazılır; süreç yeniden başlarsa oradan devam eder
+Arka plan göçü yalnızca SQLite deposunda çalışır; JSON deposunda her parti tüm
+dosyayı yeniden yazdığı için göç komut satırından büyük partilerle yapılır
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Tuple
+from config import Config
+from depolama import dosya_kilidi, json_oku, json_yaz
+from kullanici_repo import kullanici_repo
+from sifre_havuzu import bcrypt_hash_mi, sifre_havuzu, SifreHavuzuMesgul
+
+
+class SifreGocu:
+    """
+    Kullanıcıları ada göre sıralı partiler halinde tarar, düz metin şifreleri hashler
+    Şifre bu arada değiştiyse (ör. kullanıcı giriş yapıp yeniden hashlendi) dokunmaz
+    Maliyet yükseltmesi şifrenin kendisini gerektirdiği için yalnızca girişte yapılır
+    """
+
+    def __init__(self, depo, konum_dosyasi: str = None, parti: int = None, aralik: float = None):
+        self.depo = depo
+        self.konum_dosyasi = konum_dosyasi or Config.SIFRE_GOCU_KONUM_DOSYA
+        self.arka_planda = not depo.tek_dosya
+        self.parti = parti or (Config.SIFRE_GOCU_PARTI if self.arka_planda else Config.SIFRE_GOCU_JSON_PARTI)
+        self.aralik = aralik if aralik is not None else Config.SIFRE_GOCU_ARALIK_SN
+        self._durdur = threading.Event()
+        self._thread = None
+        # Göç bittiyse her baslat() çağrısında konum dosyası yeniden okunmaz
+        self._bitti = False
+
+    # ===============================
+    # KONUM
+    # ===============================
+
+    def konum(self) -> Dict:
+        """{"son": son_kullanici, "taranan", "donusturulen", "bitti", "guncelleme"}"""
+        konum, _ = json_oku(self.konum_dosyasi, None)
+        return konum or {"son": "", "taranan": 0, "donusturulen": 0, "bitti": False, "guncelleme": None}
+
+    def sifirla(self):
+        """Taramayı baştan başlat"""
+        json_yaz(self.konum_dosyasi, None)
+        self._bitti = False
+
+    # ===============================
+    # PARTİ İŞLEME
+    # ===============================
+
+    def parti_isle(self) -> bool:
+        """
+        Sıradaki partiyi işle
+        Returns: daha işlenecek kullanıcı var mı
+        """
+        # Konum dosyasının kendi kilidini json_yaz kullandığı için işçi kilidi ayrı dosyadadır
+        with dosya_kilidi(self.konum_dosyasi + ".isci", bekle=False) as alindi:
+            if not alindi:
+                # Başka bir süreç aynı partiyi işliyor
+                return True
+
+            konum = self.konum()
+            if konum["bitti"]:
+                self._bitti = True
+                return False
+
+            satirlar = self.depo.sifre_parti(konum["son"], self.parti)
+            if not satirlar:
+                konum["bitti"] = True
+            else:
+                degisiklikler = {}
+                for kullanici_adi, sifre in satirlar:
+                    if sifre and not bcrypt_hash_mi(sifre):
+                        degisiklikler[kullanici_adi] = (sifre, sifre_havuzu.hashle(sifre))
+                if degisiklikler:
+                    konum["donusturulen"] += self.depo.sifreleri_guncelle(degisiklikler)
+                konum["son"] = satirlar[-1][0]
+                konum["taranan"] += len(satirlar)
+
+            konum["guncelleme"] = datetime.now().isoformat()
+            json_yaz(self.konum_dosyasi, konum)
+            self._bitti = konum["bitti"]
+            return not konum["bitti"]
+
+    def calistir(self) -> Tuple[int, int]:
+        """
+        Göçü bitene kadar çalıştır (komut satırından)
+        Returns: (dönüştürülen, taranan)
+        """
+        while self.parti_isle():
+            pass
+        konum = self.konum()
+        return konum["donusturulen"], konum["taranan"]
+
+    # ===============================
+    # ARKA PLAN
+    # ===============================
+
+    def _dongu(self):
+        while not self._durdur.is_set():
+            try:
+                if not self.parti_isle():
+                    return
+            except SifreHavuzuMesgul:
+                # Girişler yoğun; şifre havuzunu onlara bırak
+                pass
+            except Exception as e:
+                print(f"⚠️ Şifre göçü durdu, sonra devam edilecek: {e}")
+                return
+            self._durdur.wait(self.aralik)
+
+    def baslat(self):
+        """Göç bitmediyse arka plan thread'ini başlat (tekrar çağrılırsa bir şey yapmaz)"""
+        if not self.arka_planda or self._bitti:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.konum()["bitti"]:
+            self._bitti = True
+            return
+        self._durdur.clear()
+        self._thread = threading.Thread(target=self._dongu, name="sifre-gocu", daemon=True)
+        self._thread.start()
+
+    def durdur(self):
+        self._durdur.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Global şifre göçü instance
+sifre_gocu = SifreGocu(kullanici_repo)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Düz metin şifreleri bcrypt'e çevir")
+    parser.add_argument("--bastan", action="store_true", help="Kayıtlı konumu yok say, baştan tara")
+    args = parser.parse_args()
+
+    if args.bastan:
+        sifre_gocu.sifirla()
+    donusturulen, taranan = sifre_gocu.calistir()
+    print(f"✅ {taranan} kullanıcı tarandı, {donusturulen} şifre hashlendi")
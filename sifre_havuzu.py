@@ -0,0 +1,169 @@
+"""
+KPSS Quiz App - bcrypt İş Havuzu
+Şifre hashleme/doğrulama işlerini sınırlı bir thread havuzunda çalıştırır
+bcrypt hesaplama sırasında GIL'i bıraktığı için işler çekirdek sayısı kadar paralel yürür
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict
+
+import bcrypt
+from config import Config
+
+# Metrik penceresi: son N işin süreleri tutulur
+METRIK_PENCERESI = 500
+
+
+def bcrypt_hash_mi(sifre: str) -> bool:
+    """Kayıtlı değer bir bcrypt hash'i mi (değilse eski düz metin şifredir)"""
+    return sifre.startswith(("$2a$", "$2b$", "$2y$")) and len(sifre) == 60
+
+
+def hash_maliyeti(sifre: str) -> int:
+    """bcrypt hash'inin maliyet faktörü ($2b$12$... → 12)"""
+    try:
+        return int(sifre[4:6])
+    except ValueError:
+        return 0
+
+
+class SifreHavuzuMesgul(Exception):
+    """Kuyruk dolu ya da iş zaman aşımına uğradı; şifre yanlış demek değildir"""
+
+
+class _Sure:
+    """Bir işlem türü için süre istatistikleri (milisaniye)"""
+
+    def __init__(self):
+        self.adet = 0
+        self.son = deque(maxlen=METRIK_PENCERESI)
+
+    def ekle(self, ms: float):
+        self.adet += 1
+        self.son.append(ms)
+
+    def ozet(self) -> Dict:
+        if not self.son:
+            return {"adet": self.adet, "ort_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        sirali = sorted(self.son)
+        return {
+            "adet": self.adet,
+            "ort_ms": round(sum(sirali) / len(sirali), 1),
+            "p95_ms": round(sirali[min(len(sirali) - 1, int(len(sirali) * 0.95))], 1),
+            "max_ms": round(sirali[-1], 1),
+        }
+
+
+class SifreHavuzu:
+    """
+    bcrypt işleri için sınırlı havuz
+    En fazla isci_sayisi iş aynı anda çalışır, kuyruk_boyu kadar iş bekler;
+    daha fazlası hemen SifreHavuzuMesgul ile reddedilir
+    """
+
+    def __init__(self, isci_sayisi: int = None, kuyruk_boyu: int = None,
+                 zaman_asimi: float = None, rounds: int = None):
+        self.isci_sayisi = isci_sayisi or Config.BCRYPT_ISCI_SAYISI
+        self.kuyruk_boyu = kuyruk_boyu if kuyruk_boyu is not None else Config.BCRYPT_KUYRUK_BOYU
+        self.zaman_asimi = zaman_asimi or Config.BCRYPT_ZAMAN_ASIMI_SN
+        self.rounds = rounds or Config.BCRYPT_ROUNDS
+
+        self._havuz = ThreadPoolExecutor(max_workers=self.isci_sayisi, thread_name_prefix="bcrypt")
+        self._yer = threading.BoundedSemaphore(self.isci_sayisi + self.kuyruk_boyu)
+        self._kilit = threading.Lock()
+        self._bekleyen = 0
+        self._reddedilen = 0
+        self._metrikler = {"bekleme": _Sure(), "hashle": _Sure(), "dogrula": _Sure()}
+
+    def _calistir(self, tur: str, fonksiyon, *args):
+        if not self._yer.acquire(blocking=False):
+            with self._kilit:
+                self._reddedilen += 1
+            raise SifreHavuzuMesgul("Şifre işlemleri kuyruğu dolu")
+
+        kuyruga_girdi = time.perf_counter()
+
+        def is_():
+            basladi = time.perf_counter()
+            try:
+                return fonksiyon(*args)
+            finally:
+                bitti = time.perf_counter()
+                with self._kilit:
+                    self._bekleyen -= 1
+                    self._metrikler["bekleme"].ekle((basladi - kuyruga_girdi) * 1000)
+                    self._metrikler[tur].ekle((bitti - basladi) * 1000)
+                self._yer.release()
+
+        with self._kilit:
+            self._bekleyen += 1
+        try:
+            gelecek = self._havuz.submit(is_)
+        except RuntimeError:
+            # Havuz kapatılmış
+            self._yer_birak()
+            raise SifreHavuzuMesgul("Şifre havuzu kapatıldı") from None
+        try:
+            return gelecek.result(timeout=self.zaman_asimi)
+        except CancelledError:
+            # Havuz kapatılırken kuyruktaki iş iptal edildi
+            self._yer_birak()
+            raise SifreHavuzuMesgul("Şifre havuzu kapatıldı") from None
+        except FuturesTimeoutError:
+            # Kuyrukta bekleyen iş iptal edilir; çalışmaya başlamış iş bitince yerini kendisi bırakır
+            if gelecek.cancel():
+                self._yer_birak()
+            else:
+                with self._kilit:
+                    self._reddedilen += 1
+            raise SifreHavuzuMesgul("Şifre işlemi zaman aşımına uğradı") from None
+
+    def _yer_birak(self):
+        """Hiç çalışmayan işin kuyruk yerini geri ver"""
+        with self._kilit:
+            self._reddedilen += 1
+            self._bekleyen -= 1
+        self._yer.release()
+
+    # ===============================
+    # HASHLEME / DOĞRULAMA
+    # ===============================
+
+    def hashle(self, sifre: str) -> str:
+        """Şifreyi Config.BCRYPT_ROUNDS maliyetiyle hashle"""
+        def hesapla():
+            return bcrypt.hashpw(sifre.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds)).decode("utf-8")
+        return self._calistir("hashle", hesapla)
+
+    def dogrula(self, sifre: str, hashli_sifre: str) -> bool:
+        """Şifre hash ile eşleşiyor mu (bozuk hash False döner)"""
+        def hesapla():
+            try:
+                return bcrypt.checkpw(sifre.encode("utf-8"), hashli_sifre.encode("utf-8"))
+            except ValueError:
+                return False
+        return self._calistir("dogrula", hesapla)
+
+    # ===============================
+    # METRİKLER
+    # ===============================
+
+    def istatistikler(self) -> Dict:
+        with self._kilit:
+            return {
+                "isci_sayisi": self.isci_sayisi,
+                "kuyruk_boyu": self.kuyruk_boyu,
+                "bekleyen": self._bekleyen,
+                "reddedilen": self._reddedilen,
+                **{tur: sure.ozet() for tur, sure in self._metrikler.items()},
+            }
+
+    def kapat(self):
+        self._havuz.shutdown(wait=False, cancel_futures=True)
+
+
+# Global şifre havuzu instance
+sifre_havuzu = SifreHavuzu()
@@ -0,0 +1,233 @@
+"""
+KPSS Quiz App - Sonuç Günlüğü
+Bitirilen her test için tek satırlık, yalnızca sona eklenen (append-only) kayıt
+ve bu kayıtları kullanıcı sonuçlarına işleyen arka plan sıkıştırıcısı
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from arka_plan_yazici import ArkaPlanYazici
+from config import Config
+from depolama import atomik_yaz, dosya_kilidi
+from kullanici_repo import kullanici_repo
+
+# Sıkıştırıcının her segmentte kaldığı yer
+KONUM_DOSYASI = "_konum.json"
+
+
+# ===============================
+# GÜNLÜK (YAZMA / OKUMA)
+# ===============================
+
+class SonucGunlugu:
+    """
+    Aylık segment dosyalarına (YYYY-MM.jsonl) satır ekleyen sonuç günlüğü
+    Her kayıt tek bir os.write ile eklenir, fsync toplu yapılır
+    """
+
+    def __init__(self, klasor: str = None, fsync_adet: int = None, fsync_aralik: float = None):
+        self.klasor = klasor or Config.SONUC_GUNLUGU_KLASORU
+        self.fsync_adet = fsync_adet or Config.GUNLUK_FSYNC_ADET
+        self.fsync_aralik = fsync_aralik or Config.GUNLUK_FSYNC_ARALIK_SN
+        os.makedirs(self.klasor, exist_ok=True)
+
+        self._kilit = threading.Lock()
+        self._fd = None
+        self._segment = None
+        self._bekleyen = 0
+        self._son_fsync = time.monotonic()
+        self._zamanlayici = None
+
+    @staticmethod
+    def segment_adi(zaman: datetime) -> str:
+        return zaman.strftime("%Y-%m") + ".jsonl"
+
+    def segmentler(self) -> List[str]:
+        """Segment dosya adları (eskiden yeniye)"""
+        return sorted(
+            ad for ad in os.listdir(self.klasor)
+            if ad.endswith(".jsonl")
+        )
+
+    def _fd_al(self, segment: str) -> int:
+        if self._fd is not None and segment != self._segment:
+            self._fsync()
+            os.close(self._fd)
+            self._fd = None
+        if self._fd is None:
+            yol = os.path.join(self.klasor, segment)
+            self._fd = os.open(yol, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._segment = segment
+        return self._fd
+
+    def _fsync(self):
+        if self._fd is not None and self._bekleyen:
+            os.fsync(self._fd)
+        self._bekleyen = 0
+        self._son_fsync = time.monotonic()
+
+    def _zamanlanmis_fsync(self):
+        with self._kilit:
+            self._zamanlayici = None
+            self._fsync()
+
+    def ekle(self, kullanici: str, ders: str, konu: str, test_no: int,
+             dogru: int, yanlis: int, zaman: Optional[datetime] = None):
+        """Bitirilen testi günlüğe ekle (O(1), başka kullanıcıları beklemez)"""
+        zaman = zaman or datetime.now()
+        satir = json.dumps(
+            {
+                "kullanici": kullanici,
+                "ders": ders,
+                "konu": konu,
+                "test_no": test_no,
+                "dogru": dogru,
+                "yanlis": yanlis,
+                "zaman": zaman.isoformat(timespec="seconds"),
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ) + "\n"
+
+        with self._kilit:
+            fd = self._fd_al(self.segment_adi(zaman))
+            os.write(fd, satir.encode("utf-8"))
+            self._bekleyen += 1
+
+            if (self._bekleyen >= self.fsync_adet
+                    or time.monotonic() - self._son_fsync >= self.fsync_aralik):
+                self._fsync()
+            elif self._zamanlayici is None:
+                # Sessiz dönemlerde de kayıtlar en geç fsync_aralik içinde diske iner
+                self._zamanlayici = threading.Timer(self.fsync_aralik, self._zamanlanmis_fsync)
+                self._zamanlayici.daemon = True
+                self._zamanlayici.start()
+
+    def kapat(self):
+        with self._kilit:
+            if self._zamanlayici is not None:
+                self._zamanlayici.cancel()
+                self._zamanlayici = None
+            self._fsync()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def oku(self, segment: str, baslangic: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Segmenti baslangic ofsetinden itibaren oku
+        Yarım kalmış son satır okunmaz
+        Returns: (kayıtlar, yeni_ofset)
+        """
+        yol = os.path.join(self.klasor, segment)
+        with open(yol, "rb") as f:
+            f.seek(baslangic)
+            veri = f.read()
+
+        son = veri.rfind(b"\n")
+        if son < 0:
+            return [], baslangic
+
+        kayitlar = []
+        for satir in veri[:son].split(b"\n"):
+            if satir.strip():
+                kayitlar.append(json.loads(satir))
+        return kayitlar, baslangic + son + 1
+
+    def tum_kayitlar(self) -> Iterator[Dict]:
+        """Geçmişin tamamı (analiz için)"""
+        for segment in self.segmentler():
+            kayitlar, _ = self.oku(segment)
+            yield from kayitlar
+
+
+# ===============================
+# SIKIŞTIRICI
+# ===============================
+
+class GunlukSikistirici:
+    """
+    Günlükteki yeni kayıtları kullanıcı deposundaki sonuclar yapısına işler
+    Kayıtlar mutlak test sonuçları olduğu için tekrar işlenmeleri zararsızdır
+    """
+
+    def __init__(self, gunluk: SonucGunlugu, depo, aralik: float = None):
+        self.gunluk = gunluk
+        self.depo = depo
+        self.aralik = aralik or Config.GUNLUK_SIKISTIRMA_ARALIK_SN
+        self._konum_yolu = os.path.join(gunluk.klasor, KONUM_DOSYASI)
+        self._kilit = threading.Lock()
+        self._yazici = ArkaPlanYazici(
+            "gunluk-sikistirici", self.calistir, self.aralik, "Sonuç günlüğü sıkıştırılamadı"
+        )
+
+    def _konum_oku(self) -> Dict[str, int]:
+        try:
+            with open(self._konum_yolu, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _konum_yaz(self, konum: Dict[str, int]):
+        atomik_yaz(self._konum_yolu, json.dumps(konum).encode("utf-8"))
+
+    def _yeni_kayitlar(self, konum: Dict[str, int]) -> Tuple[List[Dict], Dict[str, int]]:
+        yeni_konum = dict(konum)
+        kayitlar = []
+        for segment in self.gunluk.segmentler():
+            ofset = konum.get(segment, 0)
+            if os.path.getsize(os.path.join(self.gunluk.klasor, segment)) <= ofset:
+                continue
+            parca, yeni_konum[segment] = self.gunluk.oku(segment, ofset)
+            kayitlar.extend(parca)
+        return kayitlar, yeni_konum
+
+    def konum(self) -> Dict[str, int]:
+        """Segment → depoya işlenmiş son ofset"""
+        return self._konum_oku()
+
+    def bekleyen_kayitlar(self, kullanici: str) -> List[Dict]:
+        """Henüz sıkıştırılmamış, kullanıcıya ait kayıtlar"""
+        kayitlar, _ = self._yeni_kayitlar(self._konum_oku())
+        return [k for k in kayitlar if k["kullanici"] == kullanici]
+
+    def calistir(self) -> int:
+        """
+        Tek sıkıştırma turu
+        Returns: işlenen kayıt sayısı
+        """
+        with self._kilit, dosya_kilidi(self._konum_yolu, bekle=False) as alindi:
+            if not alindi:
+                # Başka bir süreç zaten sıkıştırıyor
+                return 0
+
+            konum = self._konum_oku()
+            kayitlar, yeni_konum = self._yeni_kayitlar(konum)
+            if kayitlar:
+                self.depo.test_sonuclarini_uygula(kayitlar)
+            if yeni_konum != konum:
+                self._konum_yaz(yeni_konum)
+            return len(kayitlar)
+
+    def baslat(self):
+        """Arka plan sıkıştırma thread'ini başlat (tekrar çağrılırsa bir şey yapmaz)"""
+        self._yazici.baslat()
+
+    def durdur(self):
+        self._yazici.durdur()
+
+
+# Global sonuç günlüğü ve sıkıştırıcı instance'ları
+sonuc_gunlugu = SonucGunlugu()
+gunluk_sikistirici = GunlukSikistirici(sonuc_gunlugu, kullanici_repo)
+atexit.register(sonuc_gunlugu.kapat)
+
+
+if __name__ == "__main__":
+    islenen = gunluk_sikistirici.calistir()
+    print(f"✅ {islenen} kayıt kullanıcı sonuçlarına işlendi")
@@ -1,17 +1,420 @@
+import hashlib
 import json
 import os
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import MutableMapping
+from depolama import (
+    atomik_yaz, dosya_kilidi, json_oku, json_yaz, versiyon,
+    BozukDosyaHatasi, VersiyonCakismasi
+)
+from soru_modeli import bankayi_duzle, soru_sozlugu, sorulari_yukle
 
 SORU_DOSYA = "soru_bankasi.json"
 
-def soru_bankasini_yukle():
-    if not os.path.exists(SORU_DOSYA):
-        with open(SORU_DOSYA, "w", encoding="utf-8") as f:
-            json.dump({}, f)
+# Parçalı format: küçük bir manifest + her konu için ayrı dosya
+PARCA_KLASORU = "soru_parcalari"
+MANIFEST_ADI = "manifest.json"
+
+# Bir testteki soru sayısı
+SORU_GRUBU_SAYISI = 5
+
+# Dosya değişikliği kontrolü için en kısa aralık (saniye)
+YENILEME_ARALIGI_SN = 2.0
+
+
+# ===============================
+# PARÇALI FORMAT
+# ===============================
+
+def _parca_bayt(sorular: list) -> bytes:
+    return json.dumps([soru_sozlugu(s) for s in sorular], ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def parca_adi(ders: str, konu: str, ozet: str) -> str:
+    """Konu parçasının dosya adı; içerik özeti ada dahildir (eski parça yazılırken bozulmaz)"""
+    konu_anahtari = hashlib.sha1(f"{ders}\x00{konu}".encode("utf-8")).hexdigest()[:12]
+    return f"{konu_anahtari}-{ozet[:12]}.json"
+
+
+class TembelKonular(MutableMapping):
+    """
+    Bir dersin konu → soru listesi eşlemesi
+    Konu adları ve soru sayıları manifestten gelir; sorular ilk erişimde okunur
+    """
+
+    def __init__(self, klasor: str, ders: str, manifest_konular: dict):
+        self._klasor = klasor
+        self._ders = ders
+        self._meta = dict(manifest_konular)
+        self._yuklu = {}
+        self._kilit = threading.Lock()
+
+    def _parca_oku(self, konu: str) -> list:
+        meta = self._meta[konu]
+        with open(os.path.join(self._klasor, meta["dosya"]), "rb") as f:
+            icerik = f.read()
+        if hashlib.sha256(icerik).hexdigest() != meta["sha256"]:
+            raise BozukDosyaHatasi(f"{meta['dosya']} sağlama toplamı tutmuyor ({self._ders} / {konu})")
+        return sorulari_yukle(json.loads(icerik))
+
+    def __getitem__(self, konu: str) -> list:
+        sorular = self._yuklu.get(konu)
+        if sorular is not None:
+            return sorular
+        if self._meta.get(konu) is None:
+            raise KeyError(konu)
+        with self._kilit:
+            if konu not in self._yuklu:
+                self._yuklu[konu] = self._parca_oku(konu)
+            return self._yuklu[konu]
+
+    def __setitem__(self, konu: str, sorular: list):
+        self._yuklu[konu] = sorular
+        self._meta.setdefault(konu, None)
+
+    def __delitem__(self, konu: str):
+        del self._meta[konu]
+        self._yuklu.pop(konu, None)
+
+    def __contains__(self, konu) -> bool:
+        return konu in self._meta
+
+    def __iter__(self):
+        return iter(list(self._meta))
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def adet(self, konu: str) -> int:
+        """Soru sayısı (konu yüklenmeden)"""
+        if konu in self._yuklu:
+            return len(self._yuklu[konu])
+        return self._meta[konu]["adet"]
+
+    def yuklu_mu(self, konu: str) -> bool:
+        return konu in self._yuklu
+
+    def meta(self, konu: str):
+        return self._meta.get(konu)
+
+    def meta_guncelle(self, konu: str, meta: dict):
+        self._meta[konu] = meta
+
+    def kopya(self) -> "TembelKonular":
+        """Aynı parça dosyalarını ve yüklü listeleri paylaşan bağımsız eşleme"""
+        yeni = TembelKonular(self._klasor, self._ders, self._meta)
+        yeni._yuklu = dict(self._yuklu)
+        return yeni
+
+
+def konu_degistir(veri: dict, ders: str, konu: str, sorular: list) -> dict:
+    """
+    Yalnızca ders/konu'nun soru listesi değişmiş sığ kopya
+    Paylaşılan banka, kopya kaydedilip yüklenene kadar değişmez
+    """
+    konular = veri.get(ders)
+    if isinstance(konular, TembelKonular):
+        konular = konular.kopya()
+    else:
+        konular = dict(konular or {})
+    konular[konu] = sorular
+    return {**veri, ders: konular}
+
+
+def _konu_adedi(konular, konu: str) -> int:
+    if isinstance(konular, TembelKonular):
+        return konular.adet(konu)
+    return len(konular[konu])
+
+
+def parcali_yukle(klasor: str = PARCA_KLASORU):
+    """
+    Yalnızca manifesti oku; konu dosyaları gerektiğinde yüklenir
+    Returns: (ders → TembelKonular, manifest_versiyonu)
+    """
+    manifest, ver = json_oku(os.path.join(klasor, MANIFEST_ADI), None)
+    if manifest is None:
+        return {}, None
+    veri = {
+        ders: TembelKonular(klasor, ders, konular)
+        for ders, konular in manifest.get("dersler", {}).items()
+    }
+    return veri, ver
+
+
+def parcali_kaydet(veri: dict, klasor: str = PARCA_KLASORU,
+                   beklenen_versiyon: str = None, kontrol: bool = False) -> str:
+    """
+    Yalnızca değişen konu dosyalarını ve manifesti yaz
+    Returns: yeni manifest versiyonu
+    """
+    os.makedirs(klasor, exist_ok=True)
+    manifest_yolu = os.path.join(klasor, MANIFEST_ADI)
+
+    with dosya_kilidi(manifest_yolu):
+        if kontrol and versiyon(manifest_yolu) != beklenen_versiyon:
+            raise VersiyonCakismasi(f"{manifest_yolu} başka bir oturum tarafından değiştirildi")
+
+        dersler = {}
+        for ders, konular in veri.items():
+            dersler[ders] = {}
+            for konu in konular:
+                meta = konular.meta(konu) if isinstance(konular, TembelKonular) else None
+                if meta is not None and not konular.yuklu_mu(konu):
+                    # Hiç açılmamış konu değişmemiştir
+                    dersler[ders][konu] = meta
+                    continue
+
+                sorular = konular[konu]
+                icerik = _parca_bayt(sorular)
+                ozet = hashlib.sha256(icerik).hexdigest()
+                if meta is None or meta["sha256"] != ozet:
+                    meta = {"dosya": parca_adi(ders, konu, ozet), "adet": len(sorular), "sha256": ozet}
+                    atomik_yaz(os.path.join(klasor, meta["dosya"]), icerik)
+                    if isinstance(konular, TembelKonular):
+                        konular.meta_guncelle(konu, meta)
+                dersler[ders][konu] = meta
+
+        atomik_yaz(
+            manifest_yolu,
+            json.dumps({"dersler": dersler}, ensure_ascii=False, indent=2).encode("utf-8"),
+        )
+
+        # Artık manifestte olmayan eski parçaları temizle
+        kullanilan = {m["dosya"] for konular in dersler.values() for m in konular.values()}
+        for ad in os.listdir(klasor):
+            if ad.endswith(".json") and ad != MANIFEST_ADI and ad not in kullanilan:
+                os.remove(os.path.join(klasor, ad))
+
+        return versiyon(manifest_yolu)
+
+
+def json_dan_parcala(kaynak: str = SORU_DOSYA, klasor: str = PARCA_KLASORU) -> int:
+    """
+    Tek dosyalık soru bankasını parçalı formata çevir
+    Returns: konu sayısı
+    """
+    veri, _ = json_oku(kaynak, {})
+    parcali_kaydet(veri, klasor)
+    return sum(len(k) for k in veri.values())
+
+
+def parcalardan_json(klasor: str = PARCA_KLASORU, hedef: str = SORU_DOSYA) -> int:
+    """
+    Parçalı formatı tek dosyalık soru bankasına geri çevir
+    Returns: konu sayısı
+    """
+    veri, _ = parcali_yukle(klasor)
+    tam = {ders: {konu: konular[konu] for konu in konular} for ders, konular in veri.items()}
+    json_yaz(hedef, bankayi_duzle(tam))
+    return sum(len(k) for k in tam.values())
+
 
-    with open(SORU_DOSYA, "r", encoding="utf-8") as f:
-        return json.load(f)
+# ===============================
+# İNDEKS
+# ===============================
+
+class _SoruIndeksi:
+    """Soru bankasının salt okunur, önceden hesaplanmış görünümü"""
+
+    __slots__ = ("veri", "dersler", "konular", "sayilar", "testler", "offsetler",
+                 "ders_sayilari", "toplam_soru", "toplam_konu")
+
+    def __init__(self, veri: dict):
+        self.veri = veri
+        self.dersler = tuple(veri.keys())
+        self.konular = {}
+        self.sayilar = {}
+        self.testler = {}
+        self.offsetler = {}
+        self.ders_sayilari = {}
+
+        for ders, konular in veri.items():
+            self.konular[ders] = tuple(konular.keys())
+            ders_toplam = 0
+            for konu in konular:
+                adet = _konu_adedi(konular, konu)
+                self.sayilar[(ders, konu)] = adet
+                self.offsetler[(ders, konu)] = tuple(range(0, adet, SORU_GRUBU_SAYISI))
+                ders_toplam += adet
+            self.ders_sayilari[ders] = ders_toplam
+
+        self.toplam_soru = sum(self.ders_sayilari.values())
+        self.toplam_konu = sum(len(k) for k in self.konular.values())
+
+    def test_listesi(self, ders: str, konu: str) -> tuple:
+        """Konunun test dilimleri (konu ilk kez açıldığında hesaplanır)"""
+        testler = self.testler.get((ders, konu))
+        if testler is None:
+            sorular = self.veri[ders][konu]
+            testler = tuple(
+                tuple(sorular[b:b + SORU_GRUBU_SAYISI]) for b in self.offsetler[(ders, konu)]
+            )
+            self.testler[(ders, konu)] = testler
+        return testler
+
+
+# ===============================
+# PAYLAŞILAN SORU DEPOSU
+# ===============================
+
+class SoruBankasiDeposu:
+    """
+    Süreç genelinde tek kopya soru bankası.
+    Dosya bir kez okunur, tüm oturumlar aynı (salt okunur) veriyi paylaşır.
+    Parçalı format varsa (soru_parcalari/manifest.json) konular gerektikçe yüklenir.
+    """
+
+    def __init__(self, dosya: str = SORU_DOSYA, parca_klasoru: str = PARCA_KLASORU):
+        self.dosya = dosya
+        self.parca_klasoru = parca_klasoru
+        self._kilit = threading.Lock()
+        self._indeks = None
+        self.versiyon = None
+        self._son_kontrol = 0.0
+
+    @property
+    def parcali(self) -> bool:
+        return os.path.exists(os.path.join(self.parca_klasoru, MANIFEST_ADI))
+
+    def _izlenen_dosya(self) -> str:
+        if self.parcali:
+            return os.path.join(self.parca_klasoru, MANIFEST_ADI)
+        return self.dosya
+
+    def _dosyadan_oku(self):
+        if self.parcali:
+            return parcali_yukle(self.parca_klasoru)
+
+        veri, ver = json_oku(self.dosya, None)
+        if veri is None:
+            ver = json_yaz(self.dosya, {})
+            veri = {}
+        veri = {
+            ders: {konu: sorulari_yukle(sorular) for konu, sorular in konular.items()}
+            for ders, konular in veri.items()
+        }
+        return veri, ver
+
+    def _indeks_al(self) -> _SoruIndeksi:
+        """Geçerli indeksi döndür; dosya başka süreçte değiştiyse yeniden yükle"""
+        indeks = self._indeks
+        simdi = time.monotonic()
+        if indeks is not None and simdi - self._son_kontrol < YENILEME_ARALIGI_SN:
+            return indeks
+
+        with self._kilit:
+            self._son_kontrol = simdi
+            if self._indeks is None or versiyon(self._izlenen_dosya()) != self.versiyon:
+                veri, self.versiyon = self._dosyadan_oku()
+                self._indeks = _SoruIndeksi(veri)
+            return self._indeks
+
+    def yenile(self, veri: dict = None, ver: str = None):
+        """İndeksi yeniden oluştur (veri verilmezse dosyadan okunur)"""
+        with self._kilit:
+            if veri is None:
+                veri, ver = self._dosyadan_oku()
+            self._indeks = _SoruIndeksi(veri)
+            self.versiyon = ver
+            self._son_kontrol = time.monotonic()
+
+    def kaydet(self, veri: dict):
+        """
+        Bankayı mevcut formatta atomik olarak kaydet
+        Dosya son okumadan beri başka bir oturumda değiştiyse VersiyonCakismasi fırlatır
+        """
+        if self.parcali:
+            ver = parcali_kaydet(veri, self.parca_klasoru, self.versiyon, kontrol=True)
+        else:
+            ver = json_yaz(self.dosya, bankayi_duzle(veri), beklenen_versiyon=self.versiyon, kontrol=True)
+        self.yenile(veri, ver)
+
+    # ===============================
+    # SORGULAR
+    # ===============================
+
+    def veri(self) -> dict:
+        """Ham ders → konu → soru listesi eşlemesi (paylaşılır, kopyalanmaz)"""
+        return self._indeks_al().veri
+
+    def ders_listesi(self) -> tuple:
+        return self._indeks_al().dersler
+
+    def konu_listesi(self, ders: str) -> tuple:
+        return self._indeks_al().konular.get(ders, ())
+
+    def sorular(self, ders: str, konu: str) -> list:
+        indeks = self._indeks_al()
+        if (ders, konu) not in indeks.sayilar:
+            return []
+        return indeks.veri[ders][konu]
+
+    def soru_sayisi(self, ders: str, konu: str) -> int:
+        return self._indeks_al().sayilar.get((ders, konu), 0)
+
+    def ders_soru_sayisi(self, ders: str) -> int:
+        return self._indeks_al().ders_sayilari.get(ders, 0)
+
+    def toplam_soru_sayisi(self) -> int:
+        return self._indeks_al().toplam_soru
+
+    def toplam_konu_sayisi(self) -> int:
+        return self._indeks_al().toplam_konu
+
+    def test_sayisi(self, ders: str, konu: str) -> int:
+        return len(self._indeks_al().offsetler.get((ders, konu), ()))
+
+    def test_baslangici(self, ders: str, konu: str, test_no: int) -> int:
+        """Testin konudaki ilk sorusunun sırası (test_no 1'den başlar)"""
+        return self._indeks_al().offsetler[(ders, konu)][test_no - 1]
+
+    def test_no_bul(self, ders: str, konu: str, sira: int) -> int:
+        """Konudaki sira'ncı sorunun bulunduğu test (1'den başlar)"""
+        return bisect_right(self._indeks_al().offsetler[(ders, konu)], sira)
+
+    def test_sorulari(self, ders: str, konu: str, test_no: int) -> tuple:
+        """Testteki soruları döndür (test_no 1'den başlar)"""
+        return self._indeks_al().test_listesi(ders, konu)[test_no - 1]
+
+
+# Global soru deposu instance
+soru_deposu = SoruBankasiDeposu()
+
+
+def soru_bankasini_yukle():
+    """Paylaşılan soru bankasını döndür (dosya süreç başına bir kez okunur)"""
+    return soru_deposu.veri()
 
 def soru_bankasini_kaydet(data):
-    with open(SORU_DOSYA, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """
+    Soru bankasını atomik olarak kaydet
+    Dosya son okumadan beri başka bir oturumda değiştiyse VersiyonCakismasi fırlatır
+    """
+    soru_deposu.kaydet(data)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Soru bankası format dönüştürücü")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    p = alt.add_parser("parcala", help="soru_bankasi.json → manifest + konu dosyaları")
+    p.add_argument("--kaynak", default=SORU_DOSYA)
+    p.add_argument("--klasor", default=PARCA_KLASORU)
+
+    b = alt.add_parser("birlestir", help="manifest + konu dosyaları → soru_bankasi.json")
+    b.add_argument("--klasor", default=PARCA_KLASORU)
+    b.add_argument("--hedef", default=SORU_DOSYA)
 
+    args = parser.parse_args()
+    if args.komut == "parcala":
+        adet = json_dan_parcala(args.kaynak, args.klasor)
+        print(f"✅ {adet} konu {args.klasor}/ klasörüne yazıldı")
+        print(f"💡 {args.klasor}/{MANIFEST_ADI} varken uygulama parçalı formatı kullanır")
+    else:
+        adet = parcalardan_json(args.klasor, args.hedef)
+        print(f"✅ {adet} konu {args.hedef} dosyasına yazıldı")
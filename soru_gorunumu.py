@@ -0,0 +1,91 @@
+"""
+KPSS Quiz App - Soru Görünüm Modeli
+Soru sayfasında her tıklamada yeniden üretilen metinler (maddeler, "A) ..." seçenek
+etiketleri, doğru/yanlış ve çözüm mesajları) soru başına bir kez hazırlanıp önbelleğe alınır
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from config import Config
+from soru_modeli import Soru
+
+# Resim alanında "resim yok" anlamına gelen değerler
+_BOS_RESIM = ("", "Yok")
+
+
+def soru_kimligi(soru: Soru) -> Tuple:
+    """
+    Sorunun kimliği ve içeriği; soru düzenlenince anahtar da değişir
+    Alanlar paylaşılan/intern edilmiş str ve tuple'lardır (hash'leri önbellekli),
+    bu yüzden anahtarı üretmek ve karşılaştırmak metinleri yeniden işlemez
+    """
+    return (
+        soru.id,
+        soru.soru,
+        soru.maddeler,
+        soru.secenekler.harfler,
+        soru.secenekler.metinler,
+        soru.dogru_cevap,
+        soru.cozum,
+        soru.soru_resmi or soru.get("resim"),
+    )
+
+
+class SoruGorunumu:
+    """Bir sorunun ekrana basılmaya hazır parçaları"""
+
+    __slots__ = ("resim", "metin", "maddeler", "harfler", "etiketler",
+                 "dogru_cevap", "yanlis_mesaji", "cozum_mesaji")
+
+    def __init__(self, soru: Soru):
+        resim = soru.soru_resmi or soru.get("resim")
+        self.resim: Optional[str] = resim if resim not in _BOS_RESIM else None
+        self.metin: str = soru.soru
+        self.maddeler: Tuple[str, ...] = tuple(
+            f"<div style='margin:2px 0'>{madde}</div>" for madde in soru.maddeler or ()
+        )
+        self.harfler: Tuple[str, ...] = soru.secenekler.harfler
+        self.etiketler: Dict[str, str] = {h: f"{h}) {m}" for h, m in soru.secenekler.items()}
+        self.dogru_cevap: str = soru.dogru_cevap
+        self.yanlis_mesaji: str = (
+            f"❌ Yanlış! Doğru Cevap: {soru.dogru_cevap}) {soru.secenekler.get(soru.dogru_cevap, '')}"
+        )
+        self.cozum_mesaji: str = f"**Çözüm:** {soru.cozum}"
+
+
+class GorunumOnbellegi:
+    """
+    soru_kimligi → SoruGorunumu (LRU)
+    Süreç genelinde paylaşılır; aynı soruyu açan tüm öğrenciler aynı görünümü kullanır
+    """
+
+    def __init__(self, boyut: int = None):
+        self.boyut = boyut or Config.SORU_GORUNUM_ONBELLEK
+        self._gorunumler: "OrderedDict[Tuple, SoruGorunumu]" = OrderedDict()
+        self._kilit = threading.Lock()
+
+        # İstatistikler
+        self.isabet = 0
+        self.iska = 0
+
+    def al(self, soru: Soru) -> SoruGorunumu:
+        anahtar = soru_kimligi(soru)
+        with self._kilit:
+            gorunum = self._gorunumler.get(anahtar)
+            if gorunum is not None:
+                self._gorunumler.move_to_end(anahtar)
+                self.isabet += 1
+                return gorunum
+            self.iska += 1
+
+        gorunum = SoruGorunumu(soru)
+        with self._kilit:
+            self._gorunumler[anahtar] = gorunum
+            while len(self._gorunumler) > self.boyut:
+                self._gorunumler.popitem(last=False)
+        return gorunum
+
+
+# Global görünüm önbelleği instance
+soru_gorunumleri = GorunumOnbellegi()
@@ -0,0 +1,284 @@
+"""
+KPSS Quiz App - Soru İstatistikleri (Madde Analizi)
+Her sorunun deneme, doğru, şık dağılımı (A–E) ve cevaplama süresi sayaçları tutulur
+Biten testin cevapları bellekte birleştirilip arka planda toplu yazılır (tek işlemde UPSERT)
+Sayaçlar toplanabilir olduğundan güçlük (p), ayırt edicilik ve çeldirici kullanımı
+geçmiş taranmadan sayaçlardan hesaplanır
+"""
+
+import atexit
+import hashlib
+import math
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from arka_plan_yazici import ArkaPlanYazici
+from config import Config
+from kullanici_deposu import baglanti_ac
+from soru_modeli import Soru
+
+HARFLER = ("A", "B", "C", "D", "E")
+
+# Toplanabilir sayaçlar (sıra SQL sütunlarıyla aynı)
+SAYACLAR = (
+    "deneme", "dogru",
+    "secim_a", "secim_b", "secim_c", "secim_d", "secim_e",
+    "sure_adet", "sure_toplam",
+    # Ayırt edicilik için: cevaplayanın testin kalanındaki başarısı (0-1)
+    "puan_adet", "puan_toplam", "puan_kare", "puan_dogru_adet", "puan_dogru_toplam",
+)
+_ONDALIKLI = {"sure_toplam", "puan_toplam", "puan_kare", "puan_dogru_toplam"}
+
+SEMA = f"""
+CREATE TABLE IF NOT EXISTS soru_istatistikleri (
+    anahtar     TEXT PRIMARY KEY,
+    ders        TEXT NOT NULL,
+    konu        TEXT NOT NULL,
+    ozet        TEXT NOT NULL,
+    dogru_cevap TEXT NOT NULL,
+    {", ".join(f"{s} {'REAL' if s in _ONDALIKLI else 'INTEGER'} NOT NULL DEFAULT 0" for s in SAYACLAR)}
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS soru_istatistikleri_konu ON soru_istatistikleri(ders, konu);
+"""
+
+_UPSERT = (
+    f"INSERT INTO soru_istatistikleri (anahtar, ders, konu, ozet, dogru_cevap, {', '.join(SAYACLAR)}) "
+    f"VALUES ({', '.join('?' * (5 + len(SAYACLAR)))}) "
+    f"ON CONFLICT(anahtar) DO UPDATE SET ders = excluded.ders, konu = excluded.konu, ozet = excluded.ozet, "
+    + ", ".join(f"{s} = {s} + excluded.{s}" for s in SAYACLAR)
+)
+
+
+def soru_anahtari(soru: Soru) -> str:
+    """
+    Soru kimliği; kimliği olmayan sorularda metin, şıklar ve cevap anahtarının özeti
+    Cevap anahtarı düzeltilen soru yeni bir madde sayılır (eski sayaçlar yanlış anahtarla tutuldu)
+    """
+    if soru.id:
+        return str(soru.id)
+    icerik = "\x1f".join((soru.soru, *soru.secenekler.harfler, *soru.secenekler.metinler, soru.dogru_cevap))
+    return hashlib.sha1(icerik.encode("utf-8")).hexdigest()[:20]
+
+
+def madde_analizi(satir: Dict) -> Dict:
+    """
+    Sayaçlardan madde analizi:
+    p (güçlük: doğru oranı), ayirt (nokta çift serili korelasyon; cevaplayanın testin
+    kalanındaki başarısıyla), çeldirici oranları ve ortalama süre
+    """
+    deneme = satir["deneme"]
+    p = satir["dogru"] / deneme if deneme else None
+
+    ayirt = None
+    n, n1 = satir["puan_adet"], satir["puan_dogru_adet"]
+    if 0 < n1 < n:
+        ortalama = satir["puan_toplam"] / n
+        varyans = satir["puan_kare"] / n - ortalama * ortalama
+        if varyans > 1e-12:
+            m1 = satir["puan_dogru_toplam"] / n1
+            m0 = (satir["puan_toplam"] - satir["puan_dogru_toplam"]) / (n - n1)
+            oran = n1 / n
+            ayirt = (m1 - m0) / math.sqrt(varyans) * math.sqrt(oran * (1 - oran))
+
+    secimler = {h: satir[f"secim_{h.lower()}"] for h in HARFLER}
+    celdiriciler = {
+        h: (adet / deneme if deneme else 0.0)
+        for h, adet in secimler.items() if h != satir["dogru_cevap"]
+    }
+    return {
+        "p": p,
+        "ayirt": ayirt,
+        "celdiriciler": celdiriciler,
+        "ortalama_sure": satir["sure_toplam"] / satir["sure_adet"] if satir["sure_adet"] else None,
+    }
+
+
+def uyarilar(satir: Dict) -> List[str]:
+    """
+    Gözden geçirilmesi gereken maddeler için kısa uyarılar (satır madde analizini de içerir)
+    SORU_ANALIZ_EN_AZ_DENEME'den az cevaplanan sorular için uyarı üretilmez
+    """
+    if satir["deneme"] < Config.SORU_ANALIZ_EN_AZ_DENEME:
+        return []
+    notlar = []
+    p, ayirt, celdiriciler = satir["p"], satir["ayirt"], satir["celdiriciler"]
+    if p is not None and p < 0.2:
+        notlar.append("çok zor")
+    if p is not None and p > 0.9:
+        notlar.append("çok kolay")
+    if ayirt is not None and ayirt < 0:
+        notlar.append("negatif ayırt edicilik")
+    if celdiriciler and max(celdiriciler.values()) * satir["deneme"] > satir["dogru"]:
+        notlar.append("bir çeldirici doğru cevaptan çok seçiliyor (anahtar?)")
+    if any(o == 0 for o in celdiriciler.values()):
+        notlar.append("hiç seçilmeyen çeldirici")
+    return notlar
+
+
+class SoruIstatistikleri:
+    """
+    Soru başına sayaçlar; bekleyen değişiklikler anahtar başına birleştirilir
+    ve zamanlayıcı ya da eşik dolunca tek işlemde yazılır
+    """
+
+    def __init__(self, dosya: str = None, aralik: float = None, esik: int = None):
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self.aralik = aralik or Config.SORU_ISTATISTIK_ARALIK_SN
+        self.esik = esik or Config.SORU_ISTATISTIK_ESIK
+
+        # anahtar → ((ders, konu, ozet, dogru_cevap), sayaçlar)
+        self._bekleyen: Dict[str, Tuple[tuple, List[float]]] = {}
+        self._yerel = threading.local()
+        self._kilit = threading.Lock()
+        self._yazma_kilidi = threading.Lock()
+        self._yazici = ArkaPlanYazici(
+            "soru-istatistikleri", self.bosalt, self.aralik, "Soru istatistikleri kaydedilemedi, tekrar denenecek"
+        )
+
+        # İstatistikler
+        self.cevap_sayisi = 0
+        self.yazilan_soru = 0
+        self.bosaltma_sayisi = 0
+
+        self._baglanti().executescript(SEMA)
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    # ===============================
+    # KAYDETME
+    # ===============================
+
+    def test_ekle(self, ders: str, konu: str, sorular: Sequence[Soru],
+                  cevaplar: Dict[int, str], sureler: Dict[int, float] = None) -> int:
+        """
+        Biten testin cevaplarını kuyruğa al
+        cevaplar: soru sırası → seçilen harf; sureler: soru sırası → cevaplama süresi (sn)
+        Returns: kuyruğa alınan cevap sayısı
+        """
+        sureler = sureler or {}
+        sonuclar = [(i, harf, harf == sorular[i].dogru_cevap)
+                    for i, harf in cevaplar.items() if 0 <= i < len(sorular)]
+        toplam_dogru = sum(dogru for _, _, dogru in sonuclar)
+
+        with self._kilit:
+            for i, harf, dogru in sonuclar:
+                soru = sorular[i]
+                anahtar = soru_anahtari(soru)
+                kayit = self._bekleyen.get(anahtar)
+                if kayit is None:
+                    ozet = " ".join(soru.soru.split())[:120]
+                    kayit = self._bekleyen[anahtar] = ((ders, konu, ozet, soru.dogru_cevap), [0] * len(SAYACLAR))
+                sayac = kayit[1]
+
+                sayac[0] += 1
+                sayac[1] += dogru
+                if harf in HARFLER:
+                    sayac[2 + HARFLER.index(harf)] += 1
+
+                sure = sureler.get(i)
+                if sure is not None and 0 < sure <= Config.SORU_SURE_UST_SN:
+                    sayac[7] += 1
+                    sayac[8] += sure
+
+                # Testin kalanı (bu soru hariç); tek soruluk cevaplarda ayırt edicilik hesaplanmaz
+                if len(sonuclar) > 1:
+                    puan = (toplam_dogru - dogru) / (len(sonuclar) - 1)
+                    sayac[9] += 1
+                    sayac[10] += puan
+                    sayac[11] += puan * puan
+                    if dogru:
+                        sayac[12] += 1
+                        sayac[13] += puan
+
+            self.cevap_sayisi += len(sonuclar)
+            dolu = len(self._bekleyen) >= self.esik
+
+        if sonuclar:
+            self._yazici.baslat()
+            if dolu:
+                self._yazici.uyandir()
+        return len(sonuclar)
+
+    # ===============================
+    # BOŞALTMA
+    # ===============================
+
+    def bosalt(self) -> int:
+        """
+        Bekleyen sayaçları hemen yaz
+        Returns: yazılan soru sayısı
+        """
+        with self._yazma_kilidi:
+            with self._kilit:
+                parti, self._bekleyen = self._bekleyen, {}
+            if not parti:
+                return 0
+
+            try:
+                conn = self._baglanti()
+                with conn:
+                    # Bağlantı autocommit modunda; BEGIN olmadan her satır ayrı commit edilir ve yarıda kalan parti iki kez sayılır
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(
+                        _UPSERT, [(anahtar, *bilgi, *sayac) for anahtar, (bilgi, sayac) in parti.items()]
+                    )
+            except Exception:
+                # Yazılamayanları geri koy (bu arada gelenlerle birleştir)
+                with self._kilit:
+                    for anahtar, (bilgi, sayac) in parti.items():
+                        yeni = self._bekleyen.get(anahtar)
+                        if yeni is not None:
+                            sayac = [a + b for a, b in zip(sayac, yeni[1])]
+                        self._bekleyen[anahtar] = (bilgi, sayac)
+                raise
+
+            self.yazilan_soru += len(parti)
+            self.bosaltma_sayisi += 1
+            return len(parti)
+
+    def kapat(self):
+        """Thread'i durdur ve kalanları yaz (süreç kapanırken çağrılır)"""
+        self._yazici.kapat()
+
+    # ===============================
+    # OKUMA
+    # ===============================
+
+    def maddeler(self, ders: Optional[str] = None, konu: Optional[str] = None,
+                 en_az_deneme: int = 1) -> List[Dict]:
+        """
+        Soruların sayaçları ve madde analizi (bekleyenler önce yazılır)
+        Returns: {anahtar, ders, konu, ozet, dogru_cevap, <sayaçlar>, p, ayirt, celdiriciler, ortalama_sure, uyarilar}
+        """
+        self.bosalt()
+        kosul, parametreler = ["deneme >= ?"], [en_az_deneme]
+        if ders is not None:
+            kosul.append("ders = ?")
+            parametreler.append(ders)
+        if konu is not None:
+            kosul.append("konu = ?")
+            parametreler.append(konu)
+
+        imlec = self._baglanti().execute(
+            f"SELECT anahtar, ders, konu, ozet, dogru_cevap, {', '.join(SAYACLAR)} "
+            f"FROM soru_istatistikleri WHERE {' AND '.join(kosul)} ORDER BY ders, konu",
+            parametreler,
+        )
+        sutunlar = [s[0] for s in imlec.description]
+        sonuc = []
+        for degerler in imlec:
+            satir = dict(zip(sutunlar, degerler))
+            satir.update(madde_analizi(satir))
+            satir["uyarilar"] = uyarilar(satir)
+            sonuc.append(satir)
+        return sonuc
+
+
+# Global soru istatistikleri instance
+soru_istatistikleri = SoruIstatistikleri()
+atexit.register(soru_istatistikleri.kapat)
@@ -0,0 +1,195 @@
+"""
+KPSS Quiz App - Soru Modeli
+Soru bankası için __slots__ kullanan, bellekte küçük soru ve seçenek nesneleri
+Sözlük gibi de okunabilir (soru["secenekler"], soru.get("soru_resmi")), böylece
+mevcut sayfalar değişmeden çalışır
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Aynı anahtar/harf dizileri tüm sorularda tek bir tuple olarak paylaşılır
+_tuple_havuzu: Dict[tuple, tuple] = {}
+
+
+def _ortak_tuple(degerler) -> tuple:
+    t = tuple(sys.intern(d) for d in degerler)
+    return _tuple_havuzu.setdefault(t, t)
+
+
+def _intern(deger):
+    return sys.intern(deger) if type(deger) is str else deger
+
+
+# ===============================
+# SEÇENEKLER
+# ===============================
+
+class Secenekler(Mapping):
+    """
+    Harf → seçenek metni eşlemesi
+    Harf dizisi ("A".."E") paylaşılır, metinler intern edilir
+    ("Yalnız I", "I ve II" gibi tekrar eden seçenekler bellekte bir kez tutulur)
+    """
+
+    __slots__ = ("harfler", "metinler")
+
+    def __init__(self, secenekler: Dict[str, str]):
+        self.harfler = _ortak_tuple(secenekler.keys())
+        self.metinler = tuple(_intern(m) for m in secenekler.values())
+
+    def __getitem__(self, harf: str) -> str:
+        try:
+            return self.metinler[self.harfler.index(harf)]
+        except ValueError:
+            raise KeyError(harf) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.harfler)
+
+    def __len__(self) -> int:
+        return len(self.harfler)
+
+    def items(self):
+        return zip(self.harfler, self.metinler)
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(zip(self.harfler, self.metinler))
+
+    def __repr__(self) -> str:
+        return f"Secenekler({self.to_dict()!r})"
+
+
+# ===============================
+# SORU
+# ===============================
+
+# Her soruda bulunan alanlar
+_TEMEL_ALANLAR = ("soru", "secenekler", "dogru_cevap", "cozum")
+# Bazı sorularda bulunan alanlar (yoksa None tutulur ve anahtar yokmuş gibi davranır)
+_SECIMLI_ALANLAR = ("id", "maddeler", "soru_resmi")
+_ALANLAR = frozenset(_TEMEL_ALANLAR + _SECIMLI_ALANLAR)
+
+
+class Soru:
+    """
+    Tek bir soru
+    Bilinmeyen alanlar (koc_yorumu, cozum_resmi vb.) ekstra sözlüğünde saklanır;
+    anahtar sırası korunur, böylece kaydedilen JSON değişmez
+    """
+
+    __slots__ = ("soru", "secenekler", "dogru_cevap", "cozum",
+                 "id", "maddeler", "soru_resmi", "ekstra", "_sira")
+
+    def __init__(self, soru: str, secenekler: Dict[str, str], dogru_cevap: str, cozum: str = "",
+                 id: Optional[str] = None, maddeler: Optional[List[str]] = None,
+                 soru_resmi: Optional[str] = None, ekstra: Optional[Dict[str, Any]] = None,
+                 sira: Optional[Tuple[str, ...]] = None):
+        self.soru = soru
+        self.secenekler = secenekler if isinstance(secenekler, Secenekler) else Secenekler(secenekler or {})
+        self.dogru_cevap = _intern(dogru_cevap)
+        self.cozum = cozum
+        self.id = id
+        self.maddeler = tuple(_intern(m) for m in maddeler) if maddeler is not None else None
+        self.soru_resmi = _intern(soru_resmi)
+        self.ekstra = ekstra or None
+        self._sira = sira
+
+    @classmethod
+    def dict_ten(cls, veri: Dict[str, Any]) -> "Soru":
+        """JSON'daki soru sözlüğünden oluştur"""
+        ekstra = {
+            sys.intern(k): _intern(v) for k, v in veri.items()
+            if k not in _ALANLAR or v is None
+        }
+        sira = _ortak_tuple(veri.keys())
+        veri = {k: v for k, v in veri.items() if k not in ekstra}
+        return cls(
+            soru=veri.get("soru", ""),
+            secenekler=veri.get("secenekler", {}),
+            dogru_cevap=veri.get("dogru_cevap", ""),
+            cozum=veri.get("cozum", ""),
+            id=veri.get("id"),
+            maddeler=veri.get("maddeler"),
+            soru_resmi=veri.get("soru_resmi"),
+            ekstra=ekstra,
+            sira=sira,
+        )
+
+    # ===============================
+    # SÖZLÜK UYUMLULUĞU
+    # ===============================
+
+    def _anahtarlar(self) -> tuple:
+        if self._sira is not None:
+            return self._sira
+        anahtarlar = list(_TEMEL_ALANLAR)
+        anahtarlar += [a for a in _SECIMLI_ALANLAR if getattr(self, a) is not None]
+        anahtarlar += list(self.ekstra or ())
+        return tuple(anahtarlar)
+
+    def __getitem__(self, anahtar: str) -> Any:
+        if anahtar in _ALANLAR:
+            deger = getattr(self, anahtar)
+            if deger is not None and (self._sira is None or anahtar in self._sira):
+                return deger
+        if self.ekstra and anahtar in self.ekstra:
+            return self.ekstra[anahtar]
+        raise KeyError(anahtar)
+
+    def get(self, anahtar: str, varsayilan: Any = None) -> Any:
+        try:
+            return self[anahtar]
+        except KeyError:
+            return varsayilan
+
+    def __contains__(self, anahtar: str) -> bool:
+        try:
+            self[anahtar]
+        except KeyError:
+            return False
+        return True
+
+    def keys(self) -> tuple:
+        return self._anahtarlar()
+
+    def items(self):
+        return ((a, self[a]) for a in self._anahtarlar())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON'a yazılacak sözlük (okunan anahtar sırasıyla)"""
+        sonuc = {}
+        for anahtar in self._anahtarlar():
+            deger = self[anahtar]
+            if isinstance(deger, Secenekler):
+                deger = deger.to_dict()
+            elif anahtar == "maddeler":
+                deger = list(deger)
+            sonuc[anahtar] = deger
+        return sonuc
+
+    def __repr__(self) -> str:
+        return f"Soru({self.soru[:40]!r}…)"
+
+
+# ===============================
+# DÖNÜŞTÜRÜCÜLER
+# ===============================
+
+def sorulari_yukle(sorular: List[Dict[str, Any]]) -> List[Soru]:
+    """JSON soru listesini Soru nesnelerine çevir"""
+    return [s if isinstance(s, Soru) else Soru.dict_ten(s) for s in sorular]
+
+
+def soru_sozlugu(soru) -> Dict[str, Any]:
+    """Soru nesnesi veya (yeni eklenmiş) sözlük → JSON sözlüğü"""
+    return soru.to_dict() if isinstance(soru, Soru) else soru
+
+
+def bankayi_duzle(veri: Dict[str, Any]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Ders → konu → soru listesi yapısını JSON'a yazılabilir hale getir"""
+    return {
+        ders: {konu: [soru_sozlugu(s) for s in konular[konu]] for konu in konular}
+        for ders, konular in veri.items()
+    }
@@ -0,0 +1,252 @@
+"""
+KPSS Quiz App - Aralıklı Tekrar (SM-2)
+Testlerde yanlış yapılan sorular kullanıcıya kart olarak eklenir; kart her tekrarda
+SM-2 ile yeniden zamanlanır. Tekrar oturumu yalnızca vadesi gelen kartları yükler ve
+bir öncelik kuyruğundan (heapq) vadesi en yakın olanı O(log n) ile seçer
+"""
+
+import heapq
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from config import Config
+from kullanici_deposu import baglanti_ac
+from soru_istatistikleri import soru_anahtari
+from soru_modeli import Soru, sorulari_yukle
+
+GUN_SN = 86400
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS tekrar_kartlari (
+    kullanici_adi TEXT NOT NULL,
+    anahtar       TEXT NOT NULL,
+    ders          TEXT NOT NULL,
+    konu          TEXT NOT NULL,
+    kolaylik      REAL NOT NULL,
+    aralik        REAL NOT NULL,
+    tekrar        INTEGER NOT NULL,
+    hata          INTEGER NOT NULL,
+    vade          REAL NOT NULL,
+    PRIMARY KEY (kullanici_adi, anahtar)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tekrar_kartlari_vade ON tekrar_kartlari(kullanici_adi, vade);
+"""
+
+_ALANLAR = ("anahtar", "ders", "konu", "kolaylik", "aralik", "tekrar", "hata", "vade")
+
+
+class Kart:
+    """Bir kullanıcının bir soru için tekrar durumu"""
+
+    __slots__ = _ALANLAR
+
+    def __init__(self, anahtar: str, ders: str, konu: str, kolaylik: float = 2.5,
+                 aralik: float = 0.0, tekrar: int = 0, hata: int = 0, vade: float = 0.0):
+        self.anahtar = anahtar
+        self.ders = ders
+        self.konu = konu
+        self.kolaylik = kolaylik   # SM-2 kolaylık katsayısı (EF)
+        self.aralik = aralik       # gün
+        self.tekrar = tekrar       # art arda doğru tekrar sayısı
+        self.hata = hata           # toplam yanlış
+        self.vade = vade           # epoch saniye
+
+    def degerler(self) -> tuple:
+        return tuple(getattr(self, a) for a in _ALANLAR)
+
+
+def kalite(dogru: bool, sure: Optional[float] = None) -> int:
+    """SM-2 cevap kalitesi (0-5): hızlı doğru 5, doğru 4, yanlış 1"""
+    if not dogru:
+        return 1
+    return 5 if sure is not None and sure <= Config.TEKRAR_HIZLI_SN else 4
+
+
+def sm2(kart: Kart, q: int, simdi: float) -> Kart:
+    """Kartı SM-2 ile yeniden zamanla (yerinde)"""
+    if q < 3:
+        # Unutulan kart baştan öğrenilir; aynı oturumda kısa süre sonra yeniden sorulur
+        kart.tekrar = 0
+        kart.hata += 1
+        kart.aralik = 0.0
+        kart.vade = simdi + Config.TEKRAR_YENIDEN_DK * 60
+    else:
+        if kart.tekrar == 0:
+            kart.aralik = 1.0
+        elif kart.tekrar == 1:
+            kart.aralik = 6.0
+        else:
+            kart.aralik = round(kart.aralik * kart.kolaylik, 2)
+        kart.tekrar += 1
+        kart.vade = simdi + kart.aralik * GUN_SN
+    kart.kolaylik = max(1.3, kart.kolaylik + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+    return kart
+
+
+class TekrarKuyrugu:
+    """
+    Oturum içi öncelik kuyruğu: (vade, sıra, kart)
+    Yanlış cevaplanan kart kısa vadeyle geri eklenir, diğerlerinden sonra yeniden gelir
+    """
+
+    def __init__(self, kartlar: Iterable[Kart] = ()):
+        self._sira = 0
+        self._yigin: List[Tuple[float, int, Kart]] = []
+        for kart in kartlar:
+            self._yigin.append((kart.vade, self._sira, kart))
+            self._sira += 1
+        heapq.heapify(self._yigin)
+
+    def ekle(self, kart: Kart):
+        heapq.heappush(self._yigin, (kart.vade, self._sira, kart))
+        self._sira += 1
+
+    def siradaki(self, simdi: float, onden_sn: float = None) -> Optional[Kart]:
+        """Vadesi (onden_sn payıyla) gelmiş en öncelikli kart; yoksa None"""
+        onden_sn = Config.TEKRAR_ONDEN_SN if onden_sn is None else onden_sn
+        if self._yigin and self._yigin[0][0] <= simdi + onden_sn:
+            return heapq.heappop(self._yigin)[2]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._yigin)
+
+
+class TekrarDeposu:
+    """Kullanıcı kartları (SQLite; kart başına tek satır)"""
+
+    def __init__(self, dosya: str = None):
+        self.dosya = dosya or Config.VERITABANI_DOSYA
+        self._yerel = threading.local()
+        self._baglanti().executescript(SEMA)
+
+    def _baglanti(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = baglanti_ac(self.dosya)
+            self._yerel.conn = conn
+        return conn
+
+    def _kaydet(self, kullanici: str, kartlar: Iterable[Kart]):
+        with self._baglanti() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO tekrar_kartlari (kullanici_adi, {', '.join(_ALANLAR)}) "
+                f"VALUES (?, {', '.join('?' * len(_ALANLAR))})",
+                [(kullanici, *kart.degerler()) for kart in kartlar],
+            )
+
+    def kartlar(self, kullanici: str, anahtarlar: Iterable[str] = None) -> Dict[str, Kart]:
+        """Kullanıcının kartları (anahtarlar verilirse yalnızca onlar)"""
+        sorgu = f"SELECT {', '.join(_ALANLAR)} FROM tekrar_kartlari WHERE kullanici_adi = ?"
+        parametreler = [kullanici]
+        if anahtarlar is not None:
+            anahtarlar = list(anahtarlar)
+            if not anahtarlar:
+                return {}
+            sorgu += f" AND anahtar IN ({', '.join('?' * len(anahtarlar))})"
+            parametreler += anahtarlar
+        return {satir[0]: Kart(*satir) for satir in self._baglanti().execute(sorgu, parametreler)}
+
+    # ===============================
+    # GÜNCELLEME
+    # ===============================
+
+    def test_isle(self, kullanici: str, ders: str, konu: str, sorular: Sequence[Soru],
+                  cevaplar: Dict[int, str], sureler: Dict[int, float] = None,
+                  simdi: float = None) -> int:
+        """
+        Biten testin cevaplarını kartlara işle
+        Yanlışlar kart olur (var olan kart unutulmuş sayılır); vadesi gelmiş kartlarda doğru cevap tekrar sayılır
+        Returns: değişen kart sayısı
+        """
+        simdi = time.time() if simdi is None else simdi
+        sureler = sureler or {}
+        cevaplanan = {soru_anahtari(sorular[i]): (i, harf == sorular[i].dogru_cevap)
+                      for i, harf in cevaplar.items() if 0 <= i < len(sorular)}
+        mevcut = self.kartlar(kullanici, cevaplanan)
+
+        degisen = []
+        for anahtar, (i, dogru) in cevaplanan.items():
+            kart = mevcut.get(anahtar)
+            if kart is None:
+                if dogru:
+                    continue
+                # Yeni kart hemen tekrar edilebilir
+                kart = Kart(anahtar, ders, konu, vade=simdi)
+                kart.hata = 1
+            elif dogru and kart.vade > simdi:
+                # Vadesinden önce doğru bilmek aralığı uzatmaz
+                continue
+            else:
+                sm2(kart, kalite(dogru, sureler.get(i)), simdi)
+            degisen.append(kart)
+
+        if degisen:
+            self._kaydet(kullanici, degisen)
+        return len(degisen)
+
+    def cevapla(self, kullanici: str, kart: Kart, dogru: bool, sure: float = None,
+                simdi: float = None) -> Kart:
+        """Tekrar oturumundaki cevabı işle ve kartı kaydet"""
+        simdi = time.time() if simdi is None else simdi
+        sm2(kart, kalite(dogru, sure), simdi)
+        self._kaydet(kullanici, [kart])
+        return kart
+
+    def sil(self, kullanici: str, anahtarlar: Iterable[str]):
+        """Sorusu silinmiş ya da değişmiş kartları kaldır"""
+        with self._baglanti() as conn:
+            conn.executemany(
+                "DELETE FROM tekrar_kartlari WHERE kullanici_adi = ? AND anahtar = ?",
+                [(kullanici, a) for a in anahtarlar],
+            )
+
+    def kullanici_sil(self, kullanici: str):
+        with self._baglanti() as conn:
+            conn.execute("DELETE FROM tekrar_kartlari WHERE kullanici_adi = ?", (kullanici,))
+
+    # ===============================
+    # OTURUM
+    # ===============================
+
+    def ozet(self, kullanici: str, simdi: float = None) -> Tuple[int, int, Optional[float]]:
+        """(kart sayısı, vadesi gelen kart sayısı, sonraki vade)"""
+        simdi = time.time() if simdi is None else simdi
+        return self._baglanti().execute(
+            "SELECT COUNT(*), COALESCE(SUM(vade <= ?), 0), MIN(CASE WHEN vade > ? THEN vade END) "
+            "FROM tekrar_kartlari WHERE kullanici_adi = ?",
+            (simdi, simdi, kullanici),
+        ).fetchone()
+
+    def oturum_kur(self, kullanici: str, kaynak: Callable[[str, str], List[Dict]],
+                   simdi: float = None, limit: int = None) -> Tuple[TekrarKuyrugu, Dict[str, Soru]]:
+        """
+        Vadesi gelen kartlardan oturum kuyruğu kur
+        kaynak(ders, konu) konunun soru sözlüklerini döndürür; sorusu bulunamayan kartlar silinir
+        Returns: (kuyruk, anahtar → Soru)
+        """
+        simdi = time.time() if simdi is None else simdi
+        limit = limit or Config.TEKRAR_OTURUM_KART
+        kartlar = [
+            Kart(*satir) for satir in self._baglanti().execute(
+                f"SELECT {', '.join(_ALANLAR)} FROM tekrar_kartlari "
+                "WHERE kullanici_adi = ? AND vade <= ? ORDER BY vade LIMIT ?",
+                (kullanici, simdi + Config.TEKRAR_ONDEN_SN, limit),
+            )
+        ]
+
+        # Yalnızca kartların konuları açılır
+        sorular: Dict[str, Soru] = {}
+        for ders, konu in dict.fromkeys((k.ders, k.konu) for k in kartlar):
+            for soru in sorulari_yukle(kaynak(ders, konu) or []):
+                sorular[soru_anahtari(soru)] = soru
+
+        kayip = [k.anahtar for k in kartlar if k.anahtar not in sorular]
+        if kayip:
+            self.sil(kullanici, kayip)
+        return TekrarKuyrugu(k for k in kartlar if k.anahtar in sorular), sorular
+
+
+# Global tekrar deposu instance
+tekrar_deposu = TekrarDeposu()
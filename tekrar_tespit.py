@@ -0,0 +1,271 @@
+"""
+KPSS Quiz App - Tekrar Eden Soru Tespiti
+Soru kökü ve seçenekler üzerinde MinHash + LSH ile (neredeyse) aynı soruları bulur
+Her soru yalnızca aynı LSH kovasına düşen adaylarla karşılaştırılır (karesel değil)
+"""
+
+import random
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+from arama import kelimeler
+from soru_bankasi import soru_deposu
+
+# Bu benzerliğin (Jaccard) üstündeki sorular tekrar sayılır
+VARSAYILAN_ESIK = 0.6
+
+# 64 permütasyon = 16 bant x 4 satır; ~0.5 benzerlikten itibaren aday yakalanır
+PERMUTASYON_SAYISI = 64
+BANT_SAYISI = 16
+
+# Kelime n-gram uzunluğu
+SINDIRA_BOYU = 3
+
+_ASAL = (1 << 61) - 1
+_rastgele = random.Random(20240601)  # sabit tohum: imzalar süreçler arasında aynı
+_PERMUTASYONLAR = tuple(
+    (_rastgele.randrange(1, _ASAL), _rastgele.randrange(0, _ASAL))
+    for _ in range(PERMUTASYON_SAYISI)
+)
+
+
+# ===============================
+# İMZA
+# ===============================
+
+def parcalar(soru) -> FrozenSet[str]:
+    """Soru kökü, maddeler ve seçeneklerden kelime n-gram kümesi"""
+    metin = [soru.get("soru", "")]
+    metin.extend(soru.get("maddeler") or ())
+    metin.extend(soru.get("secenekler", {}).values())
+    k = kelimeler(" ".join(metin))
+    if len(k) < SINDIRA_BOYU:
+        return frozenset(k)
+    return frozenset(" ".join(k[i:i + SINDIRA_BOYU]) for i in range(len(k) - SINDIRA_BOYU + 1))
+
+
+def minhash(kume: FrozenSet[str]) -> Tuple[int, ...]:
+    """Kümenin MinHash imzası"""
+    if not kume:
+        return (_ASAL,) * PERMUTASYON_SAYISI
+    ozetler = [zlib.crc32(p.encode("utf-8")) for p in kume]
+    return tuple(
+        min((a * h + b) % _ASAL for h in ozetler)
+        for a, b in _PERMUTASYONLAR
+    )
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+# ===============================
+# LSH İNDEKSİ
+# ===============================
+
+class TekrarDedektoru:
+    """
+    MinHash imzalarını bantlara bölüp kovalara yerleştirir
+    Aynı kovaya düşen adayların gerçek Jaccard benzerliği hesaplanır
+    Anahtarlar birbiriyle sıralanabilir olmalıdır (ör. (ders, konu, sira))
+    """
+
+    def __init__(self, esik: float = VARSAYILAN_ESIK):
+        self.esik = esik
+        self._satir = PERMUTASYON_SAYISI // BANT_SAYISI
+        self._kovalar: List[Dict[tuple, set]] = [defaultdict(set) for _ in range(BANT_SAYISI)]
+        self._kayitlar: Dict[Hashable, Tuple[FrozenSet[str], Tuple[int, ...]]] = {}
+
+    def _bantlar(self, imza: Tuple[int, ...]):
+        for i in range(BANT_SAYISI):
+            yield i, imza[i * self._satir:(i + 1) * self._satir]
+
+    def ekle(self, anahtar: Hashable, soru):
+        kume = parcalar(soru)
+        imza = minhash(kume)
+        self._kayitlar[anahtar] = (kume, imza)
+        for i, bant in self._bantlar(imza):
+            self._kovalar[i][bant].add(anahtar)
+
+    def cikar(self, anahtar: Hashable):
+        kayit = self._kayitlar.pop(anahtar, None)
+        if kayit is None:
+            return
+        for i, bant in self._bantlar(kayit[1]):
+            kova = self._kovalar[i][bant]
+            kova.discard(anahtar)
+            if not kova:
+                del self._kovalar[i][bant]
+
+    def _adaylar(self, imza: Tuple[int, ...]) -> set:
+        adaylar = set()
+        for i, bant in self._bantlar(imza):
+            adaylar |= self._kovalar[i].get(bant, set())
+        return adaylar
+
+    def benzerleri(self, soru, esik: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """Soruya benzeyen kayıtlı sorular, benzerliğe göre azalan"""
+        esik = self.esik if esik is None else esik
+        kume = parcalar(soru)
+        sonuc = []
+        for aday in self._adaylar(minhash(kume)):
+            benzerlik = jaccard(kume, self._kayitlar[aday][0])
+            if benzerlik >= esik:
+                sonuc.append((aday, benzerlik))
+        sonuc.sort(key=lambda x: x[1], reverse=True)
+        return sonuc
+
+    def kumeler(self, esik: Optional[float] = None) -> List[Dict]:
+        """
+        Birbirine benzeyen soru kümeleri
+        Returns: [{"uyeler": [anahtar, ...], "ciftler": [(a, b, benzerlik), ...]}, ...]
+        """
+        esik = self.esik if esik is None else esik
+        ebeveyn = {}
+
+        def bul(x):
+            while ebeveyn.get(x, x) != x:
+                x = ebeveyn[x]
+            return x
+
+        ciftler = []
+        gorulen = set()
+        for anahtar, (kume, imza) in self._kayitlar.items():
+            for aday in self._adaylar(imza):
+                if aday == anahtar:
+                    continue
+                cift = (anahtar, aday) if anahtar < aday else (aday, anahtar)
+                if cift in gorulen:
+                    continue
+                gorulen.add(cift)
+                benzerlik = jaccard(kume, self._kayitlar[aday][0])
+                if benzerlik >= esik:
+                    ciftler.append((*cift, benzerlik))
+                    kok_a, kok_b = bul(cift[0]), bul(cift[1])
+                    if kok_a != kok_b:
+                        ebeveyn[kok_b] = kok_a
+
+        gruplar: Dict[Hashable, Dict] = {}
+        for a, b, benzerlik in ciftler:
+            grup = gruplar.setdefault(bul(a), {"uyeler": set(), "ciftler": []})
+            grup["uyeler"].update((a, b))
+            grup["ciftler"].append((a, b, benzerlik))
+
+        sonuc = []
+        for grup in gruplar.values():
+            grup["uyeler"] = sorted(grup["uyeler"])
+            grup["ciftler"].sort(key=lambda c: c[2], reverse=True)
+            sonuc.append(grup)
+        sonuc.sort(key=lambda g: (-len(g["uyeler"]), -g["ciftler"][0][2]))
+        return sonuc
+
+    def __len__(self) -> int:
+        return len(self._kayitlar)
+
+
+def bankayi_tara(veri: Dict, esik: float = VARSAYILAN_ESIK, ders: Optional[str] = None) -> List[Dict]:
+    """Ders → konu → soru listesi yapısındaki tekrar kümeleri; anahtarlar (ders, konu, sira)"""
+    dedektor = TekrarDedektoru(esik)
+    for d, konular in veri.items():
+        if ders is not None and d != ders:
+            continue
+        for konu in konular:
+            for sira, soru in enumerate(konular[konu]):
+                dedektor.ekle((d, konu, sira), soru)
+    return dedektor.kumeler()
+
+
+# ===============================
+# SORU BANKASI KONTROLÜ
+# ===============================
+
+class BankaTekrarKontrolu:
+    """
+    Paylaşılan soru bankası için LSH indeksi (ilk kontrolde kurulur)
+    Yönetim panelindeki değişikliklerde yalnızca ilgili konu yenilenir
+    """
+
+    def __init__(self, depo, esik: float = VARSAYILAN_ESIK):
+        self.depo = depo
+        self.esik = esik
+        self._kilit = threading.Lock()
+        self._dedektor = None
+        self._versiyon = None
+        self._konu_boylari: Dict[Tuple[str, str], int] = {}
+
+    def _konu_ekle(self, ders: str, konu: str):
+        sorular = self.depo.sorular(ders, konu)
+        for sira, soru in enumerate(sorular):
+            self._dedektor.ekle((ders, konu, sira), soru)
+        self._konu_boylari[(ders, konu)] = len(sorular)
+
+    def _guncel_tut(self):
+        self.depo.ders_listesi()  # deponun dosya değişikliği kontrolünü tetikler
+        if self._dedektor is not None and self.depo.versiyon == self._versiyon:
+            return
+        self._dedektor = TekrarDedektoru(self.esik)
+        self._konu_boylari = {}
+        for ders in self.depo.ders_listesi():
+            for konu in self.depo.konu_listesi(ders):
+                self._konu_ekle(ders, konu)
+        self._versiyon = self.depo.versiyon
+
+    def konu_guncelle(self, ders: str, konu: str):
+        with self._kilit:
+            if self._dedektor is None:
+                return
+            for sira in range(self._konu_boylari.pop((ders, konu), 0)):
+                self._dedektor.cikar((ders, konu, sira))
+            if konu in self.depo.konu_listesi(ders):
+                self._konu_ekle(ders, konu)
+            self._versiyon = self.depo.versiyon
+
+    def benzerleri(self, soru, esik: Optional[float] = None, limit: int = 5) -> List[Dict]:
+        """
+        Kaydedilmeden önce: bankada bu soruya benzeyenler
+        Returns: [{"ders", "konu", "sira", "benzerlik", "ozet"}, ...]
+        """
+        with self._kilit:
+            self._guncel_tut()
+            sonuc = []
+            for (ders, konu, sira), benzerlik in self._dedektor.benzerleri(soru, esik)[:limit]:
+                sonuc.append({
+                    "ders": ders,
+                    "konu": konu,
+                    "sira": sira,
+                    "benzerlik": round(benzerlik, 2),
+                    "ozet": self.depo.sorular(ders, konu)[sira].get("soru", "")[:100],
+                })
+            return sonuc
+
+
+# Global tekrar kontrolü instance
+tekrar_kontrolu = BankaTekrarKontrolu(soru_deposu)
+
+
+if __name__ == "__main__":
+    import argparse
+    from depolama import json_oku
+    from soru_bankasi import SORU_DOSYA
+
+    parser = argparse.ArgumentParser(description="Soru bankasında tekrar eden soruları bul")
+    parser.add_argument("--dosya", default=SORU_DOSYA)
+    parser.add_argument("--esik", type=float, default=VARSAYILAN_ESIK, help="Jaccard benzerlik eşiği (0-1)")
+    parser.add_argument("--ders", default=None, help="Yalnızca bu dersi tara")
+    args = parser.parse_args()
+
+    veri, _ = json_oku(args.dosya, {})
+    kumeler = bankayi_tara(veri, args.esik, args.ders)
+
+    for no, grup in enumerate(kumeler, 1):
+        print(f"\n🔁 Küme {no} ({len(grup['uyeler'])} soru)")
+        for ders, konu, sira in grup["uyeler"]:
+            metin = veri[ders][konu][sira].get("soru", "")[:80].replace("\n", " ")
+            print(f"   • {ders} / {konu} / {sira + 1}. soru: {metin}")
+        for (d1, k1, s1), (d2, k2, s2), benzerlik in grup["ciftler"]:
+            print(f"     {k1} #{s1 + 1} ↔ {k2} #{s2 + 1}: %{benzerlik * 100:.0f}")
+
+    print(f"\n✅ {len(kumeler)} tekrar kümesi bulundu (eşik %{args.esik * 100:.0f})")
@@ -0,0 +1,11 @@
+"""
+Testler depo kökündeki modülleri içe aktarır
+Modül düzeyindeki örnekler (kpss.db, sonuc_gunlugu/ vb.) geçici bir klasörde oluşur
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix="kpss_test_"))
@@ -0,0 +1,71 @@
+from analitik import SonucTablosu
+from kullanici_deposu import JsonKullaniciDeposu
+from sonuc_gunlugu import GunlukSikistirici, SonucGunlugu
+
+
+def kur(tmp_path):
+    gunluk = SonucGunlugu(str(tmp_path / "gunluk"))
+    depo = JsonKullaniciDeposu(str(tmp_path / "kullanicilar.json"))
+    for kullanici in ("ali", "ayse"):
+        depo.kullanici_kaydet(kullanici, {"isim": kullanici.title(), "sifre": "x"})
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 1, 7, 3)
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 2, 5, 5)
+    depo.test_sonucu_kaydet("ayse", "Tarih", "Osmanlı", 1, 10, 0)
+    depo.test_sonucu_kaydet("ayse", "Coğrafya", "İklim", 1, 4, 6)
+    sikistirici = GunlukSikistirici(gunluk, depo)
+    return gunluk, depo, SonucTablosu(depo, gunluk, sikistirici)
+
+
+def test_depodan_kurulur_ve_gruplanir(tmp_path):
+    _, _, tablo = kur(tmp_path)
+
+    assert tablo.kullanici_toplamlari() == {"ali": (12, 8), "ayse": (14, 6)}
+    assert tablo.kullanici_raporu("ali") == {("Tarih", "Osmanlı"): (2, 12, 8)}
+
+    ortalama = tablo.ders_ortalamalari()
+    assert ortalama["Tarih"]["kullanici"] == 2
+    assert ortalama["Tarih"]["oran"] == 73          # 22 / 30
+    assert ortalama["Tarih"]["ortalama_oran"] == 80  # (60 + 100) / 2
+
+    zorluk = tablo.konu_zorlugu(en_az_cevap=1)
+    assert [(z["ders"], z["konu"]) for z in zorluk] == [("Coğrafya", "İklim"), ("Tarih", "Osmanlı")]
+    assert tablo.konu_zorlugu(en_az_cevap=20) == [{
+        "ders": "Tarih", "konu": "Osmanlı", "dogru": 22, "yanlis": 8, "oran": 73,
+    }]
+
+
+def test_gunlukten_artimli_guncellenir(tmp_path):
+    gunluk, _, tablo = kur(tmp_path)
+    tablo.kullanici_toplamlari()
+
+    # Aynı test yeniden çözülünce satır güncellenir, yeni test eklenir
+    gunluk.ekle("ali", "Tarih", "Osmanlı", 2, 9, 1)
+    gunluk.ekle("veli", "Coğrafya", "İklim", 1, 8, 2)
+    gunluk.kapat()
+
+    assert tablo.guncelle() == 2
+    assert tablo.guncelle() == 0
+    assert tablo.kullanici_toplamlari() == {"ali": (16, 4), "ayse": (14, 6), "veli": (8, 2)}
+    assert tablo.kullanici_raporu("ali") == {("Tarih", "Osmanlı"): (2, 16, 4)}
+
+
+def test_liderlik_ve_siralama(tmp_path):
+    _, _, tablo = kur(tmp_path)
+
+    # net: ali 12 - 8/4 = 10, ayse 14 - 6/4 = 12.5
+    assert [s["kullanici"] for s in tablo.liderlik()] == ["ayse", "ali"]
+    assert tablo.liderlik(limit=1)[0]["net"] == 12.5
+    assert [s["kullanici"] for s in tablo.liderlik(ders="Coğrafya")] == ["ayse"]
+    assert tablo.liderlik(ders="Yok") == []
+    assert tablo.siralama("ali") == (2, 2)
+    assert tablo.siralama("yok") is None
+
+
+def test_kullanici_silinince_sorgulardan_duser(tmp_path):
+    _, _, tablo = kur(tmp_path)
+    tablo.kullanici_toplamlari()
+
+    tablo.kullanici_sil("ayse")
+    assert tablo.kullanici_toplamlari() == {"ali": (12, 8)}
+    assert tablo.siralama("ayse") is None
+    assert tablo.siralama("ali") == (1, 1)
@@ -0,0 +1,71 @@
+import pytest
+
+from arama import SoruAramaIndeksi, kelimeler, normallestir
+from depolama import json_yaz
+from soru_bankasi import SoruBankasiDeposu, konu_degistir
+
+
+def _soru(metin, cozum=""):
+    return {"soru": metin, "secenekler": {"A": "Evet", "B": "Hayır"}, "dogru_cevap": "A", "cozum": cozum}
+
+
+@pytest.fixture
+def depo(tmp_path):
+    dosya = str(tmp_path / "soru_bankasi.json")
+    json_yaz(dosya, {
+        "Tarih": {
+            "Osmanlı": [
+                _soru("Lale Devri hangi padişah döneminde başlamıştır?"),
+                _soru("Lale yetiştiriciliği ve lale ticareti", cozum="Lale lale lale"),
+                _soru("Osmanlı Devleti'nin ilk başkenti neresidir?"),
+            ],
+            "Cumhuriyet": [_soru("1924 Anayasası hangi meclis tarafından kabul edilmiştir?")],
+        },
+        "Coğrafya": {"İklim": [_soru("IĞDIR ovasında hangi iklim görülür?")]},
+    })
+    return SoruBankasiDeposu(dosya, str(tmp_path / "soru_parcalari"))
+
+
+def bul(indeks, sorgu):
+    return [(s["ders"], s["konu"], s["sira"]) for s in indeks.ara(sorgu)]
+
+
+def test_turkce_harfler_katlanir(depo):
+    assert normallestir("İSTANBUL ışık IĞDIR") == "istanbul isik igdir"
+    indeks = SoruAramaIndeksi(depo)
+    assert bul(indeks, "ığdır") == bul(indeks, "IGDIR") == [("Coğrafya", "İklim", 0)]
+
+
+def test_kesme_eki_ayri_kelime_sayilmaz(depo):
+    assert kelimeler("Devleti'nin") == kelimeler("Devleti") == ["devlet"]
+    indeks = SoruAramaIndeksi(depo)
+    assert bul(indeks, "devletin") == [("Tarih", "Osmanlı", 2)]
+    assert "nin" not in indeks._ters
+
+
+def test_son_kelime_onek_olarak_eslesir(depo):
+    indeks = SoruAramaIndeksi(depo)
+    assert bul(indeks, "anaya") == [("Tarih", "Cumhuriyet", 0)]
+    # Önek yalnızca yazılmakta olan son kelimeye uygulanır
+    assert ("Tarih", "Cumhuriyet", 0) not in bul(indeks, "anaya lale")
+
+
+def test_tum_kelimeleri_iceren_soru_one_cikar(depo):
+    # İkinci soru "lale"yi çok daha sık geçirse de "devri"yi içermez
+    assert bul(SoruAramaIndeksi(depo), "lale devri")[:2] == [("Tarih", "Osmanlı", 0), ("Tarih", "Osmanlı", 1)]
+
+
+def test_konu_guncelle_yalnizca_konuyu_yeniden_indeksler(depo, monkeypatch):
+    indeks = SoruAramaIndeksi(depo)
+    assert bul(indeks, "lale")
+    monkeypatch.setattr(indeks, "_kur", lambda: pytest.fail("tüm indeks yeniden kuruldu"))
+
+    sorular = list(depo.sorular("Tarih", "Osmanlı"))
+    del sorular[1]
+    sorular.append(_soru("Tımar sistemi nedir?"))
+    depo.kaydet(konu_degistir(depo.veri(), "Tarih", "Osmanlı", sorular))
+    indeks.konu_guncelle("Tarih", "Osmanlı")
+
+    assert bul(indeks, "timar") == [("Tarih", "Osmanlı", 2)]
+    assert bul(indeks, "ticareti") == []
+    assert bul(indeks, "devletin") == [("Tarih", "Osmanlı", 1)]
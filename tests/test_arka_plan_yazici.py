@@ -0,0 +1,44 @@
+import threading
+
+from arka_plan_yazici import ArkaPlanYazici
+
+
+def test_uyandirilinca_yazar_ve_kapanista_son_kez_yazar():
+    yazildi = threading.Event()
+    cagri = []
+
+    def yaz():
+        cagri.append(1)
+        yazildi.set()
+
+    yazici = ArkaPlanYazici("deneme", yaz, 3600, "yazılamadı")
+    yazici.baslat()
+    yazici.baslat()  # ikinci çağrı yeni thread açmaz
+    assert sum(t.name == "deneme" for t in threading.enumerate()) == 1
+
+    yazici.uyandir()
+    assert yazildi.wait(5)
+    yazici.kapat()
+    assert len(cagri) == 2
+    assert not any(t.name == "deneme" for t in threading.enumerate())
+
+
+def test_hata_donguyu_durdurmaz(capsys):
+    cagri = []
+    birinci, ikinci = threading.Event(), threading.Event()
+
+    def yaz():
+        cagri.append(1)
+        if len(cagri) == 1:
+            birinci.set()
+            raise OSError("disk dolu")
+        ikinci.set()
+
+    yazici = ArkaPlanYazici("hatali", yaz, 3600, "yazılamadı")
+    yazici.baslat()
+    yazici.uyandir()
+    assert birinci.wait(5)
+    yazici.uyandir()
+    assert ikinci.wait(5)
+    yazici.durdur()
+    assert "yazılamadı: disk dolu" in capsys.readouterr().out
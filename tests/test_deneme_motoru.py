@@ -0,0 +1,115 @@
+import pytest
+
+from config import Config
+from deneme_motoru import DenemeMotoru, net_hesapla
+
+SIMDI = 1_700_000_000.0
+
+
+def _soru(metin, dogru="A"):
+    return {"soru": metin, "secenekler": {h: f"{metin} {h}" for h in "ABCDE"}, "dogru_cevap": dogru}
+
+
+DENEMELER = {
+    "Deneme 1": {
+        "Türkçe": [_soru("T1"), _soru("T2", "B")],
+        "Tarih": [_soru("H1", "C"), _soru("H2"), _soru("H3")],
+    },
+}
+
+
+@pytest.fixture
+def motor(tmp_path):
+    return DenemeMotoru(DENEMELER, str(tmp_path / "veri.db"), kayit_aralik=3600)
+
+
+def test_sure_ve_sira(motor):
+    assert motor.sure("Deneme 1") == 5 * Config.DENEME_SORU_SN
+    assert [(alt, s.soru) for alt, s in motor.sorular("Deneme 1")][1:3] == [("Türkçe", "T2"), ("Tarih", "H1")]
+    assert net_hesapla(10, 6) == 8.5
+
+
+def test_cevaplar_eklenir_son_cevap_gecerli(motor):
+    oturum = motor.baslat("ali", "Deneme 1", simdi=SIMDI)
+    assert motor.cevap_kaydet(oturum, 0, "B", simdi=SIMDI + 1)
+    assert motor.cevap_kaydet(oturum, 2, "C", simdi=SIMDI + 2)
+    assert motor.bosalt() == 2
+    assert motor.cevap_kaydet(oturum, 0, "A", simdi=SIMDI + 3)
+
+    # Bekleyen (henüz yazılmamış) cevap da okunur; tablo yalnızca büyür
+    assert motor.cevaplar(oturum.oturum_id) == {0: "A", 2: "C"}
+    motor.bosalt()
+    assert motor._baglanti().execute("SELECT COUNT(*) FROM deneme_cevaplari").fetchone()[0] == 3
+
+    # Süresi devam eden oturuma geri dönülür
+    assert motor.baslat("ali", "Deneme 1", simdi=SIMDI + 60).oturum_id == oturum.oturum_id
+
+
+def test_sure_dolunca_cevap_alinmaz_ve_puanlanir(motor):
+    oturum = motor.baslat("ali", "Deneme 1", simdi=SIMDI)
+    motor.cevap_kaydet(oturum, 0, "A", simdi=SIMDI)
+    motor.cevap_kaydet(oturum, 1, "A", simdi=SIMDI)
+
+    bitti = oturum.bitis + Config.DENEME_TOLERANS_SN + 1
+    assert not motor.cevap_kaydet(oturum, 2, "C", simdi=bitti)
+
+    # Teslim edilmemiş süresi dolmuş oturum okunurken puanlanır
+    kapanan = motor.oturum(oturum.oturum_id, simdi=bitti)
+    assert (kapanan.dogru, kapanan.yanlis, kapanan.bos, kapanan.net) == (1, 1, 3, 0.75)
+    assert kapanan.teslim == oturum.bitis
+    assert motor.acik_oturum("ali", "Deneme 1", simdi=bitti) is None
+
+    bolumler = motor.puanla("Deneme 1", motor.cevaplar(oturum.oturum_id))
+    assert bolumler["Türkçe"] == {"dogru": 1, "yanlis": 1, "bos": 0, "net": 0.75, "cevaplar": {0: "A", 1: "A"}}
+    assert bolumler["Tarih"]["bos"] == 3
+
+
+def test_siralama_ilk_girislere_gore(motor):
+    for kullanici, cevaplar in (("ali", {0: "A", 1: "B", 2: "C"}), ("ayse", {0: "A"}), ("veli", {0: "B"})):
+        oturum = motor.baslat(kullanici, "Deneme 1", simdi=SIMDI)
+        for sira, harf in cevaplar.items():
+            motor.cevap_kaydet(oturum, sira, harf, simdi=SIMDI)
+        motor.teslim_et(oturum, simdi=SIMDI + 100)
+
+    assert [s["kullanici"] for s in motor.liderlik("Deneme 1")] == ["ali", "ayse", "veli"]
+    assert motor.siralama(motor.son_oturum("ayse", "Deneme 1")) == (2, 3)
+
+    # Tekrar girişi sıralamayı değiştirmez, yalnızca yerini gösterir
+    tekrar = motor.baslat("veli", "Deneme 1", simdi=SIMDI + 200)
+    assert tekrar.resmi == 0
+    for sira, harf in {0: "A", 1: "B", 2: "C", 3: "A"}.items():
+        motor.cevap_kaydet(tekrar, sira, harf, simdi=SIMDI + 200)
+    motor.teslim_et(tekrar, simdi=SIMDI + 300)
+    assert motor.siralama(tekrar) == (1, 4)
+    assert [s["kullanici"] for s in motor.liderlik("Deneme 1")] == ["ali", "ayse", "veli"]
+
+    motor.kullanici_sil("ali")
+    assert motor.son_oturum("ali", "Deneme 1") is None
+
+
+def test_eszamanli_baslatma_tek_oturum_acar(tmp_path):
+    import threading
+    dosya = str(tmp_path / "veri.db")
+    motorlar = [DenemeMotoru(DENEMELER, dosya, kayit_aralik=3600) for _ in range(8)]
+    baslangic = threading.Barrier(len(motorlar))
+    oturumlar = []
+
+    def baslat(m):
+        baslangic.wait()
+        oturumlar.append(m.baslat("ali", "Deneme 1", simdi=SIMDI).oturum_id)
+
+    isciler = [threading.Thread(target=baslat, args=(m,)) for m in motorlar]
+    for t in isciler:
+        t.start()
+    for t in isciler:
+        t.join()
+    assert len(set(oturumlar)) == 1
+
+    # İki sekmeden teslim: ilk kaydedilen sonuç geçerli kalır
+    oturum = motorlar[0].oturum(oturumlar[0], simdi=SIMDI)
+    ikinci = motorlar[1].oturum(oturumlar[0], simdi=SIMDI)
+    motorlar[0].cevap_kaydet(oturum, 0, "A", simdi=SIMDI + 1)
+    ilk = motorlar[0].teslim_et(oturum, simdi=SIMDI + 10)
+    geciken = motorlar[1].teslim_et(ikinci, simdi=SIMDI + 20)
+    assert (geciken.teslim, geciken.dogru) == (ilk.teslim, 1) == (SIMDI + 10, 1)
+    assert [s["kullanici"] for s in motorlar[2].liderlik("Deneme 1")] == ["ali"]
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from depolama import (
+    BozukDosyaHatasi, VersiyonCakismasi, dosya_kilidi, json_guncelle, json_oku, json_yaz
+)
+from soru_bankasi import SoruBankasiDeposu
+
+
+def test_kilit_tutulurken_beklemeyen_kilit_alinamaz(tmp_path):
+    yol = str(tmp_path / "veri.json")
+    with dosya_kilidi(yol) as alindi:
+        assert alindi
+        with dosya_kilidi(yol, bekle=False) as ikinci:
+            assert not ikinci
+    with dosya_kilidi(yol, bekle=False) as alindi:
+        assert alindi
+
+
+def test_eszamanli_guncellemeler_kaybolmaz(tmp_path):
+    yol = str(tmp_path / "sayac.json")
+    json_yaz(yol, {"n": 0})
+
+    def artir(veri):
+        veri["n"] += 1
+
+    def isci():
+        for _ in range(25):
+            json_guncelle(yol, artir, {})
+
+    threadler = [threading.Thread(target=isci) for _ in range(4)]
+    for t in threadler:
+        t.start()
+    for t in threadler:
+        t.join()
+    assert json_oku(yol)[0] == {"n": 100}
+
+
+def test_bayat_versiyonla_yazma_cakisir(tmp_path):
+    yol = str(tmp_path / "veri.json")
+    json_yaz(yol, {"a": 1})
+    _, ver = json_oku(yol)
+    json_yaz(yol, {"a": 2})
+
+    with pytest.raises(VersiyonCakismasi):
+        json_yaz(yol, {"a": 3}, beklenen_versiyon=ver, kontrol=True)
+    assert json_oku(yol)[0] == {"a": 2}
+
+
+def test_bozuk_dosya_bos_sayilmaz(tmp_path):
+    yol = tmp_path / "veri.json"
+    yol.write_text("{yarım", encoding="utf-8")
+    with pytest.raises(BozukDosyaHatasi):
+        json_oku(str(yol), {})
+
+
+def soru(metin):
+    return {"soru": metin, "secenekler": {"A": "1", "B": "2"}, "dogru_cevap": "A"}
+
+
+def test_soru_bankasi_cakismada_yeniden_yuklenir(tmp_path):
+    dosya = str(tmp_path / "soru_bankasi.json")
+    parcalar = str(tmp_path / "soru_parcalari")
+    json_yaz(dosya, {"Tarih": {"Osmanlı": [soru("ilk")]}})
+
+    birinci = SoruBankasiDeposu(dosya, parcalar)
+    ikinci = SoruBankasiDeposu(dosya, parcalar)
+    veri = birinci.veri()
+    ikinci.veri()
+
+    ikinci.kaydet({"Tarih": {"Osmanlı": [soru("ilk"), soru("ikinci")]}})
+    with pytest.raises(VersiyonCakismasi):
+        birinci.kaydet(veri)
+
+    birinci.yenile()
+    assert [s["soru"] for s in birinci.sorular("Tarih", "Osmanlı")] == ["ilk", "ikinci"]
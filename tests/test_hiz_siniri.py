@@ -0,0 +1,100 @@
+from unittest import mock
+
+from hiz_siniri import GirisHizSiniri
+
+
+def sinir(tmp_path, **ayar):
+    ayar = {"kapasite": 3, "dolum_suresi_dk": 1, "maks_kayit": 100, **ayar}
+    return GirisHizSiniri(str(tmp_path / "kpss.db"), **ayar)
+
+
+def saat(deger):
+    return mock.patch("hiz_siniri.time.time", return_value=deger)
+
+
+def test_jetonlar_biter_ve_zamanla_dolar(tmp_path):
+    s = sinir(tmp_path)
+    with saat(1000.0):
+        assert [s.basarisiz("ali") for _ in range(3)] == [2, 1, 0]
+        izin, bekleme, kalan = s.kontrol("ali")
+        assert not izin and kalan == 0
+        assert abs(bekleme - 20) < 1e-6  # 3 jeton / 60 sn → bir jeton 20 sn'de gelir
+
+    with saat(1020.0):
+        assert s.kontrol("ali")[0]
+    with saat(1060.0):
+        assert s.kontrol("ali") == (True, 0.0, 3)
+
+
+def test_basarili_giris_kovayi_sifirlar(tmp_path):
+    s = sinir(tmp_path)
+    s.basarisiz("ali")
+    s.temizle("ali")
+    assert s.kontrol("ali") == (True, 0.0, 3)
+
+
+def test_surecler_ayni_tabloyu_paylasir(tmp_path):
+    birinci, ikinci = sinir(tmp_path), sinir(tmp_path)
+    with saat(1000.0):
+        birinci.basarisiz("ali")
+        assert ikinci.basarisiz("ali") == 1
+
+
+def say(s):
+    return s._baglanti().execute("SELECT COUNT(*) FROM giris_sinirlari").fetchone()[0]
+
+
+def test_supurme_dolan_kovalari_siler(tmp_path):
+    s = sinir(tmp_path)
+    with saat(1000.0):
+        s.basarisiz("ali")
+    with saat(1050.0):
+        s.basarisiz("veli")
+    assert s.supur(1065.0) == 1  # ali'nin kovası dolmuş, veli'ninki dolmamış
+    assert say(s) == 1
+
+
+def test_supurme_kayit_sinirini_korur(tmp_path):
+    s = sinir(tmp_path, maks_kayit=2)
+    for i, ad in enumerate(["a", "b", "c", "d"]):
+        with saat(1000.0 + i):
+            s.basarisiz(ad)
+    assert s.supur(1004.0) == 2
+    assert {r[0] for r in s._baglanti().execute("SELECT anahtar FROM giris_sinirlari")} == {"c", "d"}
+
+
+def test_kilitli_kova_kayit_sinirinda_silinmez(tmp_path):
+    s = sinir(tmp_path, maks_kayit=2)
+    with saat(1000.0):
+        for _ in range(3):
+            s.basarisiz("kurban")
+    # Rastgele kullanıcı adı seli kurbanın kilidini kaldıramaz
+    for i in range(5):
+        with saat(1001.0 + i):
+            s.basarisiz(f"sahte{i}")
+    s.supur(1006.0)
+    with saat(1006.0):
+        assert not s.kontrol("kurban")[0]
+
+
+def test_eszamanli_denemeler_kapasiteyi_asamaz(tmp_path):
+    import threading
+    s = sinir(tmp_path)
+    izinler = []
+    baslangic = threading.Barrier(10)
+
+    def dene():
+        baslangic.wait()
+        izinler.append(sinir(tmp_path).al("ali")[0])
+
+    with saat(1000.0):
+        isciler = [threading.Thread(target=dene) for _ in range(10)]
+        for t in isciler:
+            t.start()
+        for t in isciler:
+            t.join()
+        assert izinler.count(True) == 3
+        # Sonuçlanmayan denemenin jetonu geri verilir
+        s.iade("ali")
+        assert s.al("ali")[:2] == (True, 0.0)
+        assert not s.al("ali")[0]
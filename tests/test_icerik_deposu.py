@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+import icerik_deposu
+from deneme_motoru import DenemeMotoru
+from depolama import VersiyonCakismasi
+from icerik_deposu import IcerikDeposu, denemeleri_dogrula, notlari_dogrula
+
+
+def _soru(metin, dogru="A"):
+    return {"soru": metin, "secenekler": {"A": "1", "B": "2"}, "dogru_cevap": dogru}
+
+
+@pytest.fixture
+def depo(tmp_path, monkeypatch):
+    # Değişiklik kontrolü her okumada yapılsın
+    monkeypatch.setattr(icerik_deposu, "YENILEME_ARALIGI_SN", 0)
+    return IcerikDeposu(str(tmp_path / "denemeler.json"), denemeleri_dogrula)
+
+
+def test_dosya_yoksa_bos_ve_kayit_surumu_arttirir(depo):
+    assert dict(depo) == {} and depo.surum == 0
+
+    assert depo.kaydet({"D1": {"Türkçe": [_soru("S1")]}}) == 1
+    assert depo.kaydet({"D1": {"Türkçe": [_soru("S1"), _soru("S2")]}}, beklenen_surum=1) == 2
+    assert len(depo["D1"]["Türkçe"]) == 2
+
+    # Başka oturumun eski taslağı üzerine yazamaz
+    with pytest.raises(VersiyonCakismasi):
+        depo.kaydet({"D1": {"Türkçe": []}}, beklenen_surum=1)
+    assert depo.surum == 2
+
+
+def test_baska_surecteki_degisiklik_yeniden_yuklenir(depo):
+    depo.kaydet({"D1": {"Türkçe": [_soru("S1")]}})
+    diger = IcerikDeposu(depo.dosya)
+    assert list(diger) == ["D1"]
+
+    depo.kaydet({"D2": {"Tarih": [_soru("S2")]}})
+    assert list(diger) == ["D2"] and diger.surum == 2
+
+
+def test_gecersiz_icerik_kaydedilmez(depo):
+    with pytest.raises(ValueError, match="doğru cevap"):
+        depo.kaydet({"D1": {"Türkçe": [_soru("S1", dogru="E")]}})
+    with pytest.raises(ValueError):
+        notlari_dogrula({"📖 Türkçe": {"1) Sözcükte Yapı": 5}})
+    assert depo.surum == 0
+
+
+def test_deneme_motoru_yeni_surumu_kullanir(depo, tmp_path):
+    depo.kaydet({"D1": {"Türkçe": [_soru("S1")]}})
+    motor = DenemeMotoru(depo, str(tmp_path / "veri.db"))
+    assert [s.soru for _, s in motor.sorular("D1")] == ["S1"]
+
+    depo.kaydet({"D1": {"Türkçe": [_soru("S1"), _soru("S2")]}})
+    assert [s.soru for _, s in motor.sorular("D1")] == ["S1", "S2"]
+
+
+def test_depodaki_icerik_gecerli():
+    # Depoyla gelen içerik dosyaları doğrulamadan geçer
+    import os
+    kok = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for ad, dogrula in ((icerik_deposu.DENEME_DOSYA, denemeleri_dogrula),
+                        (icerik_deposu.NOTLAR_DOSYA, notlari_dogrula)):
+        with open(os.path.join(kok, ad), encoding="utf-8") as f:
+            belge = json.load(f)
+        dogrula(belge["veri"])
+        assert belge["surum"] >= 1
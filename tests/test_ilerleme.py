@@ -0,0 +1,41 @@
+from ilerleme import IlerlemeOzeti
+
+
+def sonuclar():
+    return {
+        "Tarih": {
+            "Osmanlı": {"test_1": {"dogru": 7, "yanlis": 3}, "test_2": {"dogru": 5, "yanlis": 5}, "dogru": 12, "yanlis": 8},
+            "Cumhuriyet": {"test_1": {"dogru": 9, "yanlis": 1}, "dogru": 9, "yanlis": 1},
+        },
+        "Coğrafya": {"İklim": {"test_3": {"dogru": 4, "yanlis": 6}, "dogru": 4, "yanlis": 6}},
+        "Deneme": {"eski_kayit": 5},
+    }
+
+
+def test_ozet_sonuclardan_hesaplanir():
+    ozet = IlerlemeOzeti(sonuclar())
+    assert ozet.konu("Tarih", "Osmanlı") == (2, 12, 8)
+    assert ozet.ders("Tarih") == (3, 21, 9)
+    assert ozet.toplam == [4, 25, 15]
+    assert ozet.konu("Tarih", "Yok") == (0, 0, 0)
+    # Testi 4 olan konunun yarısı çözüldü; fazla çözüm %100'ü geçmez
+    assert ozet.konu_yuzdesi("Tarih", "Osmanlı", 4) == 50
+    assert ozet.konu_yuzdesi("Tarih", "Osmanlı", 1) == 100
+    assert ozet.konu_yuzdesi("Tarih", "Osmanlı", 0) == 0
+    assert IlerlemeOzeti.basari_orani(21, 9) == 70 and IlerlemeOzeti.basari_orani(0, 0) == 0
+
+
+def test_test_degistir_ozeti_ve_sonuclari_birlikte_gunceller():
+    ozet = IlerlemeOzeti(sonuclar())
+
+    # Yeniden çözülen test sayılmaz, yalnızca doğru/yanlış farkı eklenir
+    ozet.test_degistir("Tarih", "Osmanlı", 1, 10, 0)
+    assert ozet.konu("Tarih", "Osmanlı") == (2, 15, 5)
+    # Yeni test ve yeni konu
+    ozet.test_degistir("Coğrafya", "Akarsular", 1, 6, 4)
+    assert ozet.ders("Coğrafya") == (2, 10, 10)
+    assert ozet.toplam == [5, 34, 16]
+
+    # Özet, güncellenmiş sonuçlardan baştan hesaplananla aynı
+    yeniden = IlerlemeOzeti(ozet.sonuclar)
+    assert (yeniden.konular, yeniden.dersler, yeniden.toplam) == (ozet.konular, ozet.dersler, ozet.toplam)
@@ -0,0 +1,127 @@
+import os
+from io import BytesIO
+from unittest import mock
+
+from PIL import Image
+
+from image_handler import ImageHandler
+
+
+class Yuklenen(BytesIO):
+    """Streamlit UploadedFile yerine"""
+
+    def __init__(self, ad, icerik):
+        super().__init__(icerik)
+        self.name = ad
+        self.size = len(icerik)
+
+
+def _png(genislik, yukseklik):
+    tampon = BytesIO()
+    Image.new("RGBA", (genislik, yukseklik), (200, 30, 30, 128)).save(tampon, "PNG")
+    return tampon.getvalue()
+
+
+def test_yukleme_her_genislik_icin_kopya_uretir(tmp_path):
+    handler = ImageHandler(str(tmp_path / "resimler"))
+    yol = handler.upload_image(Yuklenen("harita.png", _png(1600, 800)))
+
+    with Image.open(yol) as ana:
+        assert ana.width == 800
+    for genislik in (320, 640, 800):
+        for uzanti in handler._uzantilar():
+            with Image.open(handler._boyut_yolu(yol, genislik, uzanti)) as kopya:
+                assert kopya.size == (genislik, genislik // 2)
+                assert kopya.mode == "RGB"
+
+    # Alt klasör resim listesine karışmaz
+    assert handler.list_all_images() == [yol]
+
+
+def test_ekrana_uyan_en_kucuk_kopya_secilir(tmp_path):
+    handler = ImageHandler(str(tmp_path / "resimler"))
+    yol = handler.upload_image(Yuklenen("harita.png", _png(1600, 800)))
+    uzanti = handler._uzantilar()[0]
+
+    assert handler._boyut_sec(yol, 300) == handler._boyut_yolu(yol, 320, uzanti)
+    assert handler._boyut_sec(yol, 480) == handler._boyut_yolu(yol, 640, uzanti)
+    assert handler._boyut_sec(yol, 2000) == handler._boyut_yolu(yol, 800, uzanti)
+
+    # Klasör dışındaki yollar olduğu gibi kalır
+    assert handler._boyut_sec(__file__, 300) == __file__
+
+    with mock.patch("image_handler.st.image") as st_image:
+        handler.display_image(yol, width=300)
+    assert st_image.call_args.args[0] == handler._boyut_yolu(yol, 320, uzanti)
+
+
+def test_eski_resimler_toplu_olarak_yeniden_uretilir(tmp_path):
+    klasor = tmp_path / "resimler"
+    klasor.mkdir()
+    Image.new("RGB", (500, 250), "white").save(klasor / "eski.jpg")
+    handler = ImageHandler(str(klasor))
+    yol = os.path.join(str(klasor), "eski.jpg")
+
+    # Kopya yokken ana dosya gösterilir
+    assert handler._boyut_sec(yol, 300) == yol
+
+    assert handler.boyutlari_yeniden_olustur() == (1, 0, 0)
+    assert handler.boyutlari_yeniden_olustur() == (0, 1, 0)
+    with Image.open(handler._boyut_yolu(yol, 640, "jpg")) as kopya:
+        assert kopya.width == 500  # büyütülmez
+    assert handler._boyut_sec(yol, 300) == handler._boyut_yolu(yol, 320, handler._uzantilar()[0])
+
+    assert handler.delete_image(yol)
+    assert os.listdir(handler.boyut_klasoru) == []
+
+
+def _banka(*yollar):
+    return {"Tarih": {"Osmanlı": [{"soru": str(i), "soru_resmi": y} for i, y in enumerate(yollar)]}}
+
+
+def test_ayni_resim_bir_kez_saklanir_ve_referansla_silinir(tmp_path):
+    handler = ImageHandler(str(tmp_path / "resimler"))
+    a = handler.upload_image(Yuklenen("a.png", _png(400, 200)))
+    b = handler.upload_image(Yuklenen("b.png", _png(400, 200)))
+    assert a == b and handler.list_all_images() == [a]
+
+    banka = _banka(a, b)
+    silinen = banka["Tarih"]["Osmanlı"].pop(0)
+    assert not handler.serbest_birak(silinen["soru_resmi"], banka)
+    assert os.path.exists(a)
+
+    banka["Tarih"]["Osmanlı"].pop(0)
+    assert handler.serbest_birak(b, banka)
+    assert not os.path.exists(a) and os.listdir(handler.boyut_klasoru) == []
+
+
+def test_cop_toplama_kullanilmayan_eski_resimleri_siler(tmp_path):
+    handler = ImageHandler(str(tmp_path / "resimler"))
+    kullanilan = handler.upload_image(Yuklenen("a.png", _png(400, 200)))
+    sahipsiz = handler.upload_image(Yuklenen("b.png", _png(300, 300)))
+    banka = _banka(kullanilan, "https://drive.google.com/file/d/1AbCdEfGhIjK/view")
+
+    # Yeni yüklenmiş resimlere bekleme süresince dokunulmaz
+    assert handler.cop_topla(banka, kuru=True) == []
+    assert handler.cop_topla(banka, kuru=True, bekleme_sn=-1) == [sahipsiz]
+
+    assert handler.cop_topla(banka, bekleme_sn=-1) == [sahipsiz]
+    assert handler.list_all_images() == [kullanilan]
+    assert all(ad.startswith(os.path.basename(kullanilan)[:-4]) for ad in os.listdir(handler.boyut_klasoru))
+
+
+def test_eski_adlandirilmis_resimler_icerige_gore_tasinir(tmp_path):
+    klasor = tmp_path / "resimler"
+    klasor.mkdir()
+    for ad in ("soru_1.jpg", "soru_2.jpg"):
+        Image.new("RGB", (100, 100), "white").save(klasor / ad)
+    handler = ImageHandler(str(klasor))
+    handler.boyutlari_yeniden_olustur()
+
+    banka = _banka(os.path.join(str(klasor), "soru_1.jpg"), os.path.join(str(klasor), "soru_2.jpg"))
+    assert handler.icerige_gore_tasi(banka) == 2
+
+    yeni = handler.list_all_images()
+    assert len(yeni) == 1
+    assert [s["soru_resmi"] for s in banka["Tarih"]["Osmanlı"]] == yeni * 2
+    assert handler.boyutlari_yeniden_olustur() == (0, 1, 0)
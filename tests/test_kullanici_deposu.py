@@ -0,0 +1,64 @@
+import pytest
+
+import kullanici_deposu
+from kullanici_deposu import JsonKullaniciDeposu, SQLiteKullaniciDeposu
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def depo(request, tmp_path):
+    if request.param == "json":
+        return JsonKullaniciDeposu(str(tmp_path / "kullanicilar.json"))
+    return SQLiteKullaniciDeposu(str(tmp_path / "kpss.db"))
+
+
+def kullanici(**ek):
+    return {"isim": "Ali", "sifre": "x", "is_admin": False, "sonuclar": {}, **ek}
+
+
+def test_tek_satir_upsert_konu_toplamini_korur(depo):
+    depo.kullanici_kaydet("ali", kullanici())
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 1, 7, 3)
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 2, 5, 5)
+    # Aynı test yeniden çözülünce eski sonuç toplamdan düşülür
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 1, 9, 1)
+
+    konu = depo.kullanici_getir("ali")["sonuclar"]["Tarih"]["Osmanlı"]
+    assert konu["test_1"] == {"dogru": 9, "yanlis": 1}
+    assert (konu["dogru"], konu["yanlis"]) == (14, 6)
+
+
+def test_profil_kaydi_sonuclara_dokunmaz(depo):
+    depo.kullanici_kaydet("ali", kullanici())
+    bayat = depo.kullanici_getir("ali")
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 1, 7, 3)
+
+    bayat["isim"] = "Ali Veli"
+    bayat["sonuclar"] = {}
+    depo.kullanici_kaydet("ali", bayat)
+
+    guncel = depo.kullanici_getir("ali")
+    assert guncel["isim"] == "Ali Veli"
+    assert guncel["sonuclar"]["Tarih"]["Osmanlı"]["test_1"] == {"dogru": 7, "yanlis": 3}
+
+
+def test_eski_deneme_yapisi_acilir():
+    sonuclar = {"📝 Deneme Sınavı": {"2023 KPSS": {"Türkçe": {"dogru": 20, "yanlis": 10}}}}
+    assert list(kullanici_deposu.test_satirlari(sonuclar)) == [("📝 Deneme Sınavı", "2023 KPSS - Türkçe", 1, 20, 10)]
+
+
+def test_taninmayan_yapi_hata_verir():
+    with pytest.raises(ValueError):
+        list(kullanici_deposu.test_satirlari({"Tarih": {"Osmanlı": {"not": "metin"}}}))
+
+
+def test_sqlite_aktarimi_sonuclari_korur(tmp_path):
+    sonuclar = {
+        "Tarih": {"Osmanlı": {"dogru": 10, "yanlis": 4, "test_1": {"dogru": 7, "yanlis": 3}}},
+        "📝 Deneme Sınavı": {"2023 KPSS": {"Türkçe": {"dogru": 20, "yanlis": 10}}},
+    }
+    depo = SQLiteKullaniciDeposu(str(tmp_path / "kpss.db"))
+    depo.tumunu_kaydet({"ali": kullanici(sonuclar=sonuclar)})
+
+    yuklenen = depo.kullanici_getir("ali")["sonuclar"]
+    assert yuklenen["Tarih"]["Osmanlı"] == sonuclar["Tarih"]["Osmanlı"]
+    assert yuklenen["📝 Deneme Sınavı"]["2023 KPSS - Türkçe"]["dogru"] == 20
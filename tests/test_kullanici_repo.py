@@ -0,0 +1,62 @@
+import pytest
+
+from kullanici_deposu import JsonKullaniciDeposu, SQLiteKullaniciDeposu
+from kullanici_repo import KullaniciRepository
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def depolar(request, tmp_path):
+    """Aynı dosya üzerinde iki depo: biri repository'nin, biri 'başka süreç'in"""
+    if request.param == "json":
+        yol = str(tmp_path / "kullanicilar.json")
+        return JsonKullaniciDeposu(yol), JsonKullaniciDeposu(yol)
+    yol = str(tmp_path / "kpss.db")
+    return SQLiteKullaniciDeposu(yol), SQLiteKullaniciDeposu(yol)
+
+
+def test_yazmalar_arasindaki_okumalar_onbellekten_gelir(depolar):
+    depo, _ = depolar
+    depo.kullanici_kaydet("ali", {"isim": "Ali", "sifre": "x", "is_admin": True})
+    repo = KullaniciRepository(depo)
+
+    assert repo.kullanici_getir("ali")["isim"] == "Ali"
+    iska = repo.iska
+    for _ in range(5):
+        assert repo.alan("ali", "is_admin")
+        assert repo.var_mi("ali")
+        assert not repo.var_mi("veli")
+    assert repo.iska - iska <= 1  # SQLite'ta "veli" bir kez sorgulanır
+
+
+def test_baska_surecin_yazmasi_onbellegi_gecersiz_kilar(depolar):
+    depo, baska = depolar
+    depo.kullanici_kaydet("ali", {"isim": "Ali", "sifre": "x"})
+    repo = KullaniciRepository(depo)
+    assert repo.kullanici_getir("ali")["isim"] == "Ali"
+
+    baska.kullanici_kaydet("ali", {"isim": "Ali Veli", "sifre": "x"})
+    baska.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 1, 7, 3)
+
+    ali = repo.kullanici_getir("ali")
+    assert ali["isim"] == "Ali Veli"
+    assert ali["sonuclar"]["Tarih"]["Osmanlı"]["test_1"] == {"dogru": 7, "yanlis": 3}
+
+
+def test_yazma_hemen_gorunur_ve_kopyalar_ayridir(depolar):
+    depo, _ = depolar
+    repo = KullaniciRepository(depo)
+    repo.kullanici_kaydet("ali", {"isim": "Ali", "sifre": "x"})
+    assert repo.var_mi("ali")
+
+    kopya = repo.kullanici_getir("ali")
+    kopya["isim"] = "değişti"
+    assert repo.kullanici_getir("ali")["isim"] == "Ali"
+
+    repo.test_sonuclarini_uygula([{
+        "kullanici": "ali", "ders": "Tarih", "konu": "Osmanlı",
+        "test_no": 1, "dogru": 7, "yanlis": 3, "zaman": "2024-05-01T10:00:00",
+    }])
+    assert repo.kullanici_getir("ali")["sonuclar"]["Tarih"]["Osmanlı"]["dogru"] == 7
+
+    assert repo.kullanici_sil("ali")
+    assert not repo.var_mi("ali")
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from oturum_deposu import OturumDeposu
+
+
+def depo(tmp_path, **ayar):
+    ayar = {"omur_saat": 1, "anahtar": "gizli", "onbellek_boyu": 100, "onbellek_sn": 60, **ayar}
+    return OturumDeposu(str(tmp_path / "kpss.db"), **ayar)
+
+
+def test_jeton_kullaniciya_cozulur(tmp_path):
+    d = depo(tmp_path)
+    cerez = d.olustur("ali")
+    assert d.coz(cerez) == "ali"
+    # Önbellek boşken de veritabanından çözülür
+    assert depo(tmp_path).coz(cerez) == "ali"
+
+
+def test_imzasi_tutmayan_jeton_reddedilir(tmp_path):
+    d = depo(tmp_path)
+    jeton, imza = d.olustur("ali").rsplit(".", 1)
+    assert d.coz(f"{jeton}.{'0' * len(imza)}") is None
+    assert d.coz(jeton) is None
+    assert d.coz(None) is None
+    # Başka anahtarla imzalanmış jeton da geçmez
+    assert depo(tmp_path, anahtar="baska").coz(f"{jeton}.{imza}") is None
+
+
+def test_anahtar_verilmezse_veritabanindaki_ortak_anahtar_kullanilir(tmp_path, monkeypatch):
+    monkeypatch.setattr("oturum_deposu.Config.OTURUM_ANAHTARI", None)
+    cerez = depo(tmp_path, anahtar=None).olustur("ali")
+    # Başka işçi ya da yeniden başlatılan süreç aynı jetonu kabul eder
+    assert depo(tmp_path, anahtar=None).coz(cerez) == "ali"
+
+
+def test_suresi_dolan_oturum_kapanir(tmp_path):
+    d = depo(tmp_path)
+    with mock.patch("oturum_deposu.time.time", return_value=1000.0):
+        cerez = d.olustur("ali")
+    with mock.patch("oturum_deposu.time.time", return_value=1000.0 + 3599):
+        assert d.coz(cerez) == "ali"
+    with mock.patch("oturum_deposu.time.time", return_value=1000.0 + 3601):
+        assert d.coz(cerez) is None
+
+
+def test_supurme_suresi_dolanlari_siler(tmp_path):
+    d = depo(tmp_path)
+    with mock.patch("oturum_deposu.time.time", return_value=1000.0):
+        d.olustur("ali")
+    with mock.patch("oturum_deposu.time.time", return_value=2000.0):
+        yeni = d.olustur("veli")
+    assert d.supur(1000.0 + 3601) == 1
+    with mock.patch("oturum_deposu.time.time", return_value=4700.0):
+        assert d.coz(yeni) == "veli"
+
+
+def test_cikis_ve_toplu_iptal(tmp_path):
+    d = depo(tmp_path)
+    baska_surec = depo(tmp_path, onbellek_sn=0)
+    birinci, ikinci, ucuncu = d.olustur("ali"), d.olustur("ali"), d.olustur("veli")
+
+    d.sil(birinci)
+    assert d.coz(birinci) is None
+    assert baska_surec.coz(birinci) is None
+
+    assert d.kullanici_oturumlarini_sil("ali", haric=ucuncu) == 1
+    assert d.coz(ikinci) is None
+    assert d.coz(ucuncu) == "veli"
+
+
+def test_lru_siniri(tmp_path):
+    d = depo(tmp_path, onbellek_boyu=2)
+    cerezler = [d.olustur(f"k{i}") for i in range(3)]
+    assert len(d._onbellek) == 2
+    # Önbellekten düşen oturum veritabanından çözülmeye devam eder
+    assert d.coz(cerezler[0]) == "k0"
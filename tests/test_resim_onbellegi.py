@@ -0,0 +1,120 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from resim_onbellegi import DriveOnbellegi, drive_kimligi
+
+
+class SahteDrive:
+    """Yerel HTTP sunucusu: kimlik → (içerik, etag); ETag eşleşirse 304 döner"""
+
+    def __init__(self):
+        self.dosyalar = {}
+        self.istekler = []
+        drive = self
+
+        class Isleyici(BaseHTTPRequestHandler):
+            def do_GET(self):
+                kimlik = parse_qs(urlparse(self.path).query)["id"][0]
+                drive.istekler.append((kimlik, self.headers.get("If-None-Match")))
+                if kimlik not in drive.dosyalar:
+                    self.send_error(404)
+                    return
+                icerik, etag = drive.dosyalar[kimlik]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(icerik)))
+                self.end_headers()
+                self.wfile.write(icerik)
+
+            def log_message(self, *args):
+                pass
+
+        self.sunucu = ThreadingHTTPServer(("127.0.0.1", 0), Isleyici)
+        self.url = f"http://127.0.0.1:{self.sunucu.server_port}/uc?id={{id}}"
+        threading.Thread(target=self.sunucu.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def drive():
+    sahte = SahteDrive()
+    yield sahte
+    sahte.sunucu.shutdown()
+
+
+def _onbellek(drive, tmp_path, **ayar):
+    return DriveOnbellegi(str(tmp_path / "onbellek"), str(tmp_path / "kpss.db"),
+                          url_sablonu=drive.url, **ayar)
+
+
+def test_drive_kimligi():
+    assert drive_kimligi("https://drive.google.com/file/d/1AbC_def-GHIjk/view?usp=sharing") == "1AbC_def-GHIjk"
+    assert drive_kimligi("https://drive.google.com/uc?export=view&id=1AbC_def-GHIjk") == "1AbC_def-GHIjk"
+    assert drive_kimligi("soru_resimleri/a.jpg") is None
+
+
+def test_ilk_gosterimde_indirilir_sonra_diskten_gelir(drive, tmp_path):
+    drive.dosyalar["resim_00001"] = (b"\x89PNG birinci", '"v1"')
+    onbellek = _onbellek(drive, tmp_path)
+
+    yol = onbellek.yol("resim_00001")
+    assert open(yol, "rb").read() == b"\x89PNG birinci"
+    assert onbellek.yol("resim_00001") == yol
+    assert len(drive.istekler) == 1 and onbellek.isabet == 1
+
+
+def test_eskiyen_kopya_etag_ile_dogrulanir(drive, tmp_path):
+    drive.dosyalar["resim_00001"] = (b"\x89PNG birinci", '"v1"')
+    onbellek = _onbellek(drive, tmp_path, tazelik_sn=0)
+
+    ilk = onbellek.yol("resim_00001")
+    assert onbellek.yol("resim_00001") == ilk
+    assert drive.istekler[-1] == ("resim_00001", '"v1"') and onbellek.dogrulama == 1
+
+    # Drive'da dosya değişti: yeni içerik yeni adrese yazılır, eskisi silinir
+    drive.dosyalar["resim_00001"] = (b"\x89PNG ikinci", '"v2"')
+    yeni = onbellek.yol("resim_00001")
+    assert yeni != ilk and open(yeni, "rb").read() == b"\x89PNG ikinci"
+    assert not os.path.exists(ilk)
+
+    # Drive'a ulaşılamazsa eski kopya kullanılır
+    drive.sunucu.shutdown()
+    drive.sunucu.server_close()
+    assert onbellek.yol("resim_00001") == yeni
+
+
+def test_ayni_icerik_bir_kez_tutulur_ve_lru_cikarilir(drive, tmp_path):
+    for i in range(4):
+        drive.dosyalar[f"resim_0000{i}"] = (b"\x89PNG" + bytes([i]) * 400_000, f'"{i}"')
+    drive.dosyalar["resim_kopya"] = drive.dosyalar["resim_00000"]
+    onbellek = _onbellek(drive, tmp_path, maks_mb=1)
+
+    a = onbellek.yol("resim_00000")
+    assert onbellek.yol("resim_kopya") == a
+    assert onbellek.toplam_boyut() == 400_004
+
+    onbellek.yol("resim_00001")
+    onbellek.yol("resim_00002")  # sınır aşıldı: en eski (00000 + kopyası) çıkar
+    assert not os.path.exists(a)
+    assert onbellek.toplam_boyut() <= 1024 * 1024
+
+
+def test_onceden_getirme(drive, tmp_path):
+    for i in range(3):
+        drive.dosyalar[f"resim_0000{i}"] = (b"\x89PNG" + bytes([i]), f'"{i}"')
+    onbellek = _onbellek(drive, tmp_path)
+
+    isler = onbellek.onceden_getir(["resim_00000", "resim_00001", "resim_00001", "resim_00002"])
+    assert len(isler) == 3
+    assert all(os.path.exists(i.result(timeout=5)) for i in isler)
+
+    onbellek.yol("resim_00001")
+    assert len(drive.istekler) == 3 and onbellek.isabet == 1
@@ -0,0 +1,65 @@
+import bcrypt
+import pytest
+
+import sifre_gocu
+from kullanici_deposu import SQLiteKullaniciDeposu
+from sifre_havuzu import SifreHavuzu, SifreHavuzuMesgul
+
+HAZIR_HASH = bcrypt.hashpw(b"zaten", bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+
+@pytest.fixture
+def depo(tmp_path, monkeypatch):
+    monkeypatch.setattr(sifre_gocu, "sifre_havuzu", SifreHavuzu(isci_sayisi=1, rounds=4))
+    depo = SQLiteKullaniciDeposu(str(tmp_path / "kpss.db"))
+    for ad, sifre in (("a", "sifre-a"), ("b", HAZIR_HASH), ("c", "sifre-c"), ("d", "sifre-d"), ("e", "sifre-e")):
+        depo.kullanici_kaydet(ad, {"isim": ad, "sifre": sifre, "is_admin": False, "sonuclar": {}})
+    return depo
+
+
+def gocu(depo, tmp_path):
+    return sifre_gocu.SifreGocu(depo, str(tmp_path / "konum.json"), parti=2, aralik=0)
+
+
+def sifreler(depo):
+    return dict(depo.sifre_parti("", 100))
+
+
+def test_yarida_kalan_goc_konumdan_devam_eder(depo, tmp_path, monkeypatch):
+    ilk = gocu(depo, tmp_path)
+    assert ilk.parti_isle()
+    assert ilk.konum()["son"] == "b"
+
+    # İkinci parti hashlenirken süreç "çöker": konum ilerlemez, parti yazılmaz
+    gercek = sifre_gocu.sifre_havuzu.hashle
+
+    def yarida_kes(sifre):
+        if sifre == "sifre-d":
+            raise SifreHavuzuMesgul("meşgul")
+        return gercek(sifre)
+
+    monkeypatch.setattr(sifre_gocu.sifre_havuzu, "hashle", yarida_kes)
+    with pytest.raises(SifreHavuzuMesgul):
+        ilk.parti_isle()
+    assert ilk.konum()["son"] == "b" and sifreler(depo)["c"] == "sifre-c"
+    monkeypatch.setattr(sifre_gocu.sifre_havuzu, "hashle", gercek)
+
+    # Yeniden başlayan süreç yalnızca kalanları tarar
+    okunan = []
+    sifre_parti = depo.sifre_parti
+    monkeypatch.setattr(depo, "sifre_parti", lambda bas, adet: okunan.append(bas) or sifre_parti(bas, adet))
+    assert gocu(depo, tmp_path).calistir() == (4, 5)
+    assert okunan[0] == "b"
+
+    for ad, sifre in sifreler(depo).items():
+        assert bcrypt.checkpw(("zaten" if ad == "b" else f"sifre-{ad}").encode(), sifre.encode())
+
+
+def test_hashli_sifre_yeniden_hashlenmez(depo, tmp_path):
+    gocu(depo, tmp_path).calistir()
+    assert sifreler(depo)["b"] == HAZIR_HASH
+
+    # Bitmiş göç yeniden çalıştırılınca hiçbir şeye dokunmaz
+    once = sifreler(depo)
+    assert not gocu(depo, tmp_path).parti_isle()
+    assert sifreler(depo) == once
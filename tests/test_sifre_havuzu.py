@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from sifre_havuzu import SifreHavuzu, SifreHavuzuMesgul, bcrypt_hash_mi
+
+
+def havuz(**ayar):
+    ayar = {"isci_sayisi": 1, "kuyruk_boyu": 0, "zaman_asimi": 5, "rounds": 4, **ayar}
+    return SifreHavuzu(**ayar)
+
+
+def mesgul_et(h):
+    """İşçiyi bırakılana kadar meşgul eden bir iş başlat"""
+    basladi, birak = threading.Event(), threading.Event()
+
+    def is_():
+        basladi.set()
+        birak.wait(5)
+
+    t = threading.Thread(target=h._calistir, args=("hashle", is_))
+    t.start()
+    assert basladi.wait(5)
+    return birak, t
+
+
+def test_hashle_ve_dogrula():
+    h = havuz()
+    hashli = h.hashle("gizli123")
+    assert bcrypt_hash_mi(hashli)
+    assert h.dogrula("gizli123", hashli) and not h.dogrula("yanlis", hashli)
+    assert not h.dogrula("gizli123", "bozuk")
+    assert h.istatistikler()["hashle"]["adet"] == 1
+
+
+def test_kuyruk_doluysa_hemen_reddeder():
+    h = havuz()
+    birak, t = mesgul_et(h)
+    with pytest.raises(SifreHavuzuMesgul, match="dolu"):
+        h.hashle("gizli123")
+    birak.set()
+    t.join()
+    # Yer boşalınca yeniden kabul eder
+    assert h.dogrula("x", h.hashle("x"))
+    assert h.istatistikler()["reddedilen"] == 1
+
+
+def test_kuyrukta_bekleyen_zaman_asimina_ugrar():
+    h = havuz(kuyruk_boyu=1, zaman_asimi=0.1)
+    # İşçiyi doğrudan meşgul et (kendi zaman aşımı olmayan iş)
+    birak = threading.Event()
+    mesgul = h._havuz.submit(birak.wait, 5)
+    with pytest.raises(SifreHavuzuMesgul, match="zaman aşımı"):
+        h.hashle("gizli123")
+    birak.set()
+    mesgul.result()
+    istatistik = h.istatistikler()
+    assert (istatistik["bekleyen"], istatistik["reddedilen"]) == (0, 1)
+    assert h._yer.acquire(blocking=False) and h._yer.acquire(blocking=False)
+
+
+def test_kapat_bekleyenleri_ve_yeni_isleri_reddeder():
+    h = havuz(kuyruk_boyu=1)
+    birak, t = mesgul_et(h)
+    hatalar = []
+
+    def bekleyen():
+        try:
+            h.hashle("gizli123")
+        except SifreHavuzuMesgul as e:
+            hatalar.append(str(e))
+
+    kuyrukta = threading.Thread(target=bekleyen)
+    kuyrukta.start()
+    while h.istatistikler()["bekleyen"] < 2:
+        pass
+    h.kapat()
+    kuyrukta.join(5)
+    with pytest.raises(SifreHavuzuMesgul, match="kapatıldı"):
+        h.hashle("gizli123")
+    birak.set()
+    t.join()
+
+    assert hatalar == ["Şifre havuzu kapatıldı"]
+    assert h.istatistikler()["bekleyen"] == 0
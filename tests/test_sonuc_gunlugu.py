@@ -0,0 +1,55 @@
+import os
+from datetime import datetime
+
+from kullanici_deposu import JsonKullaniciDeposu
+from sonuc_gunlugu import GunlukSikistirici, KONUM_DOSYASI, SonucGunlugu
+
+
+def kur(tmp_path):
+    gunluk = SonucGunlugu(str(tmp_path / "gunluk"))
+    depo = JsonKullaniciDeposu(str(tmp_path / "kullanicilar.json"))
+    depo.kullanici_kaydet("ali", {"isim": "Ali", "sifre": "x", "sonuclar": {}})
+    return gunluk, depo, GunlukSikistirici(gunluk, depo)
+
+
+def test_sikistirma_kayitlari_isler_ve_konumu_ilerletir(tmp_path):
+    gunluk, depo, sikistirici = kur(tmp_path)
+    gunluk.ekle("ali", "Tarih", "Osmanlı", 1, 7, 3)
+    gunluk.ekle("ali", "Tarih", "Osmanlı", 2, 5, 5)
+    gunluk.kapat()
+
+    assert len(sikistirici.bekleyen_kayitlar("ali")) == 2
+    assert sikistirici.calistir() == 2
+    assert sikistirici.calistir() == 0
+    assert sikistirici.bekleyen_kayitlar("ali") == []
+
+    konu = depo.kullanici_getir("ali")["sonuclar"]["Tarih"]["Osmanlı"]
+    assert (konu["dogru"], konu["yanlis"]) == (12, 8)
+
+
+def test_tekrar_islemek_sonucu_degistirmez(tmp_path):
+    gunluk, depo, sikistirici = kur(tmp_path)
+    gunluk.ekle("ali", "Tarih", "Osmanlı", 1, 7, 3)
+    gunluk.ekle("ali", "Tarih", "Osmanlı", 1, 9, 1)
+    gunluk.kapat()
+    sikistirici.calistir()
+    ilk = depo.kullanici_getir("ali")["sonuclar"]
+
+    # Konum dosyası kaybolursa (ör. yazılmadan çökme) günlük baştan yeniden işlenir
+    os.remove(os.path.join(gunluk.klasor, KONUM_DOSYASI))
+    assert sikistirici.calistir() == 2
+    assert depo.kullanici_getir("ali")["sonuclar"] == ilk
+    assert ilk["Tarih"]["Osmanlı"] == {"dogru": 9, "yanlis": 1, "test_1": {"dogru": 9, "yanlis": 1}}
+
+
+def test_yarim_satir_okunmaz(tmp_path):
+    gunluk, _, _ = kur(tmp_path)
+    gunluk.ekle("ali", "Tarih", "Osmanlı", 1, 7, 3, zaman=datetime(2024, 5, 1))
+    gunluk.kapat()
+    yol = os.path.join(gunluk.klasor, "2024-05.jsonl")
+    with open(yol, "ab") as f:
+        f.write(b'{"kullanici": "ali", "ders"')
+
+    kayitlar, ofset = gunluk.oku("2024-05.jsonl")
+    assert len(kayitlar) == 1
+    assert ofset < os.path.getsize(yol)
@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+
+from depolama import BozukDosyaHatasi, VersiyonCakismasi, json_oku, json_yaz
+from soru_bankasi import (
+    MANIFEST_ADI, SoruBankasiDeposu, json_dan_parcala, konu_degistir, parcalardan_json, parcali_kaydet,
+    parcali_yukle
+)
+
+
+def banka():
+    return {
+        "Tarih": {
+            "Osmanlı": [
+                {"soru": f"Osmanlı {i}", "secenekler": {"A": "1", "B": "2"}, "dogru_cevap": "A", "cozum": ""}
+                for i in range(7)
+            ],
+            "Cumhuriyet": [
+                {"soru": "Cumhuriyet", "secenekler": {"A": "x"}, "dogru_cevap": "A", "soru_resmi": "r.png"}
+            ],
+        },
+        "Coğrafya": {"İklim": [{"soru": "İklim", "secenekler": {}, "dogru_cevap": "B", "maddeler": ["I", "II"]}]},
+    }
+
+
+def test_parcala_birlestir_ayni_dosyayi_verir(tmp_path):
+    kaynak = str(tmp_path / "soru_bankasi.json")
+    hedef = str(tmp_path / "geri.json")
+    klasor = str(tmp_path / "soru_parcalari")
+    json_yaz(kaynak, banka())
+
+    assert json_dan_parcala(kaynak, klasor) == 3
+    assert parcalardan_json(klasor, hedef) == 3
+    assert json_oku(hedef)[0] == banka()
+
+
+def test_acilmayan_konu_yeniden_yazilmaz(tmp_path):
+    klasor = str(tmp_path / "soru_parcalari")
+    parcali_kaydet(banka(), klasor)
+    veri, _ = parcali_yukle(klasor)
+    dosyalar = set(os.listdir(klasor))
+
+    veri["Tarih"]["Osmanlı"] = veri["Tarih"]["Osmanlı"][:2]
+    parcali_kaydet(veri, klasor)
+
+    yeni = set(os.listdir(klasor))
+    assert len(yeni - dosyalar) == 1 and len(dosyalar - yeni) == 1
+    assert not veri["Coğrafya"].yuklu_mu("İklim")
+    assert parcali_yukle(klasor)[0]["Tarih"].adet("Osmanlı") == 2
+
+
+def test_bozuk_parca_fark_edilir(tmp_path):
+    klasor = str(tmp_path / "soru_parcalari")
+    parcali_kaydet(banka(), klasor)
+    with open(os.path.join(klasor, MANIFEST_ADI), encoding="utf-8") as f:
+        dosya = json.load(f)["dersler"]["Coğrafya"]["İklim"]["dosya"]
+    with open(os.path.join(klasor, dosya), "w", encoding="utf-8") as f:
+        f.write("[]")
+
+    veri, _ = parcali_yukle(klasor)
+    with pytest.raises(BozukDosyaHatasi):
+        veri["Coğrafya"]["İklim"]
+
+
+def test_depo_testlere_boler(tmp_path):
+    dosya = str(tmp_path / "soru_bankasi.json")
+    json_yaz(dosya, banka())
+    depo = SoruBankasiDeposu(dosya, str(tmp_path / "soru_parcalari"))
+
+    assert depo.test_sayisi("Tarih", "Osmanlı") == 2
+    assert [s["soru"] for s in depo.test_sorulari("Tarih", "Osmanlı", 2)] == ["Osmanlı 5", "Osmanlı 6"]
+    assert depo.test_no_bul("Tarih", "Osmanlı", 5) == 2
+    assert depo.toplam_soru_sayisi() == 9
+
+
+def test_konu_degisikligi_kayit_basarisizsa_paylasilan_bankaya_yansimaz(tmp_path):
+    klasor = str(tmp_path / "soru_parcalari")
+    parcali_kaydet(banka(), klasor)
+    depo = SoruBankasiDeposu(str(tmp_path / "soru_bankasi.json"), klasor)
+    paylasilan = depo.veri()
+
+    sorular = list(depo.sorular("Tarih", "Osmanlı"))[:3]
+    kopya = konu_degistir(paylasilan, "Tarih", "Osmanlı", sorular)
+    assert len(paylasilan["Tarih"]["Osmanlı"]) == 7
+
+    # Başka süreç arada kaydetti: çakışma, paylasilan banka olduğu gibi kalır
+    diger = SoruBankasiDeposu(str(tmp_path / "soru_bankasi.json"), klasor)
+    diger.kaydet(konu_degistir(diger.veri(), "Tarih", "Osmanlı", sorular[:1]))
+    with pytest.raises(VersiyonCakismasi):
+        depo.kaydet(kopya)
+    assert depo.soru_sayisi("Tarih", "Osmanlı") == 7
+
+    depo.yenile()
+    assert depo.soru_sayisi("Tarih", "Osmanlı") == 1
+    depo.kaydet(konu_degistir(depo.veri(), "Tarih", "Osmanlı", sorular))
+    assert depo.soru_sayisi("Tarih", "Osmanlı") == 3
+    assert parcali_yukle(klasor)[0]["Tarih"].adet("Osmanlı") == 3
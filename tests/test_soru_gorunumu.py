@@ -0,0 +1,47 @@
+from soru_gorunumu import GorunumOnbellegi, soru_kimligi
+from soru_modeli import Soru
+
+
+def _soru(**degisen):
+    veri = {
+        "soru": "Hangisi doğrudur?",
+        "maddeler": ["I. Birinci", "II. İkinci"],
+        "secenekler": {"A": "Yalnız I", "B": "Yalnız II", "C": "I ve II"},
+        "dogru_cevap": "C",
+        "cozum": "İkisi de doğru",
+        "soru_resmi": "Yok",
+    }
+    veri.update(degisen)
+    return Soru.dict_ten(veri)
+
+
+def test_gorunum_hazir_metinleri_icerir():
+    gorunum = GorunumOnbellegi().al(_soru())
+
+    assert gorunum.resim is None
+    assert gorunum.harfler == ("A", "B", "C")
+    assert gorunum.etiketler["B"] == "B) Yalnız II"
+    assert gorunum.maddeler[1] == "<div style='margin:2px 0'>II. İkinci</div>"
+    assert gorunum.yanlis_mesaji == "❌ Yanlış! Doğru Cevap: C) I ve II"
+    assert gorunum.cozum_mesaji == "**Çözüm:** İkisi de doğru"
+
+
+def test_ayni_soru_yeniden_uretilmez_duzenlenen_soru_uretilir():
+    onbellek = GorunumOnbellegi()
+    ilk = onbellek.al(_soru())
+
+    # Testi yeniden açan başka bir oturum: farklı nesne, aynı içerik
+    assert onbellek.al(_soru()) is ilk
+    assert (onbellek.isabet, onbellek.iska) == (1, 1)
+
+    duzenlenen = onbellek.al(_soru(cozum="Yeni çözüm"))
+    assert duzenlenen is not ilk and duzenlenen.cozum_mesaji == "**Çözüm:** Yeni çözüm"
+    assert soru_kimligi(_soru()) != soru_kimligi(_soru(soru_resmi="a.jpg"))
+
+
+def test_lru_siniri():
+    onbellek = GorunumOnbellegi(boyut=2)
+    for i in range(3):
+        onbellek.al(_soru(soru=f"Soru {i}"))
+    onbellek.al(_soru(soru="Soru 0"))
+    assert onbellek.iska == 4
@@ -0,0 +1,77 @@
+import pytest
+
+from config import Config
+from soru_istatistikleri import SoruIstatistikleri, soru_anahtari
+from soru_modeli import Soru
+
+
+def _soru(metin, dogru="A"):
+    return Soru.dict_ten({
+        "soru": metin,
+        "secenekler": {h: f"{metin} {h}" for h in "ABCDE"},
+        "dogru_cevap": dogru,
+    })
+
+
+@pytest.fixture
+def istatistik(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SORU_ANALIZ_EN_AZ_DENEME", 1)
+    return SoruIstatistikleri(str(tmp_path / "veri.db"), aralik=3600)
+
+
+def test_sayaclar_birlestirilip_toplu_yazilir(istatistik):
+    sorular = [_soru("S1"), _soru("S2", dogru="B")]
+    istatistik.test_ekle("Tarih", "Osmanlı", sorular, {0: "A", 1: "C"}, {0: 12.0, 1: 5000.0})
+    istatistik.test_ekle("Tarih", "Osmanlı", sorular, {0: "B", 1: "B"}, {0: 8.0})
+
+    # İki test, iki soru: tek boşaltmada iki satır
+    assert istatistik.bosalt() == 2
+    assert istatistik.bosalt() == 0
+
+    s1, s2 = sorted(istatistik.maddeler(), key=lambda m: m["ozet"])
+    assert (s1["deneme"], s1["dogru"], s1["secim_a"], s1["secim_b"]) == (2, 1, 1, 1)
+    assert s1["p"] == 0.5
+    assert s1["ortalama_sure"] == 10.0
+    # Üst sınırı aşan süre ortalamaya katılmaz
+    assert s2["sure_adet"] == 0 and s2["ortalama_sure"] is None
+    assert s2["celdiriciler"] == {"A": 0.0, "C": 0.5, "D": 0.0, "E": 0.0}
+
+
+def test_ayirt_edicilik_ve_uyarilar(istatistik):
+    sorular = [_soru("Ayırt eden"), _soru("Ters"), _soru("Dolgu 1"), _soru("Dolgu 2")]
+    # Güçlü öğrenciler ilk soruyu doğru, "Ters"i yanlış yapıyor; zayıflar tersini
+    for _ in range(5):
+        istatistik.test_ekle("Tarih", "Osmanlı", sorular, {0: "A", 1: "B", 2: "A", 3: "A"})
+        istatistik.test_ekle("Tarih", "Osmanlı", sorular, {0: "B", 1: "A", 2: "B", 3: "B"})
+
+    maddeler = {m["ozet"]: m for m in istatistik.maddeler()}
+    assert maddeler["Ayırt eden"]["ayirt"] > 0.9
+    assert maddeler["Ters"]["ayirt"] < -0.9
+    assert "negatif ayırt edicilik" in maddeler["Ters"]["uyarilar"]
+    assert "hiç seçilmeyen çeldirici" in maddeler["Ayırt eden"]["uyarilar"]
+    assert [m["ozet"] for m in istatistik.maddeler(en_az_deneme=11)] == []
+
+
+def test_cevap_anahtari_degisince_yeni_madde(istatistik):
+    assert soru_anahtari(_soru("S1")) == soru_anahtari(_soru("S1"))
+    assert soru_anahtari(_soru("S1")) != soru_anahtari(_soru("S1", dogru="C"))
+    assert soru_anahtari(Soru.dict_ten({**_soru("S1").to_dict(), "id": "abc"})) == "abc"
+
+    istatistik.test_ekle("Tarih", "Osmanlı", [_soru("S1")], {0: "A"})
+    istatistik.test_ekle("Tarih", "Osmanlı", [_soru("S1", dogru="C")], {0: "C"})
+    assert len(istatistik.maddeler(ders="Tarih", konu="Osmanlı")) == 2
+    assert istatistik.maddeler(ders="Coğrafya") == []
+
+
+def test_yarida_kalan_parti_geri_alinir(istatistik):
+    istatistik.test_ekle("Tarih", "Osmanlı", [_soru("S1")], {0: "A"})
+    # NOT NULL kısıtına takılan ikinci satır partiyi yarıda keser
+    bozuk = ((None, "Osmanlı", "Bozuk", "A"), [1] + [0] * 13)
+    istatistik._bekleyen["bozuk"] = bozuk
+    with pytest.raises(Exception):
+        istatistik.bosalt()
+
+    # Parti kuyruğa geri döndü; ilk satır da yazılmamış olmalı (iki kez sayılmaz)
+    del istatistik._bekleyen["bozuk"]
+    assert istatistik.bosalt() == 1
+    assert [m["deneme"] for m in istatistik.maddeler()] == [1]
@@ -0,0 +1,66 @@
+import pytest
+
+from config import Config
+from soru_modeli import Soru
+from tekrar import GUN_SN, Kart, TekrarDeposu, TekrarKuyrugu, sm2
+
+SIMDI = 1_700_000_000.0
+
+
+def _soru(metin, dogru="A"):
+    return {"soru": metin, "secenekler": {h: f"{metin} {h}" for h in "ABCDE"}, "dogru_cevap": dogru}
+
+
+@pytest.fixture
+def depo(tmp_path):
+    return TekrarDeposu(str(tmp_path / "veri.db"))
+
+
+def test_sm2_araliklari():
+    kart = Kart("x", "Tarih", "Osmanlı")
+    assert [sm2(kart, 4, SIMDI).aralik for _ in range(3)] == [1.0, 6.0, 15.0]
+    assert kart.vade == SIMDI + 15 * GUN_SN
+
+    # Unutulan kart baştan öğrenilir, kolaylığı düşer
+    sm2(kart, 1, SIMDI)
+    assert (kart.tekrar, kart.aralik, kart.hata) == (0, 0.0, 1)
+    assert kart.vade == SIMDI + Config.TEKRAR_YENIDEN_DK * 60
+    assert kart.kolaylik == pytest.approx(1.96)
+
+
+def test_kuyruk_vadesi_en_yakin_karti_verir():
+    kartlar = [Kart(str(i), "T", "K", vade=SIMDI + v) for i, v in enumerate([50, -100, 10, 99999])]
+    kuyruk = TekrarKuyrugu(kartlar)
+
+    assert [kuyruk.siradaki(SIMDI, onden_sn=60).anahtar for _ in range(3)] == ["1", "2", "0"]
+    assert kuyruk.siradaki(SIMDI, onden_sn=60) is None
+    assert len(kuyruk) == 1
+
+
+def test_testteki_yanlislar_kart_olur_ve_oturuma_gelir(depo):
+    ham = [_soru("S1"), _soru("S2"), _soru("S3")]
+    sorular = [Soru.dict_ten(s) for s in ham]
+
+    assert depo.test_isle("ali", "Tarih", "Osmanlı", sorular, {0: "A", 1: "B", 2: "C"}, simdi=SIMDI) == 2
+    assert depo.ozet("ali", simdi=SIMDI) == (2, 2, None)
+
+    kuyruk, bulunan = depo.oturum_kur("ali", lambda d, k: ham, simdi=SIMDI)
+    kart = kuyruk.siradaki(SIMDI)
+    assert bulunan[kart.anahtar].soru in ("S2", "S3")
+
+    depo.cevapla("ali", kart, True, sure=5, simdi=SIMDI)
+    assert depo.kartlar("ali")[kart.anahtar].aralik == 1.0
+    assert depo.ozet("ali", simdi=SIMDI)[:2] == (2, 1)
+
+    # Vadesi gelmemiş kartı testte doğru bilmek aralığı değiştirmez
+    i = ["S1", "S2", "S3"].index(bulunan[kart.anahtar].soru)
+    assert depo.test_isle("ali", "Tarih", "Osmanlı", sorular, {i: "A"}, simdi=SIMDI) == 0
+
+
+def test_sorusu_kaybolan_kart_silinir(depo):
+    sorular = [Soru.dict_ten(_soru("S1"))]
+    depo.test_isle("ali", "Tarih", "Osmanlı", sorular, {0: "B"}, simdi=SIMDI)
+
+    kuyruk, _ = depo.oturum_kur("ali", lambda d, k: [_soru("S1 düzenlendi")], simdi=SIMDI)
+    assert len(kuyruk) == 0
+    assert depo.kartlar("ali") == {}
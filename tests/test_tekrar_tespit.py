@@ -0,0 +1,58 @@
+from depolama import json_yaz
+from soru_bankasi import SoruBankasiDeposu, konu_degistir
+from tekrar_tespit import BankaTekrarKontrolu, TekrarDedektoru
+
+KOK = ("Osmanlı Devleti'nde uygulanan tımar sistemi ile ilgili aşağıdaki bilgilerden "
+       "hangisi yanlıştır ve bu sistemin devlete sağladığı askeri ve mali katkılar nelerdir")
+
+
+def _soru(metin):
+    return {"soru": metin, "secenekler": {"A": "Sipahi", "B": "Yeniçeri", "C": "Akıncı"}, "dogru_cevap": "A"}
+
+
+ASIL = _soru(KOK)
+SONU_DEGISIK = _soru(KOK.replace("nelerdir", "nedir"))
+BASI_DEGISIK = _soru(KOK.replace("Osmanlı", "Selçuklu"))
+ILGISIZ = _soru("Türkiye'nin en uzun akarsuyu hangisidir ve hangi denize dökülür, kaynağı nerededir")
+
+
+def test_benzerler_bulunur_cikarilan_donmez():
+    dedektor = TekrarDedektoru()
+    dedektor.ekle(("Tarih", "Osmanlı", 0), ASIL)
+    dedektor.ekle(("Coğrafya", "Akarsular", 0), ILGISIZ)
+
+    benzerler = dedektor.benzerleri(SONU_DEGISIK)
+    assert [a for a, _ in benzerler] == [("Tarih", "Osmanlı", 0)]
+    assert dedektor.esik <= benzerler[0][1] < 1
+
+    dedektor.cikar(("Tarih", "Osmanlı", 0))
+    assert dedektor.benzerleri(SONU_DEGISIK) == [] and len(dedektor) == 1
+    dedektor.cikar(("Tarih", "Osmanlı", 0))  # olmayan anahtar sorun çıkarmaz
+
+
+def test_uclu_tekrar_tek_kume_olur():
+    dedektor = TekrarDedektoru()
+    for sira, soru in enumerate([ASIL, ILGISIZ, SONU_DEGISIK, BASI_DEGISIK]):
+        dedektor.ekle(("Tarih", "Osmanlı", sira), soru)
+
+    kumeler = dedektor.kumeler()
+    assert len(kumeler) == 1
+    assert kumeler[0]["uyeler"] == [("Tarih", "Osmanlı", 0), ("Tarih", "Osmanlı", 2), ("Tarih", "Osmanlı", 3)]
+    assert len(kumeler[0]["ciftler"]) == 3
+
+
+def test_silinen_sorudan_sonra_konu_yeniden_indekslenir(tmp_path):
+    dosya = str(tmp_path / "soru_bankasi.json")
+    json_yaz(dosya, {"Tarih": {"Osmanlı": [ILGISIZ, ASIL, _soru("Lale Devri'nin özellikleri nelerdir")]}})
+    depo = SoruBankasiDeposu(dosya, str(tmp_path / "soru_parcalari"))
+    kontrol = BankaTekrarKontrolu(depo)
+    assert [b["sira"] for b in kontrol.benzerleri(SONU_DEGISIK)] == [1]
+
+    # İlk soru silinir, kalanlar bir sıra kayar
+    sorular = list(depo.sorular("Tarih", "Osmanlı"))[1:]
+    depo.kaydet(konu_degistir(depo.veri(), "Tarih", "Osmanlı", sorular))
+    kontrol.konu_guncelle("Tarih", "Osmanlı")
+
+    benzerler = kontrol.benzerleri(SONU_DEGISIK)
+    assert [(b["sira"], b["ozet"][:7]) for b in benzerler] == [(0, "Osmanlı")]
+    assert len(kontrol._dedektor) == 2
@@ -0,0 +1,78 @@
+import io
+import json
+import os
+import zipfile
+
+import pytest
+from PIL import Image
+
+from toplu_resim import eslemeleri_oku, toplu_yukle
+
+
+def _jpeg(genislik, yukseklik):
+    tampon = io.BytesIO()
+    Image.new("RGB", (genislik, yukseklik), "navy").save(tampon, "JPEG")
+    return tampon.getvalue()
+
+
+@pytest.fixture
+def banka():
+    soru = {"soru": "?", "secenekler": {"A": "1"}, "dogru_cevap": "A", "cozum": ""}
+    return {"Coğrafya": {"Harita": [dict(soru), dict(soru)]}}
+
+
+def test_csv_ve_json_eslemeleri():
+    csv_icerik = "dosya;ders;konu;sira\nharita.jpg;Coğrafya;Harita;2\n".encode("utf-8-sig")
+    assert eslemeleri_oku(csv_icerik, "eslesme.csv") == [
+        {"dosya": "harita.jpg", "ders": "Coğrafya", "konu": "Harita", "sira": 2, "alan": "soru_resmi"}
+    ]
+
+    json_icerik = json.dumps({"c.png": {"ders": "Coğrafya", "konu": "Harita", "sira": 1, "alan": "cozum_resmi"}})
+    assert eslemeleri_oku(json_icerik.encode(), "eslesme.json")[0]["alan"] == "cozum_resmi"
+
+    with pytest.raises(ValueError):
+        eslemeleri_oku(b"dosya,ders\nx.jpg,Tarih\n", "eslesme.csv")
+    with pytest.raises(ValueError):
+        eslemeleri_oku(b"dosya,ders,konu,sira,alan\nx.jpg,T,K,1,baska\n", "eslesme.csv")
+
+
+def test_zipten_paralel_yukleme_ve_satir_sonuclari(tmp_path, banka):
+    arsiv = io.BytesIO()
+    with zipfile.ZipFile(arsiv, "w") as z:
+        z.writestr("sinav/harita.jpg", _jpeg(1600, 1200))
+        z.writestr("sinav/cozum.jpg", _jpeg(300, 200))
+        z.writestr("sinav/bozuk.jpg", b"resim degil")
+    eslemeler = eslemeleri_oku(
+        "dosya,ders,konu,sira,alan\n"
+        "harita.jpg,Coğrafya,Harita,1,\n"
+        "cozum.jpg,Coğrafya,Harita,1,cozum_resmi\n"
+        "bozuk.jpg,Coğrafya,Harita,2,\n"
+        "yok.jpg,Coğrafya,Harita,2,\n"
+        "harita.jpg,Coğrafya,Harita,9,\n".encode(),
+        "eslesme.csv",
+    )
+
+    sonuclar = toplu_yukle(arsiv, eslemeler, banka, klasor=str(tmp_path / "resimler"), isci_sayisi=2)
+
+    assert [s["durum"] for s in sonuclar] == ["ok", "ok", "hata", "hata", "hata"]
+    assert sonuclar[3]["mesaj"] == "dosya kaynakta yok"
+    assert sonuclar[4]["mesaj"] == "konuda 2 soru var"
+
+    soru = banka["Coğrafya"]["Harita"][0]
+    with Image.open(soru["soru_resmi"]) as resim:
+        assert resim.width == 800
+    assert os.path.exists(soru["cozum_resmi"])
+    assert "soru_resmi" not in banka["Coğrafya"]["Harita"][1]
+    assert len(os.listdir(tmp_path / "resimler" / "boyutlar")) > 0
+
+
+def test_klasorden_yukleme(tmp_path, banka):
+    kaynak = tmp_path / "kaynak" / "alt"
+    kaynak.mkdir(parents=True)
+    (kaynak / "a.jpg").write_bytes(_jpeg(100, 100))
+
+    sonuclar = toplu_yukle(str(tmp_path / "kaynak"), [
+        {"dosya": "a.jpg", "ders": "Coğrafya", "konu": "Harita", "sira": 2, "alan": "soru_resmi"}
+    ], banka, klasor=str(tmp_path / "resimler"), isci_sayisi=1)
+    assert sonuclar[0]["durum"] == "ok"
+    assert banka["Coğrafya"]["Harita"][1]["soru_resmi"] == sonuclar[0]["yol"]
@@ -0,0 +1,28 @@
+from kullanici_deposu import SQLiteKullaniciDeposu
+from yazma_kuyrugu import YazmaKuyrugu
+
+
+def test_ayni_kullanici_tek_yazmaya_indirgenir(tmp_path):
+    depo = SQLiteKullaniciDeposu(str(tmp_path / "kpss.db"))
+    depo.kullanici_kaydet("ali", {"isim": "Ali", "sifre": "x"})
+    depo.test_sonucu_kaydet("ali", "Tarih", "Osmanlı", 1, 7, 3)
+    kuyruk = YazmaKuyrugu(depo, aralik=3600)
+
+    kuyruk.son_giris("ali", "2024-05-01T10:00:00")
+    kuyruk.son_giris("ali", "2024-05-01T11:00:00")
+    kuyruk.profil_guncelle("ali", {"isim": "Ali Veli", "tema": "koyu"})
+    assert kuyruk.bekleyen("ali")["last_login"] == "2024-05-01T11:00:00"
+    assert depo.kullanici_getir("ali")["isim"] == "Ali"
+
+    assert kuyruk.bosalt() == 1
+    assert kuyruk.bosaltma_sayisi == 1
+    assert kuyruk.bekleyen("ali") is None
+
+    kullanici = depo.kullanici_getir("ali")
+    assert (kullanici["isim"], kullanici["tema"]) == ("Ali Veli", "koyu")
+    assert kullanici["last_login"] == "2024-05-01T11:00:00"
+    assert kullanici["sonuclar"]["Tarih"]["Osmanlı"]["test_1"] == {"dogru": 7, "yanlis": 3}
+    giris_sayisi = depo._baglanti().execute(
+        "SELECT giris_sayisi FROM giris_bilgileri WHERE kullanici_adi = 'ali'"
+    ).fetchone()[0]
+    assert giris_sayisi == 2
@@ -0,0 +1,181 @@
+"""
+KPSS Quiz App - Toplu Resim Yükleme
+ZIP arşivi ya da klasördeki resimleri bir eşleme dosyasına (CSV/JSON) göre sorulara bağlar
+EXIF düzeltme, küçültme ve yeniden kodlama süreç havuzunda paralel yapılır
+"""
+
+import csv
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from PIL import Image
+from config import Config
+from image_handler import ImageHandler
+
+# Eşlemede resmin bağlanabileceği soru alanları
+ALANLAR = ("soru_resmi", "cozum_resmi")
+
+# Eşleme dosyası sütunları: dosya, ders, konu, sira (konudaki 1'den başlayan soru numarası), alan (opsiyonel)
+ZORUNLU_SUTUNLAR = ("dosya", "ders", "konu", "sira")
+
+
+# ===============================
+# EŞLEME DOSYASI
+# ===============================
+
+def eslemeleri_oku(icerik: bytes, dosya_adi: str) -> List[Dict]:
+    """
+    CSV ya da JSON eşleme dosyasını satır listesine çevir
+    JSON: satır nesnelerinden oluşan liste veya {dosya: {ders, konu, sira, alan}}
+    Raises: ValueError (eksik sütun, geçersiz soru numarası ya da alan)
+    """
+    metin = icerik.decode("utf-8-sig")
+    if dosya_adi.lower().endswith(".json"):
+        veri = json.loads(metin)
+        if isinstance(veri, dict):
+            veri = [{"dosya": dosya, **hedef} for dosya, hedef in veri.items()]
+        if not isinstance(veri, list):
+            raise ValueError("JSON eşleme bir liste ya da sözlük olmalı")
+    else:
+        # Excel'den gelen ; ayraçlı dosyalar da okunur
+        ayrac = ";" if metin.split("\n", 1)[0].count(";") > metin.split("\n", 1)[0].count(",") else ","
+        veri = list(csv.DictReader(io.StringIO(metin), delimiter=ayrac))
+
+    satirlar = []
+    for no, satir in enumerate(veri, 1):
+        if not isinstance(satir, dict):
+            raise ValueError(f"{no}. satır geçersiz")
+        satir = {str(k).strip().lower(): v for k, v in satir.items() if k is not None}
+        eksik = [s for s in ZORUNLU_SUTUNLAR if not str(satir.get(s) or "").strip()]
+        if eksik:
+            raise ValueError(f"{no}. satırda eksik sütun: {', '.join(eksik)}")
+        try:
+            sira = int(str(satir["sira"]).strip())
+        except ValueError:
+            raise ValueError(f"{no}. satırda soru numarası sayı değil: {satir['sira']}") from None
+        alan = str(satir.get("alan") or "soru_resmi").strip()
+        if alan not in ALANLAR:
+            raise ValueError(f"{no}. satırda bilinmeyen alan: {alan}")
+        satirlar.append({
+            "dosya": str(satir["dosya"]).strip(),
+            "ders": str(satir["ders"]).strip(),
+            "konu": str(satir["konu"]).strip(),
+            "sira": sira,
+            "alan": alan,
+        })
+    return satirlar
+
+
+# ===============================
+# KAYNAK (ZIP / KLASÖR)
+# ===============================
+
+def kaynak_dosyalari(kaynak) -> Dict[str, Union[str, bytes]]:
+    """
+    Dosya adı → klasördeki yol ya da ZIP'ten okunmuş içerik
+    Eşleme yalnızca dosya adıyla yapılır; alt klasörler düzleştirilir
+    """
+    sinir = ImageHandler.MAX_FILE_SIZE_MB * 1024 * 1024
+    dosyalar: Dict[str, Union[str, bytes]] = {}
+
+    if isinstance(kaynak, str) and os.path.isdir(kaynak):
+        for kok, _, adlar in os.walk(kaynak):
+            for ad in adlar:
+                if os.path.splitext(ad)[1].lower() in ImageHandler.SUPPORTED_FORMATS:
+                    dosyalar[ad] = os.path.join(kok, ad)
+        return dosyalar
+
+    with zipfile.ZipFile(kaynak) as arsiv:
+        for bilgi in arsiv.infolist():
+            ad = os.path.basename(bilgi.filename)
+            if bilgi.is_dir() or ad.startswith(".") or bilgi.filename.startswith("__MACOSX/"):
+                continue
+            if os.path.splitext(ad)[1].lower() not in ImageHandler.SUPPORTED_FORMATS:
+                continue
+            # Sınırı aşan dosyalar açılmaz; işlenirken hata olarak raporlanır
+            dosyalar[ad] = arsiv.read(bilgi) if bilgi.file_size <= sinir else b""
+    return dosyalar
+
+
+# ===============================
+# İŞÇİ SÜREÇ
+# ===============================
+
+_isci_handler: Optional[ImageHandler] = None
+
+
+def _isci_baslat(klasor: str):
+    global _isci_handler
+    _isci_handler = ImageHandler(klasor)
+
+
+def _resmi_isle(girdi: Union[str, bytes]) -> Tuple[Optional[str], str]:
+    """
+    Tek resmi düzelt, küçült, içerik özetiyle kaydet ve boyutlandırılmış kopyalarını üret (işçi süreçte)
+    Aynı resim birden çok soruya eşlenmişse tek dosya olarak saklanır
+    Returns: (kaydedilen yol, hata mesajı)
+    """
+    try:
+        if not girdi:
+            return None, f"boş ya da {ImageHandler.MAX_FILE_SIZE_MB} MB sınırını aşıyor"
+        if isinstance(girdi, str) and os.path.getsize(girdi) > ImageHandler.MAX_FILE_SIZE_MB * 1024 * 1024:
+            return None, f"{ImageHandler.MAX_FILE_SIZE_MB} MB sınırını aşıyor"
+
+        with Image.open(girdi if isinstance(girdi, str) else io.BytesIO(girdi)) as image:
+            image.load()
+            image = _isci_handler._fix_image_orientation(image)
+            image = _isci_handler._optimize_image(image)
+            return _isci_handler._icerik_kaydet(image), ""
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+# ===============================
+# TOPLU YÜKLEME
+# ===============================
+
+def toplu_yukle(kaynak, eslemeler: List[Dict], soru_bankasi: Dict,
+                klasor: str = None, isci_sayisi: int = None) -> List[Dict]:
+    """
+    Eşlenen resimleri paralel işle ve başarılı olanları soru bankasına (bellekte) bağla
+    Bankayı diske yazmak çağıranın işidir
+    Returns: satır başına {dosya, ders, konu, sira, alan, durum ("ok"/"hata"), mesaj, yol}
+    """
+    klasor = klasor or ImageHandler.IMAGE_FOLDER
+    dosyalar = kaynak_dosyalari(kaynak)
+    sonuclar = [{**e, "durum": "hata", "mesaj": "", "yol": None} for e in eslemeler]
+
+    # Önce eşlemeyi doğrula; hatalı satırlar için resim işlenmez
+    isler = []
+    for sonuc in sonuclar:
+        sorular = soru_bankasi.get(sonuc["ders"], {}).get(sonuc["konu"])
+        if sorular is None:
+            sonuc["mesaj"] = "ders/konu bulunamadı"
+        elif not 1 <= sonuc["sira"] <= len(sorular):
+            sonuc["mesaj"] = f"konuda {len(sorular)} soru var"
+        elif sonuc["dosya"] not in dosyalar:
+            sonuc["mesaj"] = "dosya kaynakta yok"
+        else:
+            isler.append(sonuc)
+
+    if isler:
+        isci_sayisi = isci_sayisi or Config.TOPLU_RESIM_ISCI
+        with ProcessPoolExecutor(max_workers=isci_sayisi, initializer=_isci_baslat,
+                                 initargs=(klasor,)) as havuz:
+            # Aynı dosya birden çok satırda geçse de bir kez işlenir
+            gelecekler = {
+                ad: havuz.submit(_resmi_isle, dosyalar[ad])
+                for ad in dict.fromkeys(s["dosya"] for s in isler)
+            }
+            for sonuc in isler:
+                sonuc["yol"], sonuc["mesaj"] = gelecekler[sonuc["dosya"]].result()
+
+    for sonuc in isler:
+        if sonuc["yol"]:
+            soru = soru_bankasi[sonuc["ders"]][sonuc["konu"]][sonuc["sira"] - 1]
+            soru[sonuc["alan"]] = sonuc["yol"]
+            sonuc["durum"] = "ok"
+    return sonuclar
@@ -0,0 +1,123 @@
+"""
+KPSS Quiz App - Geciktirilmiş Yazma (Write-Behind) Kuyruğu
+Son giriş zamanı ve profil alanları gibi küçük kullanıcı güncellemelerini
+istek sırasında değil, arka planda toplu olarak kaydeder
+Test sonuçları buradan geçmez; her test sonuç günlüğüne (sonuc_gunlugu) yazılır
+"""
+
+import atexit
+import threading
+from typing import Dict, Optional
+from arka_plan_yazici import ArkaPlanYazici
+from config import Config
+from kullanici_repo import kullanici_repo
+
+
+class YazmaKuyrugu:
+    """
+    Değişen (kirli) kullanıcıların bekleyen alanlarını biriktirir, aynı kullanıcının
+    art arda değişikliklerini tek yazmaya indirger ve zamanlayıcı ya da eşik dolunca boşaltır
+    """
+
+    def __init__(self, depo, aralik: float = None, esik: int = None):
+        self.depo = depo
+        self.aralik = aralik or Config.YAZMA_KUYRUGU_ARALIK_SN
+        self.esik = esik or Config.YAZMA_KUYRUGU_ESIK
+
+        # kullanıcı → {alan: değer}; aynı alana sonradan gelen değer öncekini ezer
+        self._kirli: Dict[str, Dict] = {}
+        # kullanıcı → yazılmamış giriş sayısı
+        self._girisler: Dict[str, int] = {}
+        self._kilit = threading.Lock()
+        self._yazma_kilidi = threading.Lock()
+        self._yazici = ArkaPlanYazici(
+            "yazma-kuyrugu", self.bosalt, self.aralik, "Kullanıcı bilgileri kaydedilemedi, tekrar denenecek"
+        )
+
+        # İstatistikler
+        self.isaret_sayisi = 0
+        self.yazilan_kullanici = 0
+        self.bosaltma_sayisi = 0
+
+    # ===============================
+    # KUYRUĞA ALMA
+    # ===============================
+
+    def profil_guncelle(self, kullanici: str, alanlar: Dict):
+        """Profil alanlarını yazılmak üzere kuyruğa al (şifre ve sonuçlar için kullanılmaz)"""
+        if not kullanici or not alanlar:
+            return
+        with self._kilit:
+            self._kirli.setdefault(kullanici, {}).update(alanlar)
+            self.isaret_sayisi += 1
+            dolu = len(self._kirli) >= self.esik
+        self._yazici.baslat()
+        if dolu:
+            self._yazici.uyandir()
+
+    def son_giris(self, kullanici: str, zaman: str):
+        """Başarılı girişi kuyruğa al (son giriş zamanı + giriş sayısı)"""
+        with self._kilit:
+            self._girisler[kullanici] = self._girisler.get(kullanici, 0) + 1
+        self.profil_guncelle(kullanici, {"last_login": zaman})
+
+    def bekleyen(self, kullanici: str) -> Optional[Dict]:
+        """Henüz yazılmamış alanların kopyası (yoksa None)"""
+        with self._kilit:
+            alanlar = self._kirli.get(kullanici)
+            return dict(alanlar) if alanlar is not None else None
+
+    def uygula(self, kullanicilar: Dict) -> Dict:
+        """Diskten okunmuş kullanıcı kayıtlarının üzerine bekleyen alanları işle"""
+        with self._kilit:
+            for kullanici, alanlar in self._kirli.items():
+                if kullanici in kullanicilar:
+                    kullanicilar[kullanici].update(alanlar)
+        return kullanicilar
+
+    # ===============================
+    # BOŞALTMA
+    # ===============================
+
+    def bosalt(self, kullanici: str = None) -> int:
+        """
+        Kuyruğu (veya yalnızca bir kullanıcıyı) hemen diske yaz
+        Returns: yazılan kullanıcı sayısı
+        """
+        with self._yazma_kilidi:
+            with self._kilit:
+                if kullanici is None:
+                    parti, self._kirli = self._kirli, {}
+                    girisler, self._girisler = self._girisler, {}
+                elif kullanici in self._kirli:
+                    parti = {kullanici: self._kirli.pop(kullanici)}
+                    girisler = {kullanici: self._girisler.pop(kullanici, 0)}
+                else:
+                    parti, girisler = {}, {}
+
+            if not parti:
+                return 0
+
+            try:
+                self.depo.profilleri_toplu_guncelle(parti, girisler)
+            except Exception:
+                # Yazılamayanları geri koy (bu arada gelen daha yeni değerler korunur)
+                with self._kilit:
+                    for k, alanlar in parti.items():
+                        self._kirli[k] = {**alanlar, **self._kirli.get(k, {})}
+                    for k, adet in girisler.items():
+                        self._girisler[k] = self._girisler.get(k, 0) + adet
+                raise
+
+            self.yazilan_kullanici += len(parti)
+            self.bosaltma_sayisi += 1
+            return len(parti)
+
+    def kapat(self):
+        """Thread'i durdur ve kalanları yaz (süreç kapanırken çağrılır)"""
+        self._yazici.kapat()
+
+
+# Global yazma kuyruğu instance
+yazma_kuyrugu = YazmaKuyrugu(kullanici_repo)
+atexit.register(yazma_kuyrugu.kapat)